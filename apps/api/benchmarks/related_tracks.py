@@ -0,0 +1,109 @@
+"""
+Benchmark: building the related-tracks neighbour table (related.py) offline.
+
+Generates a synthetic user × track interaction matrix and times the two
+stages of the nightly job that do not touch Postgres: assembling the sparse
+matrix and computing every track's top-K cosine neighbours.  Reports the
+matrix size, peak resident memory and the size of the resulting
+``track_neighbors`` rows.
+
+Users are given a taste cluster; most of their interactions come from that
+cluster's tracks with a Zipf-like popularity, the rest from the global head.
+That keeps co-occurrence concentrated the way real listening is, instead of
+uniform noise where every pair of tracks is equally (un)related.
+
+    PYTHONPATH=src python benchmarks/related_tracks.py --users 1000000 --tracks 100000
+"""
+from __future__ import annotations
+
+import argparse
+import resource
+import sys
+import time
+
+import numpy as np
+
+from myndral_api.related import build_matrix, top_k_neighbours
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _popular(rng: np.random.Generator, size: int, n: int, skew: float) -> np.ndarray:
+    # Inverse-CDF sampling of a power law over 0..n-1: low indices dominate.
+    return np.minimum((n * rng.random(size) ** skew).astype(np.int64), n - 1)
+
+
+def synthesize(
+    users: int, tracks: int, per_user: float, clusters: int, seed: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    counts = np.maximum(1, rng.geometric(1 / per_user, size=users))
+    user_idx = np.repeat(np.arange(users, dtype=np.int32), counts)
+    total = len(user_idx)
+
+    cluster_size = tracks // clusters
+    user_cluster = rng.integers(0, clusters, size=users)[user_idx]
+    in_cluster = user_cluster * cluster_size + _popular(rng, total, cluster_size, 3.0)
+    global_head = _popular(rng, total, tracks, 4.0)
+    from_cluster = rng.random(total) < 0.8
+    track_idx = np.where(from_cluster, in_cluster, global_head).astype(np.int32)
+
+    # Mix of likes/saves (2.0) and ln(1 + plays) for a handful of plays.
+    weights = np.where(
+        rng.random(total) < 0.1, 2.0, np.log1p(rng.integers(1, 20, size=total))
+    ).astype(np.float32)
+    return user_idx, track_idx, weights
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--tracks", type=int, default=100_000)
+    parser.add_argument("--per-user", type=float, default=30.0, help="mean interactions per user")
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--min-users", type=int, default=3)
+    parser.add_argument("--block-mb", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    user_idx, track_idx, weights = synthesize(
+        args.users, args.tracks, args.per_user, args.clusters, args.seed
+    )
+    synth_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matrix = build_matrix(user_idx, track_idx, weights, (args.users, args.tracks))
+    build_s = time.perf_counter() - started
+    del user_idx, track_idx, weights
+    matrix_mb = (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 2**20
+
+    started = time.perf_counter()
+    neighbours = top_k_neighbours(
+        matrix, args.k, min_users=args.min_users, block_bytes=args.block_mb * 2**20
+    )
+    topk_s = time.perf_counter() - started
+
+    rows = [n for n, _ in neighbours if len(n)]
+    stored = sum(len(n) for n in rows)
+    # uuid (16 B) + real (4 B) per neighbour, plus the track id and ~48 B of
+    # tuple and array headers per row.
+    table_mb = (stored * 20 + len(rows) * (16 + 48)) / 2**20
+
+    print(f"users × tracks         {args.users:,} × {args.tracks:,}")
+    print(f"interactions (nnz)     {matrix.nnz:,}  ({matrix_mb:,.0f} MB as CSR)")
+    print(f"synthesis              {synth_s:6.1f} s")
+    print(f"matrix build           {build_s:6.1f} s")
+    print(f"top-{args.k} neighbours       {topk_s:6.1f} s")
+    print(f"tracks with neighbours {len(rows):,}  ({stored / max(1, len(rows)):.1f} avg)")
+    print(f"track_neighbors size   ≈{table_mb:,.0f} MB")
+    print(f"peak RSS               {_peak_rss_mb():,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
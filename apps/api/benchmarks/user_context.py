@@ -0,0 +1,103 @@
+"""
+Benchmark: authenticated-endpoint latency with and without the user context cache.
+
+Runs the API in-process (httpx over ASGI, no network hop) against a real
+Postgres and issues --requests authenticated GETs as one active user, first
+with ``user_context_cache_ttl_seconds = 0`` (every request runs
+``fetch_user_by_id`` and its subscription subquery), then with the configured
+TTL.  Reports mean, p50, p95 and p99 latency and throughput for both runs.
+
+    PYTHONPATH=src python benchmarks/user_context.py \\
+        --path /v1/users/me/library/tracks --requests 2000 --concurrency 8
+
+The user is the first active one unless --user-id is given; the database URL
+comes from DATABASE_URL like the API itself.  REDIS_CACHE_ENABLED=true
+measures the Redis-backed mode instead of the in-process LRU.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from myndral_api import auth_utils
+from myndral_api.config import get_settings
+from myndral_api.db.session import AsyncSessionLocal
+from myndral_api.main import app
+
+
+async def _pick_user() -> str:
+    async with AsyncSessionLocal() as db:
+        user_id = (
+            await db.execute(
+                text("SELECT id::text FROM users WHERE is_active ORDER BY created_at LIMIT 1")
+            )
+        ).scalar_one_or_none()
+    if user_id is None:
+        raise SystemExit("No active user to authenticate as; pass --user-id.")
+    return user_id
+
+
+async def _run(
+    client: AsyncClient, path: str, token: str, requests: int, concurrency: int
+) -> tuple[list[float], float]:
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+def _report(label: str, latencies: list[float], elapsed: float) -> None:
+    ordered = sorted(latencies)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    print(
+        f"{label:<12} mean {statistics.fmean(ordered) * 1000:6.2f} ms  "
+        f"p50 {pct(0.50):6.2f}  p95 {pct(0.95):6.2f}  p99 {pct(0.99):6.2f}  "
+        f"{len(ordered) / elapsed:7.0f} req/s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--path", default="/v1/users/me")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--user-id")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    cached_ttl = settings.user_context_cache_ttl_seconds
+    token, _ = auth_utils.create_access_token(args.user_id or await _pick_user())
+    print(f"GET {args.path}  requests={args.requests:,} concurrency={args.concurrency}")
+    print(f"redis_cache_enabled={settings.redis_cache_enabled} cache ttl={cached_ttl}s")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for label, ttl in (("uncached", 0), ("cached", cached_ttl)):
+            settings.user_context_cache_ttl_seconds = ttl
+            await _run(client, args.path, token, args.warmup, args.concurrency)
+            latencies, elapsed = await _run(
+                client, args.path, token, args.requests, args.concurrency
+            )
+            _report(label, latencies, elapsed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,263 @@
+"""
+On-disk block cache for GCS-backed audio.
+
+Objects are split into fixed-size, block-aligned pieces and each piece is
+stored as its own file under ``<cache dir>/<object key>/<block index>.blk``.
+A range request only fetches the blocks it is missing from GCS; everything
+else is read back from local disk with ``mmap``.
+
+The object key is derived from the storage URL *and* the checksum recorded in
+``track_audio_files``, so replacing a track's audio under the same object name
+naturally misses the cache instead of serving stale bytes.
+
+The LRU index lives in process memory and is rebuilt from the directory on
+startup (oldest mtime first), so the cache survives worker restarts on the
+same instance.  Note that Cloud Run's filesystem is memory-backed: the size
+cap counts against the instance memory limit.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+
+from myndral_api.config import get_settings
+from myndral_api.media_utils import DATA_DIR
+from myndral_api.prefetch import get_prefetcher
+
+BLOCK_SIZE = 1024 * 1024
+
+_BlockId = tuple[str, int]
+
+
+@dataclass
+class AudioCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    bytes_served_from_cache: int = 0
+    bytes_fetched: int = 0
+
+    def to_dict(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "bytesServedFromCache": self.bytes_served_from_cache,
+            "bytesFetched": self.bytes_fetched,
+        }
+
+
+class AudioBlockCache:
+    """Size-capped LRU cache of aligned object blocks on local disk."""
+
+    def __init__(self, root: Path, max_bytes: int, block_size: int = BLOCK_SIZE) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.block_size = block_size
+        self.stats = AudioCacheStats()
+        self._index: OrderedDict[_BlockId, int] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def object_key(storage_url: str, checksum: str | None) -> str:
+        return hashlib.sha256(f"{storage_url}\0{checksum or ''}".encode()).hexdigest()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def has_block(self, key: str, index: int) -> bool:
+        return (key, index) in self._index
+
+    def describe(self) -> dict[str, int | float]:
+        return {
+            **self.stats.to_dict(),
+            "blocks": len(self._index),
+            "sizeBytes": self._size,
+            "maxBytes": self.max_bytes,
+            "blockSize": self.block_size,
+        }
+
+    async def iter_range(
+        self,
+        key: str,
+        start: int,
+        end: int,
+        fetch: Callable[[int, int], Awaitable[bytes]],
+    ) -> AsyncIterator[bytes]:
+        """Yield bytes ``start..end`` (inclusive), block by block.
+
+        ``fetch(block_start, block_end)`` is the origin read used for missing
+        blocks; its result is stored before being sliced for the caller.
+        """
+        for index in range(start // self.block_size, end // self.block_size + 1):
+            block_start = index * self.block_size
+            lo = max(start, block_start) - block_start
+            hi = min(end, block_start + self.block_size - 1) - block_start + 1
+
+            data = await run_in_threadpool(self._read, (key, index), lo, hi)
+            if data is None:
+                block = await fetch(block_start, block_start + self.block_size - 1)
+                if not block:
+                    return
+                await run_in_threadpool(self._store, (key, index), block)
+                data = block[lo:hi]
+            if not data:
+                return
+            yield data
+
+    # ── Internals (run on the threadpool) ────────────────────────────────────
+
+    def _path(self, block_id: _BlockId) -> Path:
+        key, index = block_id
+        return self.root / key / f"{index}.blk"
+
+    def _read(self, block_id: _BlockId, lo: int, hi: int) -> bytes | None:
+        with self._lock:
+            known = block_id in self._index
+            if known:
+                self._index.move_to_end(block_id)
+            else:
+                self.stats.misses += 1
+        if not known:
+            return None
+        try:
+            with self._path(block_id).open("rb") as handle, mmap.mmap(
+                handle.fileno(), 0, access=mmap.ACCESS_READ
+            ) as view:
+                data = view[lo:hi]
+        except (FileNotFoundError, ValueError):
+            # Evicted between the index check and the open, or truncated on disk.
+            with self._lock:
+                self._forget(block_id)
+                self.stats.misses += 1
+            return None
+        with self._lock:
+            self.stats.hits += 1
+            self.stats.bytes_served_from_cache += len(data)
+        return data
+
+    def _store(self, block_id: _BlockId, block: bytes) -> None:
+        with self._lock:
+            self.stats.bytes_fetched += len(block)
+        if len(block) > self.max_bytes:
+            return
+        path = self._path(block_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(block)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._forget(block_id)
+            self._index[block_id] = len(block)
+            self._size += len(block)
+            self._evict()
+
+    def _forget(self, block_id: _BlockId) -> None:
+        size = self._index.pop(block_id, None)
+        if size is not None:
+            self._size -= size
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._index:
+            block_id, size = self._index.popitem(last=False)
+            self._size -= size
+            self.stats.evictions += 1
+            self._path(block_id).unlink(missing_ok=True)
+
+    def _load_index(self) -> None:
+        found: list[tuple[float, _BlockId, int]] = []
+        for path in self.root.glob("*/*.blk"):
+            try:
+                stat = path.stat()
+                found.append((stat.st_mtime, (path.parent.name, int(path.stem)), stat.st_size))
+            except (OSError, ValueError):
+                continue
+        for _, block_id, size in sorted(found):
+            self._index[block_id] = size
+            self._size += size
+        self._evict()
+
+
+@lru_cache
+def get_audio_block_cache() -> AudioBlockCache | None:
+    """Process-wide cache instance, or ``None`` when disabled in settings."""
+    settings = get_settings()
+    if settings.audio_cache_max_bytes <= 0:
+        return None
+    root = Path(settings.audio_cache_dir or DATA_DIR / "cache" / "audio")
+    return AudioBlockCache(root, settings.audio_cache_max_bytes)
+
+
+def observe_stream_read(
+    client_key: str,
+    gs_url: str,
+    checksum: str | None,
+    start: int,
+    end: int,
+    total_size: int,
+) -> None:
+    """Feed a client's range request to the read-ahead prefetcher, if enabled.
+
+    Blocks already in the on-disk cache are not prefetched again.
+    """
+    prefetcher = get_prefetcher()
+    if prefetcher is None:
+        return
+    cache = get_audio_block_cache()
+    is_cached = None
+    if cache is not None:
+        key = cache.object_key(gs_url, checksum)
+        is_cached = functools.partial(cache.has_block, key)
+    prefetcher.observe(client_key, gs_url, checksum, start, end, total_size, is_cached=is_cached)
+
+
+async def iter_audio_bytes(
+    gs_url: str,
+    start: int,
+    end: int,
+    *,
+    checksum: str | None = None,
+) -> AsyncIterator[bytes]:
+    """Yield bytes ``start..end`` of a GCS audio object.
+
+    Reads go through the on-disk block cache and the read-ahead buffer when
+    they are enabled, and straight to GCS otherwise.
+    """
+    from myndral_api.gcs_utils import download_gcs_range, get_storage_backend, iter_gcs_bytes
+
+    cache = get_audio_block_cache()
+    prefetcher = get_prefetcher()
+    if cache is None and prefetcher is None:
+        async for chunk in iter_gcs_bytes(gs_url, start, end):
+            yield chunk
+        return
+
+    if cache is None:
+        async for chunk in prefetcher.iter_range(gs_url, checksum, start, end):
+            yield chunk
+        return
+
+    if prefetcher is not None:
+        fetch = functools.partial(prefetcher.fetch, gs_url, checksum)
+    else:
+        backend = get_storage_backend()
+        fetch = functools.partial(backend.run, download_gcs_range, gs_url)
+    key = cache.object_key(gs_url, checksum)
+    async for chunk in cache.iter_range(key, start, end, fetch):
+        yield chunk
@@ -1,3 +1,4 @@
+import json
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -10,8 +11,10 @@ from sqlalchemy import text
 from sqlalchemy.engine import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from myndral_api.caching import TTLCache, redis_call
 from myndral_api.config import get_settings
 from myndral_api.db.session import get_db
+from myndral_api.sessions import access_token_status
 
 settings = get_settings()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -19,6 +22,12 @@ bearer_scheme = HTTPBearer(auto_error=False)
 
 ALGORITHM = "HS256"
 
+_USER_CONTEXT_KEY_PREFIX = "myndral:user-context"
+# Public user dicts (``to_public_user``) of active users, by user id.
+_user_context_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+    ttl_seconds=settings.user_context_cache_ttl_seconds, max_entries=50_000
+)
+
 USER_SELECT_BASE = """
 SELECT
   u.id::text AS id,
@@ -62,10 +71,32 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
-def create_access_token(user_id: str) -> tuple[str, int]:
+def create_access_token(
+    user_id: str,
+    *,
+    role: str | None = None,
+    subscription_plan: str | None = None,
+    session_id: str | None = None,
+) -> tuple[str, int]:
+    """Sign an access token; ``role`` and ``subscription_plan`` become claims.
+
+    Tokens carrying both claims let ``get_token_user`` authorize without a
+    database lookup.  ``iat`` keeps sub-second precision so it can be
+    compared with revocation times (sessions.py).
+    """
     expires_in = settings.access_token_expire_minutes * 60
-    expires_at = datetime.now(UTC) + timedelta(seconds=expires_in)
-    payload = {"sub": user_id, "type": "access", "exp": expires_at}
+    issued_at = datetime.now(UTC)
+    payload: dict[str, Any] = {
+        "sub": user_id,
+        "type": "access",
+        "iat": issued_at.timestamp(),
+        "exp": issued_at + timedelta(seconds=expires_in),
+    }
+    if role is not None and subscription_plan is not None:
+        payload["role"] = role
+        payload["plan"] = subscription_plan
+    if session_id is not None:
+        payload["sid"] = session_id
     token = jwt.encode(payload, settings.secret_key, algorithm=ALGORITHM)
     return token, expires_in
 
@@ -120,21 +151,137 @@ async def fetch_user_by_id(db: AsyncSession, user_id: str) -> RowMapping[str, An
     return result.mappings().first()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> dict[str, Any]:
+def _bearer_claims(credentials: HTTPAuthorizationCredentials | None) -> dict[str, Any]:
     if credentials is None or credentials.scheme.lower() != "bearer":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing bearer token",
         )
+    return decode_access_token(credentials.credentials)
+
+
+def _session_revoked() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Session has been revoked",
+    )
 
-    payload = decode_access_token(credentials.credentials)
-    user = await fetch_user_by_id(db, str(payload["sub"]))
+
+async def _load_user_context(db: AsyncSession, user_id: str) -> dict[str, Any]:
+    cached = await _user_context_get(user_id)
+    if cached is not None:
+        return cached
+    user = await fetch_user_by_id(db, user_id)
     if user is None or not user["is_active"]:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User account is not available",
         )
-    return to_public_user(user)
+    public_user = to_public_user(user)
+    await _user_context_put(user_id, public_user)
+    return dict(public_user)
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    claims = _bearer_claims(credentials)
+    if await access_token_status(claims) == "revoked":
+        raise _session_revoked()
+    return await _load_user_context(db, str(claims["sub"]))
+
+
+async def get_token_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    """``id``, ``role`` and ``subscriptionPlan`` of the caller, from the token if possible.
+
+    For hot endpoints that need nothing else about the user.  The claims are
+    used only when the revocation set (sessions.py) vouches for them; tokens
+    without claims, stale claims and deployments without Redis fall back to
+    the ``get_current_user`` lookup.
+    """
+    claims = _bearer_claims(credentials)
+    token_status = await access_token_status(claims)
+    if token_status == "revoked":
+        raise _session_revoked()
+    if token_status == "valid" and "role" in claims and "plan" in claims:
+        return {
+            "id": str(claims["sub"]),
+            "role": claims["role"],
+            "subscriptionPlan": claims["plan"],
+        }
+    return await _load_user_context(db, str(claims["sub"]))
+
+
+async def get_optional_user_id(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> str | None:
+    """User id from the bearer token without a database lookup; ``None`` if anonymous.
+
+    Only for high-volume, low-stakes requests such as play events or the home
+    screen, where a deactivated account being accepted until its token expires
+    is harmless.
+    """
+    if credentials is None or credentials.scheme.lower() != "bearer":
+        return None
+    return str(decode_access_token(credentials.credentials)["sub"])
+
+
+# ── User context cache ────────────────────────────────────────────────────────
+# ``get_current_user`` would otherwise run ``fetch_user_by_id`` (with its
+# subscription subquery) on every authenticated request.  Only active users
+# are cached, so an unknown or deactivated account always reaches Postgres.
+# Anything that changes a user's role, plan or active flag must call
+# ``invalidate_user_context`` after committing.
+#
+# Each worker keeps an entry for at most ``user_context_local_ttl_seconds``,
+# the window in which a worker that did not handle the invalidation can serve
+# a stale role or a deactivated account.  Redis on: the shared entry lives in
+# Redis for the full TTL behind those local copies.  Redis off: the local copy
+# is all there is, so the short TTL also bounds how often each worker reads
+# the user from Postgres.
+
+def _user_context_key(user_id: str) -> str:
+    return f"{_USER_CONTEXT_KEY_PREFIX}:{user_id}"
+
+
+async def _user_context_get(user_id: str) -> dict[str, Any] | None:
+    settings = get_settings()
+    if settings.user_context_cache_ttl_seconds <= 0:
+        return None
+    cached = _user_context_cache.get(user_id)
+    if cached is None and settings.redis_cache_enabled:
+        payload = await redis_call(lambda redis: redis.get(_user_context_key(user_id)))
+        if payload:
+            cached = json.loads(payload)
+            _user_context_cache.put(user_id, cached, settings.user_context_local_ttl_seconds)
+    # Callers get their own copy; the cached dict is shared.
+    return dict(cached) if cached is not None else None
+
+
+async def _user_context_put(user_id: str, public_user: dict[str, Any]) -> None:
+    settings = get_settings()
+    if settings.user_context_cache_ttl_seconds <= 0:
+        return
+    local_ttl = min(
+        settings.user_context_local_ttl_seconds, settings.user_context_cache_ttl_seconds
+    )
+    _user_context_cache.put(user_id, public_user, local_ttl)
+    if not settings.redis_cache_enabled:
+        return
+    await redis_call(
+        lambda redis: redis.set(
+            _user_context_key(user_id),
+            json.dumps(public_user),
+            ex=settings.user_context_cache_ttl_seconds,
+        )
+    )
+
+
+async def invalidate_user_context(user_id: str) -> None:
+    """Drop a user's cached context here and in Redis; call after the commit."""
+    _user_context_cache.invalidate(user_id)
+    await redis_call(lambda redis: redis.delete(_user_context_key(user_id)))
@@ -0,0 +1,96 @@
+"""
+Shared caching primitives.
+
+``TTLCache`` is a bounded, in-process LRU with per-entry expiry.  It is the
+building block for the hot-path caches (object metadata, playable-track
+resolution, …) that trade a few seconds of staleness for skipping a database
+or storage round trip.
+
+``get_redis`` returns the process-wide ``redis.asyncio`` client used to share
+cache entries between instances, or ``None`` when ``REDIS_CACHE_ENABLED`` is
+off.  Callers must treat Redis as an optimisation: every Redis error is
+swallowed by ``redis_call`` and the caller falls back to the source of truth.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from myndral_api.config import get_settings
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache[K: Hashable, V]:
+    """Bounded LRU mapping whose entries expire ``ttl_seconds`` after insertion."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: K) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+@lru_cache
+def get_redis() -> Redis | None:
+    settings = get_settings()
+    if not settings.redis_cache_enabled:
+        return None
+    from redis import asyncio as aioredis
+
+    return aioredis.from_url(
+        settings.redis_url,
+        decode_responses=True,
+        socket_timeout=0.25,
+        socket_connect_timeout=0.25,
+    )
+
+
+async def redis_call(
+    fn: Callable[[Redis], Awaitable[Any]], default: Any = None
+) -> Any:
+    """Run ``fn(redis)`` if Redis is enabled; return ``default`` if it is off or failing."""
+    redis = get_redis()
+    if redis is None:
+        return default
+    from redis.exceptions import RedisError
+
+    try:
+        return await fn(redis)
+    except (RedisError, OSError) as exc:
+        logger.warning("Redis cache unavailable, falling back: %s", exc)
+        return default
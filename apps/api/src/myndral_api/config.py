@@ -32,10 +32,27 @@ class Settings(BaseSettings):
 
     # Redis
     redis_url: str = "redis://localhost:6379"
+    # Share hot-path caches (caching.py) between instances through Redis.
+    # Off → each worker keeps its own in-process copy.
+    redis_cache_enabled: bool = False
+    # Anonymous catalog responses (response_cache.py), shared through Redis
+    # and purged by tag on staging actions and internal edits.
+    response_cache_ttl_seconds: int = 60
 
     # Auth
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 30
+    # Authenticated user context (auth_utils.get_current_user) keyed by user
+    # id.  Admin user updates and studio claims invalidate explicitly; the TTL
+    # bounds how late an expired subscription is noticed.  0 disables it.
+    user_context_cache_ttl_seconds: int = 30
+    # Each worker keeps its own copy for at most this long.  Invalidation only
+    # reaches the worker that handled the change (and Redis), so this is how
+    # long other workers may still accept a deactivated account or a revoked
+    # role.  Without Redis it is also the whole cache lifetime: one user
+    # lookup per user and worker every few seconds rather than once per
+    # cache TTL, the price of keeping the deactivation lag that short.
+    user_context_local_ttl_seconds: int = 5
 
     # AI
     anthropic_api_key: str = ""
@@ -59,6 +76,85 @@ class Settings(BaseSettings):
     # Storage — GCS bucket for images and audio in production.
     # Empty string → use local data/ directory (dev default).
     gcs_bucket_name: str = ""
+    # Shared storage client (gcs_utils.StorageBackend): worker threads for
+    # blocking SDK calls and pooled HTTPS connections to storage.googleapis.com.
+    gcs_max_workers: int = 32
+    gcs_http_pool_size: int = 64
+    # How long object size/generation lookups are reused before re-asking GCS.
+    gcs_metadata_cache_ttl_seconds: int = 300
+    # Opt-in: after the published/quality check, /v1/stream answers with a 307
+    # to a short-lived V4 signed URL instead of proxying the bytes.
+    stream_signed_url_redirect: bool = False
+    stream_signed_url_ttl_seconds: int = 300
+    # track_id → playable audio file lookups (playback.py).  Staging status
+    # changes invalidate explicitly; the TTL only bounds drift from direct SQL.
+    stream_resolution_cache_ttl_seconds: int = 30
+
+    # Local block cache for GCS-backed audio (see audio_cache.py).
+    # Empty dir → <DATA_DIR>/cache/audio.  max_bytes <= 0 disables the cache.
+    audio_cache_dir: str = ""
+    audio_cache_max_bytes: int = 256 * 1024 * 1024
+    # Sequential read-ahead for proxied streams (see prefetch.py): blocks
+    # fetched ahead of a client's next range request.  0 disables read-ahead.
+    stream_prefetch_blocks: int = 2
+    stream_prefetch_max_bytes: int = 64 * 1024 * 1024
+
+    # Playback event ingestion (events.py).  Backend "memory" buffers per
+    # process; "redis" uses a Redis stream shared by every instance.
+    event_ingest_backend: str = "memory"
+    event_flush_batch_size: int = 1000
+    event_flush_interval_seconds: float = 2.0
+    event_buffer_max_events: int = 100_000
+    # Writes of one batch Postgres may reject on its data (DataError,
+    # IntegrityError, ProgrammingError) before the batch is dead-lettered:
+    # dropped for the memory backend, moved to a dead stream for redis.
+    # Connection errors and timeouts are retried with backoff and not counted.
+    event_flush_max_attempts: int = 5
+    # Counter rollups (rollups.py).  Events newer than the settle delay are left
+    # for the next run so that in-flight insert transactions are not skipped.
+    rollup_batch_size: int = 50_000
+    rollup_settle_seconds: int = 30
+    rollup_listener_window_days: int = 28
+    # Trending charts (trending.py), rebuilt by the rollup job: how fast play
+    # and skip weight decays, and how many entries each chart keeps.
+    chart_half_life_hours: float = 72.0
+    chart_size: int = 100
+    # Related tracks (related.py): neighbours kept per track, how far back
+    # completed plays count, the fewest users a track needs to take part, and
+    # the memory budget for one block of the similarity product.
+    related_tracks_k: int = 50
+    related_play_window_days: int = 90
+    related_min_users: int = 3
+    related_block_bytes: int = 256 * 1024 * 1024
+    # Radio stations (radio.py): candidate pool length per artist/genre seed,
+    # rebuilt with the related tracks, and how long a worker reuses a pool.
+    radio_pool_size: int = 200
+    radio_pool_cache_ttl_seconds: int = 600
+    # Home screen (home.py): items per shelf, the time budget each shelf gets
+    # before it is returned empty, and how long shared catalog shelves are
+    # reused by a worker.
+    home_shelf_size: int = 12
+    home_shelf_timeout_seconds: float = 0.5
+    home_shared_shelf_ttl_seconds: int = 60
+    # Totals of paginated lists (totals.py): unfiltered catalog lists reuse an
+    # exact count for the TTL, or the planner's estimate once a table has
+    # more than estimate_min_rows rows; filtered lists stop counting at the
+    # cap.  Clients pass exactTotal=true for an exact count.
+    list_total_cache_ttl_seconds: int = 60
+    list_total_estimate_min_rows: int = 100_000
+    list_total_cap: int = 1000
+    # Monthly partitions of play_events / skip_events / ad_impressions
+    # (partitions.py): months created ahead, months kept, and what happens to
+    # expired months — "archive" detaches them into the archive schema for
+    # export, "drop" deletes them.
+    partition_premake_months: int = 3
+    event_retention_months: int = 25
+    ad_impression_retention_months: int = 13
+    partition_expired_action: str = "archive"
+
+    # HLS packaging (see hls.py), run in the background after a track is approved.
+    hls_packaging_enabled: bool = True
+    hls_segment_seconds: int = 6
 
     # Studio access tokens — JSON object mapping token string → role name.
     # Stored in Secret Manager (myndral-studio-tokens) and injected as an env
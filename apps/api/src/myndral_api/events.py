@@ -0,0 +1,530 @@
+"""
+Buffered ingestion of playback events (plays and skips).
+
+Play reporting is the highest-volume write in the system, so request handlers
+never touch Postgres.  ``EventIngestor.submit`` appends validated events to a
+queue and returns; a background loop drains the queue and writes each batch
+with one multi-row ``INSERT … SELECT FROM unnest(…)`` per table, in a single
+transaction.  A flush is triggered when ``EVENT_FLUSH_BATCH_SIZE`` events are
+pending or every ``EVENT_FLUSH_INTERVAL_SECONDS``, whichever comes first.
+
+Queues (``EVENT_INGEST_BACKEND``):
+  * ``memory`` — a bounded per-process deque.  Events still buffered when a
+    worker is killed without shutdown are lost; acceptable for analytics.
+  * ``redis``  — a Redis stream read through a consumer group, so any
+    instance can flush and unacknowledged batches are re-claimed after a
+    crash.  If Redis is unreachable on submit, events fall back to the
+    local deque instead of failing the request.
+
+Failed flushes are retried with exponential backoff; events keep queueing
+meanwhile (up to ``EVENT_BUFFER_MAX_EVENTS``, beyond which new ones are
+counted as dropped).  Connection errors and timeouts are retried for as long
+as they last.  A batch Postgres rejects on its data (``DataError``,
+``IntegrityError``, ``ProgrammingError``) would fail the same way forever
+and hold up everything behind it, so after ``EVENT_FLUSH_MAX_ATTEMPTS`` such
+failures it is logged and dead-lettered: the memory queue drops it, the
+Redis queue moves its entries to ``myndral:events:playback:dead``.
+
+Rows referencing tracks that do not exist are dropped at insert time, and
+unknown user or session ids are stored as NULL, so a single bad event cannot
+fail a whole batch on a foreign key.  ``play_count`` and the other
+denormalised counters are not touched here; they are derived from these
+tables by the rollup job.  The per-artist daily listener sketches are the
+exception: they are updated here, in the same transaction as the plays.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Literal, Protocol
+
+from sqlalchemy import text
+from sqlalchemy.exc import DataError, IntegrityError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api.config import get_settings
+from myndral_api.db.session import AsyncSessionLocal
+from myndral_api.listeners import record_listens
+
+logger = logging.getLogger(__name__)
+
+EventKind = Literal["play", "skip"]
+
+# Upper bound on the wait between flush attempts while flushes keep failing.
+MAX_FLUSH_BACKOFF_SECONDS = 60.0
+# Failures caused by the rows themselves: retrying the same batch cannot help.
+_DATA_ERRORS = (DataError, IntegrityError, ProgrammingError)
+
+
+@dataclass(frozen=True)
+class PlaybackEvent:
+    kind: EventKind
+    track_id: str
+    occurred_at: datetime
+    user_id: str | None = None
+    session_id: str | None = None
+    played_ms: int = 0
+    completed: bool = False
+    context_type: str = "unknown"
+    context_id: str | None = None
+    audio_quality: str | None = None
+    shuffle_active: bool | None = None
+
+    def to_json(self) -> str:
+        return json.dumps({**asdict(self), "occurred_at": self.occurred_at.isoformat()})
+
+    @classmethod
+    def from_json(cls, payload: str) -> PlaybackEvent:
+        data = json.loads(payload)
+        data["occurred_at"] = datetime.fromisoformat(data["occurred_at"])
+        return cls(**data)
+
+
+@dataclass
+class EventBatch:
+    events: list[PlaybackEvent]
+    # Backend-specific handle used to acknowledge the batch (Redis entry ids).
+    receipt: list[str] = field(default_factory=list)
+    # Earlier writes of these events that Postgres rejected on the data.
+    # Transient failures (connection lost, timeouts) are not counted.
+    failures: int = 0
+
+
+@dataclass
+class IngestStats:
+    accepted: int = 0
+    dropped: int = 0
+    flushed: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    dead_lettered: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "accepted": self.accepted,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "flushes": self.flushes,
+            "failedFlushes": self.failed_flushes,
+            "deadLettered": self.dead_lettered,
+        }
+
+
+class EventQueue(Protocol):
+    async def put(self, events: list[PlaybackEvent]) -> int: ...
+    async def take(self, limit: int) -> EventBatch: ...
+    async def ack(self, batch: EventBatch) -> None: ...
+    async def nack(self, batch: EventBatch) -> None: ...
+    async def dead_letter(self, batch: EventBatch) -> None: ...
+    async def pending(self) -> int: ...
+
+
+class MemoryEventQueue:
+    """Bounded in-process FIFO.  Returns how many events were dropped on overflow."""
+
+    def __init__(self, max_events: int) -> None:
+        self.max_events = max_events
+        self._events: deque[PlaybackEvent] = deque()
+        # A failed batch, handed out again as a unit before anything newer so
+        # ordering survives a failed flush and its failures can be counted.
+        self._retry: EventBatch | None = None
+
+    async def put(self, events: list[PlaybackEvent]) -> int:
+        room = self.max_events - await self.pending()
+        self._events.extend(events[: max(room, 0)])
+        return max(len(events) - room, 0)
+
+    async def take(self, limit: int) -> EventBatch:
+        if self._retry is not None:
+            batch, self._retry = self._retry, None
+            return batch
+        count = min(limit, len(self._events))
+        return EventBatch([self._events.popleft() for _ in range(count)])
+
+    async def ack(self, batch: EventBatch) -> None:
+        pass
+
+    async def nack(self, batch: EventBatch) -> None:
+        self._retry = batch
+
+    async def dead_letter(self, batch: EventBatch) -> None:
+        # Nowhere durable to keep it; the ingestor has logged the drop.
+        pass
+
+    async def pending(self) -> int:
+        retry = len(self._retry.events) if self._retry is not None else 0
+        return len(self._events) + retry
+
+
+class RedisEventQueue:
+    """Redis stream + consumer group shared by every API instance.
+
+    Acknowledged entries are deleted, so the stream length is the backlog.
+    ``put`` refuses events beyond ``max_events`` and reports them as dropped,
+    like the memory queue; concurrent submits can overshoot the bound by at
+    most one request's events each.
+    """
+
+    stream = "myndral:events:playback"
+    dead_stream = "myndral:events:playback:dead"
+    group = "flushers"
+
+    def __init__(self, redis: Any, max_events: int, reclaim_idle_ms: int = 60_000) -> None:
+        self.redis = redis
+        self.max_events = max_events
+        self.reclaim_idle_ms = reclaim_idle_ms
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._group_ready = False
+
+    async def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        from redis.exceptions import ResponseError
+
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    async def put(self, events: list[PlaybackEvent]) -> int:
+        # No MAXLEN on XADD: trimming would silently discard unread entries.
+        room = self.max_events - int(await self.redis.xlen(self.stream))
+        accepted = events[: max(room, 0)]
+        if accepted:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for event in accepted:
+                    pipe.xadd(self.stream, {"e": event.to_json()})
+                await pipe.execute()
+        return len(events) - len(accepted)
+
+    async def take(self, limit: int) -> EventBatch:
+        await self._ensure_group()
+        # Entries whose earlier delivery failed or went to a consumer that died
+        # before acknowledging them.
+        _, entries, *_ = await self.redis.xautoclaim(
+            self.stream, self.group, self.consumer, self.reclaim_idle_ms, count=limit
+        )
+        if entries:
+            receipt = [entry_id for entry_id, _ in entries]
+            failures = await self._failures(receipt)
+        else:
+            response = await self.redis.xreadgroup(
+                self.group, self.consumer, {self.stream: ">"}, count=limit
+            )
+            entries = response[0][1] if response else []
+            receipt = [entry_id for entry_id, _ in entries]
+            failures = 0
+        return EventBatch(
+            [PlaybackEvent.from_json(fields["e"]) for _, fields in entries],
+            receipt,
+            failures,
+        )
+
+    async def _failures(self, receipt: list[str]) -> int:
+        """Counted failures of reclaimed entries, from the group's pending list.
+
+        ``nack`` resets each entry's delivery count to its failure count, and
+        the reclaim that handed it out again added one.
+        """
+        pending = await self.redis.xpending_range(
+            self.stream,
+            self.group,
+            min=receipt[0],
+            max=receipt[-1],
+            count=len(receipt),
+            consumername=self.consumer,
+        )
+        wanted = set(receipt)
+        deliveries = max(
+            (int(entry["times_delivered"]) for entry in pending if entry["message_id"] in wanted),
+            default=1,
+        )
+        return max(deliveries - 1, 0)
+
+    async def ack(self, batch: EventBatch) -> None:
+        if batch.receipt:
+            await self.redis.xack(self.stream, self.group, *batch.receipt)
+            await self.redis.xdel(self.stream, *batch.receipt)
+
+    async def nack(self, batch: EventBatch) -> None:
+        # Left pending; xautoclaim hands it out again after reclaim_idle_ms.
+        # Record the counted failures as the delivery count, so retries after
+        # transient errors do not count towards the dead-letter limit.
+        if batch.receipt:
+            await self.redis.xclaim(
+                self.stream,
+                self.group,
+                self.consumer,
+                0,
+                batch.receipt,
+                retrycount=batch.failures,
+                justid=True,
+            )
+
+    async def dead_letter(self, batch: EventBatch) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for event in batch.events:
+                pipe.xadd(
+                    self.dead_stream,
+                    {"e": event.to_json()},
+                    maxlen=self.max_events,
+                    approximate=True,
+                )
+            await pipe.execute()
+        await self.ack(batch)
+
+    async def pending(self) -> int:
+        return int(await self.redis.xlen(self.stream))
+
+
+EventWriter = Callable[[list[PlaybackEvent]], Awaitable[None]]
+
+
+class EventIngestor:
+    """Accepts events from request handlers and flushes them in batches."""
+
+    def __init__(
+        self,
+        queue: EventQueue,
+        writer: EventWriter,
+        *,
+        batch_size: int,
+        interval_seconds: float,
+        max_attempts: int = 5,
+        fallback: MemoryEventQueue | None = None,
+    ) -> None:
+        self.queue = queue
+        self.writer = writer
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.max_attempts = max_attempts
+        self.fallback = fallback
+        self.stats = IngestStats()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._flush_lock = asyncio.Lock()
+
+    async def submit(self, events: list[PlaybackEvent]) -> None:
+        try:
+            dropped = await self.queue.put(events)
+        except Exception as exc:
+            if self.fallback is None:
+                raise
+            logger.warning("Event queue unavailable, buffering locally: %s", exc)
+            dropped = await self.fallback.put(events)
+        self.stats.accepted += len(events) - dropped
+        self.stats.dropped += dropped
+        if await self._local_pending() >= self.batch_size:
+            self._wake.set()
+
+    async def flush(self) -> int:
+        """Write everything currently pending; returns the number of events written."""
+        async with self._flush_lock:
+            written = 0
+            for queue in (self.fallback, self.queue):
+                if queue is not None:
+                    written += await self._drain(queue)
+            return written
+
+    async def describe(self) -> dict[str, int]:
+        try:
+            pending = await self.queue.pending()
+        except Exception:
+            pending = -1
+        return {**self.stats.to_dict(), "pending": pending}
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _local_pending(self) -> int:
+        if isinstance(self.queue, MemoryEventQueue):
+            return await self.queue.pending()
+        # Remote queues are flushed on the timer; size-triggering on them
+        # would cost a Redis round trip per request.
+        return await self.fallback.pending() if self.fallback is not None else 0
+
+    async def _run(self) -> None:
+        failed = 0
+        while True:
+            if failed:
+                # Size-triggered wakes are ignored until a flush succeeds again.
+                await asyncio.sleep(self._backoff(failed))
+            else:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.interval_seconds)
+                except TimeoutError:
+                    pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                failed += 1
+                logger.exception(
+                    "Playback event flush failed; retrying in %.0fs", self._backoff(failed)
+                )
+            else:
+                failed = 0
+
+    def _backoff(self, failed: int) -> float:
+        return min(self.interval_seconds * 2 ** (failed - 1), MAX_FLUSH_BACKOFF_SECONDS)
+
+    async def _drain(self, queue: EventQueue) -> int:
+        written = 0
+        while True:
+            batch = await queue.take(self.batch_size)
+            if not batch.events:
+                return written
+            try:
+                await self.writer(batch.events)
+            except Exception as exc:
+                self.stats.failed_flushes += 1
+                if _is_data_error(exc):
+                    batch.failures += 1
+                if batch.failures < self.max_attempts:
+                    await queue.nack(batch)
+                    raise
+                logger.exception(
+                    "Dead-lettering %d playback events after %d rejected flushes",
+                    len(batch.events),
+                    batch.failures,
+                )
+                await queue.dead_letter(batch)
+                self.stats.dead_lettered += len(batch.events)
+                continue
+            await queue.ack(batch)
+            self.stats.flushes += 1
+            self.stats.flushed += len(batch.events)
+            written += len(batch.events)
+            if len(batch.events) < self.batch_size:
+                return written
+
+
+def _is_data_error(exc: Exception) -> bool:
+    return isinstance(exc, _DATA_ERRORS) and not exc.connection_invalidated
+
+
+# ── Postgres writer ───────────────────────────────────────────────────────────
+
+# Returns the signed-in listens of the inserted rows for the listener sketches.
+_INSERT_PLAYS_SQL = """
+WITH inserted AS (
+INSERT INTO play_events (
+  user_id, track_id, session_id, duration_played_ms, completed,
+  context_type, context_id, audio_quality, shuffle_active, played_at
+)
+SELECT u.id, t.id, s.id, e.played_ms, e.completed,
+       e.context_type::playback_context, e.context_id,
+       e.audio_quality::audio_quality, e.shuffle_active, e.occurred_at
+FROM unnest(
+  CAST(:user_ids AS uuid[]), CAST(:track_ids AS uuid[]), CAST(:session_ids AS uuid[]),
+  CAST(:played_ms AS integer[]), CAST(:completed AS boolean[]),
+  CAST(:context_types AS text[]), CAST(:context_ids AS uuid[]),
+  CAST(:audio_qualities AS text[]), CAST(:shuffle_active AS boolean[]),
+  CAST(:occurred_at AS timestamptz[])
+) AS e(user_id, track_id, session_id, played_ms, completed,
+       context_type, context_id, audio_quality, shuffle_active, occurred_at)
+JOIN tracks t ON t.id = e.track_id
+LEFT JOIN users u ON u.id = e.user_id
+LEFT JOIN listening_sessions s ON s.id = e.session_id
+RETURNING track_id, user_id, played_at
+)
+SELECT DISTINCT t.primary_artist_id, (i.played_at AT TIME ZONE 'UTC')::date, i.user_id
+FROM inserted i
+JOIN tracks t ON t.id = i.track_id
+WHERE i.user_id IS NOT NULL
+"""
+
+_INSERT_SKIPS_SQL = """
+INSERT INTO skip_events (
+  user_id, track_id, session_id, played_ms, context_type, context_id, skipped_at
+)
+SELECT u.id, t.id, s.id, e.played_ms, e.context_type::playback_context,
+       e.context_id, e.occurred_at
+FROM unnest(
+  CAST(:user_ids AS uuid[]), CAST(:track_ids AS uuid[]), CAST(:session_ids AS uuid[]),
+  CAST(:played_ms AS integer[]), CAST(:context_types AS text[]),
+  CAST(:context_ids AS uuid[]), CAST(:occurred_at AS timestamptz[])
+) AS e(user_id, track_id, session_id, played_ms, context_type, context_id, occurred_at)
+JOIN tracks t ON t.id = e.track_id
+LEFT JOIN users u ON u.id = e.user_id
+LEFT JOIN listening_sessions s ON s.id = e.session_id
+"""
+
+
+def _columns(events: list[PlaybackEvent]) -> dict[str, list[Any]]:
+    return {
+        "user_ids": [e.user_id for e in events],
+        "track_ids": [e.track_id for e in events],
+        "session_ids": [e.session_id for e in events],
+        "played_ms": [e.played_ms for e in events],
+        "completed": [e.completed for e in events],
+        "context_types": [e.context_type for e in events],
+        "context_ids": [e.context_id for e in events],
+        "audio_qualities": [e.audio_quality for e in events],
+        "shuffle_active": [e.shuffle_active for e in events],
+        "occurred_at": [e.occurred_at for e in events],
+    }
+
+
+async def insert_events(db: AsyncSession, events: list[PlaybackEvent]) -> None:
+    """One multi-row insert per event table, plus listener sketches.  The caller commits."""
+    plays = [e for e in events if e.kind == "play"]
+    skips = [e for e in events if e.kind == "skip"]
+    if plays:
+        listens = (await db.execute(text(_INSERT_PLAYS_SQL), _columns(plays))).all()
+        await record_listens(db, listens)
+    if skips:
+        columns = _columns(skips)
+        for unused in ("completed", "audio_qualities", "shuffle_active"):
+            del columns[unused]
+        await db.execute(text(_INSERT_SKIPS_SQL), columns)
+
+
+async def _write_to_postgres(events: list[PlaybackEvent]) -> None:
+    async with AsyncSessionLocal() as db:
+        await insert_events(db, events)
+        await db.commit()
+
+
+@lru_cache
+def get_event_ingestor() -> EventIngestor:
+    settings = get_settings()
+    queue: EventQueue
+    fallback = None
+    if settings.event_ingest_backend == "redis":
+        from redis import asyncio as aioredis
+
+        redis = aioredis.from_url(settings.redis_url, decode_responses=True)
+        queue = RedisEventQueue(redis, settings.event_buffer_max_events)
+        fallback = MemoryEventQueue(settings.event_buffer_max_events)
+    else:
+        queue = MemoryEventQueue(settings.event_buffer_max_events)
+    return EventIngestor(
+        queue,
+        _write_to_postgres,
+        batch_size=settings.event_flush_batch_size,
+        interval_seconds=settings.event_flush_interval_seconds,
+        max_attempts=settings.event_flush_max_attempts,
+        fallback=fallback,
+    )
@@ -9,56 +9,242 @@ google.cloud.storage is imported lazily so that running the API locally
 without the package (or without credentials) does not fail at startup.
 These helpers are only reached when gcs_bucket_name is configured in
 Settings, which never happens in a pure local dev environment.
+
+All helpers share one process-wide ``StorageBackend``: a single client with
+cached credentials, a pooled HTTP session and a bounded thread pool for the
+blocking SDK calls.  The app lifespan (``main.lifespan``) opens it at startup
+and closes it on shutdown; ``get_storage_backend`` falls back to opening it
+lazily for code running outside the app (scripts, one-off jobs).  The
+synchronous helpers below are meant to run on that pool, e.g.
+``await get_storage_backend().run(upload_bytes_to_gcs, ...)``.
 """
 from __future__ import annotations
 
+import asyncio
+import functools
+import threading
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Any
+
+from myndral_api.caching import TTLCache
+from myndral_api.config import get_settings
+from myndral_api.singleflight import SingleFlight
+
+# Upper bound on bytes held in memory per in-flight stream.  Each chunk is one
+# ranged GET against GCS, so this also sets the request granularity.
+GCS_STREAM_CHUNK_SIZE = 512 * 1024
+
+
+class StorageBackend:
+    """Process-wide GCS client with pooled connections and a bounded worker pool."""
+
+    def __init__(self, *, max_workers: int, pool_size: int) -> None:
+        import google.auth  # lazy — not required in dev
+        from google.auth.transport.requests import AuthorizedSession
+        from google.cloud import storage as gcs
+        from requests.adapters import HTTPAdapter
+
+        # Credentials are resolved once; AuthorizedSession caches the access
+        # token and refreshes it only when it is about to expire.
+        credentials, project = google.auth.default(scopes=gcs.Client.SCOPE)
+        self._credentials = credentials
+        self._session = AuthorizedSession(credentials)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self.client = gcs.Client(project=project, credentials=credentials, _http=self._session)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gcs")
+
+    def blob(self, gs_url: str) -> Any:
+        without_scheme = gs_url[5:]          # strip "gs://"
+        bucket_name, _, object_name = without_scheme.partition("/")
+        return self.client.bucket(bucket_name).blob(object_name)
+
+    def generate_signed_url(self, gs_url: str, ttl_seconds: int) -> str:
+        """Issue a V4 signed GET URL bound to a single object.
+
+        Service-account key credentials sign locally.  Metadata-server
+        credentials (Cloud Run, GCE) hold no private key, so the signature is
+        delegated to the IAM signBlob API using the current access token.
+        """
+        from google.auth import credentials as auth_credentials
+        from google.auth.transport.requests import Request
+
+        kwargs: dict[str, Any] = {}
+        if not isinstance(self._credentials, auth_credentials.Signing):
+            if not self._credentials.valid:
+                self._credentials.refresh(Request(session=self._session))
+            kwargs = {
+                "service_account_email": self._credentials.service_account_email,
+                "access_token": self._credentials.token,
+            }
+        return self.blob(gs_url).generate_signed_url(
+            version="v4",
+            expiration=timedelta(seconds=ttl_seconds),
+            method="GET",
+            **kwargs,
+        )
+
+    async def run[T](self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run a blocking SDK call on the storage thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+
+
+_backend: StorageBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def open_storage_backend() -> StorageBackend:
+    """Create the process-wide backend if it does not exist yet."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            settings = get_settings()
+            _backend = StorageBackend(
+                max_workers=settings.gcs_max_workers,
+                pool_size=settings.gcs_http_pool_size,
+            )
+        return _backend
+
+
+def get_storage_backend() -> StorageBackend:
+    return _backend or open_storage_backend()
+
+
+def close_storage_backend() -> None:
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            _backend.close()
+            _backend = None
 
 
 def upload_bytes_to_gcs(bucket_name: str, object_name: str, data: bytes, content_type: str) -> str:
     """Upload raw bytes to GCS; return the canonical ``gs://`` storage URL."""
-    from google.cloud import storage as gcs  # lazy — not required in dev
-
-    client = gcs.Client()
-    blob = client.bucket(bucket_name).blob(object_name)
+    blob = get_storage_backend().client.bucket(bucket_name).blob(object_name)
     blob.upload_from_string(data, content_type=content_type)
     return f"gs://{bucket_name}/{object_name}"
 
 
 def upload_file_to_gcs(bucket_name: str, object_name: str, path: Path, content_type: str) -> str:
     """Upload a local file to GCS; return the canonical ``gs://`` storage URL."""
-    from google.cloud import storage as gcs  # lazy — not required in dev
-
-    client = gcs.Client()
-    blob = client.bucket(bucket_name).blob(object_name)
+    blob = get_storage_backend().client.bucket(bucket_name).blob(object_name)
     blob.upload_from_filename(str(path), content_type=content_type)
     return f"gs://{bucket_name}/{object_name}"
 
 
-def download_gcs_bytes(gs_url: str, start: int | None = None, end: int | None = None) -> tuple[bytes, int]:
-    """Download bytes from a ``gs://bucket/object`` URL.
+@dataclass(frozen=True)
+class GcsObjectMetadata:
+    size: int
+    content_type: str | None = None
+    generation: int | None = None
+    etag: str | None = None
+    checksum_sha256: str | None = None
+    updated: datetime | None = None
+
+
+# Range responses only need the object size for ``Content-Range``; caching it
+# turns every seek from a reload + ranged GET into a single ranged GET.
+object_metadata_cache: TTLCache[str, GcsObjectMetadata] = TTLCache(
+    ttl_seconds=get_settings().gcs_metadata_cache_ttl_seconds
+)
+# Concurrent misses for one object (a new cover on every client) share a stat.
+_metadata_flights: SingleFlight[str] = SingleFlight("gcs.metadata")
+# Whole-object reads, keyed by URL and generation; used by the image proxy.
+_read_flights: SingleFlight[tuple[str, int | None]] = SingleFlight("gcs.read")
 
-    Args:
-        gs_url:  Canonical GCS URL (``gs://bucket/object``).
-        start:   First byte offset for a range request (inclusive).  None → 0.
-        end:     Last byte offset for a range request (inclusive).  None → EOF.
 
-    Returns:
-        A ``(data, total_size)`` tuple.  ``total_size`` is the full object size
-        in bytes (needed for ``Content-Range`` response headers).
+def stat_gcs_object(gs_url: str) -> GcsObjectMetadata:
+    """Fetch size, content type and generation of an object (one metadata request)."""
+    blob = _gcs_blob(gs_url)
+    blob.reload()
+    return GcsObjectMetadata(
+        size=blob.size or 0,
+        content_type=blob.content_type,
+        generation=blob.generation,
+        etag=blob.etag,
+        updated=blob.updated,
+    )
 
-    The GCS blob is reloaded once to populate ``blob.size`` before the
-    download.  Both the reload and the download are synchronous; callers in
-    async handlers should wrap this in ``starlette.concurrency.run_in_threadpool``
-    if strict non-blocking behaviour is required.
+
+async def get_gcs_object_metadata(
+    gs_url: str,
+    *,
+    size_hint: int | None = None,
+    checksum_sha256: str | None = None,
+    fresh: bool = False,
+) -> GcsObjectMetadata:
+    """Return cached metadata for an object, fetching it from GCS only on a miss.
+
+    ``size_hint`` / ``checksum_sha256`` come from ``track_audio_files``; when
+    the size is already known from the database no storage request is made.
+    ``fresh`` skips the cache lookup (the fetch still refreshes the entry), for
+    objects that may be overwritten in place and whose validators must be
+    current.
     """
-    from google.cloud import storage as gcs  # lazy — not required in dev
-
-    without_scheme = gs_url[5:]          # strip "gs://"
-    bucket_name, _, object_name = without_scheme.partition("/")
-    client = gcs.Client()
-    blob = client.bucket(bucket_name).blob(object_name)
-    blob.reload()                        # populate blob.size
-    total_size: int = blob.size or 0
-    data = blob.download_as_bytes(start=start, end=end)
-    return data, total_size
+    metadata = None if fresh else object_metadata_cache.get(gs_url)
+    if metadata is not None:
+        return metadata
+    if size_hint is not None:
+        metadata = GcsObjectMetadata(size=size_hint, checksum_sha256=checksum_sha256)
+    else:
+        metadata = await _metadata_flights.do(
+            gs_url, lambda: get_storage_backend().run(stat_gcs_object, gs_url)
+        )
+    object_metadata_cache.put(gs_url, metadata)
+    return metadata
+
+
+def read_gcs_object(gs_url: str) -> bytes:
+    """Download a whole object without a metadata round trip."""
+    return _gcs_blob(gs_url).download_as_bytes()
+
+
+async def read_gcs_object_shared(gs_url: str, generation: int | None = None) -> bytes:
+    """``read_gcs_object`` on the storage pool, one download per concurrent burst."""
+    return await _read_flights.do(
+        (gs_url, generation), lambda: get_storage_backend().run(read_gcs_object, gs_url)
+    )
+
+
+def download_gcs_range(gs_url: str, start: int, end: int) -> bytes:
+    """Download bytes ``start..end`` (inclusive) without a metadata round trip."""
+    return _gcs_blob(gs_url).download_as_bytes(start=start, end=end)
+
+
+async def iter_gcs_bytes(
+    gs_url: str,
+    start: int,
+    end: int,
+    *,
+    chunk_size: int = GCS_STREAM_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Yield bytes ``start..end`` (inclusive) of a GCS object in bounded chunks.
+
+    Each chunk is fetched with a ranged ``download_as_bytes`` call on the
+    storage thread pool, so the event loop never blocks on GCS and at most one
+    chunk per stream is held in memory.  Stopping iteration early (e.g. because the
+    client disconnected) stops the download at the next chunk boundary.
+    """
+    backend = get_storage_backend()
+    blob = backend.blob(gs_url)
+    position = start
+    while position <= end:
+        chunk_end = min(position + chunk_size - 1, end)
+        chunk: bytes = await backend.run(blob.download_as_bytes, start=position, end=chunk_end)
+        if not chunk:
+            break
+        yield chunk
+        position += len(chunk)
+
+
+def _gcs_blob(gs_url: str) -> Any:
+    return get_storage_backend().blob(gs_url)
@@ -0,0 +1,165 @@
+"""
+HyperLogLog sketches for approximate distinct counts.
+
+A sketch of precision ``p`` keeps ``m = 2**p`` one-byte registers.  Each added
+value is hashed to 64 bits; the top ``p`` bits pick a register and the register
+keeps the longest run of leading zeros (+1) seen in the remaining bits.  Two
+sketches merge by taking the register-wise maximum, so a month of daily
+sketches merges into exactly the sketch the month's events would have built.
+
+Error bound (Flajolet et al., 2007): the relative standard error is
+``1.04 / sqrt(m)``.  With the default ``p = 12`` (4096 registers) that is
+≈1.6 %, i.e. about 95 % of estimates fall within ±3.3 % of the true count and
+99.7 % within ±4.9 %.  Below ``2.5 · m`` distinct values linear counting is used
+instead, which is near-exact for small artists.  The error does not grow with
+the number of sketches merged.
+
+Serialised form (``to_bytes``): one format byte, one precision byte, then
+either sorted ``(index: u16, rank: u8)`` pairs (sparse — small sketches cost a
+few bytes per listener) or all ``m`` registers (dense, 4 KiB at ``p = 12``).
+A sketch switches to dense once that is smaller.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import struct
+from collections.abc import Iterable
+
+DEFAULT_PRECISION = 12
+
+_SPARSE = 1
+_DENSE = 2
+_PAIR = struct.Struct(">HB")
+# 2**-rank for every possible register value, so estimation is a table lookup.
+_INVERSE_POWERS = [2.0**-rank for rank in range(65)]
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    __slots__ = ("precision", "_sparse", "_dense")
+
+    def __init__(self, precision: int = DEFAULT_PRECISION) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self._sparse: dict[int, int] | None = {}
+        self._dense: bytearray | None = None
+
+    @property
+    def registers(self) -> int:
+        return 1 << self.precision
+
+    def _densify(self) -> bytearray:
+        if self._dense is None:
+            dense = bytearray(self.registers)
+            for index, rank in (self._sparse or {}).items():
+                dense[index] = rank
+            self._dense = dense
+            self._sparse = None
+        return self._dense
+
+    def add(self, value: str) -> bool:
+        """Add one value; returns True if the sketch changed."""
+        hashed = _hash64(value)
+        index = hashed >> (64 - self.precision)
+        rest_bits = 64 - self.precision
+        rest = hashed & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if self._sparse is not None:
+            if self._sparse.get(index, 0) >= rank:
+                return False
+            self._sparse[index] = rank
+            if len(self._sparse) * _PAIR.size >= self.registers:
+                self._densify()
+            return True
+        dense = self._densify()
+        if dense[index] >= rank:
+            return False
+        dense[index] = rank
+        return True
+
+    def update(self, values: Iterable[str]) -> bool:
+        changed = False
+        for value in values:
+            changed = self.add(value) or changed
+        return changed
+
+    def merge(self, other: HyperLogLog) -> None:
+        """Register-wise max with ``other`` (same precision) in place."""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        if self._sparse is not None and other._sparse is not None:
+            for index, rank in other._sparse.items():
+                if self._sparse.get(index, 0) < rank:
+                    self._sparse[index] = rank
+            if len(self._sparse) * _PAIR.size >= self.registers:
+                self._densify()
+            return
+        dense = self._densify()
+        if other._dense is not None:
+            # map() over two byte strings runs in C; ~100× a Python loop.
+            self._dense = bytearray(map(max, dense, other._dense))
+        else:
+            for index, rank in (other._sparse or {}).items():
+                if dense[index] < rank:
+                    dense[index] = rank
+
+    def count(self) -> int:
+        m = self.registers
+        if self._sparse is not None:
+            values = list(self._sparse.values())
+            zeros = m - len(values)
+            harmonic = zeros + sum(map(_INVERSE_POWERS.__getitem__, values))
+        else:
+            dense = self._dense or b""
+            zeros = dense.count(0)
+            harmonic = sum(map(_INVERSE_POWERS.__getitem__, dense))
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / harmonic
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        if self._sparse is not None:
+            pairs = b"".join(_PAIR.pack(i, r) for i, r in sorted(self._sparse.items()))
+            return bytes((_SPARSE, self.precision)) + pairs
+        return bytes((_DENSE, self.precision)) + bytes(self._dense or b"")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> HyperLogLog:
+        if len(data) < 2 or data[0] not in (_SPARSE, _DENSE):
+            raise ValueError("not a serialised HyperLogLog sketch")
+        sketch = cls(data[1])
+        body = memoryview(data)[2:]
+        if data[0] == _DENSE:
+            if len(body) != sketch.registers:
+                raise ValueError("dense sketch has the wrong number of registers")
+            sketch._sparse = None
+            sketch._dense = bytearray(body)
+        else:
+            sketch._sparse = dict(_PAIR.iter_unpack(body))
+        return sketch
+
+    @classmethod
+    def union(
+        cls, sketches: Iterable[HyperLogLog], precision: int = DEFAULT_PRECISION
+    ) -> HyperLogLog:
+        merged = cls(precision)
+        dense: list[bytearray] = []
+        for sketch in sketches:
+            if sketch._dense is not None and sketch.precision == precision:
+                dense.append(sketch._dense)
+            else:
+                merged.merge(sketch)
+        if dense:
+            # One max() call per register across every dense sketch at once.
+            combined = cls(precision)
+            combined._sparse = None
+            combined._dense = bytearray(map(max, *dense)) if len(dense) > 1 else dense[0][:]
+            merged.merge(combined)
+        return merged
@@ -0,0 +1,357 @@
+"""
+HLS packaging for published tracks.
+
+``package_track`` slices every MP3 tier in ``track_audio_files`` into
+fixed-duration segments on MPEG frame boundaries and writes, per tier:
+
+  <prefix>/index.m3u8        VOD variant playlist
+  <prefix>/seg_00000.mp3 …   HLS "packed audio" segments
+
+where ``<prefix>`` is ``hls/<track_id>/<version>/<quality>`` in the GCS
+bucket (or under ``data/`` in dev).  ``version`` hashes the source bytes and
+the segment length, so a given URL always names the same bytes and can be
+cached for a year.  The master playlist is rendered per request from
+``track_hls_variants`` instead, because it has to change when a track is
+re-packaged.
+
+Packed audio segments are plain MPEG audio frames prefixed with an ID3 tag
+carrying the segment start time (HLS spec §3.4), so no transcoder is needed.
+Non-MP3 tiers (FLAC, WAV, …) cannot be carried as packed audio and are
+skipped; their listeners keep using byte-range streaming.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from myndral_api.config import get_settings
+from myndral_api.db.session import AsyncSessionLocal
+from myndral_api.media_utils import DATA_DIR, resolve_local_storage_path
+
+logger = logging.getLogger(__name__)
+
+PLAYLIST_MEDIA_TYPE = "application/vnd.apple.mpegurl"
+SEGMENT_MEDIA_TYPE = "audio/mpeg"
+# RFC 6381 codec string for MPEG-1/2 Layer III.
+MP3_CODECS = "mp4a.40.34"
+
+_MP3_BITRATES_KBPS = {
+    "mpeg1": (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    "mpeg2": (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),   # MPEG-2.5
+}
+_TIMESTAMP_OWNER = b"com.apple.streaming.transportStreamTimestamp\x00"
+
+
+class HlsPackagingError(ValueError):
+    """The source audio cannot be packaged (not MP3, free-format, empty, …)."""
+
+
+@dataclass(frozen=True)
+class Mp3Frame:
+    offset: int
+    length: int
+    samples: int
+    sample_rate: int
+
+
+@dataclass(frozen=True)
+class HlsSegment:
+    data: bytes
+    duration: float
+
+
+@dataclass(frozen=True)
+class HlsRendition:
+    version: str
+    segments: list[HlsSegment]
+    playlist: str
+    bandwidth_bps: int
+    target_duration: int
+
+
+# ── MPEG audio framing ────────────────────────────────────────────────────────
+
+def _parse_mp3_header(header: bytes) -> tuple[int, int, int] | None:
+    """Return ``(frame_length, samples, sample_rate)`` for a Layer III header."""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x03
+    padding = (header[2] >> 1) & 0x01
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+    if version == 3:
+        bitrate = _MP3_BITRATES_KBPS["mpeg1"][bitrate_index] * 1000
+        return 144 * bitrate // sample_rate + padding, 1152, sample_rate
+    bitrate = _MP3_BITRATES_KBPS["mpeg2"][bitrate_index] * 1000
+    return 72 * bitrate // sample_rate + padding, 576, sample_rate
+
+
+def iter_mp3_frames(data: bytes) -> Iterator[Mp3Frame]:
+    """Yield the audio frames of an MP3 stream, skipping tags and junk.
+
+    A leading Xing/Info frame (encoder metadata, no audio) is dropped because
+    its duration fields would describe the whole file, not the segment.
+    """
+    pos = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        pos = 10 + size + (10 if data[5] & 0x10 else 0)
+
+    first = True
+    while pos + 4 <= len(data):
+        parsed = _parse_mp3_header(data[pos : pos + 4])
+        if parsed is None or pos + parsed[0] > len(data):
+            pos += 1
+            continue
+        length, samples, sample_rate = parsed
+        if first and (b"Xing" in data[pos : pos + 64] or b"Info" in data[pos : pos + 64]):
+            first = False
+            pos += length
+            continue
+        first = False
+        yield Mp3Frame(pos, length, samples, sample_rate)
+        pos += length
+
+
+def _timestamp_id3(start_seconds: float) -> bytes:
+    """ID3v2.4 tag with the PRIV frame HLS uses to timestamp packed audio."""
+    pts = round(start_seconds * 90_000) & ((1 << 33) - 1)
+    payload = _TIMESTAMP_OWNER + struct.pack(">Q", pts)
+    frame = b"PRIV" + struct.pack(">I", len(payload)) + b"\x00\x00" + payload
+    size = len(frame)
+    syncsafe = bytes((size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + syncsafe + frame
+
+
+def segment_mp3(data: bytes, segment_seconds: float) -> list[HlsSegment]:
+    """Split an MP3 stream into packed-audio segments of about ``segment_seconds``."""
+    segments: list[HlsSegment] = []
+    elapsed = 0.0
+    current: list[bytes] = []
+    current_duration = 0.0
+    for frame in iter_mp3_frames(data):
+        current.append(data[frame.offset : frame.offset + frame.length])
+        current_duration += frame.samples / frame.sample_rate
+        if current_duration >= segment_seconds:
+            segments.append(
+                HlsSegment(_timestamp_id3(elapsed) + b"".join(current), current_duration)
+            )
+            elapsed += current_duration
+            current, current_duration = [], 0.0
+    if current:
+        segments.append(HlsSegment(_timestamp_id3(elapsed) + b"".join(current), current_duration))
+    if not segments:
+        raise HlsPackagingError("No MPEG Layer III frames found.")
+    return segments
+
+
+# ── Playlists ─────────────────────────────────────────────────────────────────
+
+def segment_name(index: int) -> str:
+    return f"seg_{index:05d}.mp3"
+
+
+def render_variant_playlist(segments: list[HlsSegment]) -> str:
+    target_duration = math.ceil(max(segment.duration for segment in segments))
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{target_duration}",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+    ]
+    for index, segment in enumerate(segments):
+        lines += [f"#EXTINF:{segment.duration:.3f},", segment_name(index)]
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+
+def render_master_playlist(variants: list[tuple[str, int]]) -> str:
+    """``variants`` is a list of ``(variant playlist URI, peak bandwidth)``."""
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for uri, bandwidth in sorted(variants, key=lambda variant: variant[1]):
+        lines += [f'#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},CODECS="{MP3_CODECS}"', uri]
+    return "\n".join(lines) + "\n"
+
+
+def build_rendition(data: bytes, segment_seconds: int) -> HlsRendition:
+    segments = segment_mp3(data, segment_seconds)
+    digest = hashlib.sha256(data)
+    digest.update(f":{segment_seconds}".encode())
+    return HlsRendition(
+        version=digest.hexdigest()[:16],
+        segments=segments,
+        playlist=render_variant_playlist(segments),
+        bandwidth_bps=max(math.ceil(len(s.data) * 8 / s.duration) for s in segments),
+        target_duration=math.ceil(max(s.duration for s in segments)),
+    )
+
+
+# ── Storage ───────────────────────────────────────────────────────────────────
+
+def hls_storage_prefix(track_id: str, version: str, quality: str) -> str:
+    """Where one rendition lives: ``gs://<bucket>/hls/…`` in prod, ``data/hls/…`` in dev."""
+    object_prefix = f"hls/{track_id}/{version}/{quality}"
+    bucket = get_settings().gcs_bucket_name
+    if bucket:
+        return f"gs://{bucket}/{object_prefix}"
+    return f"data/{object_prefix}"
+
+
+async def _read_source(storage_url: str) -> bytes:
+    local_path = resolve_local_storage_path(storage_url)
+    if local_path is not None:
+        return await run_in_threadpool(local_path.read_bytes)
+    if storage_url.startswith("gs://"):
+        # lazy — not needed in dev
+        from myndral_api.gcs_utils import get_storage_backend, read_gcs_object
+
+        return await get_storage_backend().run(read_gcs_object, storage_url)
+    raise HlsPackagingError(f"Unsupported storage URL for packaging: {storage_url}")
+
+
+async def _write_object(prefix: str, name: str, data: bytes, content_type: str) -> None:
+    if prefix.startswith("gs://"):
+        # lazy — not needed in dev
+        from myndral_api.gcs_utils import get_storage_backend, upload_bytes_to_gcs
+
+        bucket, object_prefix = prefix[5:].split("/", 1)
+        await get_storage_backend().run(
+            upload_bytes_to_gcs, bucket, f"{object_prefix}/{name}", data, content_type
+        )
+        return
+
+    path = DATA_DIR / prefix.removeprefix("data/") / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    await run_in_threadpool(path.write_bytes, data)
+
+
+async def read_hls_object(prefix: str, name: str) -> bytes | Path:
+    """Return a local path (dev) or the object's bytes (GCS) for a packaged file.
+
+    Raises ``FileNotFoundError`` when the object does not exist.
+    """
+    if not prefix.startswith("gs://"):
+        path = resolve_local_storage_path(f"{prefix}/{name}")
+        if path is None:
+            raise FileNotFoundError(f"{prefix}/{name}")
+        return path
+
+    # lazy — not needed in dev
+    from myndral_api.gcs_utils import get_storage_backend, read_gcs_object
+
+    try:
+        return await get_storage_backend().run(read_gcs_object, f"{prefix}/{name}")
+    except Exception as exc:
+        raise FileNotFoundError(f"{prefix}/{name}") from exc
+
+
+# ── Packaging ─────────────────────────────────────────────────────────────────
+
+async def package_track(db: AsyncSession, track_id: str) -> int:
+    """Package every MP3 tier of a track and record it in ``track_hls_variants``.
+
+    Returns the number of renditions written.  The caller commits.
+    """
+    segment_seconds = get_settings().hls_segment_seconds
+    rows = (
+        await db.execute(
+            text(
+                """
+SELECT quality::text AS quality, format::text AS format, storage_url
+FROM track_audio_files
+WHERE track_id = :track_id
+"""
+            ),
+            {"track_id": track_id},
+        )
+    ).mappings().all()
+
+    packaged: list[str] = []
+    for row in rows:
+        if row["format"] != "mp3":
+            continue
+        source = await _read_source(str(row["storage_url"]))
+        rendition = await run_in_threadpool(build_rendition, source, segment_seconds)
+        prefix = hls_storage_prefix(track_id, rendition.version, row["quality"])
+        # Segments first, playlist last: a playlist only ever names objects that exist.
+        for index, segment in enumerate(rendition.segments):
+            await _write_object(prefix, segment_name(index), segment.data, SEGMENT_MEDIA_TYPE)
+        await _write_object(
+            prefix, "index.m3u8", rendition.playlist.encode(), PLAYLIST_MEDIA_TYPE
+        )
+        await db.execute(
+            text(
+                """
+INSERT INTO track_hls_variants (
+  track_id, quality, version, storage_prefix, bandwidth_bps, segment_count, target_duration_s
+)
+VALUES (
+  :track_id, CAST(:quality AS audio_quality), :version, :storage_prefix,
+  :bandwidth_bps, :segment_count, :target_duration_s
+)
+ON CONFLICT (track_id, quality) DO UPDATE
+SET version = EXCLUDED.version,
+    storage_prefix = EXCLUDED.storage_prefix,
+    bandwidth_bps = EXCLUDED.bandwidth_bps,
+    segment_count = EXCLUDED.segment_count,
+    target_duration_s = EXCLUDED.target_duration_s,
+    packaged_at = now()
+"""
+            ),
+            {
+                "track_id": track_id,
+                "quality": row["quality"],
+                "version": rendition.version,
+                "storage_prefix": prefix,
+                "bandwidth_bps": rendition.bandwidth_bps,
+                "segment_count": len(rendition.segments),
+                "target_duration_s": rendition.target_duration,
+            },
+        )
+        packaged.append(row["quality"])
+
+    # Tiers that were removed (or are no longer MP3) must drop out of the master playlist.
+    await db.execute(
+        text(
+            """
+DELETE FROM track_hls_variants
+WHERE track_id = :track_id AND NOT (quality::text = ANY(:qualities))
+"""
+        ),
+        {"track_id": track_id, "qualities": packaged},
+    )
+    return len(packaged)
+
+
+async def package_track_in_background(track_id: str) -> None:
+    """Background-task entry point: own session, commit, never raise.
+
+    A failed packaging run only means the track has no HLS rendition yet;
+    byte-range streaming through ``/v1/stream/{track_id}`` keeps working.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            await package_track(db, track_id)
+            await db.commit()
+    except Exception:
+        logger.exception("HLS packaging failed for track %s", track_id)
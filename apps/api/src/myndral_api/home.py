@@ -0,0 +1,123 @@
+"""
+Parallel shelf assembly for the home screen (/v1/home).
+
+A home page is a list of shelves — trending tracks, new releases, the user's
+recently liked tracks, … — each of which used to be a separate request with
+its own auth lookup, session and count query.  ``assemble`` builds every
+shelf concurrently, each on its own pooled connection, under a per-shelf
+time budget:
+
+* Shared shelves (the same for every caller) are served from an in-process
+  ``TTLCache``; only a miss touches the database.  The last good copy is kept
+  beyond the TTL and served when a refresh fails or runs out of time.
+* Per-user shelves are always computed live.
+* A shelf that errors or exceeds ``HOME_SHELF_TIMEOUT_SECONDS`` comes back
+  empty with ``status`` ``"timeout"`` / ``"error"`` instead of failing or
+  stalling the page.  Waiting for a pooled connection counts against the
+  budget, so a saturated pool degrades shelves rather than queueing requests.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api.caching import TTLCache
+from myndral_api.config import get_settings
+from myndral_api.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+ShelfKind = Literal["tracks", "albums", "artists", "playlists"]
+ShelfStatus = Literal["ok", "stale", "timeout", "error"]
+# Loads a shelf's items on the session it is given.
+ShelfLoader = Callable[[AsyncSession], Awaitable[list[dict[str, Any]]]]
+SessionFactory = Callable[[], Any]
+
+
+@dataclass(frozen=True)
+class Shelf:
+    id: str
+    title: str
+    kind: ShelfKind
+    load: ShelfLoader
+    # Shared shelves are identical for every caller and cached per process.
+    shared: bool = False
+
+
+_shared_cache: TTLCache[str, list[dict[str, Any]]] = TTLCache(
+    ttl_seconds=get_settings().home_shared_shelf_ttl_seconds, max_entries=64
+)
+# Last successful copy of each shared shelf, served past its TTL when a
+# refresh times out or fails.  Keyed by shelf id, so it stays tiny.
+_last_good: dict[str, list[dict[str, Any]]] = {}
+
+
+def _payload(shelf: Shelf, items: list[dict[str, Any]], status: ShelfStatus) -> dict[str, Any]:
+    return {
+        "id": shelf.id,
+        "title": shelf.title,
+        "kind": shelf.kind,
+        "items": items,
+        "status": status,
+    }
+
+
+async def build_shelf(
+    shelf: Shelf,
+    *,
+    timeout: float,
+    session_factory: SessionFactory = AsyncSessionLocal,
+) -> dict[str, Any]:
+    if shelf.shared:
+        cached = _shared_cache.get(shelf.id)
+        if cached is not None:
+            return _payload(shelf, cached, "ok")
+
+    status: ShelfStatus
+    try:
+        async with asyncio.timeout(timeout):
+            async with session_factory() as db:
+                items = await shelf.load(db)
+    except TimeoutError:
+        logger.warning("Home shelf %s exceeded its %.2fs budget", shelf.id, timeout)
+        status = "timeout"
+    except Exception:
+        logger.exception("Home shelf %s failed", shelf.id)
+        status = "error"
+    else:
+        if shelf.shared:
+            _shared_cache.put(shelf.id, items)
+            _last_good[shelf.id] = items
+        return _payload(shelf, items, "ok")
+
+    stale = _last_good.get(shelf.id) if shelf.shared else None
+    if stale is not None:
+        return _payload(shelf, stale, "stale")
+    return _payload(shelf, [], status)
+
+
+async def assemble(
+    shelves: Sequence[Shelf],
+    *,
+    timeout: float,
+    session_factory: SessionFactory = AsyncSessionLocal,
+) -> list[dict[str, Any]]:
+    """Build every shelf concurrently; the result keeps the order of ``shelves``."""
+    return list(
+        await asyncio.gather(
+            *(
+                build_shelf(shelf, timeout=timeout, session_factory=session_factory)
+                for shelf in shelves
+            )
+        )
+    )
+
+
+def clear_shared_cache() -> None:
+    _shared_cache.clear()
+    _last_good.clear()
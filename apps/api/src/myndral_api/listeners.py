@@ -0,0 +1,112 @@
+"""
+Per-artist, per-day distinct-listener sketches (``artist_listener_sketches``).
+
+The event writer (events.py) calls ``record_listens`` in the same transaction
+as its play insert, so a sketch always covers exactly the committed plays.
+Adding a listener twice is a no-op, which keeps redelivered event batches
+harmless.  The rollup job (rollups.py) calls ``count_listeners`` to merge the
+sketches inside the rolling window into ``artists.monthly_listeners``.
+
+Postgres cannot merge these sketches itself, so updates are read-modify-write:
+missing rows are created empty first, then every affected row is locked in
+key order before merging, so concurrent flushers serialise instead of
+overwriting each other's listeners.  See hll.py for the error bound.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api.hll import HyperLogLog
+
+_EMPTY_SKETCH = HyperLogLog().to_bytes()
+
+_CREATE_MISSING_SQL = """
+INSERT INTO artist_listener_sketches (artist_id, day, sketch)
+SELECT k.artist_id, k.day, :empty
+FROM unnest(CAST(:artist_ids AS uuid[]), CAST(:days AS date[])) AS k(artist_id, day)
+ORDER BY k.artist_id, k.day
+ON CONFLICT (artist_id, day) DO NOTHING
+"""
+
+_LOCK_SQL = """
+SELECT s.artist_id, s.day, s.sketch
+FROM artist_listener_sketches s
+JOIN unnest(CAST(:artist_ids AS uuid[]), CAST(:days AS date[])) AS k(artist_id, day)
+  ON s.artist_id = k.artist_id AND s.day = k.day
+ORDER BY s.artist_id, s.day
+FOR UPDATE OF s
+"""
+
+_STORE_SQL = """
+UPDATE artist_listener_sketches s
+SET sketch = k.sketch, updated_at = now()
+FROM unnest(
+  CAST(:artist_ids AS uuid[]), CAST(:days AS date[]), CAST(:sketches AS bytea[])
+) AS k(artist_id, day, sketch)
+WHERE s.artist_id = k.artist_id AND s.day = k.day
+"""
+
+_WINDOW_SQL = """
+SELECT artist_id, sketch FROM artist_listener_sketches
+WHERE artist_id = ANY(CAST(:artist_ids AS uuid[])) AND day >= :window_start
+"""
+
+
+async def record_listens(
+    db: AsyncSession, listens: Iterable[tuple[str, date, str]]
+) -> int:
+    """Add ``(artist_id, day, user_id)`` listens to the daily sketches.
+
+    Returns the number of sketches that changed.  The caller commits.
+    """
+    by_key: dict[tuple[str, date], set[str]] = defaultdict(set)
+    for artist_id, day, user_id in listens:
+        by_key[(str(artist_id), day)].add(str(user_id))
+    if not by_key:
+        return 0
+
+    keys = sorted(by_key)
+    params = {"artist_ids": [k[0] for k in keys], "days": [k[1] for k in keys]}
+    await db.execute(text(_CREATE_MISSING_SQL), {**params, "empty": _EMPTY_SKETCH})
+    rows = (await db.execute(text(_LOCK_SQL), params)).all()
+
+    changed: list[tuple[str, date, bytes]] = []
+    for artist_id, day, stored in rows:
+        sketch = HyperLogLog.from_bytes(bytes(stored))
+        if sketch.update(by_key.get((str(artist_id), day), ())):
+            changed.append((str(artist_id), day, sketch.to_bytes()))
+    if changed:
+        await db.execute(
+            text(_STORE_SQL),
+            {
+                "artist_ids": [c[0] for c in changed],
+                "days": [c[1] for c in changed],
+                "sketches": [c[2] for c in changed],
+            },
+        )
+    return len(changed)
+
+
+async def count_listeners(
+    db: AsyncSession, artist_ids: list[str], window_start: date
+) -> dict[str, int]:
+    """Estimated distinct listeners per artist from ``window_start`` through today."""
+    if not artist_ids:
+        return {}
+    rows = (
+        await db.execute(
+            text(_WINDOW_SQL), {"artist_ids": artist_ids, "window_start": window_start}
+        )
+    ).all()
+    sketches: dict[str, list[HyperLogLog]] = defaultdict(list)
+    for artist_id, stored in rows:
+        sketches[str(artist_id)].append(HyperLogLog.from_bytes(bytes(stored)))
+    return {
+        artist_id: HyperLogLog.union(sketches.get(artist_id, ())).count()
+        for artist_id in artist_ids
+    }
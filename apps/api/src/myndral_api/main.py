@@ -1,21 +1,35 @@
 import mimetypes
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from email.utils import format_datetime
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, Response
 
 from myndral_api.config import get_settings
-from myndral_api.media_utils import DATA_DIR
+from myndral_api.events import get_event_ingestor
+from myndral_api.media_utils import (
+    DATA_DIR,
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    etag_matches,
+    is_content_addressed_image,
+)
 from myndral_api.routers import (
     albums,
     artists,
     auth,
+    charts,
     exports,
     health,
+    home,
     internal,
     internal_users,
+    metrics,
     notifications,
     playlists,
+    radio,
     search,
     staging,
     stream,
@@ -25,6 +39,28 @@ from myndral_api.routers import (
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # One storage client per process: credentials, token refreshes and TLS
+    # connections are shared by every upload, image tile and audio range.
+    if settings.gcs_bucket_name:
+        from myndral_api.gcs_utils import open_storage_backend  # lazy — not needed in dev
+
+        open_storage_backend()
+    # Play/skip events are buffered in memory (or Redis) and flushed in batches.
+    ingestor = get_event_ingestor()
+    ingestor.start()
+    try:
+        yield
+    finally:
+        await ingestor.stop()
+        if settings.gcs_bucket_name:
+            from myndral_api.gcs_utils import close_storage_backend
+
+            close_storage_backend()
+
+
 app = FastAPI(
     title=settings.app_name,
     version="0.1.0",
@@ -33,6 +69,7 @@ app = FastAPI(
     ),
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -53,10 +90,14 @@ app.include_router(internal.router,      prefix="/v1/internal",      tags=["inte
 app.include_router(internal_users.router, prefix="/v1/internal",     tags=["internal-users"])
 app.include_router(staging.router,       prefix="/v1/internal",      tags=["staging"])
 app.include_router(notifications.router, prefix="/v1/internal",      tags=["notifications"])
+app.include_router(metrics.router,       prefix="/v1/internal",      tags=["metrics"])
 app.include_router(artists.router,       prefix="/v1/artists",       tags=["artists"])
 app.include_router(albums.router,        prefix="/v1/albums",        tags=["albums"])
 app.include_router(tracks.router,        prefix="/v1/tracks",        tags=["tracks"])
+app.include_router(home.router,          prefix="/v1/home",          tags=["home"])
+app.include_router(charts.router,        prefix="/v1/charts",        tags=["charts"])
 app.include_router(playlists.router,     prefix="/v1/playlists",     tags=["playlists"])
+app.include_router(radio.router,         prefix="/v1/radio",         tags=["radio"])
 app.include_router(search.router,        prefix="/v1/search",        tags=["search"])
 app.include_router(stream.router,        prefix="/v1/stream",        tags=["stream"])
 app.include_router(exports.router,       prefix="/v1",               tags=["exports"])
@@ -72,22 +113,50 @@ _IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 
 
 @app.get("/v1/images/{filepath:path}", include_in_schema=False)
-async def serve_image(filepath: str) -> Response:
+async def serve_image(filepath: str, request: Request) -> Response:
     _settings = get_settings()
+    # Uploads are named by content hash (see upload_image) and never change;
+    # older timestamp-only names may be overwritten, so those revalidate.
+    immutable = is_content_addressed_image(filepath)
+    headers = {
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+    }
     if _settings.gcs_bucket_name:
         # Production: fetch from GCS using the service account's ADC credentials.
-        from google.cloud import storage as _gcs  # lazy — not needed in dev
+        from myndral_api.gcs_utils import (  # lazy — not needed in dev
+            get_gcs_object_metadata,
+            read_gcs_object_shared,
+        )
+
+        gs_url = f"gs://{_settings.gcs_bucket_name}/images/{filepath}"
+        try:
+            # Revalidated names need current validators: a cached generation
+            # would answer 304 for bytes that were overwritten since.
+            metadata = await get_gcs_object_metadata(gs_url, fresh=not immutable)
+        except Exception:
+            raise HTTPException(status_code=404, detail="Image not found.")
+        if metadata.generation is not None:
+            headers["ETag"] = f'"{metadata.generation}"'
+        if metadata.updated is not None:
+            headers["Last-Modified"] = format_datetime(metadata.updated, usegmt=True)
+        if etag_matches(request.headers.get("if-none-match"), headers.get("ETag")):
+            return Response(status_code=304, headers=headers)
 
         try:
-            blob = _gcs.Client().bucket(_settings.gcs_bucket_name).blob(f"images/{filepath}")
-            data = blob.download_as_bytes()
+            data = await read_gcs_object_shared(gs_url, metadata.generation)
         except Exception:
             raise HTTPException(status_code=404, detail="Image not found.")
-        mime, _ = mimetypes.guess_type(filepath)
-        return Response(content=data, media_type=mime or "application/octet-stream")
+        mime = metadata.content_type or mimetypes.guess_type(filepath)[0]
+        return Response(
+            content=data, media_type=mime or "application/octet-stream", headers=headers
+        )
     else:
         # Dev: read from local data/images/ directory.
         local_path = _IMAGES_DIR / filepath
         if not local_path.exists() or not local_path.is_file():
             raise HTTPException(status_code=404, detail="Image not found.")
-        return FileResponse(local_path)
+        stat = local_path.stat()
+        headers["ETag"] = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        return FileResponse(local_path, headers=headers)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import hashlib
 import mimetypes
+import re
 from pathlib import Path
 from typing import Any
 from urllib.parse import unquote, urlparse
@@ -30,6 +31,17 @@ else:
 REPO_ROOT = DATA_DIR.parent
 
 
+# Cache-Control for URLs whose bytes can never change (content hash in the path).
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Cache-Control for stable URLs whose bytes may change: store, but revalidate
+# with If-None-Match on every use (answered with a body-less 304 when unchanged).
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+# Image filenames written since content hashing was introduced:
+# <UTC timestamp>-<first 16 hex chars of sha256>.<ext>
+_CONTENT_ADDRESSED_IMAGE_RE = re.compile(r"^\d{8}T\d{6}Z-[0-9a-f]{16}\.[a-z0-9]+$")
+
+
 def is_local_storage_url(value: str | None) -> bool:
     return bool(value and value.startswith(LOCAL_STORAGE_PREFIXES))
 
@@ -88,6 +100,26 @@ def normalize_image_url(storage_url: str | None) -> str | None:
     return storage_url
 
 
+def content_addressed_image_name(contents: bytes, ext: str, timestamp: str) -> str:
+    return f"{timestamp}-{hashlib.sha256(contents).hexdigest()[:16]}.{ext}"
+
+
+def is_content_addressed_image(filepath: str) -> bool:
+    return bool(_CONTENT_ADDRESSED_IMAGE_RE.match(Path(filepath).name))
+
+
+def etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against ``etag`` (RFC 7232 §3.2)."""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == wanted for candidate in if_none_match.split(",")
+    )
+
+
 def resolve_local_storage_path(storage_url: str) -> Path | None:
     candidate: Path
     if storage_url.startswith("data/"):
@@ -476,10 +476,11 @@ async def generate_song_file(
         # Production: mirror the generated file to GCS.  The local copy is
         # retained as a dev fallback and for the Cloud Run ephemeral filesystem
         # (gone on next container restart, but that's acceptable).
-        from myndral_api.gcs_utils import upload_file_to_gcs  # lazy import
+        from myndral_api.gcs_utils import get_storage_backend, upload_file_to_gcs  # lazy import
 
         mime_type_for_upload = guess_media_type(output_path, fallback_format=guess_audio_format(output_path.name))
-        storage_url = upload_file_to_gcs(
+        storage_url = await get_storage_backend().run(
+            upload_file_to_gcs,
             gcs_bucket,
             f"{output_subdir}/{output_path.name}",
             output_path,
@@ -0,0 +1,144 @@
+"""
+Keyset ("cursor") pagination for list endpoints.
+
+``LIMIT … OFFSET n`` makes Postgres produce and discard ``n`` rows before the
+page starts, so every page deeper into a list costs more than the one before.
+A keyset page starts right after the sort key of the previous page's last row,
+so it reads from the same index position however deep the client is.
+
+Every list endpoint sorts on a ``Keyset``: its ORDER BY keys ending in a
+unique column, so that no two rows tie.  ``Keyset.after`` turns a cursor into
+the WHERE condition that starts the page.  ``Keyset.page`` cuts the rows,
+which are fetched with one extra to tell whether another page follows, and
+encodes the last row's keys as the next cursor.
+
+Cursors are opaque to clients.  Each one is the URL-safe base64 of the key
+values, and a malformed cursor is a 400.  List responses carry
+``nextCursor``, which is ``null`` on the last page.  Passing it back as
+``cursor`` returns the following page.  ``offset`` still works on its own or
+after a cursor, so existing clients keep paging as before.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+
+def _integer(bits: int) -> Callable[[Any], int]:
+    """Decoder for a ``bits``-wide SQL integer; rejects floats, bools and overflow."""
+    bound = 2 ** (bits - 1)
+
+    def decode(value: Any) -> int:
+        if type(value) is not int or not -bound <= value < bound:
+            raise ValueError(f"not an int{bits // 8}: {value!r}")
+        return value
+
+    return decode
+
+
+# How a cursor value is turned back into the Python type asyncpg binds for
+# the key's SQL type.  Cursors come from clients, so each decoder must reject
+# anything the CAST in the query would fail on.
+_DECODERS: dict[str, Callable[[Any], Any]] = {
+    "bigint": _integer(64),
+    "integer": _integer(32),
+    "text": str,
+    "uuid": lambda value: str(UUID(value)),
+    "date": date.fromisoformat,
+    "timestamptz": datetime.fromisoformat,
+}
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """One ORDER BY key.
+
+    ``expression`` is the SQL ordered on.  ``column`` is the key of the
+    result row holding the same value, and ``sql_type`` is the type the
+    cursor value is bound as.
+    """
+
+    expression: str
+    column: str
+    sql_type: str
+    descending: bool = True
+
+    def __post_init__(self) -> None:
+        if self.sql_type not in _DECODERS:
+            raise ValueError(f"Unsupported sort key type: {self.sql_type}")
+
+
+class Keyset:
+    """The sort order of one list endpoint; the last key must be unique."""
+
+    def __init__(self, *keys: SortKey) -> None:
+        self.keys = keys
+
+    def order_by(self) -> str:
+        terms = ", ".join(
+            f"{key.expression} {'DESC' if key.descending else 'ASC'}" for key in self.keys
+        )
+        return f"ORDER BY {terms}\n"
+
+    def after(self, cursor: str | None) -> tuple[str, dict[str, Any]]:
+        """The ``AND …`` condition and parameters that start a page after ``cursor``."""
+        if cursor is None:
+            return "", {}
+        values = self._decode(cursor)
+        params = {f"cursor_{i}": value for i, value in enumerate(values)}
+        bound = [f"CAST(:cursor_{i} AS {key.sql_type})" for i, key in enumerate(self.keys)]
+        directions = {key.descending for key in self.keys}
+        if len(directions) == 1:
+            # One direction for every key: a row comparison, which Postgres
+            # can start an index scan from.
+            op = "<" if self.keys[0].descending else ">"
+            left = ", ".join(key.expression for key in self.keys)
+            return f"  AND ({left}) {op} ({', '.join(bound)})\n", params
+        branches = []
+        for i, key in enumerate(self.keys):
+            equal = [f"{k.expression} = {bound[j]}" for j, k in enumerate(self.keys[:i])]
+            op = "<" if key.descending else ">"
+            branches.append(" AND ".join([*equal, f"{key.expression} {op} {bound[i]}"]))
+        return "  AND (" + " OR ".join(f"({branch})" for branch in branches) + ")\n", params
+
+    def page(self, rows: Sequence[Any], limit: int) -> tuple[Sequence[Any], str | None]:
+        """Cut rows fetched with ``LIMIT limit + 1``; returns the page and its next cursor."""
+        if len(rows) <= limit:
+            return rows, None
+        page = rows[:limit]
+        return page, self._encode(page[-1])
+
+    def _encode(self, row: Any) -> str:
+        values = []
+        for key in self.keys:
+            value = row[key.column]
+            if isinstance(value, date | datetime):
+                value = value.isoformat()
+            elif isinstance(value, UUID):
+                value = str(value)
+            values.append(value)
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    def _decode(self, cursor: str) -> list[Any]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(self.keys):
+                raise ValueError("wrong number of keys")
+            return [_DECODERS[key.sql_type](value) for key, value in zip(self.keys, values)]
+        except (
+            binascii.Error, UnicodeDecodeError, TypeError, ValueError, OverflowError
+        ) as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor",
+            ) from exc
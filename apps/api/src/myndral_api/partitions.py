@@ -0,0 +1,293 @@
+"""
+Maintenance of the monthly event partitions.
+
+``play_events``, ``skip_events`` and ``ad_impressions`` are RANGE-partitioned
+by month on their event time (db/schema.sql).  Each run of this job, per table:
+
+  1. creates ``<table>_pYYYY_MM`` for the current month and the next
+     ``PARTITION_PREMAKE_MONTHS``, so inserts never fall through to the
+     DEFAULT partition in normal operation.  Rows that did land in
+     ``<table>_default`` for a month being created (e.g. before the first
+     run) are moved into the new partition in the same transaction, since
+     Postgres refuses to create a partition that the default already covers;
+  2. detaches every partition whose upper bound is older than the table's
+     retention, then archives it (``ALTER TABLE … SET SCHEMA archive``, for
+     export and a manual drop) or drops it, per ``PARTITION_EXPIRED_ACTION``.
+
+Retention is therefore a catalog operation rather than a DELETE: no dead
+tuples, no vacuum debt, and each partition's indexes stay the size of one
+month.  Closed months stop receiving writes, so autovacuum freezes them once
+and then leaves them alone.
+
+Locks are taken with a short ``lock_timeout``; a table that is busy is simply
+retried on the next run.  Run daily as a Cloud Run job (see infra/DEPLOY.md):
+
+    python -m myndral_api.partitions
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api.config import Settings, get_settings
+from myndral_api.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = "archive"
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    name: str
+    column: str
+    retention_months: int
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    lower: datetime | None  # None → MINVALUE
+    upper: datetime | None  # None → MAXVALUE
+    is_default: bool = False
+
+
+@dataclass
+class MaintenanceReport:
+    table: str
+    created: list[str] = field(default_factory=list)
+    moved_rows: int = 0
+    expired: list[str] = field(default_factory=list)
+    default_rows: int = 0
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "table": self.table,
+            "created": self.created,
+            "movedRows": self.moved_rows,
+            "expired": self.expired,
+            "defaultRows": self.default_rows,
+        }
+
+
+def managed_tables(settings: Settings) -> tuple[PartitionedTable, ...]:
+    return (
+        PartitionedTable("play_events", "played_at", settings.event_retention_months),
+        PartitionedTable("skip_events", "skipped_at", settings.event_retention_months),
+        PartitionedTable("ad_impressions", "played_at", settings.ad_impression_retention_months),
+    )
+
+
+# ── Month arithmetic and bounds ───────────────────────────────────────────────
+
+def month_start(value: datetime) -> datetime:
+    value = value.astimezone(UTC)
+    return datetime(value.year, value.month, 1, tzinfo=UTC)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+_BOUND_RE = re.compile(r"FOR VALUES FROM \((.+?)\) TO \((.+?)\)")
+
+
+def _bound_value(raw: str) -> datetime | None:
+    if raw in ("MINVALUE", "MAXVALUE"):
+        return None
+    return datetime.fromisoformat(raw.strip("'"))
+
+
+def parse_partition(name: str, bound: str) -> Partition:
+    """Build a Partition from ``pg_get_expr(relpartbound, …)`` output (TimeZone UTC)."""
+    if bound == "DEFAULT":
+        return Partition(name, None, None, is_default=True)
+    match = _BOUND_RE.fullmatch(bound)
+    if match is None:
+        raise ValueError(f"unexpected partition bound for {name}: {bound}")
+    return Partition(name, _bound_value(match.group(1)), _bound_value(match.group(2)))
+
+
+def plan_maintenance(
+    table: PartitionedTable,
+    partitions: list[Partition],
+    *,
+    now: datetime,
+    premake_months: int,
+) -> tuple[list[datetime], list[Partition]]:
+    """Months to create and partitions to expire; pure, so the policy is testable."""
+    ranged = [p for p in partitions if not p.is_default]
+    current = month_start(now)
+
+    def covered(month: datetime) -> bool:
+        end = add_months(month, 1)
+        return any(
+            (p.lower is None or p.lower < end) and (p.upper is None or p.upper > month)
+            for p in ranged
+        )
+
+    to_create = [
+        month
+        for month in (add_months(current, offset) for offset in range(premake_months + 1))
+        if not covered(month)
+    ]
+    horizon = add_months(current, -table.retention_months)
+    expired = [p for p in ranged if p.upper is not None and p.upper <= horizon]
+    return to_create, expired
+
+
+# ── SQL ───────────────────────────────────────────────────────────────────────
+
+_LIST_PARTITIONS_SQL = """
+SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = CAST(:table AS regclass)
+ORDER BY c.relname
+"""
+
+# Identifiers below come from managed_tables()/partition_name(), never from input.
+_STASH_DEFAULT_ROWS_SQL = """
+CREATE TEMP TABLE partition_moved_rows ON COMMIT DROP AS
+WITH moved AS (
+  DELETE FROM {default} WHERE {column} >= :lower AND {column} < :upper RETURNING *
+)
+SELECT * FROM moved
+"""
+
+
+async def _session_setup(db: AsyncSession) -> None:
+    # Bounds are rendered by pg_get_expr in the session time zone.
+    await db.execute(text("SET LOCAL TimeZone = 'UTC'"))
+    await db.execute(text("SET LOCAL lock_timeout = '5s'"))
+
+
+async def list_partitions(db: AsyncSession, table: str) -> list[Partition]:
+    rows = (await db.execute(text(_LIST_PARTITIONS_SQL), {"table": table})).all()
+    return [parse_partition(name, bound) for name, bound in rows]
+
+
+async def _create_partition(
+    db: AsyncSession, table: PartitionedTable, month: datetime, default: str | None
+) -> int:
+    name = partition_name(table.name, month)
+    upper = add_months(month, 1)
+    moved = 0
+    if default:
+        await db.execute(
+            text(_STASH_DEFAULT_ROWS_SQL.format(default=default, column=table.column)),
+            {"lower": month, "upper": upper},
+        )
+        moved = int(
+            (await db.execute(text("SELECT count(*) FROM partition_moved_rows"))).scalar_one()
+        )
+    await db.execute(
+        text(
+            f"CREATE TABLE {name} PARTITION OF {table.name} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+    )
+    if default:
+        if moved:
+            await db.execute(text(f"INSERT INTO {table.name} SELECT * FROM partition_moved_rows"))
+        await db.execute(text("DROP TABLE partition_moved_rows"))
+    return moved
+
+
+async def _expire_partition(
+    db: AsyncSession, table: PartitionedTable, partition: Partition, action: str
+) -> None:
+    await db.execute(text(f"ALTER TABLE {table.name} DETACH PARTITION {partition.name}"))
+    if action == "drop":
+        await db.execute(text(f"DROP TABLE {partition.name}"))
+    else:
+        await db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+        await db.execute(text(f"ALTER TABLE {partition.name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+
+
+async def maintain_table(
+    db: AsyncSession,
+    table: PartitionedTable,
+    *,
+    now: datetime,
+    premake_months: int,
+    expired_action: str,
+) -> MaintenanceReport:
+    """Create upcoming months and expire old ones for one table.  The caller commits."""
+    if expired_action not in ("archive", "drop"):
+        raise ValueError(f"PARTITION_EXPIRED_ACTION must be archive or drop: {expired_action!r}")
+
+    await _session_setup(db)
+    partitions = await list_partitions(db, table.name)
+    default = next((p.name for p in partitions if p.is_default), None)
+    to_create, expired = plan_maintenance(
+        table, partitions, now=now, premake_months=premake_months
+    )
+
+    report = MaintenanceReport(table.name)
+    for month in to_create:
+        report.moved_rows += await _create_partition(db, table, month, default)
+        report.created.append(partition_name(table.name, month))
+    for partition in expired:
+        await _expire_partition(db, table, partition, expired_action)
+        report.expired.append(partition.name)
+    if default:
+        report.default_rows = int(
+            (await db.execute(text(f"SELECT count(*) FROM {default}"))).scalar_one()
+        )
+    return report
+
+
+async def run_maintenance(now: datetime | None = None) -> list[MaintenanceReport]:
+    """Maintain every managed table, each in its own transaction.
+
+    A failing table does not stop the others; the run raises at the end so the
+    job execution is marked failed.
+    """
+    settings = get_settings()
+    now = now or datetime.now(UTC)
+    reports: list[MaintenanceReport] = []
+    failed: list[str] = []
+    for table in managed_tables(settings):
+        async with AsyncSessionLocal() as db:
+            try:
+                report = await maintain_table(
+                    db,
+                    table,
+                    now=now,
+                    premake_months=settings.partition_premake_months,
+                    expired_action=settings.partition_expired_action,
+                )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                logger.exception("Partition maintenance failed for %s", table.name)
+                failed.append(table.name)
+                continue
+        logger.info("Partition maintenance: %s", report.to_dict())
+        if report.default_rows:
+            logger.warning(
+                "%s_default holds %d rows outside every monthly partition",
+                table.name,
+                report.default_rows,
+            )
+        reports.append(report)
+    if failed:
+        raise RuntimeError(f"partition maintenance failed for {', '.join(failed)}")
+    return reports
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(run_maintenance())
@@ -0,0 +1,164 @@
+"""
+Playable-track resolution for the stream hot path.
+
+``resolve_playable_track`` answers "which audio file does /v1/stream serve for
+this track, and may it be served at all?".  The underlying query joins four
+tables and sorts by quality tier, and a single listen issues it once per range
+request, so results are cached for a few seconds.
+
+Two cache layers, chosen by ``REDIS_CACHE_ENABLED``:
+  * off — an in-process ``TTLCache`` per worker.
+  * on  — one Redis key per track, shared by every instance.  The
+    in-process layer is skipped in this mode so an invalidation issued on one
+    instance takes effect everywhere at once.
+
+Unpublished tracks are cached too (``published=False``) so probing for them is
+as cheap as streaming them.  Every status change that can affect
+playability must therefore call ``invalidate_playable_tracks``: the staging
+approve / reject / revoke / restore handlers and ``_upsert_audio_files``.
+
+Concurrent misses for the same track share one query (``singleflight``), so
+the first plays of a new release do not each run it.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api.caching import TTLCache, redis_call
+from myndral_api.config import get_settings
+from myndral_api.singleflight import SingleFlight
+
+_REDIS_KEY_PREFIX = "myndral:playable"
+_REDIS_GENERATION_KEY = f"{_REDIS_KEY_PREFIX}:generation"
+
+
+@dataclass(frozen=True)
+class PlayableTrack:
+    track_id: str
+    storage_url: str
+    quality: str
+    format: str | None
+    file_size_bytes: int | None
+    checksum_sha256: str | None
+    published: bool
+
+
+_PLAYABLE_TRACK_SQL = """
+SELECT
+  taf.storage_url,
+  taf.quality::text AS quality,
+  taf.format::text AS format,
+  taf.file_size_bytes,
+  taf.checksum_sha256,
+  (t.status = 'published' AND a.status = 'published' AND ar.status = 'published') AS published
+FROM track_audio_files taf
+JOIN tracks t ON t.id = taf.track_id
+JOIN albums a ON a.id = t.album_id
+JOIN artists ar ON ar.id = t.primary_artist_id
+WHERE taf.track_id = :track_id
+ORDER BY CASE taf.quality
+  WHEN 'high_320' THEN 1
+  WHEN 'lossless' THEN 2
+  WHEN 'standard_256' THEN 3
+  WHEN 'low_128' THEN 4
+  ELSE 5
+END
+LIMIT 1
+"""
+
+_local_cache: TTLCache[str, PlayableTrack] = TTLCache(
+    ttl_seconds=get_settings().stream_resolution_cache_ttl_seconds
+)
+_flights: SingleFlight[str] = SingleFlight("stream.resolve")
+
+
+async def resolve_playable_track(db: AsyncSession, track_id: str) -> PlayableTrack | None:
+    """Return the preferred audio file for a track, or ``None`` if it has none.
+
+    Callers must still check ``published`` before serving bytes.
+    """
+    cached = await _cache_get(track_id)
+    if cached is not None:
+        return cached
+
+    return await _flights.do(track_id, lambda: _load_playable_track(db, track_id))
+
+
+async def _load_playable_track(db: AsyncSession, track_id: str) -> PlayableTrack | None:
+    row = (
+        await db.execute(text(_PLAYABLE_TRACK_SQL), {"track_id": track_id})
+    ).mappings().first()
+    if row is None:
+        return None
+
+    playable = PlayableTrack(
+        track_id=track_id,
+        storage_url=str(row["storage_url"]),
+        quality=row["quality"],
+        format=row["format"],
+        file_size_bytes=row["file_size_bytes"],
+        checksum_sha256=row["checksum_sha256"],
+        published=bool(row["published"]),
+    )
+    await _cache_put(playable)
+    return playable
+
+
+async def invalidate_playable_tracks(track_ids: list[str] | None = None) -> None:
+    """Drop cached resolutions for ``track_ids``, or for every track when ``None``.
+
+    Album- and artist-level status changes pass ``None``: they are rare admin
+    actions, and clearing everything is cheaper than enumerating the tracks.
+    """
+    if track_ids is None:
+        _local_cache.clear()
+        await redis_call(lambda redis: redis.incr(_REDIS_GENERATION_KEY))
+        return
+
+    _local_cache.invalidate(*track_ids)
+
+    async def _delete(redis):
+        generation = await redis.get(_REDIS_GENERATION_KEY) or "0"
+        await redis.delete(*(_redis_key(generation, track_id) for track_id in track_ids))
+
+    if track_ids:
+        await redis_call(_delete)
+
+
+# ── Cache layers ──────────────────────────────────────────────────────────────
+
+def _redis_key(generation: str, track_id: str) -> str:
+    return f"{_REDIS_KEY_PREFIX}:{generation}:{track_id}"
+
+
+async def _cache_get(track_id: str) -> PlayableTrack | None:
+    if not get_settings().redis_cache_enabled:
+        return _local_cache.get(track_id)
+
+    async def _get(redis):
+        generation = await redis.get(_REDIS_GENERATION_KEY) or "0"
+        return await redis.get(_redis_key(generation, track_id))
+
+    payload = await redis_call(_get)
+    return PlayableTrack(**json.loads(payload)) if payload else None
+
+
+async def _cache_put(playable: PlayableTrack) -> None:
+    settings = get_settings()
+    if not settings.redis_cache_enabled:
+        _local_cache.put(playable.track_id, playable)
+        return
+
+    async def _set(redis):
+        generation = await redis.get(_REDIS_GENERATION_KEY) or "0"
+        await redis.set(
+            _redis_key(generation, playable.track_id),
+            json.dumps(asdict(playable)),
+            ex=settings.stream_resolution_cache_ttl_seconds,
+        )
+
+    await redis_call(_set)
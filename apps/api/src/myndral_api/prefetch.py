@@ -0,0 +1,212 @@
+"""
+Sequential read-ahead for proxied audio streams.
+
+Players fetch audio as a run of adjacent range requests (``0-65535``,
+``65536-131071``, …).  Without read-ahead each range only reaches GCS once the
+client asks for it, so origin latency is paid on every request.
+
+``ReadAheadPrefetcher.observe`` remembers where each (client, object) pair
+stopped reading.  When the next request starts exactly where the previous one
+ended the access is treated as sequential and the next ``window_blocks``
+block-aligned pieces are fetched in the background into a bounded in-memory
+buffer.  ``fetch`` — the origin read used by the audio block cache and by
+``iter_range`` — answers from that buffer (or joins the in-flight download)
+before going to GCS.
+
+Blocks evicted from the buffer without ever being read are counted as wasted,
+so the window can be tuned from ``/v1/internal/metrics/stream-prefetch``.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from myndral_api.caching import TTLCache
+from myndral_api.config import get_settings
+
+_BlockId = tuple[str, str, int]
+OriginFetch = Callable[[str, int, int], Awaitable[bytes]]
+
+
+@dataclass
+class PrefetchStats:
+    issued: int = 0
+    hits: int = 0
+    misses: int = 0
+    failed: int = 0
+    bytes_prefetched: int = 0
+    wasted_blocks: int = 0
+    wasted_bytes: int = 0
+
+    def to_dict(self) -> dict[str, int | float]:
+        return {
+            "issued": self.issued,
+            "hits": self.hits,
+            "misses": self.misses,
+            "failed": self.failed,
+            "hitRate": round(self.hits / self.issued, 4) if self.issued else 0.0,
+            "bytesPrefetched": self.bytes_prefetched,
+            "wastedBlocks": self.wasted_blocks,
+            "wastedBytes": self.wasted_bytes,
+        }
+
+
+@dataclass
+class _Entry:
+    task: asyncio.Task[bytes | None]
+    used: bool = False
+
+
+class ReadAheadPrefetcher:
+    """Detects sequential range reads and prefetches the following blocks."""
+
+    def __init__(
+        self,
+        origin: OriginFetch,
+        *,
+        block_size: int,
+        window_blocks: int,
+        max_bytes: int,
+        session_ttl_seconds: float = 120,
+    ) -> None:
+        self.origin = origin
+        self.block_size = block_size
+        self.window_blocks = window_blocks
+        self.max_blocks = max(1, max_bytes // block_size)
+        self.stats = PrefetchStats()
+        self._buffer: OrderedDict[_BlockId, _Entry] = OrderedDict()
+        self._read_positions: TTLCache[tuple[str, str], int] = TTLCache(session_ttl_seconds)
+
+    def describe(self) -> dict[str, int | float]:
+        return {
+            **self.stats.to_dict(),
+            "bufferedBlocks": len(self._buffer),
+            "maxBlocks": self.max_blocks,
+            "blockSize": self.block_size,
+            "windowBlocks": self.window_blocks,
+        }
+
+    def observe(
+        self,
+        client_key: str,
+        gs_url: str,
+        checksum: str | None,
+        start: int,
+        end: int,
+        total_size: int,
+        *,
+        is_cached: Callable[[int], bool] | None = None,
+    ) -> int:
+        """Record a range read and schedule read-ahead if it continues the last one.
+
+        ``is_cached(block_index)`` lets the caller skip blocks that are already
+        available locally.  Returns the number of blocks scheduled.
+        """
+        session = (client_key, gs_url)
+        previous_end = self._read_positions.get(session)
+        self._read_positions.put(session, end)
+        if previous_end is None or start != previous_end + 1:
+            return 0
+
+        scheduled = 0
+        first = (end + 1) // self.block_size
+        for index in range(first, first + self.window_blocks):
+            block_start = index * self.block_size
+            if block_start >= total_size:
+                break
+            block_id = (gs_url, checksum or "", index)
+            if block_id in self._buffer:
+                self._buffer.move_to_end(block_id)
+                continue
+            if is_cached is not None and is_cached(index):
+                continue
+            block_end = min(block_start + self.block_size, total_size) - 1
+            task = asyncio.create_task(self._prefetch(gs_url, block_start, block_end))
+            self._buffer[block_id] = _Entry(task)
+            self.stats.issued += 1
+            scheduled += 1
+        self._evict()
+        return scheduled
+
+    async def fetch(self, gs_url: str, checksum: str | None, start: int, end: int) -> bytes:
+        """Origin read for ``start..end`` that prefers prefetched blocks."""
+        entry = None
+        if start % self.block_size == 0:
+            entry = self._buffer.get((gs_url, checksum or "", start // self.block_size))
+        if entry is None:
+            self.stats.misses += 1
+            return await self.origin(gs_url, start, end)
+
+        self._buffer.move_to_end((gs_url, checksum or "", start // self.block_size))
+        # Mark before awaiting so eviction never cancels a download someone is waiting on.
+        first_use = not entry.used
+        entry.used = True
+        block = await asyncio.shield(entry.task)
+        if block is None:
+            self.stats.misses += 1
+            return await self.origin(gs_url, start, end)
+        if first_use:
+            self.stats.hits += 1
+        return block[: end - start + 1]
+
+    async def iter_range(
+        self, gs_url: str, checksum: str | None, start: int, end: int
+    ) -> AsyncIterator[bytes]:
+        """Yield bytes ``start..end`` (inclusive) via block-aligned ``fetch`` calls."""
+        for index in range(start // self.block_size, end // self.block_size + 1):
+            block_start = index * self.block_size
+            block = await self.fetch(
+                gs_url, checksum, block_start, block_start + self.block_size - 1
+            )
+            lo = max(start, block_start) - block_start
+            hi = min(end, block_start + self.block_size - 1) - block_start + 1
+            data = block[lo:hi]
+            if not data:
+                return
+            yield data
+
+    async def _prefetch(self, gs_url: str, start: int, end: int) -> bytes | None:
+        try:
+            block = await self.origin(gs_url, start, end)
+        except Exception:  # a failed read-ahead is just a later miss
+            self.stats.failed += 1
+            return None
+        self.stats.bytes_prefetched += len(block)
+        return block
+
+    def _evict(self) -> None:
+        while len(self._buffer) > self.max_blocks:
+            _, entry = self._buffer.popitem(last=False)
+            if entry.used:
+                continue
+            self.stats.wasted_blocks += 1
+            if entry.task.done():
+                block = entry.task.result()
+                self.stats.wasted_bytes += len(block or b"")
+            else:
+                entry.task.cancel()
+
+
+async def _gcs_origin(gs_url: str, start: int, end: int) -> bytes:
+    from myndral_api.gcs_utils import download_gcs_range, get_storage_backend
+
+    return await get_storage_backend().run(download_gcs_range, gs_url, start, end)
+
+
+@lru_cache
+def get_prefetcher() -> ReadAheadPrefetcher | None:
+    """Process-wide prefetcher, or ``None`` when ``STREAM_PREFETCH_BLOCKS`` is 0."""
+    from myndral_api.audio_cache import BLOCK_SIZE  # audio_cache imports this module
+
+    settings = get_settings()
+    if settings.stream_prefetch_blocks <= 0:
+        return None
+    return ReadAheadPrefetcher(
+        _gcs_origin,
+        block_size=BLOCK_SIZE,
+        window_blocks=settings.stream_prefetch_blocks,
+        max_bytes=settings.stream_prefetch_max_bytes,
+    )
@@ -0,0 +1,397 @@
+"""
+Radio stations: endless queues seeded by a track, an artist or a genre.
+
+Serving a page never scans the catalog.  Each station plays through a
+candidate pool — an ordered list of (track, artist) pairs — that is cheap to
+load and cached per process:
+
+  * genre:<id>  — the ``radio_pools`` row for the genre: its published tracks
+    by trending score, then all-time plays;
+  * artist:<id> — the artist's ``radio_pools`` row (their top tracks
+    interleaved with the listener neighbours of those tracks), followed by
+    the pool of one of the artist's genres;
+  * track:<id>  — the seed itself, its ``track_neighbors``, then the pool of
+    its primary artist and of one of its genres.
+
+``radio_pools`` is rebuilt by the nightly related-tracks job right after the
+neighbours (``rebuild_pools``), so every source is a primary-key read.
+
+A page walks the pool from the cursor's position, wrapping around at the end,
+and re-ranks in memory: tracks the listener played or skipped recently are
+left out, as are artists they keep skipping.  The opaque cursor carries the
+seed and the position, so the next page is one cached pool lookup, two
+indexed history reads and the hydration of the tracks returned.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import uuid
+from dataclasses import dataclass
+from typing import Literal, cast
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api.caching import TTLCache
+from myndral_api.config import get_settings
+
+SeedType = Literal["track", "artist", "genre"]
+SEED_TYPES: tuple[SeedType, ...] = ("track", "artist", "genre")
+
+# Own tracks of an artist that lead its pool and seed its neighbour lookup.
+ARTIST_TOP_TRACKS = 30
+ARTIST_NEIGHBOUR_SEEDS = 10
+# Listening history considered when re-ranking a page.
+RECENT_PLAYS = 50
+RECENT_SKIPS = 200
+HISTORY_DAYS = 30
+# An artist skipped this often in the recent history is left out of stations.
+SKIPPED_ARTIST_THRESHOLD = 3
+
+
+@dataclass(frozen=True)
+class Seed:
+    type: SeedType
+    id: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.type}:{self.id}"
+
+
+@dataclass(frozen=True)
+class Pool:
+    track_ids: tuple[str, ...]
+    artist_ids: tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+
+@dataclass(frozen=True)
+class History:
+    tracks: frozenset[str] = frozenset()
+    artists: frozenset[str] = frozenset()
+
+
+# ── Cursors ───────────────────────────────────────────────────────────────────
+
+def encode_cursor(seed: Seed, position: int) -> str:
+    payload = json.dumps({"s": seed.key, "p": position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Seed, int]:
+    """Inverse of ``encode_cursor``; raises ValueError for anything malformed.
+
+    The cursor is client-supplied, so the seed id must parse as a UUID before
+    it is bound against the uuid columns in the pool queries.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        seed_type, _, seed_id = str(payload["s"]).partition(":")
+        position = int(payload["p"])
+        seed_id = str(uuid.UUID(seed_id))
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as exc:
+        raise ValueError("invalid radio cursor") from exc
+    if seed_type not in SEED_TYPES or position < 0:
+        raise ValueError("invalid radio cursor")
+    return Seed(cast(SeedType, seed_type), seed_id), position
+
+
+# ── Re-ranking ────────────────────────────────────────────────────────────────
+
+def next_batch(pool: Pool, position: int, limit: int, history: History) -> tuple[list[str], int]:
+    """Pick up to ``limit`` tracks from ``position`` on; returns (track ids, next position).
+
+    Walks the pool at most once around, so a small pool whose every track is
+    excluded returns a short page instead of looping.
+    """
+    picked: list[str] = []
+    seen: set[str] = set()
+    size = len(pool)
+    index = position
+    for index in range(position, position + size):
+        if len(picked) >= limit:
+            break
+        slot = index % size
+        track_id = pool.track_ids[slot]
+        if (
+            track_id in seen
+            or track_id in history.tracks
+            or pool.artist_ids[slot] in history.artists
+        ):
+            continue
+        picked.append(track_id)
+        seen.add(track_id)
+    else:
+        index = position + size
+    return picked, index % size if size else 0
+
+
+# ── SQL ───────────────────────────────────────────────────────────────────────
+
+_GENRE_POOL_SQL = """
+SELECT track_ids::text[] AS track_ids, artist_ids::text[] AS artist_ids
+FROM radio_pools
+WHERE seed_type = 'genre' AND seed_id = :seed_id
+"""
+
+_ARTIST_POOL_SQL = """
+SELECT
+  ap.track_ids::text[] AS track_ids,
+  ap.artist_ids::text[] AS artist_ids,
+  g.track_ids::text[] AS genre_track_ids,
+  g.artist_ids::text[] AS genre_artist_ids
+FROM artists a
+LEFT JOIN radio_pools ap ON ap.seed_type = 'artist' AND ap.seed_id = a.id
+LEFT JOIN LATERAL (
+  SELECT rp.track_ids, rp.artist_ids
+  FROM artist_genres ag
+  JOIN radio_pools rp ON rp.seed_type = 'genre' AND rp.seed_id = ag.genre_id
+  WHERE ag.artist_id = a.id
+  ORDER BY cardinality(rp.track_ids) DESC
+  LIMIT 1
+) AS g ON true
+WHERE a.id = :seed_id AND a.status = 'published'
+"""
+
+_TRACK_POOL_SQL = """
+SELECT
+  t.id::text AS seed_track_id,
+  t.primary_artist_id::text AS seed_artist_id,
+  n.track_ids AS neighbour_track_ids,
+  n.artist_ids AS neighbour_artist_ids,
+  ap.track_ids::text[] AS artist_track_ids,
+  ap.artist_ids::text[] AS artist_artist_ids,
+  g.track_ids::text[] AS genre_track_ids,
+  g.artist_ids::text[] AS genre_artist_ids
+FROM tracks t
+LEFT JOIN LATERAL (
+  SELECT
+    array_agg(nt.id::text ORDER BY u.ord) AS track_ids,
+    array_agg(nt.primary_artist_id::text ORDER BY u.ord) AS artist_ids
+  FROM track_neighbors tn
+  CROSS JOIN LATERAL unnest(tn.neighbor_ids) WITH ORDINALITY AS u(track_id, ord)
+  JOIN tracks nt ON nt.id = u.track_id
+  WHERE tn.track_id = t.id
+) AS n ON true
+LEFT JOIN radio_pools ap ON ap.seed_type = 'artist' AND ap.seed_id = t.primary_artist_id
+LEFT JOIN LATERAL (
+  SELECT rp.track_ids, rp.artist_ids
+  FROM radio_pools rp
+  WHERE rp.seed_type = 'genre'
+    AND rp.seed_id IN (
+      SELECT tg.genre_id FROM track_genres tg WHERE tg.track_id = t.id
+      UNION
+      SELECT ag.genre_id FROM album_genres ag WHERE ag.album_id = t.album_id
+    )
+  ORDER BY cardinality(rp.track_ids) DESC
+  LIMIT 1
+) AS g ON true
+WHERE t.id = :seed_id AND t.status = 'published'
+"""
+
+_HISTORY_SQL = """
+SELECT h.track_id::text, t.primary_artist_id::text, h.skipped
+FROM (
+  (SELECT track_id, false AS skipped FROM play_events
+   WHERE user_id = :user_id AND played_at >= now() - make_interval(days => :days)
+   ORDER BY played_at DESC LIMIT :plays)
+  UNION ALL
+  (SELECT track_id, true FROM skip_events
+   WHERE user_id = :user_id AND skipped_at >= now() - make_interval(days => :days)
+   ORDER BY skipped_at DESC LIMIT :skips)
+) AS h
+JOIN tracks t ON t.id = h.track_id
+"""
+
+_CLEAR_POOLS_SQL = """
+DELETE FROM radio_pools
+"""
+
+# Published tracks tagged with the genre directly or through their album,
+# hottest first; tracks that never charted follow by all-time plays.
+_BUILD_GENRE_POOLS_SQL = """
+WITH tagged AS (
+  SELECT tg.genre_id, tg.track_id FROM track_genres tg
+  UNION
+  SELECT ag.genre_id, t.id FROM album_genres ag JOIN tracks t ON t.album_id = ag.album_id
+),
+ranked AS (
+  SELECT
+    tg.genre_id,
+    t.id AS track_id,
+    t.primary_artist_id AS artist_id,
+    row_number() OVER (
+      PARTITION BY tg.genre_id
+      ORDER BY COALESCE(cs.score, 0) DESC, t.play_count DESC, t.id
+    ) AS rank
+  FROM tagged tg
+  JOIN tracks t ON t.id = tg.track_id
+  JOIN albums al ON al.id = t.album_id
+  JOIN artists pa ON pa.id = t.primary_artist_id
+  LEFT JOIN chart_scores cs ON cs.entity_type = 'track' AND cs.entity_id = t.id
+  WHERE t.status = 'published' AND al.status = 'published' AND pa.status = 'published'
+)
+INSERT INTO radio_pools (seed_type, seed_id, track_ids, artist_ids)
+SELECT 'genre', genre_id, array_agg(track_id ORDER BY rank), array_agg(artist_id ORDER BY rank)
+FROM ranked
+WHERE rank <= :pool_size
+GROUP BY genre_id
+"""
+
+# The artist's own top tracks alternate with the strongest listener
+# neighbours of their top few, so a station is neither one artist on repeat
+# nor unrelated to it.
+_BUILD_ARTIST_POOLS_SQL = """
+WITH own AS (
+  SELECT
+    t.primary_artist_id AS artist_id,
+    t.id AS track_id,
+    row_number() OVER (
+      PARTITION BY t.primary_artist_id ORDER BY t.play_count DESC, t.id
+    ) AS rank
+  FROM tracks t
+  JOIN albums al ON al.id = t.album_id
+  JOIN artists pa ON pa.id = t.primary_artist_id
+  WHERE t.status = 'published' AND al.status = 'published' AND pa.status = 'published'
+),
+neighbours AS (
+  SELECT o.artist_id, u.track_id, max(u.score) AS score
+  FROM own o
+  JOIN track_neighbors tn ON tn.track_id = o.track_id
+  CROSS JOIN LATERAL unnest(tn.neighbor_ids, tn.scores) AS u(track_id, score)
+  WHERE o.rank <= :neighbour_seeds
+  GROUP BY o.artist_id, u.track_id
+),
+related AS (
+  SELECT
+    n.artist_id,
+    n.track_id,
+    t.primary_artist_id AS track_artist_id,
+    row_number() OVER (PARTITION BY n.artist_id ORDER BY n.score DESC, n.track_id) AS rank
+  FROM neighbours n
+  JOIN tracks t ON t.id = n.track_id
+  JOIN albums al ON al.id = t.album_id
+  JOIN artists pa ON pa.id = t.primary_artist_id
+  WHERE t.primary_artist_id <> n.artist_id
+    AND t.status = 'published' AND al.status = 'published' AND pa.status = 'published'
+),
+merged AS (
+  SELECT artist_id, track_id, artist_id AS track_artist_id, rank * 2 AS slot
+  FROM own WHERE rank <= :top_tracks
+  UNION ALL
+  SELECT artist_id, track_id, track_artist_id, rank * 2 + 1
+  FROM related
+),
+ranked AS (
+  SELECT *, row_number() OVER (PARTITION BY artist_id ORDER BY slot) AS position FROM merged
+)
+INSERT INTO radio_pools (seed_type, seed_id, track_ids, artist_ids)
+SELECT
+  'artist', artist_id,
+  array_agg(track_id ORDER BY position),
+  array_agg(track_artist_id ORDER BY position)
+FROM ranked
+WHERE position <= :pool_size
+GROUP BY artist_id
+"""
+
+
+# ── Pools ─────────────────────────────────────────────────────────────────────
+
+_pool_cache: TTLCache[str, Pool] = TTLCache(
+    ttl_seconds=get_settings().radio_pool_cache_ttl_seconds, max_entries=4096
+)
+
+
+def compose_pool(*parts: tuple[list[str] | None, list[str] | None]) -> Pool:
+    """Concatenate (track ids, artist ids) sources in order, keeping first occurrences."""
+    tracks: list[str] = []
+    artists: list[str] = []
+    seen: set[str] = set()
+    for track_ids, artist_ids in parts:
+        for track_id, artist_id in zip(track_ids or [], artist_ids or [], strict=True):
+            if track_id not in seen:
+                seen.add(track_id)
+                tracks.append(track_id)
+                artists.append(artist_id)
+    return Pool(tuple(tracks), tuple(artists))
+
+
+async def load_pool(db: AsyncSession, seed: Seed) -> Pool | None:
+    """The station's candidate pool, or None if the seed does not exist or is unpublished."""
+    cached = _pool_cache.get(seed.key)
+    if cached is not None:
+        return cached
+
+    sql = {"genre": _GENRE_POOL_SQL, "artist": _ARTIST_POOL_SQL, "track": _TRACK_POOL_SQL}
+    row = (
+        await db.execute(text(sql[seed.type]), {"seed_id": seed.id})
+    ).mappings().first()
+    if seed.type == "genre":
+        # A genre with no published tracks yet has no pool row; that is an
+        # empty station, not a missing seed (the router has resolved the slug).
+        pool = compose_pool((row["track_ids"], row["artist_ids"]) if row else (None, None))
+    elif row is None:
+        return None
+    elif seed.type == "artist":
+        pool = compose_pool(
+            (row["track_ids"], row["artist_ids"]),
+            (row["genre_track_ids"], row["genre_artist_ids"]),
+        )
+    else:
+        pool = compose_pool(
+            ([row["seed_track_id"]], [row["seed_artist_id"]]),
+            (row["neighbour_track_ids"], row["neighbour_artist_ids"]),
+            (row["artist_track_ids"], row["artist_artist_ids"]),
+            (row["genre_track_ids"], row["genre_artist_ids"]),
+        )
+    _pool_cache.put(seed.key, pool)
+    return pool
+
+
+async def load_history(db: AsyncSession, user_id: str | None) -> History:
+    if user_id is None:
+        return History()
+    rows = (
+        await db.execute(
+            text(_HISTORY_SQL),
+            {
+                "user_id": user_id,
+                "days": HISTORY_DAYS,
+                "plays": RECENT_PLAYS,
+                "skips": RECENT_SKIPS,
+            },
+        )
+    ).all()
+    skips_by_artist: dict[str, int] = {}
+    for _, artist_id, skipped in rows:
+        if skipped:
+            skips_by_artist[artist_id] = skips_by_artist.get(artist_id, 0) + 1
+    return History(
+        tracks=frozenset(track_id for track_id, _, _ in rows),
+        artists=frozenset(
+            artist for artist, skips in skips_by_artist.items()
+            if skips >= SKIPPED_ARTIST_THRESHOLD
+        ),
+    )
+
+
+async def rebuild_pools(db: AsyncSession, *, pool_size: int) -> int:
+    """Replace every genre and artist pool; the caller commits.  Returns pools written."""
+    await db.execute(text(_CLEAR_POOLS_SQL))
+    genres = await db.execute(text(_BUILD_GENRE_POOLS_SQL), {"pool_size": pool_size})
+    artists = await db.execute(
+        text(_BUILD_ARTIST_POOLS_SQL),
+        {
+            "pool_size": pool_size,
+            "top_tracks": ARTIST_TOP_TRACKS,
+            "neighbour_seeds": ARTIST_NEIGHBOUR_SEEDS,
+        },
+    )
+    return int(genres.rowcount or 0) + int(artists.rowcount or 0)
@@ -0,0 +1,261 @@
+"""
+Offline item-to-item "related tracks", served by /v1/tracks/{id}/related.
+
+Each run builds a sparse user × track matrix from the co-occurrence signal we
+already store — ``user_liked_tracks``, ``user_saved_tracks`` and the last
+``RELATED_PLAY_WINDOW_DAYS`` of completed ``play_events`` — and keeps, for
+every published track, its ``RELATED_TRACKS_K`` nearest neighbours by cosine
+similarity of the track columns:
+
+    weight(user, track) = LIKE_WEIGHT·liked + SAVE_WEIGHT·saved + ln(1 + completed plays)
+    similarity(a, b)    = (X[:, a] · X[:, b]) / (‖X[:, a]‖ ‖X[:, b]‖)
+
+The similarity matrix is never materialised.  Columns are L2-normalised once,
+then ``Xᵀ X`` is computed a block of tracks at a time with SciPy's sparse
+product; each block's top K per row is picked with a dense partial sort, so
+memory stays bounded by ``RELATED_BLOCK_BYTES`` however large the catalog.
+Tracks with fewer than ``RELATED_MIN_USERS`` users are left out on both
+sides: a single shared listener would otherwise score 1.0.
+
+Results go to ``track_neighbors``, one row per track holding the neighbour ids
+and scores as arrays, so serving is a single primary-key lookup.  The radio
+candidate pools that draw on the neighbours are rebuilt in the same
+transaction (radio.py); readers keep the previous data until it commits.
+
+Run nightly as a Cloud Run job (see infra/DEPLOY.md):
+
+    python -m myndral_api.related
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api.config import get_settings
+from myndral_api.db.session import AsyncSessionLocal
+from myndral_api.radio import rebuild_pools
+
+logger = logging.getLogger(__name__)
+
+LIKE_WEIGHT = 2.0
+SAVE_WEIGHT = 2.0
+# Rows written per INSERT round trip.
+STORE_CHUNK_SIZE = 1000
+# Bytes per cell of a product block while it is ranked: the sparse product,
+# its dense copy and argpartition's int64 indices.
+_BYTES_PER_PRODUCT_ENTRY = 24
+
+
+@dataclass
+class RelatedResult:
+    users: int = 0
+    tracks: int = 0
+    interactions: int = 0
+    stored: int = 0
+    radio_pools: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "users": self.users,
+            "tracks": self.tracks,
+            "interactions": self.interactions,
+            "stored": self.stored,
+            "radioPools": self.radio_pools,
+            "seconds": round(self.seconds, 1),
+        }
+
+
+# ── SQL ───────────────────────────────────────────────────────────────────────
+
+_INTERACTIONS_SQL = """
+SELECT s.user_id, s.track_id, sum(s.weight) AS weight
+FROM (
+  SELECT user_id, track_id, CAST(:like_weight AS double precision) AS weight
+  FROM user_liked_tracks
+  UNION ALL
+  SELECT user_id, track_id, CAST(:save_weight AS double precision)
+  FROM user_saved_tracks
+  UNION ALL
+  SELECT user_id, track_id, ln(1 + count(*))
+  FROM play_events
+  WHERE user_id IS NOT NULL AND completed AND played_at >= :since
+  GROUP BY user_id, track_id
+) AS s
+JOIN tracks t ON t.id = s.track_id
+WHERE t.status = 'published'
+GROUP BY s.user_id, s.track_id
+"""
+
+_CLEAR_SQL = """
+DELETE FROM track_neighbors
+"""
+
+_STORE_SQL = """
+INSERT INTO track_neighbors (track_id, neighbor_ids, scores)
+VALUES (:track_id, CAST(:neighbor_ids AS uuid[]), CAST(:scores AS real[]))
+"""
+
+
+# ── Similarity ────────────────────────────────────────────────────────────────
+
+def build_matrix(
+    user_idx: np.ndarray, track_idx: np.ndarray, weights: np.ndarray, shape: tuple[int, int]
+) -> sparse.csr_matrix:
+    """User × track CSR matrix; duplicate (user, track) pairs are summed."""
+    matrix = sparse.coo_matrix(
+        (weights.astype(np.float32, copy=False), (user_idx, track_idx)), shape=shape
+    )
+    return matrix.tocsr()
+
+
+def top_k_neighbours(
+    matrix: sparse.csr_matrix,
+    k: int,
+    *,
+    min_users: int = 1,
+    block_bytes: int = 256 * 1024 * 1024,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Cosine top-``k`` neighbours of every column of a user × item matrix.
+
+    Returns, per item, ``(neighbour indices, scores)`` sorted by descending
+    score; items below ``min_users`` get empty arrays and never appear as a
+    neighbour.
+    """
+    n_items = matrix.shape[1]
+    users_per_item = np.diff(matrix.tocsc().indptr)
+    eligible = users_per_item >= min_users
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    scale = np.zeros(n_items, dtype=np.float32)
+    np.divide(1.0, norms, out=scale, where=eligible & (norms > 0))
+    normalised = (matrix @ sparse.diags(scale)).tocsr()
+    by_item = normalised.T.tocsr()
+
+    empty = (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32))
+    neighbours: list[tuple[np.ndarray, np.ndarray]] = [empty] * n_items
+    k = min(k, n_items - 1)
+    if k <= 0:
+        return neighbours
+    block = max(1, block_bytes // (n_items * _BYTES_PER_PRODUCT_ENTRY))
+    # Most of a product row is exactly zero, and introselect degrades badly on
+    # ties; a ramp far below float32 resolution at real scores makes them
+    # distinct without reordering any pair of actual neighbours.
+    tie_break = np.arange(n_items, dtype=np.float32) * np.float32(1e-12)
+    for start in range(0, n_items, block):
+        stop = min(start + block, n_items)
+        rows = np.arange(stop - start)
+        # Popular tracks co-occur with most of the catalog, so product rows
+        # are close to dense: a dense partial sort is O(n) per row, where
+        # sorting the sparse entries would be O(nnz log nnz).
+        product = (by_item[start:stop] @ normalised).toarray()
+        product -= tie_break
+        product[rows, rows + start] = -1.0
+        top = np.argpartition(product, -k, axis=1)[:, -k:]
+        top_scores = np.take_along_axis(product, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1).astype(np.int32)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        found = (top_scores > 0).sum(axis=1)
+        for row in np.flatnonzero(found):
+            neighbours[start + row] = (top[row, : found[row]], top_scores[row, : found[row]])
+    return neighbours
+
+
+# ── Job ───────────────────────────────────────────────────────────────────────
+
+async def load_interactions(
+    db: AsyncSession, *, since: datetime
+) -> tuple[list[str], sparse.csr_matrix, int]:
+    """Returns (track ids by column, user × track matrix, number of users)."""
+    users: dict[object, int] = {}
+    tracks: dict[object, int] = {}
+    # Typed arrays: tens of millions of interactions would not fit as lists of ints.
+    user_idx = array("i")
+    track_idx = array("i")
+    weights = array("f")
+
+    result = await db.stream(
+        text(_INTERACTIONS_SQL),
+        {"like_weight": LIKE_WEIGHT, "save_weight": SAVE_WEIGHT, "since": since},
+    )
+    async for rows in result.partitions(50_000):
+        for user_id, track_id, weight in rows:
+            user_idx.append(users.setdefault(user_id, len(users)))
+            track_idx.append(tracks.setdefault(track_id, len(tracks)))
+            weights.append(weight)
+
+    matrix = build_matrix(
+        np.frombuffer(user_idx, dtype=np.int32),
+        np.frombuffer(track_idx, dtype=np.int32),
+        np.frombuffer(weights, dtype=np.float32),
+        (len(users), len(tracks)),
+    )
+    return [str(track_id) for track_id in tracks], matrix, len(users)
+
+
+async def store_neighbours(
+    db: AsyncSession, track_ids: list[str], neighbours: list[tuple[np.ndarray, np.ndarray]]
+) -> int:
+    """Replace ``track_neighbors``; the caller commits."""
+    await db.execute(text(_CLEAR_SQL))
+    rows = [
+        {
+            "track_id": track_ids[item],
+            "neighbor_ids": [track_ids[n] for n in cols.tolist()],
+            "scores": [round(s, 4) for s in scores.tolist()],
+        }
+        for item, (cols, scores) in enumerate(neighbours)
+        if len(cols)
+    ]
+    for offset in range(0, len(rows), STORE_CHUNK_SIZE):
+        await db.execute(text(_STORE_SQL), rows[offset : offset + STORE_CHUNK_SIZE])
+    return len(rows)
+
+
+async def run_related(now: datetime | None = None) -> RelatedResult:
+    settings = get_settings()
+    started = time.perf_counter()
+    since = (now or datetime.now(UTC)) - timedelta(days=settings.related_play_window_days)
+    result = RelatedResult()
+
+    async with AsyncSessionLocal() as db:
+        track_ids, matrix, result.users = await load_interactions(db, since=since)
+    result.tracks = len(track_ids)
+    result.interactions = int(matrix.nnz)
+
+    # No connection is held while the similarity product runs.
+    neighbours = await asyncio.to_thread(
+        top_k_neighbours,
+        matrix,
+        settings.related_tracks_k,
+        min_users=settings.related_min_users,
+        block_bytes=settings.related_block_bytes,
+    )
+
+    async with AsyncSessionLocal() as db:
+        result.stored = await store_neighbours(db, track_ids, neighbours)
+        result.radio_pools = await rebuild_pools(db, pool_size=settings.radio_pool_size)
+        await db.commit()
+
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+async def _main() -> None:
+    result = await run_related()
+    logger.info("Related tracks rebuilt: %s", result.to_dict())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(_main())
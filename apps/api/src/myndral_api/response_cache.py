@@ -0,0 +1,170 @@
+"""
+Shared response cache for hot anonymous catalog reads.
+
+``cached_response`` wraps a GET handler whose answer depends only on its
+parameters.  The JSON body is stored in Redis under the route name plus those
+parameters for ``response_cache_ttl_seconds``.  A cached body is served
+without touching Postgres.
+
+Every entry is tagged with the catalog ids it involves: each ``*_id``
+argument of the handler, and each ``id``, ``albumId`` and ``artistId``
+anywhere in the body.  ``listing=True`` entries are lists whose membership
+changes when something is published, and they are also tagged ``lists``.
+``invalidate_on_commit`` purges those tags once the writing transaction
+commits, which keeps a reader from refilling an entry with the old rows in
+between.  Staging actions and the internal catalog edits call
+it with the ids they touch.  The TTL only bounds drift from direct SQL.
+
+The cache is only active with ``REDIS_CACHE_ENABLED``.  A per-worker copy
+could not be purged on every instance, so without Redis handlers always run.
+Redis errors fall back to running the handler (``caching.redis_call``).
+Either way, identical concurrent misses on one instance run the handler once
+(``singleflight``).
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from myndral_api.caching import redis_call
+from myndral_api.config import get_settings
+from myndral_api.singleflight import SingleFlight
+
+_KEY_PREFIX = "myndral:resp"
+_TAG_PREFIX = "myndral:resp-tag"
+_LISTS_TAG = "lists"
+_ID_FIELDS = ("id", "albumId", "artistId")
+_PENDING_TAGS = "response_cache_tags"
+
+# Purges scheduled by the commit hook; held so they are not collected mid-flight.
+_purge_tasks: set[asyncio.Task[None]] = set()
+
+_flights: SingleFlight[str] = SingleFlight("catalog")
+
+Handler = Callable[..., Awaitable[dict[str, Any]]]
+
+
+def _collect_ids(value: Any, found: set[str]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in _ID_FIELDS and isinstance(item, str):
+                found.add(item)
+            else:
+                _collect_ids(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_ids(item, found)
+
+
+def _tag_key(tag: str) -> str:
+    return f"{_TAG_PREFIX}:{tag}"
+
+
+def cached_response(name: str, *, listing: bool = False) -> Callable[[Handler], Handler]:
+    """Cache a handler's JSON body in Redis, keyed by ``name`` and its arguments.
+
+    The ``db`` argument is left out of the key, so handlers called directly
+    (the home screen does) share entries with HTTP requests.  Concurrent
+    callers with the same key share a single handler run.
+    """
+
+    def decorate(handler: Handler) -> Handler:
+        signature = inspect.signature(handler)
+
+        @functools.wraps(handler)
+        async def wrapper(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = {k: v for k, v in bound.arguments.items() if k != "db"}
+            digest = hashlib.sha1(
+                json.dumps(params, sort_keys=True, default=str).encode()
+            ).hexdigest()
+            key = f"{_KEY_PREFIX}:{name}:{digest}"
+
+            if not get_settings().redis_cache_enabled:
+                return await _flights.do(key, lambda: handler(*args, **kwargs))
+
+            cached = await redis_call(lambda redis: redis.get(key))
+            if cached:
+                return json.loads(cached)
+
+            async def load() -> dict[str, Any]:
+                body = jsonable_encoder(await handler(*args, **kwargs))
+                # Path ids too: an album's empty track list names no album.
+                tags = {str(v) for k, v in params.items() if k.endswith("_id") and v is not None}
+                _collect_ids(body, tags)
+                if listing:
+                    tags.add(_LISTS_TAG)
+                await _store(key, json.dumps(body), tags)
+                return body
+
+            return await _flights.do(key, load)
+
+        return wrapper
+
+    return decorate
+
+
+async def _store(key: str, payload: str, tags: set[str]) -> None:
+    ttl = get_settings().response_cache_ttl_seconds
+
+    async def _set(redis):
+        pipe = redis.pipeline(transaction=False)
+        pipe.set(key, payload, ex=ttl)
+        for tag in tags:
+            pipe.sadd(_tag_key(tag), key)
+            # A tag set outlives each entry it lists by at most one TTL.
+            pipe.expire(_tag_key(tag), ttl)
+        await pipe.execute()
+
+    await redis_call(_set)
+
+
+async def purge(ids: Iterable[str], *, lists: bool = True) -> None:
+    """Drop every entry containing one of ``ids``, and every listing entry."""
+    tags = [str(i) for i in ids]
+    if lists:
+        tags.append(_LISTS_TAG)
+    if not tags or not get_settings().redis_cache_enabled:
+        return
+
+    async def _purge(redis):
+        tag_keys = [_tag_key(tag) for tag in tags]
+        pipe = redis.pipeline(transaction=False)
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        members = await pipe.execute()
+        keys = set().union(*members)
+        await redis.delete(*keys, *tag_keys)
+
+    await redis_call(_purge)
+
+
+def invalidate_on_commit(db: AsyncSession, ids: Iterable[str]) -> None:
+    """Purge ``ids`` (and listing entries) once ``db``'s transaction commits."""
+    db.info.setdefault(_PENDING_TAGS, set()).update(str(i) for i in ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _purge_after_commit(session: Session) -> None:
+    ids = session.info.pop(_PENDING_TAGS, None)
+    if ids is None:
+        return
+    task = asyncio.get_running_loop().create_task(purge(ids))
+    _purge_tasks.add(task)
+    task.add_done_callback(_purge_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING_TAGS, None)
@@ -0,0 +1,368 @@
+"""
+Incremental rollup of playback events into the denormalised counters.
+
+``tracks.play_count`` / ``skip_count``, ``albums.total_plays`` and
+``artists.total_plays`` / ``monthly_listeners`` / ``follower_count`` are never
+written on the request path.  This job folds new ``play_events`` and
+``skip_events`` into them in batches:
+
+  1. lock the source's row in ``rollup_state`` and read its high-water mark;
+  2. pick the next ``ROLLUP_BATCH_SIZE`` events by ``seq`` (insertion order,
+     not client time), leaving the last ``ROLLUP_SETTLE_SECONDS`` alone so a
+     slower insert transaction holding a lower ``seq`` is not skipped;
+  3. apply the per-track/album/artist deltas as grouped ``UPDATE … FROM``
+     and add the batch to the trending scores;
+  4. advance the high-water mark in the same transaction.
+
+A crash between batches therefore loses nothing and counts nothing twice, and
+two overlapping runs serialise on the ``rollup_state`` row lock.
+
+``monthly_listeners`` is a rolling distinct count over the last
+``ROLLUP_LISTENER_WINDOW_DAYS`` UTC days, estimated by merging the per-artist
+daily HyperLogLog sketches that the event writer maintains (listeners.py).
+Each run recounts only artists whose sketches changed since the previous run
+or who had a day fall out of the window; expired days are then deleted.  The
+event log is never read for this.  Plays are credited to
+``tracks.primary_artist_id``; anonymous plays count towards plays, not
+listeners.
+
+``follower_count`` is recomputed from ``user_followed_artists`` on every run;
+that table is small next to the event log and follows can be undone, so a
+delta stream would buy nothing.
+
+Each batch also adds its events to the time-decayed trending scores, and the
+run ends by rebuilding the charts from them (trending.py).
+
+Play counts and monthly listeners are also shown on the track-card read
+model, so the same transactions copy them onto ``track_cards``
+(track_cards.py).
+
+Run as a scheduled Cloud Run job (see infra/DEPLOY.md):
+
+    python -m myndral_api.rollups
+    python -m myndral_api.rollups --backfill-listeners   # once, to seed sketches
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from typing import Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api.config import get_settings
+from myndral_api.db.session import AsyncSessionLocal
+from myndral_api.listeners import count_listeners, record_listens
+from myndral_api.track_cards import sync_listener_counts
+from myndral_api.trending import rebase_scores, refresh_charts, score_batch
+
+logger = logging.getLogger(__name__)
+
+RollupSource = Literal["play_events", "skip_events"]
+
+# Stop after this many batches so one run cannot hold the job slot forever
+# after a long outage; the next scheduled run continues from the high-water mark.
+MAX_BATCHES_PER_RUN = 100
+# Artists recounted per query when refreshing monthly_listeners.
+LISTENER_CHUNK_SIZE = 500
+
+
+@dataclass
+class RollupResult:
+    plays: int = 0
+    skips: int = 0
+    batches: int = 0
+    listener_artists: int = 0
+    expired_listener_artists: int = 0
+    follower_artists: int = 0
+    chart_entries: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "plays": self.plays,
+            "skips": self.skips,
+            "batches": self.batches,
+            "listenerArtists": self.listener_artists,
+            "expiredListenerArtists": self.expired_listener_artists,
+            "followerArtists": self.follower_artists,
+            "chartEntries": self.chart_entries,
+        }
+
+
+# ── SQL ───────────────────────────────────────────────────────────────────────
+
+_ENSURE_STATE_SQL = """
+INSERT INTO rollup_state (source) VALUES (:source)
+ON CONFLICT (source) DO NOTHING
+"""
+
+_LOCK_STATE_SQL = """
+SELECT high_water FROM rollup_state WHERE source = :source FOR UPDATE
+"""
+
+_ADVANCE_STATE_SQL = """
+UPDATE rollup_state SET high_water = :high, updated_at = now() WHERE source = :source
+"""
+
+# Table names come from RollupSource, never from input.
+_NEXT_BATCH_SQL = """
+SELECT max(seq) AS high, count(*) AS events
+FROM (
+  SELECT seq FROM {table}
+  WHERE seq > :low
+    AND ingested_at <= now() - make_interval(secs => CAST(:settle_seconds AS integer))
+  ORDER BY seq
+  LIMIT :batch_size
+) AS batch
+"""
+
+_APPLY_PLAYS_SQL = """
+WITH batch AS (
+  SELECT t.id AS track_id, t.album_id, t.primary_artist_id AS artist_id
+  FROM play_events pe
+  JOIN tracks t ON t.id = pe.track_id
+  WHERE pe.seq > :low AND pe.seq <= :high
+),
+track_deltas AS (
+  UPDATE tracks t SET play_count = t.play_count + d.plays
+  FROM (SELECT track_id, count(*) AS plays FROM batch GROUP BY track_id) AS d
+  WHERE t.id = d.track_id
+),
+card_deltas AS (
+  UPDATE track_cards c SET play_count = c.play_count + d.plays
+  FROM (SELECT track_id, count(*) AS plays FROM batch GROUP BY track_id) AS d
+  WHERE c.id = d.track_id
+),
+album_deltas AS (
+  UPDATE albums a SET total_plays = a.total_plays + d.plays
+  FROM (SELECT album_id, count(*) AS plays FROM batch GROUP BY album_id) AS d
+  WHERE a.id = d.album_id
+)
+UPDATE artists ar SET total_plays = ar.total_plays + d.plays
+FROM (SELECT artist_id, count(*) AS plays FROM batch GROUP BY artist_id) AS d
+WHERE ar.id = d.artist_id
+"""
+
+_APPLY_SKIPS_SQL = """
+UPDATE tracks t SET skip_count = t.skip_count + d.skips
+FROM (
+  SELECT track_id, count(*) AS skips FROM skip_events
+  WHERE seq > :low AND seq <= :high
+  GROUP BY track_id
+) AS d
+WHERE t.id = d.track_id
+"""
+
+_SKETCHES_CHANGED_SQL = """
+SELECT DISTINCT artist_id FROM artist_listener_sketches
+WHERE updated_at > to_timestamp(CAST(:since AS bigint))
+"""
+
+_EXPIRE_SKETCHES_SQL = """
+WITH expired AS (
+  DELETE FROM artist_listener_sketches WHERE day < :window_start RETURNING artist_id
+)
+SELECT DISTINCT artist_id FROM expired
+"""
+
+_STORE_LISTENERS_SQL = """
+UPDATE artists ar SET monthly_listeners = l.listeners
+FROM unnest(CAST(:artist_ids AS uuid[]), CAST(:listeners AS bigint[])) AS l(id, listeners)
+WHERE ar.id = l.id AND ar.monthly_listeners <> l.listeners
+"""
+
+# Listener sketch mark: a transaction's updated_at is its start time, so leave
+# the settle delay behind to catch sketch writes still in flight.
+_LISTENER_MARK_SQL = """
+SELECT extract(epoch FROM now())::bigint - CAST(:settle_seconds AS integer)
+"""
+
+_BACKFILL_LISTENS_SQL = """
+SELECT DISTINCT t.primary_artist_id, (pe.played_at AT TIME ZONE 'UTC')::date, pe.user_id
+FROM play_events pe
+JOIN tracks t ON t.id = pe.track_id
+WHERE pe.user_id IS NOT NULL AND pe.played_at >= :window_start
+"""
+
+_REFRESH_FOLLOWERS_SQL = """
+UPDATE artists ar SET follower_count = f.followers
+FROM (
+  SELECT a.id, count(uf.user_id) AS followers
+  FROM artists a
+  LEFT JOIN user_followed_artists uf ON uf.artist_id = a.id
+  GROUP BY a.id
+) AS f
+WHERE ar.id = f.id AND ar.follower_count <> f.followers
+"""
+
+
+# ── Steps ─────────────────────────────────────────────────────────────────────
+
+def listener_window_start(window_days: int, today: date | None = None) -> date:
+    """First UTC day inside a ``window_days``-long window ending today (inclusive)."""
+    today = today or datetime.now(UTC).date()
+    return today - timedelta(days=window_days - 1)
+
+
+async def roll_up_batch(
+    db: AsyncSession,
+    source: RollupSource,
+    *,
+    batch_size: int,
+    settle_seconds: int,
+    half_life_hours: float,
+    result: RollupResult,
+) -> int:
+    """Fold the next batch of ``source`` into the counters; returns events consumed.
+
+    The caller commits.  Returns 0 when nothing new has settled yet.
+    """
+    await db.execute(text(_ENSURE_STATE_SQL), {"source": source})
+    low = int((await db.execute(text(_LOCK_STATE_SQL), {"source": source})).scalar_one())
+    row = (
+        await db.execute(
+            text(_NEXT_BATCH_SQL.format(table=source)),
+            {"low": low, "settle_seconds": settle_seconds, "batch_size": batch_size},
+        )
+    ).mappings().one()
+    events = int(row["events"] or 0)
+    if not events:
+        return 0
+
+    bounds = {"low": low, "high": int(row["high"])}
+    if source == "play_events":
+        await db.execute(text(_APPLY_PLAYS_SQL), bounds)
+        result.plays += events
+    else:
+        await db.execute(text(_APPLY_SKIPS_SQL), bounds)
+        result.skips += events
+    await score_batch(db, source, half_life_hours=half_life_hours, **bounds)
+
+    await db.execute(text(_ADVANCE_STATE_SQL), {"source": source, "high": bounds["high"]})
+    result.batches += 1
+    return events
+
+
+async def refresh_monthly_listeners(
+    db: AsyncSession, *, window_start: date, settle_seconds: int
+) -> tuple[int, int]:
+    """Recount artists whose sketches changed or expired; returns (recounted, expired).
+
+    The caller commits.
+    """
+    source = "listener_sketches"
+    await db.execute(text(_ENSURE_STATE_SQL), {"source": source})
+    since = int((await db.execute(text(_LOCK_STATE_SQL), {"source": source})).scalar_one())
+    mark = int(
+        (
+            await db.execute(text(_LISTENER_MARK_SQL), {"settle_seconds": settle_seconds})
+        ).scalar_one()
+    )
+    changed = (await db.execute(text(_SKETCHES_CHANGED_SQL), {"since": since})).scalars().all()
+    expired = (
+        await db.execute(text(_EXPIRE_SKETCHES_SQL), {"window_start": window_start})
+    ).scalars().all()
+
+    artist_ids = sorted({str(a) for a in changed} | {str(a) for a in expired})
+    for offset in range(0, len(artist_ids), LISTENER_CHUNK_SIZE):
+        chunk = artist_ids[offset : offset + LISTENER_CHUNK_SIZE]
+        counts = await count_listeners(db, chunk, window_start)
+        await db.execute(
+            text(_STORE_LISTENERS_SQL),
+            {"artist_ids": chunk, "listeners": [counts[a] for a in chunk]},
+        )
+        await sync_listener_counts(db, chunk)
+
+    await db.execute(text(_ADVANCE_STATE_SQL), {"source": source, "high": max(mark, since)})
+    return len(artist_ids), len(expired)
+
+
+async def backfill_listener_sketches(db: AsyncSession, *, window_start: date) -> int:
+    """Rebuild the window's sketches from ``play_events``; a one-off full scan.
+
+    Only needed when sketches start out empty (first deploy, or after losing
+    the table).  Safe to re-run: adding a listener twice changes nothing.
+    """
+    listens = 0
+    result = await db.stream(text(_BACKFILL_LISTENS_SQL), {"window_start": window_start})
+    async for rows in result.partitions(10_000):
+        await record_listens(db, rows)
+        listens += len(rows)
+    return listens
+
+
+async def refresh_follower_counts(db: AsyncSession) -> int:
+    result = await db.execute(text(_REFRESH_FOLLOWERS_SQL))
+    return int(result.rowcount or 0)
+
+
+async def run_rollups(max_batches: int = MAX_BATCHES_PER_RUN) -> RollupResult:
+    """One scheduled run: drain both event tables, then the window, follower and chart passes.
+
+    Every batch commits on its own, so a failure part-way keeps the batches
+    already applied.
+    """
+    settings = get_settings()
+    result = RollupResult()
+    options = {
+        "batch_size": settings.rollup_batch_size,
+        "settle_seconds": settings.rollup_settle_seconds,
+        "half_life_hours": settings.chart_half_life_hours,
+    }
+    window_start = listener_window_start(settings.rollup_listener_window_days)
+
+    async with AsyncSessionLocal() as db:
+        if await rebase_scores(db, half_life_hours=settings.chart_half_life_hours):
+            logger.info("Rebased trending scores to today's epoch")
+        await db.commit()
+
+        for source in ("play_events", "skip_events"):
+            for _ in range(max_batches):
+                consumed = await roll_up_batch(db, source, result=result, **options)
+                await db.commit()
+                if consumed < settings.rollup_batch_size:
+                    break
+
+        recounted, expired = await refresh_monthly_listeners(
+            db, window_start=window_start, settle_seconds=settings.rollup_settle_seconds
+        )
+        result.listener_artists = recounted
+        result.expired_listener_artists = expired
+        result.follower_artists = await refresh_follower_counts(db)
+        await db.commit()
+
+        result.chart_entries = await refresh_charts(
+            db, size=settings.chart_size, half_life_hours=settings.chart_half_life_hours
+        )
+        await db.commit()
+
+    return result
+
+
+async def _main(backfill_listeners: bool) -> None:
+    if backfill_listeners:
+        window_days = get_settings().rollup_listener_window_days
+        async with AsyncSessionLocal() as db:
+            listens = await backfill_listener_sketches(
+                db, window_start=listener_window_start(window_days)
+            )
+            await db.commit()
+        logger.info("Backfilled listener sketches from %d listens", listens)
+    result = await run_rollups()
+    logger.info("Rollup finished: %s", result.to_dict())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fold playback events into counters.")
+    parser.add_argument(
+        "--backfill-listeners",
+        action="store_true",
+        help="rebuild the listener sketches for the current window from play_events first",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(_main(args.backfill_listeners))
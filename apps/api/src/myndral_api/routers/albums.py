@@ -4,19 +4,41 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from myndral_api.auth_utils import get_current_user
+from myndral_api import totals
+from myndral_api.auth_utils import get_token_user
 from myndral_api.db.session import get_db
 from myndral_api.media_utils import normalize_audio_url, normalize_image_url
+from myndral_api.pagination import Keyset, SortKey
+from myndral_api.response_cache import cached_response
 
 router = APIRouter()
 
+# Newest releases first, undated albums last; idx_albums_release holds the
+# same order.
+ALBUM_KEYSET = Keyset(
+    SortKey("COALESCE(al.release_date, DATE '0001-01-01')", "release_sort", "date"),
+    SortKey("al.created_at", "created_at", "timestamptz"),
+    SortKey("al.id", "id", "uuid"),
+)
+
+_PUBLISHED_ALBUMS_SQL = """
+SELECT 1
+FROM albums al
+JOIN artists ar ON ar.id = al.artist_id
+WHERE al.status = 'published'
+  AND ar.status = 'published'
+"""
+
 
 @router.get("/", summary="List albums (paginated)")
 async def list_albums(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
+    after_sql, after_params = ALBUM_KEYSET.after(cursor)
     rows = (
         await db.execute(
             text(
@@ -40,42 +62,38 @@ SELECT
     FROM album_genres ag
     JOIN genres g ON g.id = ag.genre_id
     WHERE ag.album_id = al.id
-  ), ARRAY[]::text[]) AS genre_tags
+  ), ARRAY[]::text[]) AS genre_tags,
+  COALESCE(al.release_date, DATE '0001-01-01') AS release_sort,
+  al.created_at
 FROM albums al
 JOIN artists ar ON ar.id = al.artist_id
 WHERE al.status = 'published'
   AND ar.status = 'published'
-ORDER BY al.release_date DESC NULLS LAST, al.created_at DESC
-LIMIT :limit OFFSET :offset
 """
+                + after_sql
+                + ALBUM_KEYSET.order_by()
+                + "LIMIT :limit OFFSET :offset\n"
             ),
-            {"limit": limit, "offset": offset},
+            {"limit": limit + 1, "offset": offset, **after_params},
         )
     ).mappings().all()
-    total = int(
-        (
-            await db.execute(
-                text(
-                    """
-SELECT count(*)
-FROM albums al
-JOIN artists ar ON ar.id = al.artist_id
-WHERE al.status = 'published'
-  AND ar.status = 'published'
-"""
-                )
-            )
-        ).scalar_one()
-    )
+    page, next_cursor = ALBUM_KEYSET.page(rows, limit)
+    total = totals.NO_TOTAL
+    if cursor is None:
+        total = await totals.cached_total(
+            db, "albums", _PUBLISHED_ALBUMS_SQL, exact=exact_total
+        )
     return {
-        "items": [_serialize_album(row) for row in rows],
-        "total": total,
+        "items": [_serialize_album(row) for row in page],
+        **total.fields(),
         "limit": limit,
         "offset": offset,
+        "nextCursor": next_cursor,
     }
 
 
 @router.get("/new-releases", summary="Get new releases")
+@cached_response("albums.new_releases", listing=True)
 async def get_new_releases(
     limit: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
@@ -108,9 +126,9 @@ FROM albums al
 JOIN artists ar ON ar.id = al.artist_id
 WHERE al.status = 'published'
   AND ar.status = 'published'
-ORDER BY al.release_date DESC NULLS LAST, al.created_at DESC
-LIMIT :limit
 """
+                + ALBUM_KEYSET.order_by()
+                + "LIMIT :limit\n"
             ),
             {"limit": limit},
         )
@@ -120,6 +138,7 @@ LIMIT :limit
 
 
 @router.get("/{album_id}", summary="Get album by ID")
+@cached_response("albums.get")
 async def get_album(album_id: str, db: AsyncSession = Depends(get_db)) -> dict[str, Any]:
     row = (
         await db.execute(
@@ -162,6 +181,7 @@ LIMIT 1
 
 
 @router.get("/{album_id}/tracks", summary="Get album tracks")
+@cached_response("albums.tracks")
 async def get_album_tracks(
     album_id: str,
     db: AsyncSession = Depends(get_db),
@@ -183,29 +203,15 @@ SELECT
   t.duration_ms,
   t.play_count,
   t.explicit,
-  pa.name AS artist_name,
-  pa.slug AS artist_slug,
-  pa.bio AS artist_bio,
-  pa.image_url AS artist_image_url,
-  pa.monthly_listeners AS artist_monthly_listeners,
-  pa.style_tags AS artist_style_tags,
-  COALESCE((
-    SELECT taf.storage_url
-    FROM track_audio_files taf
-    WHERE taf.track_id = t.id
-    ORDER BY CASE taf.quality
-      WHEN 'high_320' THEN 1
-      WHEN 'lossless' THEN 2
-      WHEN 'standard_256' THEN 3
-      WHEN 'low_128' THEN 4
-      ELSE 5
-    END
-    LIMIT 1
-  ), NULL) AS audio_url
-FROM tracks t
-JOIN artists pa ON pa.id = t.primary_artist_id
+  t.artist_name,
+  t.artist_slug,
+  t.artist_bio,
+  t.artist_image_url,
+  t.artist_monthly_listeners,
+  t.artist_style_tags,
+  t.audio_url
+FROM track_cards t
 WHERE t.album_id = :album_id
-  AND t.status = 'published'
 ORDER BY t.disc_number ASC, t.track_number ASC, t.created_at ASC
 """
             ),
@@ -224,7 +230,7 @@ ORDER BY t.disc_number ASC, t.track_number ASC, t.created_at ASC
 @router.put("/{album_id}/save", summary="Save album to library")
 async def save_album(
     album_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     album = await _fetch_album(db, album_id)
@@ -247,7 +253,7 @@ ON CONFLICT (user_id, album_id) DO NOTHING
 @router.delete("/{album_id}/save", summary="Remove album from library")
 async def unsave_album(
     album_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await db.execute(
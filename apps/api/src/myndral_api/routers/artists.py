@@ -4,20 +4,33 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from myndral_api.auth_utils import get_current_user
+from myndral_api import totals
+from myndral_api.auth_utils import get_token_user
 from myndral_api.db.session import get_db
 from myndral_api.media_utils import normalize_audio_url, normalize_image_url
+from myndral_api.pagination import Keyset, SortKey
+from myndral_api.response_cache import cached_response
 
 router = APIRouter()
 
+# Most listened first, then by name; idx_artists_listeners holds the same order.
+ARTIST_KEYSET = Keyset(
+    SortKey("a.monthly_listeners", "monthly_listeners", "bigint"),
+    SortKey("a.name", "name", "text", descending=False),
+    SortKey("a.id", "id", "uuid", descending=False),
+)
+
 
 @router.get("/", summary="List artists (paginated)")
 async def list_artists(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     session = db
+    after_sql, after_params = ARTIST_KEYSET.after(cursor)
     rows = (
         await session.execute(
             text(
@@ -32,29 +45,34 @@ SELECT
   a.style_tags
 FROM artists a
 WHERE a.status = 'published'
-ORDER BY a.monthly_listeners DESC, a.name ASC
-LIMIT :limit OFFSET :offset
 """
+                + after_sql
+                + ARTIST_KEYSET.order_by()
+                + "LIMIT :limit OFFSET :offset\n"
             ),
-            {"limit": limit, "offset": offset},
+            {"limit": limit + 1, "offset": offset, **after_params},
         )
     ).mappings().all()
-    total = int(
-        (
-            await session.execute(
-                text("SELECT count(*) FROM artists WHERE status = 'published'"),
-            )
-        ).scalar_one()
-    )
+    page, next_cursor = ARTIST_KEYSET.page(rows, limit)
+    total = totals.NO_TOTAL
+    if cursor is None:
+        total = await totals.cached_total(
+            session,
+            "artists",
+            "SELECT 1 FROM artists WHERE status = 'published'",
+            exact=exact_total,
+        )
     return {
-        "items": [_serialize_artist(row) for row in rows],
-        "total": total,
+        "items": [_serialize_artist(row) for row in page],
+        **total.fields(),
         "limit": limit,
         "offset": offset,
+        "nextCursor": next_cursor,
     }
 
 
 @router.get("/{artist_id}", summary="Get artist by ID")
+@cached_response("artists.get")
 async def get_artist(artist_id: str, db: AsyncSession = Depends(get_db)) -> dict[str, Any]:
     session = db
     row = (
@@ -88,6 +106,7 @@ async def get_artist_albums(
     artist_id: str,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    exact_total: bool = Query(False, alias="exactTotal"),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     session = db
@@ -123,30 +142,27 @@ LIMIT :limit OFFSET :offset
             {"artist_id": artist_id, "limit": limit, "offset": offset},
         )
     ).mappings().all()
-    total = int(
-        (
-            await session.execute(
-                text(
-                    """
-SELECT count(*)
+    total = await totals.capped_total(
+        session,
+        """
+SELECT 1
 FROM albums
 WHERE artist_id = :artist_id
   AND status = 'published'
-"""
-                ),
-                {"artist_id": artist_id},
-            )
-        ).scalar_one()
+""",
+        {"artist_id": artist_id},
+        exact=exact_total,
     )
     return {
         "items": [_serialize_album(row, artist) for row in rows],
-        "total": total,
+        **total.fields(),
         "limit": limit,
         "offset": offset,
     }
 
 
 @router.get("/{artist_id}/top-tracks", summary="Get artist's top tracks")
+@cached_response("artists.top_tracks")
 async def get_artist_top_tracks(
     artist_id: str,
     limit: int = Query(10, ge=1, le=50),
@@ -170,35 +186,15 @@ SELECT
   t.duration_ms,
   t.play_count,
   t.explicit,
-  al.title AS album_title,
-  al.cover_url AS album_cover_url,
-  COALESCE(al.release_date::text, CURRENT_DATE::text) AS album_release_date,
-  al.album_type::text AS album_type,
-  al.track_count AS album_track_count,
-  COALESCE((
-    SELECT array_agg(g.name ORDER BY g.name)
-    FROM album_genres ag
-    JOIN genres g ON g.id = ag.genre_id
-    WHERE ag.album_id = al.id
-  ), ARRAY[]::text[]) AS album_genre_tags,
-  COALESCE((
-    SELECT taf.storage_url
-    FROM track_audio_files taf
-    WHERE taf.track_id = t.id
-    ORDER BY CASE taf.quality
-      WHEN 'high_320' THEN 1
-      WHEN 'lossless' THEN 2
-      WHEN 'standard_256' THEN 3
-      WHEN 'low_128' THEN 4
-      ELSE 5
-    END
-    LIMIT 1
-  ), NULL) AS audio_url
-FROM tracks t
-JOIN albums al ON al.id = t.album_id
+  t.album_title,
+  t.album_cover_url,
+  COALESCE(t.album_release_date::text, CURRENT_DATE::text) AS album_release_date,
+  t.album_type,
+  t.album_track_count,
+  t.album_genre_tags,
+  t.audio_url
+FROM track_cards t
 WHERE t.primary_artist_id = :artist_id
-  AND t.status = 'published'
-  AND al.status = 'published'
 ORDER BY t.play_count DESC, t.created_at DESC
 LIMIT :limit
 """
@@ -218,7 +214,7 @@ LIMIT :limit
 @router.put("/{artist_id}/follow", summary="Follow an artist")
 async def follow_artist(
     artist_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     artist = await _fetch_artist(db, artist_id)
@@ -241,7 +237,7 @@ ON CONFLICT (user_id, artist_id) DO NOTHING
 @router.delete("/{artist_id}/follow", summary="Unfollow an artist")
 async def unfollow_artist(
     artist_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await db.execute(
@@ -1,19 +1,30 @@
+import ipaddress
 import json
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, EmailStr, Field
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from myndral_api.auth_utils import (
     create_access_token,
+    fetch_user_by_id,
     fetch_user_for_login,
     hash_password,
+    invalidate_user_context,
     to_public_user,
     verify_password,
 )
 from myndral_api.config import get_settings
 from myndral_api.db.session import get_db
+from myndral_api.sessions import (
+    open_session,
+    revoke_access_tokens,
+    revoke_session,
+    revoke_user_sessions,
+    rotate_session,
+)
 
 # Roles that grant access to the internal studio.
 _STUDIO_ROLES = {"content_editor", "content_reviewer", "admin"}
@@ -35,7 +46,9 @@ class LoginRequest(BaseModel):
 
 
 @router.post("/register", summary="Register a new user account", status_code=status.HTTP_201_CREATED)
-async def register(payload: RegisterRequest, db: AsyncSession = Depends(get_db)) -> dict:
+async def register(
+    payload: RegisterRequest, request: Request, db: AsyncSession = Depends(get_db)
+) -> dict:
     # Enforce uniqueness up-front with a clear 409 rather than letting the DB
     # constraint bubble up as an opaque 500.
     conflict = await db.execute(
@@ -85,17 +98,14 @@ async def register(payload: RegisterRequest, db: AsyncSession = Depends(get_db))
     # New accounts always start on the free plan (no subscription row yet).
     user_data = {**row, "subscription_plan": "free"}
 
-    access_token, expires_in = create_access_token(row["id"])
-    return {
-        "accessToken": access_token,
-        "tokenType": "bearer",
-        "expiresIn": expires_in,
-        "user": to_public_user(user_data),
-    }
+    tokens = await _issue_tokens(db, request, user_data)
+    return {**tokens, "user": to_public_user(user_data)}
 
 
 @router.post("/login", summary="Login and obtain JWT tokens")
-async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)) -> dict:
+async def login(
+    payload: LoginRequest, request: Request, db: AsyncSession = Depends(get_db)
+) -> dict:
     identity = payload.username.strip()
     invalid_credentials = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -111,13 +121,8 @@ async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)) -> di
     if not verify_password(payload.password, user["hashed_password"]):
         raise invalid_credentials
 
-    access_token, expires_in = create_access_token(user["id"])
-    return {
-        "accessToken": access_token,
-        "tokenType": "bearer",
-        "expiresIn": expires_in,
-        "user": to_public_user(user),
-    }
+    tokens = await _issue_tokens(db, request, user)
+    return {**tokens, "user": to_public_user(user)}
 
 
 def _resolve_studio_token(access_token: str) -> str:
@@ -158,7 +163,9 @@ class StudioClaimRequest(BaseModel):
     summary="Register a new account with a studio access token",
     status_code=status.HTTP_201_CREATED,
 )
-async def studio_register(payload: StudioRegisterRequest, db: AsyncSession = Depends(get_db)) -> dict:
+async def studio_register(
+    payload: StudioRegisterRequest, request: Request, db: AsyncSession = Depends(get_db)
+) -> dict:
     # Validate the token first — fail fast before touching the DB.
     role = _resolve_studio_token(payload.studio_access_token)
 
@@ -208,20 +215,17 @@ async def studio_register(payload: StudioRegisterRequest, db: AsyncSession = Dep
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="User creation failed.")
 
     user_data = {**row, "subscription_plan": "free"}
-    access_token, expires_in = create_access_token(row["id"])
-    return {
-        "accessToken": access_token,
-        "tokenType": "bearer",
-        "expiresIn": expires_in,
-        "user": to_public_user(user_data),
-    }
+    tokens = await _issue_tokens(db, request, user_data)
+    return {**tokens, "user": to_public_user(user_data)}
 
 
 @router.post(
     "/studio-claim",
     summary="Upgrade an existing user's role using a studio access token",
 )
-async def studio_claim(payload: StudioClaimRequest, db: AsyncSession = Depends(get_db)) -> dict:
+async def studio_claim(
+    payload: StudioClaimRequest, request: Request, db: AsyncSession = Depends(get_db)
+) -> dict:
     # Validate the token first.
     new_role = _resolve_studio_token(payload.studio_access_token)
 
@@ -244,33 +248,89 @@ async def studio_claim(payload: StudioClaimRequest, db: AsyncSession = Depends(g
         {"role": new_role, "uid": user["id"]},
     )
     await db.commit()
+    await invalidate_user_context(user["id"])
+    # Tokens issued before the claim carry the old role.
+    await revoke_access_tokens(user_id=user["id"])
 
     # Re-fetch so the returned user object reflects the updated role.
-    from myndral_api.auth_utils import fetch_user_by_id
     updated = await fetch_user_by_id(db, user["id"])
     if updated is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Role update failed.")
 
-    access_token, expires_in = create_access_token(updated["id"])
+    tokens = await _issue_tokens(db, request, updated)
+    return {**tokens, "user": to_public_user(updated)}
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(min_length=1, max_length=255)
+
+
+@router.post("/refresh", summary="Rotate a refresh token and obtain a new access token")
+async def refresh(payload: RefreshTokenRequest, db: AsyncSession = Depends(get_db)) -> dict:
+    invalid_token = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token.",
+    )
+    rotated = await rotate_session(db, payload.refresh_token)
+    if rotated is None:
+        raise invalid_token
+    session_id, user_id, refresh_token = rotated
+
+    # Claims are re-read on every refresh, so role and plan changes reach the
+    # next access token.
+    user = await fetch_user_by_id(db, user_id)
+    if user is None or not user["is_active"]:
+        await revoke_user_sessions(db, user_id)
+        await db.commit()
+        raise invalid_token
+    await db.commit()
+
+    return {**_token_fields(user, session_id, refresh_token), "user": to_public_user(user)}
+
+
+@router.post("/logout", summary="Revoke a refresh token and its session's access tokens")
+async def logout(payload: RefreshTokenRequest, db: AsyncSession = Depends(get_db)) -> dict:
+    # Idempotent: an unknown or already revoked token is not an error.
+    session_id = await revoke_session(db, payload.refresh_token)
+    await db.commit()
+    if session_id is not None:
+        await revoke_access_tokens(session_id=session_id)
+    return {"loggedOut": True}
+
+
+# ── Token issuance ────────────────────────────────────────────────────────────
+
+def _client_ip(request: Request) -> str | None:
+    host = request.client.host if request.client else None
+    try:
+        return str(ipaddress.ip_address(host)) if host else None
+    except ValueError:
+        return None
+
+
+def _token_fields(user: Any, session_id: str, refresh_token: str) -> dict[str, Any]:
+    access_token, expires_in = create_access_token(
+        user["id"],
+        role=user["role"],
+        subscription_plan=user["subscription_plan"],
+        session_id=session_id,
+    )
     return {
         "accessToken": access_token,
         "tokenType": "bearer",
         "expiresIn": expires_in,
-        "user": to_public_user(updated),
+        "refreshToken": refresh_token,
     }
 
 
-@router.post("/refresh", summary="Refresh access token")
-async def refresh() -> dict:
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Refresh endpoint is not implemented yet.",
-    )
-
-
-@router.post("/logout", summary="Invalidate refresh token")
-async def logout() -> dict:
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Logout endpoint is not implemented yet.",
+async def _issue_tokens(db: AsyncSession, request: Request, user: Any) -> dict[str, Any]:
+    """Open a refresh-token session for ``user`` and sign its first access token."""
+    session_id, refresh_token = await open_session(
+        db,
+        user["id"],
+        ip_address=_client_ip(request),
+        user_agent=request.headers.get("user-agent"),
     )
+    # Committed before the response, so the refresh token works immediately.
+    await db.commit()
+    return _token_fields(user, session_id, refresh_token)
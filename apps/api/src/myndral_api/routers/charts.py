@@ -0,0 +1,165 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api import trending
+from myndral_api.db.session import get_db
+from myndral_api.routers import albums as albums_router
+from myndral_api.routers import artists as artists_router
+from myndral_api.routers import tracks as tracks_router
+from myndral_api.routers import users as users_router
+
+router = APIRouter()
+
+# Charts are rebuilt by the rollup job (trending.py); these endpoints only read
+# one precomputed chart by rank.  Entries whose track, album or artist has been
+# unpublished since the last rebuild are dropped from the page.
+
+
+async def _resolve_genre(db: AsyncSession, genre: str | None) -> dict[str, Any] | None:
+    if genre is None:
+        return None
+    row = (
+        await db.execute(
+            text("SELECT id::text AS id, name, slug FROM genres WHERE slug = :slug"),
+            {"slug": genre},
+        )
+    ).mappings().first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Genre not found")
+    return dict(row)
+
+
+async def _read_chart(
+    db: AsyncSession,
+    entity_type: trending.EntityType,
+    genre: str | None,
+    limit: int,
+    offset: int,
+) -> tuple[dict[str, Any] | None, list[trending.ChartEntry], int]:
+    resolved = await _resolve_genre(db, genre)
+    chart_key = resolved["id"] if resolved else trending.GLOBAL_CHART
+    entries = await trending.read_chart(db, entity_type, chart_key, limit=limit, offset=offset)
+    total = await trending.chart_length(db, entity_type, chart_key)
+    return resolved, entries, total
+
+
+def _chart_page(
+    chart_type: str,
+    field: str,
+    genre: dict[str, Any] | None,
+    entries: list[trending.ChartEntry],
+    items_by_id: dict[str, dict[str, Any]],
+    total: int,
+    limit: int,
+    offset: int,
+) -> dict[str, Any]:
+    return {
+        "type": chart_type,
+        "genre": genre,
+        "generatedAt": entries[0].generated_at.isoformat() if entries else None,
+        "items": [
+            {
+                "rank": entry.rank,
+                "score": round(entry.score, 3),
+                field: items_by_id[entry.entity_id],
+            }
+            for entry in entries
+            if entry.entity_id in items_by_id
+        ],
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+    }
+
+
+@router.get("/", summary="List available charts")
+async def list_charts(db: AsyncSession = Depends(get_db)) -> dict[str, Any]:
+    rows = (
+        await db.execute(
+            text(
+                """
+SELECT
+  ce.entity_type,
+  g.id::text AS genre_id,
+  g.name AS genre_name,
+  g.slug AS genre_slug,
+  count(*) AS size,
+  max(ce.generated_at) AS generated_at
+FROM chart_entries ce
+LEFT JOIN genres g ON ce.chart_key = g.id::text
+GROUP BY ce.entity_type, g.id, g.name, g.slug, g.sort_order
+ORDER BY array_position(ARRAY['track', 'album', 'artist'], ce.entity_type),
+  g.id IS NOT NULL, g.sort_order, g.name
+"""
+            )
+        )
+    ).mappings().all()
+    items = [
+        {
+            "type": f"{row['entity_type']}s",
+            "genre": (
+                {"id": row["genre_id"], "name": row["genre_name"], "slug": row["genre_slug"]}
+                if row["genre_id"]
+                else None
+            ),
+            "size": int(row["size"]),
+            "generatedAt": row["generated_at"].isoformat(),
+        }
+        for row in rows
+    ]
+    return {"items": items, "total": len(items)}
+
+
+@router.get("/tracks", summary="Trending tracks")
+async def track_chart(
+    genre: str | None = Query(None, description="Genre slug; omit for the global chart"),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    resolved, entries, total = await _read_chart(db, "track", genre, limit, offset)
+    tracks = await tracks_router._fetch_tracks_by_ids(db, [e.entity_id for e in entries])
+    return _chart_page("tracks", "track", resolved, entries, tracks, total, limit, offset)
+
+
+@router.get("/albums", summary="Trending albums")
+async def album_chart(
+    genre: str | None = Query(None, description="Genre slug; omit for the global chart"),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    resolved, entries, total = await _read_chart(db, "album", genre, limit, offset)
+    albums: dict[str, dict[str, Any]] = {}
+    if entries:
+        rows = (
+            await db.execute(
+                text(users_router.ALBUM_SELECT_BASE + "  AND al.id = ANY(CAST(:ids AS uuid[]))\n"),
+                {"ids": [e.entity_id for e in entries]},
+            )
+        ).mappings().all()
+        albums = {row["id"]: albums_router._serialize_album(row) for row in rows}
+    return _chart_page("albums", "album", resolved, entries, albums, total, limit, offset)
+
+
+@router.get("/artists", summary="Trending artists")
+async def artist_chart(
+    genre: str | None = Query(None, description="Genre slug; omit for the global chart"),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    resolved, entries, total = await _read_chart(db, "artist", genre, limit, offset)
+    artists: dict[str, dict[str, Any]] = {}
+    if entries:
+        rows = (
+            await db.execute(
+                text(users_router.ARTIST_SELECT_BASE + "  AND a.id = ANY(CAST(:ids AS uuid[]))\n"),
+                {"ids": [e.entity_id for e in entries]},
+            )
+        ).mappings().all()
+        artists = {row["id"]: artists_router._serialize_artist(row) for row in rows}
+    return _chart_page("artists", "artist", resolved, entries, artists, total, limit, offset)
@@ -9,6 +9,7 @@ from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from myndral_api import totals
 from myndral_api.auth_utils import get_current_user
 from myndral_api.db.session import get_db
 from myndral_api.media_utils import DATA_DIR, resolve_local_storage_path
@@ -326,6 +327,7 @@ LIMIT 1
 async def list_export_licenses(
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    exact_total: bool = Query(default=False, alias="exactTotal"),
     current_user: dict = Depends(_require_auth),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
@@ -353,14 +355,14 @@ LIMIT :limit OFFSET :offset
         ),
         {"user_id": current_user["id"], "limit": limit, "offset": offset},
     )
-    count_row = await db.execute(
-        text(
-            """
-SELECT count(*) FROM export_licenses
+    total = await totals.capped_total(
+        db,
+        """
+SELECT 1 FROM export_licenses
 WHERE user_id = CAST(:user_id AS uuid) AND payment_status = 'completed'
-"""
-        ),
+""",
         {"user_id": current_user["id"]},
+        exact=exact_total,
     )
     items = rows.mappings().all()
     return {
@@ -368,7 +370,7 @@ WHERE user_id = CAST(:user_id AS uuid) AND payment_status = 'completed'
             {**_serialize_license(r), "subjectTitle": r["subject_title"]}
             for r in items
         ],
-        "total": int(count_row.scalar_one()),
+        **total.fields(),
         "limit": limit,
         "offset": offset,
     }
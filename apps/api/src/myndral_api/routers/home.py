@@ -0,0 +1,226 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api import home, trending
+from myndral_api.auth_utils import get_optional_user_id
+from myndral_api.config import get_settings
+from myndral_api.routers import albums as albums_router
+from myndral_api.routers import artists as artists_router
+from myndral_api.routers import tracks as tracks_router
+from myndral_api.routers import users as users_router
+from myndral_api.routers.playlists import _serialize_playlist
+
+router = APIRouter()
+
+# One request for the whole home screen instead of one per shelf.  Each loader
+# below gets its own session from home.assemble and runs concurrently with the
+# others; none of them counts totals, since a shelf is never paginated.
+
+# Ids are read newest first from the relation's (user_id, timestamp) index and
+# only then hydrated; a few extra are read so that unpublished entities
+# dropped by the hydration do not leave the shelf short.
+_RECENT_IDS_SQL = """
+SELECT {id_column}::text
+FROM {table_name}
+WHERE user_id = :user_id
+ORDER BY {timestamp_column} DESC
+LIMIT :limit
+"""
+
+_RECENTLY_PLAYED_SQL = """
+SELECT track_id::text
+FROM play_events
+WHERE user_id = :user_id AND played_at >= now() - interval '30 days'
+ORDER BY played_at DESC
+LIMIT :limit
+"""
+
+_PLAYLISTS_SQL = """
+SELECT
+  p.id::text AS id,
+  p.name,
+  p.description,
+  p.cover_url,
+  p.owner_id::text AS owner_id,
+  p.is_public,
+  p.is_ai_curated,
+  p.track_count,
+  p.follower_count,
+  p.total_duration_ms,
+  p.created_at,
+  p.updated_at,
+  owner.display_name AS owner_display_name,
+  p.owner_id = :user_id AS can_edit,
+  true AS is_in_library
+FROM playlists p
+JOIN users owner ON owner.id = p.owner_id
+WHERE p.owner_id = :user_id
+   OR EXISTS (
+     SELECT 1
+     FROM user_followed_playlists ufp
+     WHERE ufp.playlist_id = p.id
+       AND ufp.user_id = :user_id
+   )
+ORDER BY p.updated_at DESC
+LIMIT :limit
+"""
+
+_OVERFETCH = 2
+
+
+def _shelf_size() -> int:
+    return get_settings().home_shelf_size
+
+
+def _in_order(ids: list[str], by_id: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+    seen: set[str] = set()
+    items: list[dict[str, Any]] = []
+    for entity_id in ids:
+        if entity_id in by_id and entity_id not in seen:
+            seen.add(entity_id)
+            items.append(by_id[entity_id])
+    return items[: _shelf_size()]
+
+
+async def _recent_ids(
+    db: AsyncSession, *, table_name: str, id_column: str, timestamp_column: str, user_id: str
+) -> list[str]:
+    sql = _RECENT_IDS_SQL.format(
+        id_column=id_column, table_name=table_name, timestamp_column=timestamp_column
+    )
+    result = await db.execute(
+        text(sql), {"user_id": user_id, "limit": _shelf_size() * _OVERFETCH}
+    )
+    return list(result.scalars().all())
+
+
+async def _albums_by_ids(db: AsyncSession, ids: list[str]) -> dict[str, dict[str, Any]]:
+    if not ids:
+        return {}
+    rows = (
+        await db.execute(
+            text(users_router.ALBUM_SELECT_BASE + "  AND al.id = ANY(CAST(:ids AS uuid[]))\n"),
+            {"ids": ids},
+        )
+    ).mappings().all()
+    return {row["id"]: albums_router._serialize_album(row) for row in rows}
+
+
+async def _artists_by_ids(db: AsyncSession, ids: list[str]) -> dict[str, dict[str, Any]]:
+    if not ids:
+        return {}
+    rows = (
+        await db.execute(
+            text(users_router.ARTIST_SELECT_BASE + "  AND a.id = ANY(CAST(:ids AS uuid[]))\n"),
+            {"ids": ids},
+        )
+    ).mappings().all()
+    return {row["id"]: artists_router._serialize_artist(row) for row in rows}
+
+
+# ── Shared shelves ────────────────────────────────────────────────────────────
+
+async def _trending_tracks(db: AsyncSession) -> list[dict[str, Any]]:
+    return (await tracks_router.featured_tracks(limit=_shelf_size(), db=db))["items"]
+
+
+async def _new_releases(db: AsyncSession) -> list[dict[str, Any]]:
+    return (await albums_router.get_new_releases(limit=_shelf_size(), db=db))["items"]
+
+
+async def _trending_albums(db: AsyncSession) -> list[dict[str, Any]]:
+    entries = await trending.read_chart(db, "album", limit=_shelf_size())
+    ids = [entry.entity_id for entry in entries]
+    return _in_order(ids, await _albums_by_ids(db, ids))
+
+
+async def _popular_artists(db: AsyncSession) -> list[dict[str, Any]]:
+    rows = (
+        await db.execute(
+            text(
+                users_router.ARTIST_SELECT_BASE
+                + "ORDER BY a.monthly_listeners DESC, a.name ASC\nLIMIT :limit\n"
+            ),
+            {"limit": _shelf_size()},
+        )
+    ).mappings().all()
+    return [artists_router._serialize_artist(row) for row in rows]
+
+
+SHARED_SHELVES = (
+    home.Shelf("trendingTracks", "Trending now", "tracks", _trending_tracks, shared=True),
+    home.Shelf("newReleases", "New releases", "albums", _new_releases, shared=True),
+    home.Shelf("trendingAlbums", "Popular albums", "albums", _trending_albums, shared=True),
+    home.Shelf("popularArtists", "Popular artists", "artists", _popular_artists, shared=True),
+)
+
+
+# ── Per-user shelves ──────────────────────────────────────────────────────────
+
+def _user_shelves(user_id: str) -> tuple[home.Shelf, ...]:
+    async def recently_played(db: AsyncSession) -> list[dict[str, Any]]:
+        # Plays repeat; read more of them so the distinct tracks fill the shelf.
+        result = await db.execute(
+            text(_RECENTLY_PLAYED_SQL), {"user_id": user_id, "limit": _shelf_size() * 10}
+        )
+        ids = list(dict.fromkeys(result.scalars().all()))
+        return _in_order(ids, await tracks_router._fetch_tracks_by_ids(db, ids))
+
+    async def liked_tracks(db: AsyncSession) -> list[dict[str, Any]]:
+        ids = await _recent_ids(
+            db,
+            table_name="user_liked_tracks",
+            id_column="track_id",
+            timestamp_column="liked_at",
+            user_id=user_id,
+        )
+        return _in_order(ids, await tracks_router._fetch_tracks_by_ids(db, ids))
+
+    async def saved_albums(db: AsyncSession) -> list[dict[str, Any]]:
+        ids = await _recent_ids(
+            db,
+            table_name="user_saved_albums",
+            id_column="album_id",
+            timestamp_column="saved_at",
+            user_id=user_id,
+        )
+        return _in_order(ids, await _albums_by_ids(db, ids))
+
+    async def followed_artists(db: AsyncSession) -> list[dict[str, Any]]:
+        ids = await _recent_ids(
+            db,
+            table_name="user_followed_artists",
+            id_column="artist_id",
+            timestamp_column="followed_at",
+            user_id=user_id,
+        )
+        return _in_order(ids, await _artists_by_ids(db, ids))
+
+    async def playlists(db: AsyncSession) -> list[dict[str, Any]]:
+        # Shelf cards show counts and covers only; track lists are not loaded.
+        rows = (
+            await db.execute(text(_PLAYLISTS_SQL), {"user_id": user_id, "limit": _shelf_size()})
+        ).mappings().all()
+        return [_serialize_playlist(row, []) for row in rows]
+
+    return (
+        home.Shelf("recentlyPlayed", "Jump back in", "tracks", recently_played),
+        home.Shelf("likedTracks", "Your liked tracks", "tracks", liked_tracks),
+        home.Shelf("savedAlbums", "Your albums", "albums", saved_albums),
+        home.Shelf("followedArtists", "Artists you follow", "artists", followed_artists),
+        home.Shelf("playlists", "Your playlists", "playlists", playlists),
+    )
+
+
+@router.get("/", summary="Home screen shelves")
+async def get_home(user_id: str | None = Depends(get_optional_user_id)) -> dict[str, Any]:
+    # Anonymous visitors get the catalog shelves only.
+    shelves = SHARED_SHELVES if user_id is None else _user_shelves(user_id) + SHARED_SHELVES
+    return {
+        "shelves": await home.assemble(
+            shelves, timeout=get_settings().home_shelf_timeout_seconds
+        ),
+    }
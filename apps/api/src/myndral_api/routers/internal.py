@@ -4,12 +4,13 @@ from datetime import UTC, date, datetime
 from typing import Any, Literal
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
-from fastapi.responses import FileResponse, Response
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import text
 from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from myndral_api.audio_cache import iter_audio_bytes
 from myndral_api.auth_utils import (
     create_access_token,
     fetch_user_for_login,
@@ -19,8 +20,10 @@ from myndral_api.auth_utils import (
 )
 from myndral_api.config import get_settings
 from myndral_api.db.session import get_db
+from myndral_api.gcs_utils import object_metadata_cache
 from myndral_api.media_utils import (
     DATA_DIR,
+    content_addressed_image_name,
     guess_audio_format,
     guess_media_type,
     infer_local_audio_metadata,
@@ -39,6 +42,9 @@ from myndral_api.music_generation import (
     build_song_prompt,
     generate_song_file,
 )
+from myndral_api.playback import invalidate_playable_tracks
+from myndral_api.response_cache import invalidate_on_commit
+from myndral_api.track_cards import refresh_track_cards
 
 router = APIRouter()
 
@@ -939,7 +945,14 @@ async def _upsert_audio_files(
     audio_files: list[TrackAudioInput],
     *,
     replace: bool,
-) -> None:
+) -> list[str]:
+    """Write ``audio_files``; return the storage URLs whose cached state is now stale."""
+    previous_urls = (
+        await db.execute(
+            text("SELECT storage_url FROM track_audio_files WHERE track_id = :track_id"),
+            {"track_id": track_id},
+        )
+    ).scalars().all()
     if replace:
         await db.execute(
             text("DELETE FROM track_audio_files WHERE track_id = :track_id"),
@@ -982,6 +995,19 @@ SET format = EXCLUDED.format,
                 "checksum_sha256": audio.checksum_sha256,
             },
         )
+    return [*previous_urls, *(audio.storage_url for audio in audio_files)]
+
+
+async def _invalidate_track_audio(track_id: str, storage_urls: list[str]) -> None:
+    """Drop cached stream state for a track whose audio files changed.
+
+    Call after the commit: invalidating earlier lets a concurrent stream
+    request re-cache the old rows before the new ones are visible.  Cached
+    object metadata goes for both the replaced and the new objects, so the
+    next stream request re-reads sizes instead of serving stale ranges.
+    """
+    object_metadata_cache.invalidate(*storage_urls)
+    await invalidate_playable_tracks([track_id])
 
 
 async def _recompute_album_track_count(db: AsyncSession, album_id: str) -> None:
@@ -999,6 +1025,9 @@ WHERE id = :album_id
         ),
         {"album_id": album_id},
     )
+    # Every card on the album shows the count; this also picks up the edited track.
+    await refresh_track_cards(db, album_ids=[album_id])
+    invalidate_on_commit(db, [album_id])
 
 
 @router.post("/auth/login", summary="Internal employee login")
@@ -1318,6 +1347,8 @@ WHERE id = CAST(:album_id AS uuid)
             ),
             {"album_id": payload.album_id},
         )
+        await refresh_track_cards(db, album_ids=[payload.album_id])
+        invalidate_on_commit(db, [payload.album_id])
 
         # Optionally store generated lyrics on the track
         if generated.lyrics:
@@ -1371,6 +1402,7 @@ WHERE id = CAST(:job_id AS uuid)
         except Exception:
             pass
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=detail) from db_exc
+    await _invalidate_track_audio(track_id, [generated.storage_url])
 
     result = await db.execute(
         text(
@@ -1468,10 +1500,10 @@ async def read_generated_music_file(
 
     # ── GCS (production) ─────────────────────────────────────────────────────
     if normalized.startswith("gs://"):
-        from myndral_api.gcs_utils import download_gcs_bytes
+        from myndral_api.gcs_utils import get_gcs_object_metadata
 
         try:
-            data, _ = download_gcs_bytes(normalized)
+            total_size = (await get_gcs_object_metadata(normalized)).size
         except Exception as exc:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
@@ -1482,7 +1514,13 @@ async def read_generated_music_file(
         from pathlib import Path as _Path
         fallback_format = guess_audio_format(object_name)
         media_type = guess_media_type(_Path(object_name), fallback_format)
-        return Response(content=data, media_type=media_type)
+        # Generated object names are unique per upload, so the storage URL alone
+        # is a safe block-cache key here.
+        return StreamingResponse(
+            iter_audio_bytes(normalized, 0, total_size - 1),
+            media_type=media_type,
+            headers={"Content-Length": str(total_size)},
+        )
 
     raise HTTPException(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -1555,18 +1593,23 @@ async def upload_image(
         )
 
     timestamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
-    filename = f"{timestamp}.{ext}"
     contents = await file.read()
+    # Content hash in the name: the URL never changes meaning, so /v1/images
+    # can serve it as immutable, and same-second uploads no longer collide.
+    filename = content_addressed_image_name(contents, ext, timestamp)
     mime = content_type or f"image/{ext}"
 
     settings = get_settings()
     if settings.gcs_bucket_name:
         # Production: upload directly to GCS; images/ prefix is public-read.
-        from myndral_api.gcs_utils import upload_bytes_to_gcs  # lazy — not needed in dev
+        from myndral_api.gcs_utils import (  # lazy — not needed in dev
+            get_storage_backend,
+            upload_bytes_to_gcs,
+        )
 
         try:
-            storage_url = upload_bytes_to_gcs(
-                settings.gcs_bucket_name, f"images/{filename}", contents, mime
+            storage_url = await get_storage_backend().run(
+                upload_bytes_to_gcs, settings.gcs_bucket_name, f"images/{filename}", contents, mime
             )
         except Exception as exc:
             raise HTTPException(
@@ -1658,10 +1701,14 @@ async def upload_custom_music(
     # before mutagen reads it.
     settings = get_settings()
     if settings.gcs_bucket_name:
-        from myndral_api.gcs_utils import upload_file_to_gcs  # lazy — not needed in dev
+        from myndral_api.gcs_utils import (  # lazy — not needed in dev
+            get_storage_backend,
+            upload_file_to_gcs,
+        )
 
         try:
-            storage_url = upload_file_to_gcs(
+            storage_url = await get_storage_backend().run(
+                upload_file_to_gcs,
                 settings.gcs_bucket_name,
                 f"generated/music/{filename}",
                 output_path,
@@ -1812,6 +1859,8 @@ WHERE id = CAST(:album_id AS uuid)
             ),
             {"album_id": album_id},
         )
+        await refresh_track_cards(db, album_ids=[album_id])
+        invalidate_on_commit(db, [album_id])
 
         if lyrics and lyrics.strip():
             await db.execute(
@@ -1851,6 +1900,7 @@ WHERE id = CAST(:job_id AS uuid)
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Upload succeeded but catalog write failed: {db_exc}",
         ) from db_exc
+    await _invalidate_track_audio(track_id, [storage_url])
 
     result = await db.execute(
         text(
@@ -2048,6 +2098,8 @@ WHERE id = CAST(:album_id AS uuid)
             ),
             {"album_id": payload.album_id},
         )
+        await refresh_track_cards(db, album_ids=[payload.album_id])
+        invalidate_on_commit(db, [payload.album_id])
 
         if payload.lyrics and payload.lyrics.strip():
             await db.execute(
@@ -2085,6 +2137,7 @@ WHERE id = CAST(:job_id AS uuid)
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Link succeeded but catalog write failed: {db_exc}",
         ) from db_exc
+    await _invalidate_track_audio(track_id, [payload.storage_url])
 
     result = await db.execute(
         text(
@@ -2288,6 +2341,8 @@ async def update_artist(
 
     if "genre_ids" in values and values["genre_ids"] is not None:
         await _replace_artist_genres(db, artist_id, values["genre_ids"])
+    await refresh_track_cards(db, artist_ids=[artist_id])
+    invalidate_on_commit(db, [artist_id])
 
     updated = await _fetch_artist(db, artist_id)
     if updated is None:
@@ -2477,6 +2532,8 @@ async def update_album(
 
     if "genre_ids" in values and values["genre_ids"] is not None:
         await _replace_album_genres(db, album_id, values["genre_ids"])
+    await refresh_track_cards(db, album_ids=[album_id])
+    invalidate_on_commit(db, [album_id])
 
     updated = await _fetch_album(db, album_id)
     if updated is None:
@@ -2659,10 +2716,12 @@ RETURNING id::text
         await _replace_track_artists(db, track_id, primary_artist_id, payload.artist_links)
         await _replace_track_genres(db, track_id, payload.genre_ids)
         await _upsert_lyrics(db, track_id, payload.lyrics)
-        await _upsert_audio_files(db, track_id, audio_files, replace=False)
+        stale_urls = await _upsert_audio_files(db, track_id, audio_files, replace=False)
         await _recompute_album_track_count(db, payload.album_id)
+        await db.commit()
     except IntegrityError as exc:
         raise _integrity_exception(exc, "Could not create track with the provided data.") from exc
+    await _invalidate_track_audio(track_id, stale_urls)
 
     created = await _fetch_track(db, track_id)
     if created is None:
@@ -2741,8 +2800,9 @@ async def update_track(
             text("DELETE FROM lyrics WHERE track_id = :track_id"),
             {"track_id": track_id},
         )
+    stale_urls: list[str] | None = None
     if audio_files_input is not None:
-        await _upsert_audio_files(
+        stale_urls = await _upsert_audio_files(
             db,
             track_id,
             audio_files_input,
@@ -2752,6 +2812,9 @@ async def update_track(
     if previous_album_id != new_album_id:
         await _recompute_album_track_count(db, previous_album_id)
     await _recompute_album_track_count(db, new_album_id)
+    if stale_urls is not None:
+        await db.commit()
+        await _invalidate_track_audio(track_id, stale_urls)
 
     updated = await _fetch_track(db, track_id)
     if updated is None:
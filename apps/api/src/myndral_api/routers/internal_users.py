@@ -6,8 +6,10 @@ from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from myndral_api.auth_utils import get_current_user
+from myndral_api import totals
+from myndral_api.auth_utils import get_current_user, invalidate_user_context
 from myndral_api.db.session import get_db
+from myndral_api.sessions import revoke_access_tokens, revoke_user_sessions
 
 router = APIRouter()
 
@@ -243,6 +245,7 @@ async def list_users(
     is_active: bool | None = Query(default=None, alias="isActive"),
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    exact_total: bool = Query(default=False, alias="exactTotal"),
     _: dict[str, Any] = Depends(_require_admin_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
@@ -283,26 +286,22 @@ ORDER BY created_at DESC, username ASC
 LIMIT :limit OFFSET :offset
 """
     rows = (await db.execute(text(query_sql), params)).mappings().all()
-    total = int(
-        (
-            await db.execute(
-                text(
-                    f"""
+    total = await totals.capped_total(
+        db,
+        f"""
 WITH user_rows AS (
   {_base_user_select()}
 )
-SELECT count(*)
+SELECT 1
 FROM user_rows
 {where_sql}
-"""
-                ),
-                params,
-            )
-        ).scalar_one()
+""",
+        params,
+        exact=exact_total,
     )
     return {
         "items": [_serialize_user(row) for row in rows],
-        "total": total,
+        **total.fields(),
         "limit": limit,
         "offset": offset,
     }
@@ -341,8 +340,16 @@ async def update_user(
             text("UPDATE users SET is_active = :is_active WHERE id = :user_id"),
             {"is_active": payload.is_active, "user_id": user_id},
         )
+        if not payload.is_active:
+            # Forced logout: no session of the account may refresh again.
+            await revoke_user_sessions(db, user_id)
     if payload.subscription_plan is not None and payload.subscription_plan != existing["subscription_plan"]:
         await _set_subscription_plan(db, user_id, payload.subscription_plan)
+    # Committed before invalidating, so no request can re-cache the old row.
+    await db.commit()
+    await invalidate_user_context(user_id)
+    # Access tokens issued until now carry the old role and plan claims.
+    await revoke_access_tokens(user_id=user_id)
 
     updated = await _fetch_user_row(db, user_id)
     if updated is None:
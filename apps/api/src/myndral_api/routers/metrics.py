@@ -0,0 +1,49 @@
+"""
+Runtime metrics for the current API process.
+
+Counters are per instance (they live in process memory), which is exactly
+what is needed to size per-instance caches on Cloud Run.
+"""
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from myndral_api.audio_cache import get_audio_block_cache
+from myndral_api.auth_utils import get_current_user
+from myndral_api.events import get_event_ingestor
+from myndral_api.prefetch import get_prefetcher
+from myndral_api.singleflight import describe_all as describe_single_flights
+
+router = APIRouter()
+
+
+async def _require_admin(current_user: dict = Depends(get_current_user)) -> dict:
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin role required.")
+    return current_user
+
+
+@router.get("/metrics/audio-cache", summary="Audio block cache counters for this instance")
+async def audio_cache_metrics(_: dict = Depends(_require_admin)) -> dict[str, Any]:
+    cache = get_audio_block_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.describe()}
+
+
+@router.get("/metrics/stream-prefetch", summary="Read-ahead prefetch counters for this instance")
+async def stream_prefetch_metrics(_: dict = Depends(_require_admin)) -> dict[str, Any]:
+    prefetcher = get_prefetcher()
+    if prefetcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **prefetcher.describe()}
+
+
+@router.get("/metrics/events", summary="Playback event ingestion counters for this instance")
+async def event_ingest_metrics(_: dict = Depends(_require_admin)) -> dict[str, Any]:
+    return await get_event_ingestor().describe()
+
+
+@router.get("/metrics/single-flight", summary="Read coalescing counters for this instance")
+async def single_flight_metrics(_: dict = Depends(_require_admin)) -> dict[str, Any]:
+    return describe_single_flights()
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from myndral_api import totals
 from myndral_api.auth_utils import get_current_user
 from myndral_api.db.session import get_db
 
@@ -81,30 +82,27 @@ LIMIT :limit OFFSET :offset
         },
     )
 
-    count_row = await db.execute(
-        text(
-            """
-SELECT count(*) FROM notifications
+    # The page total and the unread badge come from one pass over the
+    # recipient's notifications.
+    counts = (
+        await db.execute(
+            text(
+                """
+SELECT
+  count(*) FILTER (WHERE :unread_only = false OR NOT is_read) AS total,
+  count(*) FILTER (WHERE NOT is_read) AS unread
+FROM notifications
 WHERE recipient_id = CAST(:recipient_id AS uuid)
-  AND (:unread_only = false OR is_read = false)
 """
-        ),
-        {"recipient_id": current_user["id"], "unread_only": unread_only},
-    )
-    total = int(count_row.scalar_one())
-
-    unread_row = await db.execute(
-        text(
-            "SELECT count(*) FROM notifications WHERE recipient_id = CAST(:id AS uuid) AND NOT is_read"
-        ),
-        {"id": current_user["id"]},
-    )
-    unread_count = int(unread_row.scalar_one())
+            ),
+            {"recipient_id": current_user["id"], "unread_only": unread_only},
+        )
+    ).mappings().one()
 
     return {
         "items": [_serialize_notification(r) for r in rows.mappings().all()],
-        "total": total,
-        "unreadCount": unread_count,
+        **totals.Total(int(counts["total"])).fields(),
+        "unreadCount": int(counts["unread"]),
         "limit": limit,
         "offset": offset,
     }
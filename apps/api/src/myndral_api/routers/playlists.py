@@ -6,12 +6,21 @@ from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from myndral_api import totals
 from myndral_api.auth_utils import get_current_user
 from myndral_api.db.session import get_db
 from myndral_api.media_utils import normalize_audio_url, normalize_image_url
+from myndral_api.pagination import Keyset, SortKey
 
 router = APIRouter()
 
+# Recently updated first.  The id key is the selected text form, because
+# SELECT DISTINCT can only order by expressions it returns.
+PLAYLIST_KEYSET = Keyset(
+    SortKey("p.updated_at", "updated_at", "timestamptz"),
+    SortKey("p.id::text", "id", "text"),
+)
+
 
 class CamelModel(BaseModel):
     model_config = ConfigDict(populate_by_name=True, extra="forbid")
@@ -140,53 +149,29 @@ SELECT
   t.duration_ms,
   t.play_count,
   t.explicit,
-  pa.name AS artist_name,
-  pa.slug AS artist_slug,
-  pa.bio AS artist_bio,
-  pa.image_url AS artist_image_url,
-  pa.monthly_listeners AS artist_monthly_listeners,
-  pa.style_tags AS artist_style_tags,
-  al.title AS album_title,
-  al.cover_url AS album_cover_url,
-  al.release_date AS album_release_date,
-  al.album_type::text AS album_type,
-  al.track_count AS album_track_count,
-  aa.id::text AS album_artist_id,
-  aa.name AS album_artist_name,
-  aa.slug AS album_artist_slug,
-  aa.bio AS album_artist_bio,
-  aa.image_url AS album_artist_image_url,
-  aa.monthly_listeners AS album_artist_monthly_listeners,
-  aa.style_tags AS album_artist_style_tags,
-  COALESCE((
-    SELECT array_agg(g.name ORDER BY g.name)
-    FROM album_genres ag
-    JOIN genres g ON g.id = ag.genre_id
-    WHERE ag.album_id = al.id
-  ), ARRAY[]::text[]) AS album_genre_tags,
-  COALESCE((
-    SELECT taf.storage_url
-    FROM track_audio_files taf
-    WHERE taf.track_id = t.id
-    ORDER BY CASE taf.quality
-      WHEN 'high_320' THEN 1
-      WHEN 'lossless' THEN 2
-      WHEN 'standard_256' THEN 3
-      WHEN 'low_128' THEN 4
-      ELSE 5
-    END
-    LIMIT 1
-  ), NULL) AS audio_url
+  t.artist_name,
+  t.artist_slug,
+  t.artist_bio,
+  t.artist_image_url,
+  t.artist_monthly_listeners,
+  t.artist_style_tags,
+  t.album_title,
+  t.album_cover_url,
+  t.album_release_date,
+  t.album_type,
+  t.album_track_count,
+  t.album_artist_id::text AS album_artist_id,
+  t.album_artist_name,
+  t.album_artist_slug,
+  t.album_artist_bio,
+  t.album_artist_image_url,
+  t.album_artist_monthly_listeners,
+  t.album_artist_style_tags,
+  t.album_genre_tags,
+  t.audio_url
 FROM playlist_tracks pt
-JOIN tracks t ON t.id = pt.track_id
-JOIN artists pa ON pa.id = t.primary_artist_id
-JOIN albums al ON al.id = t.album_id
-JOIN artists aa ON aa.id = al.artist_id
+JOIN track_cards t ON t.id = pt.track_id
 WHERE pt.playlist_id = :playlist_id
-  AND t.status = 'published'
-  AND al.status = 'published'
-  AND pa.status = 'published'
-  AND aa.status = 'published'
 ORDER BY pt.position ASC, pt.added_at ASC
 """
             ),
@@ -521,15 +506,19 @@ VALUES (
 async def list_playlists(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
     db: AsyncSession = Depends(get_db),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> dict[str, Any]:
     user_id = current_user["id"]
+    after_sql, after_params = PLAYLIST_KEYSET.after(cursor)
     params = {
         "user_id": user_id,
         "is_admin": _is_admin(current_user),
-        "limit": limit,
+        "limit": limit + 1,
         "offset": offset,
+        **after_params,
     }
     rows = (
         await db.execute(
@@ -580,33 +569,37 @@ SELECT DISTINCT
 FROM playlists p
 JOIN users owner ON owner.id = p.owner_id
 WHERE {_playlist_access_where(include_public=True)}
-ORDER BY p.updated_at DESC
-LIMIT :limit OFFSET :offset
+{after_sql}{PLAYLIST_KEYSET.order_by()}LIMIT :limit OFFSET :offset
 """
             ),
             params,
         )
     ).mappings().all()
-    total = int(
-        (
-            await db.execute(
-                text(
-                    f"""
-SELECT count(*)
+    page, next_cursor = PLAYLIST_KEYSET.page(rows, limit)
+    total = totals.NO_TOTAL
+    if cursor is None:
+        total = await totals.capped_total(
+            db,
+            f"""
+SELECT 1
 FROM playlists p
 WHERE {_playlist_access_where(include_public=True)}
-"""
-                ),
-                {"user_id": user_id, "is_admin": _is_admin(current_user)},
-            )
-        ).scalar_one()
-    )
+""",
+            {"user_id": user_id, "is_admin": _is_admin(current_user)},
+            exact=exact_total,
+        )
 
     items: list[dict[str, Any]] = []
-    for row in rows:
+    for row in page:
         tracks = await _fetch_playlist_tracks(db, row["id"])
         items.append(_serialize_playlist(row, tracks))
-    return {"items": items, "total": total, "limit": limit, "offset": offset}
+    return {
+        "items": items,
+        **total.fields(),
+        "limit": limit,
+        "offset": offset,
+        "nextCursor": next_cursor,
+    }
 
 
 @router.post("/", summary="Create a playlist", status_code=status.HTTP_201_CREATED)
@@ -0,0 +1,74 @@
+from typing import Any, cast
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api import radio
+from myndral_api.auth_utils import get_optional_user_id
+from myndral_api.db.session import get_db
+from myndral_api.routers import tracks as tracks_router
+
+router = APIRouter()
+
+
+async def _parse_seed(db: AsyncSession, seed: str) -> radio.Seed:
+    seed_type, _, value = seed.partition(":")
+    if seed_type not in radio.SEED_TYPES or not value:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="seed must be track:<id>, artist:<id> or genre:<slug>.",
+        )
+    if seed_type == "genre":
+        genre_id = (
+            await db.execute(
+                text("SELECT id::text FROM genres WHERE slug = :slug"), {"slug": value}
+            )
+        ).scalar_one_or_none()
+        if genre_id is None:
+            raise HTTPException(status_code=404, detail="Genre not found")
+        return radio.Seed("genre", genre_id)
+    try:
+        return radio.Seed(cast(radio.SeedType, seed_type), str(UUID(value)))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid {seed_type} id."
+        ) from exc
+
+
+@router.get("/", summary="Next tracks for a radio station")
+async def radio_station(
+    seed: str | None = Query(None, description="track:<id>, artist:<id> or genre:<slug>"),
+    cursor: str | None = Query(None, description="nextCursor of the previous page"),
+    limit: int = Query(20, ge=1, le=50),
+    user_id: str | None = Depends(get_optional_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    if cursor:
+        try:
+            station, position = radio.decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+            ) from exc
+    elif seed:
+        station, position = await _parse_seed(db, seed), 0
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Either seed or cursor is required."
+        )
+
+    pool = await radio.load_pool(db, station)
+    if pool is None:
+        raise HTTPException(status_code=404, detail="Station seed not found")
+
+    history = await radio.load_history(db, user_id)
+    picked, next_position = radio.next_batch(pool, position, limit, history)
+    by_id = await tracks_router._fetch_tracks_by_ids(db, picked)
+    return {
+        "station": {"type": station.type, "seed": station.key, "size": len(pool)},
+        "items": [by_id[track_id] for track_id in picked if track_id in by_id],
+        "limit": limit,
+        "nextCursor": radio.encode_cursor(station, next_position) if len(pool) else None,
+    }
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from myndral_api import totals
 from myndral_api.db.session import get_db
 from myndral_api.media_utils import normalize_audio_url, normalize_image_url
 
@@ -20,7 +21,7 @@ def _iso(value: Any) -> str | None:
 
 
 def _empty_page(limit: int, offset: int) -> dict[str, Any]:
-    return {"items": [], "total": 0, "limit": limit, "offset": offset}
+    return {"items": [], "total": 0, "totalAccuracy": "exact", "limit": limit, "offset": offset}
 
 
 def _serialize_artist(row: Any) -> dict[str, Any]:
@@ -155,6 +156,7 @@ async def search(
     ),
     limit: int = Query(20, ge=1, le=50),
     offset: int = Query(0, ge=0),
+    exact_total: bool = Query(False, alias="exactTotal"),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     query = q.strip()
@@ -171,10 +173,10 @@ async def search(
         "offset": offset,
     }
 
-    artists = await _search_artists(db, sql_params, include, limit, offset)
-    albums = await _search_albums(db, sql_params, include, limit, offset)
-    tracks = await _search_tracks(db, sql_params, include, limit, offset)
-    playlists = await _search_playlists(db, sql_params, include, limit, offset)
+    artists = await _search_artists(db, sql_params, include, limit, offset, exact_total)
+    albums = await _search_albums(db, sql_params, include, limit, offset, exact_total)
+    tracks = await _search_tracks(db, sql_params, include, limit, offset, exact_total)
+    playlists = await _search_playlists(db, sql_params, include, limit, offset, exact_total)
 
     return {
         "tracks": tracks,
@@ -190,6 +192,7 @@ async def _search_artists(
     include: set[str],
     limit: int,
     offset: int,
+    exact_total: bool,
 ) -> dict[str, Any]:
     if "artist" not in include:
         return _empty_page(limit, offset)
@@ -236,17 +239,12 @@ LIMIT :limit OFFSET :offset
             params,
         )
     ).mappings().all()
-    total = int(
-        (
-            await db.execute(
-                text("SELECT count(*) FROM artists a " + filter_sql),
-                params,
-            )
-        ).scalar_one()
+    total = await totals.capped_total(
+        db, "SELECT 1 FROM artists a " + filter_sql, params, exact=exact_total
     )
     return {
         "items": [_serialize_artist(row) for row in rows],
-        "total": total,
+        **total.fields(),
         "limit": limit,
         "offset": offset,
     }
@@ -258,6 +256,7 @@ async def _search_albums(
     include: set[str],
     limit: int,
     offset: int,
+    exact_total: bool,
 ) -> dict[str, Any]:
     if "album" not in include:
         return _empty_page(limit, offset)
@@ -314,24 +313,20 @@ LIMIT :limit OFFSET :offset
             params,
         )
     ).mappings().all()
-    total = int(
-        (
-            await db.execute(
-                text(
-                    """
-SELECT count(*)
+    total = await totals.capped_total(
+        db,
+        """
+SELECT 1
 FROM albums al
 JOIN artists ar ON ar.id = al.artist_id
 """
-                    + filter_sql
-                ),
-                params,
-            )
-        ).scalar_one()
+        + filter_sql,
+        params,
+        exact=exact_total,
     )
     return {
         "items": [_serialize_album(row) for row in rows],
-        "total": total,
+        **total.fields(),
         "limit": limit,
         "offset": offset,
     }
@@ -343,20 +338,15 @@ async def _search_tracks(
     include: set[str],
     limit: int,
     offset: int,
+    exact_total: bool,
 ) -> dict[str, Any]:
     if "track" not in include:
         return _empty_page(limit, offset)
 
     filter_sql = """
-WHERE t.status = 'published'
-  AND al.status = 'published'
-  AND pa.status = 'published'
-  AND aa.status = 'published'
-  AND (
-    lower(t.title) LIKE lower(:pattern)
-    OR lower(pa.name) LIKE lower(:pattern)
-    OR lower(al.title) LIKE lower(:pattern)
-  )
+WHERE lower(t.title) LIKE lower(:pattern)
+   OR lower(t.artist_name) LIKE lower(:pattern)
+   OR lower(t.album_title) LIKE lower(:pattern)
 """
     rows = (
         await db.execute(
@@ -371,47 +361,27 @@ SELECT
   t.duration_ms,
   t.play_count,
   t.explicit,
-  pa.name AS artist_name,
-  pa.slug AS artist_slug,
-  pa.bio AS artist_bio,
-  pa.image_url AS artist_image_url,
-  pa.monthly_listeners AS artist_monthly_listeners,
-  pa.style_tags AS artist_style_tags,
-  al.title AS album_title,
-  al.cover_url AS album_cover_url,
-  al.release_date AS album_release_date,
-  al.album_type::text AS album_type,
-  al.track_count AS album_track_count,
-  aa.id::text AS album_artist_id,
-  aa.name AS album_artist_name,
-  aa.slug AS album_artist_slug,
-  aa.bio AS album_artist_bio,
-  aa.image_url AS album_artist_image_url,
-  aa.monthly_listeners AS album_artist_monthly_listeners,
-  aa.style_tags AS album_artist_style_tags,
-  COALESCE((
-    SELECT array_agg(g.name ORDER BY g.name)
-    FROM album_genres ag
-    JOIN genres g ON g.id = ag.genre_id
-    WHERE ag.album_id = al.id
-  ), ARRAY[]::text[]) AS album_genre_tags,
-  COALESCE((
-    SELECT taf.storage_url
-    FROM track_audio_files taf
-    WHERE taf.track_id = t.id
-    ORDER BY CASE taf.quality
-      WHEN 'high_320' THEN 1
-      WHEN 'lossless' THEN 2
-      WHEN 'standard_256' THEN 3
-      WHEN 'low_128' THEN 4
-      ELSE 5
-    END
-    LIMIT 1
-  ), NULL) AS audio_url
-FROM tracks t
-JOIN artists pa ON pa.id = t.primary_artist_id
-JOIN albums al ON al.id = t.album_id
-JOIN artists aa ON aa.id = al.artist_id
+  t.artist_name,
+  t.artist_slug,
+  t.artist_bio,
+  t.artist_image_url,
+  t.artist_monthly_listeners,
+  t.artist_style_tags,
+  t.album_title,
+  t.album_cover_url,
+  t.album_release_date,
+  t.album_type,
+  t.album_track_count,
+  t.album_artist_id::text AS album_artist_id,
+  t.album_artist_name,
+  t.album_artist_slug,
+  t.album_artist_bio,
+  t.album_artist_image_url,
+  t.album_artist_monthly_listeners,
+  t.album_artist_style_tags,
+  t.album_genre_tags,
+  t.audio_url
+FROM track_cards t
 """
                 + filter_sql
                 + """
@@ -429,26 +399,19 @@ LIMIT :limit OFFSET :offset
             params,
         )
     ).mappings().all()
-    total = int(
-        (
-            await db.execute(
-                text(
-                    """
-SELECT count(*)
-FROM tracks t
-JOIN artists pa ON pa.id = t.primary_artist_id
-JOIN albums al ON al.id = t.album_id
-JOIN artists aa ON aa.id = al.artist_id
+    total = await totals.capped_total(
+        db,
+        """
+SELECT 1
+FROM track_cards t
 """
-                    + filter_sql
-                ),
-                params,
-            )
-        ).scalar_one()
+        + filter_sql,
+        params,
+        exact=exact_total,
     )
     return {
         "items": [_serialize_track(row) for row in rows],
-        "total": total,
+        **total.fields(),
         "limit": limit,
         "offset": offset,
     }
@@ -460,6 +423,7 @@ async def _search_playlists(
     include: set[str],
     limit: int,
     offset: int,
+    exact_total: bool,
 ) -> dict[str, Any]:
     if "playlist" not in include:
         return _empty_page(limit, offset)
@@ -502,17 +466,12 @@ LIMIT :limit OFFSET :offset
             params,
         )
     ).mappings().all()
-    total = int(
-        (
-            await db.execute(
-                text("SELECT count(*) FROM playlists p " + filter_sql),
-                params,
-            )
-        ).scalar_one()
+    total = await totals.capped_total(
+        db, "SELECT 1 FROM playlists p " + filter_sql, params, exact=exact_total
     )
     return {
         "items": [_serialize_playlist(row) for row in rows],
-        "total": total,
+        **total.fields(),
         "limit": limit,
         "offset": offset,
     }
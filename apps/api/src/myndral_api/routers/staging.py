@@ -15,6 +15,13 @@ Hierarchy enforcement on track approval:
 Polymorphic staging_reviews / notifications:
   Both tables carry an entity_type discriminator ('artist' | 'album' | 'track')
   and a nullable FK per entity type with an XOR constraint (exactly one set).
+
+Stream cache invalidation:
+  Every status change that can make a track (un)playable drops the cached
+  /v1/stream resolution after commit — the track itself, or the whole cache
+  for artist/album changes — so a revoke takes effect on the next request.
+  The same actions purge cached catalog responses tagged with the entity
+  (response_cache.invalidate_on_commit).
 """
 
 from __future__ import annotations
@@ -22,14 +29,19 @@ from __future__ import annotations
 import json
 from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from myndral_api.auth_utils import get_current_user
+from myndral_api.config import get_settings
 from myndral_api.db.session import get_db
+from myndral_api.hls import package_track_in_background
 from myndral_api.media_utils import normalize_image_url
+from myndral_api.playback import invalidate_playable_tracks
+from myndral_api.response_cache import invalidate_on_commit
+from myndral_api.track_cards import refresh_track_cards
 
 router = APIRouter()
 
@@ -386,7 +398,10 @@ async def approve_artist(
                                  reviewer_id=current_user["id"], action="approved")
     await _notify(db, recipient_id=creator_id, entity_type="artist", entity_id=artist_id,
                   message=f'{reviewer} approved your artist and it is now live in the player.')
+    await refresh_track_cards(db, artist_ids=[artist_id])
+    invalidate_on_commit(db, [artist_id])
     await db.commit()
+    await invalidate_playable_tracks()
     return {"artistId": artist_id, "action": "approved"}
 
 
@@ -409,7 +424,9 @@ async def reject_artist(
                                  reviewer_id=current_user["id"], action="rejected", notes=payload.notes)
     await _notify(db, recipient_id=creator_id, entity_type="artist", entity_id=artist_id,
                   message=f'{reviewer} rejected your artist: {payload.notes}')
+    invalidate_on_commit(db, [artist_id])
     await db.commit()
+    await invalidate_playable_tracks()
     return {"artistId": artist_id, "action": "rejected"}
 
 
@@ -467,7 +484,17 @@ WHERE id = (SELECT artist_id FROM albums WHERE id = CAST(:album_id AS uuid))
                                  reviewer_id=current_user["id"], action="approved")
     await _notify(db, recipient_id=creator_id, entity_type="album", entity_id=album_id,
                   message=f'{reviewer} approved your album and it is now live in the player.')
+    # Publishing the artist as well can bring back its other published albums.
+    artist_id = (
+        await db.execute(
+            text("SELECT artist_id::text FROM albums WHERE id = CAST(:id AS uuid)"),
+            {"id": album_id},
+        )
+    ).scalar_one()
+    await refresh_track_cards(db, album_ids=[album_id], artist_ids=[artist_id])
+    invalidate_on_commit(db, [album_id, artist_id])
     await db.commit()
+    await invalidate_playable_tracks()
     return {"albumId": album_id, "action": "approved"}
 
 
@@ -490,7 +517,9 @@ async def reject_album(
                                  reviewer_id=current_user["id"], action="rejected", notes=payload.notes)
     await _notify(db, recipient_id=creator_id, entity_type="album", entity_id=album_id,
                   message=f'{reviewer} rejected your album: {payload.notes}')
+    invalidate_on_commit(db, [album_id])
     await db.commit()
+    await invalidate_playable_tracks()
     return {"albumId": album_id, "action": "rejected"}
 
 
@@ -518,6 +547,7 @@ async def review_album(
 @router.post("/staging/{track_id}/approve", summary="Approve a staged track (publish it)")
 async def approve_track(
     track_id: str,
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(_require_reviewer),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
@@ -593,7 +623,14 @@ WHERE id = CAST(:album_id AS uuid)
                                  reviewer_id=current_user["id"], action="approved")
     await _notify(db, recipient_id=creator_id, entity_type="track", entity_id=track_id,
                   message=f'{reviewer} approved your track — it is now live in the player.')
+    # The album's track count changed, and the cascade may have published its artist.
+    await refresh_track_cards(db, album_ids=[album_id], artist_ids=[artist_id])
+    invalidate_on_commit(db, [track_id, album_id])
     await db.commit()
+    await invalidate_playable_tracks([track_id])
+    # Package HLS renditions after the response; streaming works without them.
+    if get_settings().hls_packaging_enabled:
+        background_tasks.add_task(package_track_in_background, track_id)
     return {"trackId": track_id, "action": "approved"}
 
 
@@ -631,12 +668,16 @@ WHERE id = CAST(:album_id AS uuid)
             ),
             {"album_id": str(album_row["album_id"])},
         )
+        await refresh_track_cards(db, album_ids=[str(album_row["album_id"])])
+        invalidate_on_commit(db, [str(album_row["album_id"])])
 
     await _insert_staging_review(db, entity_type="track", entity_id=track_id,
                                  reviewer_id=current_user["id"], action="rejected", notes=payload.notes)
     await _notify(db, recipient_id=creator_id, entity_type="track", entity_id=track_id,
                   message=f'{reviewer} rejected your track: {payload.notes}')
+    invalidate_on_commit(db, [track_id])
     await db.commit()
+    await invalidate_playable_tracks([track_id])
     return {"trackId": track_id, "action": "rejected"}
 
 
@@ -692,7 +733,10 @@ async def revoke_artist(
             msg_parts.append(f"Note: {payload.notes}")
         await _notify(db, recipient_id=creator_id, entity_type="artist", entity_id=artist_id, message=" ".join(msg_parts))
 
+    await refresh_track_cards(db, artist_ids=[artist_id])
+    invalidate_on_commit(db, [artist_id])
     await db.commit()
+    await invalidate_playable_tracks()
     return {"artistId": artist_id, "action": "revoked"}
 
 
@@ -723,7 +767,10 @@ async def revoke_album(
             msg_parts.append(f"Note: {payload.notes}")
         await _notify(db, recipient_id=creator_id, entity_type="album", entity_id=album_id, message=" ".join(msg_parts))
 
+    await refresh_track_cards(db, album_ids=[album_id])
+    invalidate_on_commit(db, [album_id])
     await db.commit()
+    await invalidate_playable_tracks()
     return {"albumId": album_id, "action": "revoked"}
 
 
@@ -754,7 +801,10 @@ async def revoke_track(
             msg_parts.append(f"Note: {payload.notes}")
         await _notify(db, recipient_id=creator_id, entity_type="track", entity_id=track_id, message=" ".join(msg_parts))
 
+    await refresh_track_cards(db, track_ids=[track_id])
+    invalidate_on_commit(db, [track_id])
     await db.commit()
+    await invalidate_playable_tracks([track_id])
     return {"trackId": track_id, "action": "revoked"}
 
 
@@ -794,7 +844,9 @@ async def restore_artist(
         text("UPDATE artists SET status = 'review', archived_at = NULL WHERE id = CAST(:id AS uuid)"),
         {"id": artist_id},
     )
+    invalidate_on_commit(db, [artist_id])
     await db.commit()
+    await invalidate_playable_tracks()
     return {"artistId": artist_id, "action": "restored"}
 
 
@@ -809,7 +861,9 @@ async def restore_album(
         text("UPDATE albums SET status = 'review', archived_at = NULL WHERE id = CAST(:id AS uuid)"),
         {"id": album_id},
     )
+    invalidate_on_commit(db, [album_id])
     await db.commit()
+    await invalidate_playable_tracks()
     return {"albumId": album_id, "action": "restored"}
 
 
@@ -842,5 +896,9 @@ WHERE id = CAST(:album_id AS uuid)
             ),
             {"album_id": str(album_row["album_id"])},
         )
+        await refresh_track_cards(db, album_ids=[str(album_row["album_id"])])
+        invalidate_on_commit(db, [str(album_row["album_id"])])
+    invalidate_on_commit(db, [track_id])
     await db.commit()
+    await invalidate_playable_tracks([track_id])
     return {"trackId": track_id, "action": "restored"}
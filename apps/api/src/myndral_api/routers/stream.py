@@ -1,21 +1,142 @@
 import re
+import secrets
+from collections.abc import AsyncIterator
+from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import FileResponse, Response
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from myndral_api.audio_cache import iter_audio_bytes, observe_stream_read
+from myndral_api.caching import TTLCache
+from myndral_api.config import get_settings
 from myndral_api.db.session import get_db
+from myndral_api.hls import (
+    PLAYLIST_MEDIA_TYPE,
+    SEGMENT_MEDIA_TYPE,
+    hls_storage_prefix,
+    read_hls_object,
+    render_master_playlist,
+)
 from myndral_api.media_utils import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    etag_matches,
     guess_media_type,
     is_remote_storage_url,
     resolve_local_storage_path,
 )
+from myndral_api.playback import resolve_playable_track
 
 router = APIRouter()
 
-# Matches the standard HTTP Range header value, e.g. "bytes=0-1023" or "bytes=512-"
-_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)", re.IGNORECASE)
+# One byte-range-spec: "0-1023", "512-" or the suffix form "-65536" (RFC 7233 §2.1)
+_RANGE_SPEC_RE = re.compile(r"^(\d*)-(\d*)$")
+# Beyond this many ranges the header is ignored and the full object is served,
+# so a hostile client cannot fan one request out into thousands of GCS reads.
+_MAX_RANGES = 16
+
+
+def parse_range_header(header: str, total_size: int) -> list[tuple[int, int]] | None:
+    """Resolve an HTTP ``Range`` header against an object of ``total_size`` bytes.
+
+    Returns:
+        ``None`` when the header is syntactically invalid or not a byte range;
+        the caller must then ignore it and serve the full object (§3.1).
+        An empty list when no range is satisfiable (→ 416).
+        Otherwise inclusive ``(start, end)`` pairs, clamped to the object,
+        sorted and with overlapping/adjacent ranges merged.
+    """
+    unit, _, spec_list = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec_list.strip():
+        return None
+
+    specs = [spec.strip() for spec in spec_list.split(",") if spec.strip()]
+    if not specs or len(specs) > _MAX_RANGES:
+        return None
+
+    ranges: list[tuple[int, int]] = []
+    for spec in specs:
+        m = _RANGE_SPEC_RE.match(spec)
+        if m is None or not (m.group(1) or m.group(2)):
+            return None
+        if not m.group(1):
+            # Suffix range: the final N bytes.
+            suffix_length = int(m.group(2))
+            if suffix_length > 0 and total_size > 0:
+                ranges.append((max(total_size - suffix_length, 0), total_size - 1))
+            continue
+        start = int(m.group(1))
+        if m.group(2) and int(m.group(2)) < start:
+            return None
+        end = int(m.group(2)) if m.group(2) else total_size - 1
+        if start < total_size:
+            ranges.append((start, min(end, total_size - 1)))
+
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _audio_etag(checksum: str | None) -> str | None:
+    """Strong validator for an audio object: its recorded SHA-256."""
+    return f'"{checksum}"' if checksum else None
+
+
+def _if_range_allows_partial(request: Request, etag: str | None) -> bool:
+    """Evaluate ``If-Range`` (§3.2): partial content only while the validator matches.
+
+    Only strong entity-tags are accepted.  HTTP-date validators are treated as
+    a mismatch because these responses carry no ``Last-Modified``.
+    """
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    return etag is not None and if_range.strip() == etag
+
+
+class SignedUrlCache:
+    """Signed URLs per (track, quality), reused until shortly before they expire.
+
+    The remaining lifetime handed to a client never drops below
+    ``refresh_margin`` seconds, so a player that starts a download right after
+    the redirect is not cut off mid-stream by an expiring signature.  Entries
+    live in a bounded ``TTLCache``, so the cache never outgrows the hot part
+    of the catalog.
+    """
+
+    def __init__(self, refresh_margin: float = 60.0, max_entries: int = 10_000) -> None:
+        self.refresh_margin = refresh_margin
+        # Keyed by (track, quality); the value remembers the object it signs.
+        self._entries: TTLCache[tuple[str, str], tuple[str, str]] = TTLCache(
+            ttl_seconds=get_settings().stream_signed_url_ttl_seconds - refresh_margin,
+            max_entries=max_entries,
+        )
+
+    def get(self, track_id: str, quality: str, storage_url: str) -> str | None:
+        entry = self._entries.get((track_id, quality))
+        if entry is None:
+            return None
+        cached_storage_url, signed_url = entry
+        if cached_storage_url != storage_url:
+            self._entries.invalidate((track_id, quality))
+            return None
+        return signed_url
+
+    def put(
+        self, track_id: str, quality: str, storage_url: str, signed_url: str, ttl_seconds: int
+    ) -> None:
+        reusable_for = ttl_seconds - self.refresh_margin
+        if reusable_for > 0:
+            self._entries.put((track_id, quality), (storage_url, signed_url), reusable_for)
+
+
+_signed_urls = SignedUrlCache()
 
 
 @router.get("/{track_id}", summary="Stream audio for a track")
@@ -24,39 +145,22 @@ async def stream_track(
     request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    row = (
-        await db.execute(
-            text(
-                """
-SELECT
-  taf.storage_url,
-  taf.format::text AS format
-FROM track_audio_files taf
-JOIN tracks t ON t.id = taf.track_id
-JOIN albums a ON a.id = t.album_id
-JOIN artists ar ON ar.id = t.primary_artist_id
-WHERE taf.track_id = :track_id
-  AND t.status = 'published'
-  AND a.status = 'published'
-  AND ar.status = 'published'
-ORDER BY CASE taf.quality
-  WHEN 'high_320' THEN 1
-  WHEN 'lossless' THEN 2
-  WHEN 'standard_256' THEN 3
-  WHEN 'low_128' THEN 4
-  ELSE 5
-END
-LIMIT 1
-"""
-            ),
-            {"track_id": track_id},
-        )
-    ).mappings().first()
-    if row is None:
+    playable = await resolve_playable_track(db, track_id)
+    if playable is None or not playable.published:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Track audio not found")
 
-    storage_url = str(row["storage_url"])
-    audio_format = row["format"]
+    storage_url = playable.storage_url
+    audio_format = playable.format
+    checksum = playable.checksum_sha256
+
+    # The URL is stable across re-uploads, so clients may keep the bytes but
+    # must revalidate; the checksum ETag turns an unchanged repeat into a 304.
+    etag = _audio_etag(checksum)
+    cache_headers = {"Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if etag:
+        cache_headers["ETag"] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
 
     # ── Local file (dev) ──────────────────────────────────────────────────────
     local_path = resolve_local_storage_path(storage_url)
@@ -65,6 +169,7 @@ LIMIT 1
             path=local_path,
             media_type=guess_media_type(local_path, audio_format),
             filename=local_path.name,
+            headers=cache_headers,
         )
 
     # ── GCS (production) — proxy with HTTP Range support ─────────────────────
@@ -74,45 +179,72 @@ LIMIT 1
     #     guessing a GCS object path directly.
     # Range request support is required for the browser seek bar.
     if storage_url.startswith("gs://"):
-        from myndral_api.gcs_utils import download_gcs_bytes
+        settings = get_settings()
+        if settings.stream_signed_url_redirect:
+            return await _redirect_to_signed_url(track_id, playable.quality, storage_url)
+
+        from myndral_api.gcs_utils import get_gcs_object_metadata
 
-        range_header = request.headers.get("range", "")
+        range_header = request.headers.get("range")
         media_type = _gcs_audio_media_type(storage_url, audio_format)
+        metadata = await get_gcs_object_metadata(
+            storage_url, size_hint=playable.file_size_bytes, checksum_sha256=checksum
+        )
+        total_size = metadata.size
+        base_headers = {"Accept-Ranges": "bytes", **cache_headers}
 
-        m = _RANGE_RE.match(range_header.strip()) if range_header else None
-        if m:
-            start = int(m.group(1)) if m.group(1) else 0
-            # GCS end is *inclusive*; if the header omits end we request None (→ EOF)
-            end: int | None = int(m.group(2)) if m.group(2) else None
+        ranges = None
+        if range_header and _if_range_allows_partial(request, etag):
+            ranges = parse_range_header(range_header, total_size)
 
-            data, total_size = download_gcs_bytes(storage_url, start=start, end=end)
-            actual_end = (end if end is not None else total_size - 1)
+        if ranges is not None and not ranges:
             return Response(
-                content=data,
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**base_headers, "Content-Range": f"bytes */{total_size}"},
+            )
+
+        if ranges is not None and len(ranges) == 1:
+            start, end = ranges[0]
+            observe_stream_read(
+                _client_key(request), storage_url, checksum, start, end, total_size
+            )
+            return StreamingResponse(
+                _stream_gcs_range(request, storage_url, start, end, checksum),
                 status_code=206,
+                media_type=media_type,
                 headers={
-                    "Content-Range": f"bytes {start}-{actual_end}/{total_size}",
-                    "Content-Length": str(len(data)),
-                    "Content-Type": media_type,
-                    "Accept-Ranges": "bytes",
+                    **base_headers,
+                    "Content-Range": f"bytes {start}-{end}/{total_size}",
+                    "Content-Length": str(end - start + 1),
                 },
             )
 
+        if ranges is not None:
+            boundary = secrets.token_hex(16)
+            parts = _multipart_part_headers(ranges, total_size, media_type, boundary)
+            closing = f"\r\n--{boundary}--\r\n".encode()
+            content_length = (
+                sum(len(part) for part in parts)
+                + sum(end - start + 1 for start, end in ranges)
+                + len(closing)
+            )
+            return StreamingResponse(
+                _stream_gcs_multipart(request, storage_url, checksum, ranges, parts, closing),
+                status_code=206,
+                media_type=f"multipart/byteranges; boundary={boundary}",
+                headers={**base_headers, "Content-Length": str(content_length)},
+            )
+
         # Full download
-        data, total_size = download_gcs_bytes(storage_url)
-        return Response(
-            content=data,
+        return StreamingResponse(
+            _stream_gcs_range(request, storage_url, 0, total_size - 1, checksum),
             status_code=200,
-            headers={
-                "Content-Length": str(total_size),
-                "Content-Type": media_type,
-                "Accept-Ranges": "bytes",
-            },
+            media_type=media_type,
+            headers={**base_headers, "Content-Length": str(total_size)},
         )
 
     # ── External HTTPS CDN URL ────────────────────────────────────────────────
     if is_remote_storage_url(storage_url):
-        from fastapi.responses import RedirectResponse
         return RedirectResponse(storage_url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
 
     raise HTTPException(
@@ -121,6 +253,161 @@ LIMIT 1
     )
 
 
+# ── HLS ───────────────────────────────────────────────────────────────────────
+# Variant playlists and segments live under content-hashed paths (see hls.py),
+# so they are cached for a year.  The master playlist is the only mutable
+# document and is cached briefly so re-packaging and revokes propagate.
+# Published status is still checked on every request that reaches the API;
+# copies already held by a CDN are not recalled.
+
+_HLS_MASTER_CACHE_CONTROL = "public, max-age=60"
+_HLS_QUALITIES = frozenset({"low_128", "standard_256", "high_320", "lossless"})
+_HLS_VERSION_RE = re.compile(r"^[0-9a-f]{16}$")
+_HLS_OBJECT_RE = re.compile(r"^(index\.m3u8|seg_\d{5}\.mp3)$")
+
+
+async def _require_streamable(db: AsyncSession, track_id: str) -> None:
+    playable = await resolve_playable_track(db, track_id)
+    if playable is None or not playable.published:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Track audio not found")
+
+
+@router.get("/{track_id}/hls/master.m3u8", summary="HLS master playlist for a track")
+async def hls_master_playlist(
+    track_id: str,
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    await _require_streamable(db, track_id)
+    rows = (
+        await db.execute(
+            text(
+                """
+SELECT quality::text AS quality, version, bandwidth_bps
+FROM track_hls_variants
+WHERE track_id = :track_id
+"""
+            ),
+            {"track_id": track_id},
+        )
+    ).mappings().all()
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="HLS rendition not found")
+
+    playlist = render_master_playlist(
+        [(f"{row['quality']}/{row['version']}/index.m3u8", row["bandwidth_bps"]) for row in rows]
+    )
+    return Response(
+        content=playlist,
+        media_type=PLAYLIST_MEDIA_TYPE,
+        headers={"Cache-Control": _HLS_MASTER_CACHE_CONTROL},
+    )
+
+
+@router.get(
+    "/{track_id}/hls/{quality}/{version}/{name}",
+    summary="HLS variant playlist or segment for a track",
+)
+async def hls_object(
+    track_id: str,
+    quality: str,
+    version: str,
+    name: str,
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    if (
+        quality not in _HLS_QUALITIES
+        or not _HLS_VERSION_RE.match(version)
+        or not _HLS_OBJECT_RE.match(name)
+    ):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="HLS object not found")
+    await _require_streamable(db, track_id)
+
+    try:
+        obj = await read_hls_object(hls_storage_prefix(track_id, version, quality), name)
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="HLS object not found")
+
+    media_type = PLAYLIST_MEDIA_TYPE if name.endswith(".m3u8") else SEGMENT_MEDIA_TYPE
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if isinstance(obj, Path):
+        return FileResponse(path=obj, media_type=media_type, headers=headers)
+    return Response(content=obj, media_type=media_type, headers=headers)
+
+
+async def _redirect_to_signed_url(track_id: str, quality: str, storage_url: str) -> Response:
+    """307 to a short-lived signed URL; access was already checked by the caller.
+
+    The redirect itself is marked ``no-store`` so every play goes back
+    through the published-status check in ``stream_track``.
+    """
+    signed_url = _signed_urls.get(track_id, quality, storage_url)
+    if signed_url is None:
+        from myndral_api.gcs_utils import get_storage_backend
+
+        ttl_seconds = get_settings().stream_signed_url_ttl_seconds
+        backend = get_storage_backend()
+        signed_url = await backend.run(backend.generate_signed_url, storage_url, ttl_seconds)
+        _signed_urls.put(track_id, quality, storage_url, signed_url, ttl_seconds)
+    return RedirectResponse(
+        signed_url,
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+async def _stream_gcs_range(
+    request: Request, gs_url: str, start: int, end: int, checksum: str | None
+) -> AsyncIterator[bytes]:
+    """Relay a GCS byte range chunk by chunk, stopping as soon as the client goes away.
+
+    Players abort in-flight range requests on every seek; without the
+    disconnect check the worker would keep pulling the rest of the range
+    from GCS for nobody.  Blocks already in the local audio cache are read
+    from disk instead of GCS.
+    """
+    async for chunk in iter_audio_bytes(gs_url, start, end, checksum=checksum):
+        if await request.is_disconnected():
+            break
+        yield chunk
+
+
+def _client_key(request: Request) -> str:
+    """Identify one player for read-ahead: client address plus user agent."""
+    host = request.client.host if request.client else ""
+    return f"{host}|{request.headers.get('user-agent', '')}"
+
+
+def _multipart_part_headers(
+    ranges: list[tuple[int, int]], total_size: int, media_type: str, boundary: str
+) -> list[bytes]:
+    return [
+        (
+            f"\r\n--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{total_size}\r\n\r\n"
+        ).encode()
+        for start, end in ranges
+    ]
+
+
+async def _stream_gcs_multipart(
+    request: Request,
+    gs_url: str,
+    checksum: str | None,
+    ranges: list[tuple[int, int]],
+    part_headers: list[bytes],
+    closing: bytes,
+) -> AsyncIterator[bytes]:
+    """Body of a ``multipart/byteranges`` response (RFC 7233 Appendix A)."""
+    for (start, end), part_header in zip(ranges, part_headers, strict=True):
+        yield part_header
+        async for chunk in _stream_gcs_range(request, gs_url, start, end, checksum):
+            yield chunk
+        if await request.is_disconnected():
+            return
+    yield closing
+
+
 def _gcs_audio_media_type(gs_url: str, db_format: str | None) -> str:
     """Derive a MIME type from the GCS object path extension, falling back to db_format."""
     from pathlib import Path
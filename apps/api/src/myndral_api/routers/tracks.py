@@ -1,12 +1,19 @@
-from typing import Any
+from datetime import UTC, datetime, timedelta
+from typing import Any, Literal
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from myndral_api.auth_utils import get_current_user
+from myndral_api import totals, trending
+from myndral_api.auth_utils import get_optional_user_id, get_token_user
 from myndral_api.db.session import get_db
+from myndral_api.events import EventKind, PlaybackEvent, get_event_ingestor
 from myndral_api.media_utils import normalize_audio_url, normalize_image_url
+from myndral_api.pagination import Keyset, SortKey
+from myndral_api.response_cache import cached_response
 
 router = APIRouter()
 
@@ -64,8 +71,11 @@ def _serialize_track(row: Any) -> dict[str, Any]:
     }
 
 
-TRACK_SELECT_BASE = """
-SELECT
+# Reads the track_cards read model (track_cards.py): one pre-joined row per
+# visible track, so there is nothing left to filter on and callers append
+# "AND ..." conditions and an ORDER BY on card columns.  TRACK_COLUMNS alone
+# is for queries that reach the cards through another table.
+TRACK_COLUMNS = """
   t.id::text AS id,
   t.title,
   t.album_id::text AS album_id,
@@ -74,104 +84,101 @@ SELECT
   t.duration_ms,
   t.play_count,
   t.explicit,
-  pa.name AS artist_name,
-  pa.slug AS artist_slug,
-  pa.bio AS artist_bio,
-  pa.image_url AS artist_image_url,
-  pa.monthly_listeners AS artist_monthly_listeners,
-  pa.style_tags AS artist_style_tags,
-  al.title AS album_title,
-  al.cover_url AS album_cover_url,
-  COALESCE(al.release_date::text, CURRENT_DATE::text) AS album_release_date,
-  al.album_type::text AS album_type,
-  al.track_count AS album_track_count,
-  aa.id::text AS album_artist_id,
-  aa.name AS album_artist_name,
-  aa.slug AS album_artist_slug,
-  aa.bio AS album_artist_bio,
-  aa.image_url AS album_artist_image_url,
-  aa.monthly_listeners AS album_artist_monthly_listeners,
-  aa.style_tags AS album_artist_style_tags,
-  COALESCE((
-    SELECT array_agg(g.name ORDER BY g.name)
-    FROM album_genres ag
-    JOIN genres g ON g.id = ag.genre_id
-    WHERE ag.album_id = al.id
-  ), ARRAY[]::text[]) AS album_genre_tags,
-  COALESCE((
-    SELECT taf.storage_url
-    FROM track_audio_files taf
-    WHERE taf.track_id = t.id
-    ORDER BY CASE taf.quality
-      WHEN 'high_320' THEN 1
-      WHEN 'lossless' THEN 2
-      WHEN 'standard_256' THEN 3
-      WHEN 'low_128' THEN 4
-      ELSE 5
-    END
-    LIMIT 1
-  ), NULL) AS audio_url
-FROM tracks t
-JOIN artists pa ON pa.id = t.primary_artist_id
-JOIN albums al ON al.id = t.album_id
-JOIN artists aa ON aa.id = al.artist_id
-WHERE t.status = 'published'
-  AND al.status = 'published'
-  AND pa.status = 'published'
-  AND aa.status = 'published'
+  t.artist_name,
+  t.artist_slug,
+  t.artist_bio,
+  t.artist_image_url,
+  t.artist_monthly_listeners,
+  t.artist_style_tags,
+  t.album_title,
+  t.album_cover_url,
+  COALESCE(t.album_release_date::text, CURRENT_DATE::text) AS album_release_date,
+  t.album_type,
+  t.album_track_count,
+  t.album_artist_id::text AS album_artist_id,
+  t.album_artist_name,
+  t.album_artist_slug,
+  t.album_artist_bio,
+  t.album_artist_image_url,
+  t.album_artist_monthly_listeners,
+  t.album_artist_style_tags,
+  t.album_genre_tags,
+  t.audio_url,
+  t.created_at
+"""
+TRACK_SELECT_BASE = f"""
+SELECT{TRACK_COLUMNS}FROM track_cards t
+WHERE true
 """
 
+# Most played first; idx_track_cards_plays holds the same order.
+TRACK_KEYSET = Keyset(
+    SortKey("t.play_count", "play_count", "bigint"),
+    SortKey("t.created_at", "created_at", "timestamptz"),
+    SortKey("t.id", "id", "uuid"),
+)
+
 
 @router.get("/", summary="List tracks (paginated)")
 async def list_tracks(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
+    after_sql, after_params = TRACK_KEYSET.after(cursor)
     rows = (
         await db.execute(
             text(
                 TRACK_SELECT_BASE
-                + """
-ORDER BY t.play_count DESC, t.created_at DESC
-LIMIT :limit OFFSET :offset
-"""
+                + after_sql
+                + TRACK_KEYSET.order_by()
+                + "LIMIT :limit OFFSET :offset\n"
             ),
-            {"limit": limit, "offset": offset},
+            {"limit": limit + 1, "offset": offset, **after_params},
         )
     ).mappings().all()
-    total = int(
-        (
-            await db.execute(
-                text(
-                    """
-SELECT count(*)
-FROM tracks t
-JOIN artists pa ON pa.id = t.primary_artist_id
-JOIN albums al ON al.id = t.album_id
-JOIN artists aa ON aa.id = al.artist_id
-WHERE t.status = 'published'
-  AND al.status = 'published'
-  AND pa.status = 'published'
-  AND aa.status = 'published'
-"""
-                )
-            )
-        ).scalar_one()
-    )
+    page, next_cursor = TRACK_KEYSET.page(rows, limit)
+    total = totals.NO_TOTAL
+    if cursor is None:
+        total = await totals.estimated_total(db, "track_cards", exact=exact_total)
     return {
-        "items": [_serialize_track(row) for row in rows],
-        "total": total,
+        "items": [_serialize_track(row) for row in page],
+        **total.fields(),
         "limit": limit,
         "offset": offset,
+        "nextCursor": next_cursor,
     }
 
 
+async def _fetch_tracks_by_ids(db: AsyncSession, track_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """Serialized published tracks keyed by id; unknown or unpublished ids are left out."""
+    if not track_ids:
+        return {}
+    rows = (
+        await db.execute(
+            text(TRACK_SELECT_BASE + "  AND t.id = ANY(CAST(:track_ids AS uuid[]))\n"),
+            {"track_ids": track_ids},
+        )
+    ).mappings().all()
+    return {row["id"]: _serialize_track(row) for row in rows}
+
+
 @router.get("/featured", summary="Get featured tracks")
+@cached_response("tracks.featured", listing=True)
 async def featured_tracks(
     limit: int = Query(10, ge=1, le=50),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
+    # Featured is the global trending chart; before the rollup job has built
+    # one (fresh database, dev seed) fall back to all-time plays.
+    entries = await trending.read_chart(db, "track", limit=limit)
+    if entries:
+        by_id = await _fetch_tracks_by_ids(db, [entry.entity_id for entry in entries])
+        items = [by_id[entry.entity_id] for entry in entries if entry.entity_id in by_id]
+        return {"items": items, "total": len(items), "limit": limit, "offset": 0}
+
     rows = (
         await db.execute(
             text(
@@ -189,6 +196,7 @@ LIMIT :limit
 
 
 @router.get("/{track_id}", summary="Get track by ID")
+@cached_response("tracks.get")
 async def get_track(track_id: str, db: AsyncSession = Depends(get_db)) -> dict[str, Any]:
     row = (
         await db.execute(
@@ -201,6 +209,42 @@ async def get_track(track_id: str, db: AsyncSession = Depends(get_db)) -> dict[s
     return _serialize_track(row)
 
 
+@router.get("/{track_id}/related", summary="Get related tracks")
+async def related_tracks(
+    track_id: str,
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, Any]:
+    # Neighbours are precomputed offline (related.py): one primary-key lookup,
+    # then only the returned tracks are hydrated.
+    neighbor_ids = (
+        await db.execute(
+            text(
+                """
+SELECT (neighbor_ids[1:CAST(:limit AS integer)])::text[]
+FROM track_neighbors
+WHERE track_id = :track_id
+"""
+            ),
+            {"track_id": track_id, "limit": limit},
+        )
+    ).scalar_one_or_none()
+    if neighbor_ids is None:
+        exists = (
+            await db.execute(
+                text(TRACK_SELECT_BASE + "\nAND t.id = :track_id\nLIMIT 1\n"),
+                {"track_id": track_id},
+            )
+        ).first()
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Track not found")
+        neighbor_ids = []
+
+    by_id = await _fetch_tracks_by_ids(db, neighbor_ids)
+    items = [by_id[neighbor_id] for neighbor_id in neighbor_ids if neighbor_id in by_id]
+    return {"items": items, "total": len(items), "limit": limit, "offset": 0}
+
+
 @router.get("/{track_id}/lyrics", summary="Get track lyrics")
 async def get_lyrics(track_id: str, db: AsyncSession = Depends(get_db)) -> dict[str, Any]:
     row = (
@@ -229,7 +273,7 @@ LIMIT 1
 @router.put("/{track_id}/like", summary="Like a track")
 async def like_track(
     track_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     row = (
@@ -257,7 +301,7 @@ ON CONFLICT (user_id, track_id) DO NOTHING
 @router.delete("/{track_id}/like", summary="Unlike a track")
 async def unlike_track(
     track_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await db.execute(
@@ -267,7 +311,111 @@ async def unlike_track(
     return {"trackId": track_id, "isFavorite": False}
 
 
-@router.post("/{track_id}/play", summary="Record a play event")
-async def record_play(track_id: str) -> dict:
-    # TODO: write to play_history, increment play_count
-    raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Not implemented")
+# ── Playback events ───────────────────────────────────────────────────────────
+# Accepted with 202 and buffered (see events.py); nothing here touches the
+# database.  Track and session ids are only checked for UUID syntax — rows for
+# unknown tracks are dropped when the batch is flushed.
+
+PlaybackContext = Literal[
+    "album", "playlist", "artist_page", "search", "radio", "library", "recommendations", "unknown"
+]
+AudioQuality = Literal["low_128", "standard_256", "high_320", "lossless"]
+
+# Client clocks are trusted within this window; anything else is stamped on receipt.
+_MAX_EVENT_AGE = timedelta(hours=24)
+_MAX_EVENT_SKEW = timedelta(minutes=5)
+_MAX_EVENTS_PER_BATCH = 100
+
+
+class CamelModel(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, extra="forbid")
+
+
+class PlaybackEventRequest(CamelModel):
+    played_ms: int = Field(default=0, ge=0, le=86_400_000, alias="playedMs")
+    completed: bool = False
+    context_type: PlaybackContext = Field(default="unknown", alias="contextType")
+    context_id: UUID | None = Field(default=None, alias="contextId")
+    audio_quality: AudioQuality | None = Field(default=None, alias="audioQuality")
+    shuffle_active: bool | None = Field(default=None, alias="shuffleActive")
+    session_id: UUID | None = Field(default=None, alias="sessionId")
+    occurred_at: datetime | None = Field(default=None, alias="occurredAt")
+
+
+class BatchedPlaybackEventRequest(PlaybackEventRequest):
+    type: EventKind
+    track_id: UUID = Field(alias="trackId")
+
+
+class PlaybackEventBatchRequest(CamelModel):
+    events: list[BatchedPlaybackEventRequest] = Field(
+        min_length=1, max_length=_MAX_EVENTS_PER_BATCH
+    )
+
+
+def _to_event(
+    kind: EventKind, track_id: UUID, payload: PlaybackEventRequest, user_id: str | None
+) -> PlaybackEvent:
+    now = datetime.now(UTC)
+    occurred_at = payload.occurred_at
+    if occurred_at is not None and occurred_at.tzinfo is None:
+        occurred_at = occurred_at.replace(tzinfo=UTC)
+    if occurred_at is None or not (now - _MAX_EVENT_AGE <= occurred_at <= now + _MAX_EVENT_SKEW):
+        occurred_at = now
+    return PlaybackEvent(
+        kind=kind,
+        track_id=str(track_id),
+        occurred_at=occurred_at,
+        user_id=user_id,
+        session_id=str(payload.session_id) if payload.session_id else None,
+        played_ms=payload.played_ms,
+        completed=payload.completed,
+        context_type=payload.context_type,
+        context_id=str(payload.context_id) if payload.context_id else None,
+        audio_quality=payload.audio_quality,
+        shuffle_active=payload.shuffle_active,
+    )
+
+
+@router.post(
+    "/events",
+    summary="Record a batch of play/skip events",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def record_events(
+    payload: PlaybackEventBatchRequest,
+    user_id: str | None = Depends(get_optional_user_id),
+) -> dict[str, int]:
+    events = [_to_event(item.type, item.track_id, item, user_id) for item in payload.events]
+    await get_event_ingestor().submit(events)
+    return {"accepted": len(events)}
+
+
+@router.post(
+    "/{track_id}/play",
+    summary="Record a play event",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def record_play(
+    track_id: UUID,
+    payload: PlaybackEventRequest | None = None,
+    user_id: str | None = Depends(get_optional_user_id),
+) -> dict[str, int]:
+    event = _to_event("play", track_id, payload or PlaybackEventRequest(), user_id)
+    await get_event_ingestor().submit([event])
+    return {"accepted": 1}
+
+
+@router.post(
+    "/{track_id}/skip",
+    summary="Record a skip event",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def record_skip(
+    track_id: UUID,
+    payload: PlaybackEventRequest | None = None,
+    user_id: str | None = Depends(get_optional_user_id),
+) -> dict[str, int]:
+    event = _to_event("skip", track_id, payload or PlaybackEventRequest(), user_id)
+    await get_event_ingestor().submit([event])
+    return {"accepted": 1}
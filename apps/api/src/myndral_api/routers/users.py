@@ -4,18 +4,23 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from myndral_api.auth_utils import get_current_user
+from myndral_api import totals
+from myndral_api.auth_utils import get_current_user, get_token_user
 from myndral_api.db.session import get_db
+from myndral_api.pagination import Keyset, SortKey
 from myndral_api.routers import albums as albums_router
 from myndral_api.routers import artists as artists_router
 from myndral_api.routers import tracks as tracks_router
-from myndral_api.routers.playlists import _fetch_playlist_tracks, _serialize_playlist
+from myndral_api.routers.playlists import (
+    PLAYLIST_KEYSET,
+    _fetch_playlist_tracks,
+    _serialize_playlist,
+)
 
 router = APIRouter()
 
 
-ALBUM_SELECT_BASE = """
-SELECT
+ALBUM_COLUMNS = """
   al.id::text AS id,
   al.title,
   al.artist_id::text AS artist_id,
@@ -35,15 +40,16 @@ SELECT
     JOIN genres g ON g.id = ag.genre_id
     WHERE ag.album_id = al.id
   ), ARRAY[]::text[]) AS genre_tags
-FROM albums al
+"""
+ALBUM_SELECT_BASE = f"""
+SELECT{ALBUM_COLUMNS}FROM albums al
 JOIN artists ar ON ar.id = al.artist_id
 WHERE al.status = 'published'
   AND ar.status = 'published'
 """
 
 
-ARTIST_SELECT_BASE = """
-SELECT
+ARTIST_COLUMNS = """
   a.id::text AS id,
   a.name,
   a.slug,
@@ -51,11 +57,22 @@ SELECT
   a.image_url,
   a.monthly_listeners,
   a.style_tags
-FROM artists a
+"""
+ARTIST_SELECT_BASE = f"""
+SELECT{ARTIST_COLUMNS}FROM artists a
 WHERE a.status = 'published'
 """
 
 
+def _relation_keyset(timestamp_column: str, id_column: str) -> Keyset:
+    # Most recently added first, read off the relation's (user_id, timestamp)
+    # index; the relation's primary key makes (timestamp, id) unique.
+    return Keyset(
+        SortKey(f"rel.{timestamp_column}", "related_at", "timestamptz"),
+        SortKey(f"rel.{id_column}", "id", "uuid"),
+    )
+
+
 def _is_admin(current_user: dict[str, Any]) -> bool:
     return current_user.get("role") == "admin"
 
@@ -197,16 +214,20 @@ async def _list_library_playlists(
     *,
     limit: int,
     offset: int,
+    cursor: str | None,
+    exact_total: bool,
     editable_only: bool,
     current_user: dict[str, Any],
     db: AsyncSession,
 ) -> dict[str, Any]:
     user_id = current_user["id"]
+    after_sql, after_params = PLAYLIST_KEYSET.after(cursor)
     params = {
         "user_id": user_id,
         "is_admin": _is_admin(current_user),
-        "limit": limit,
+        "limit": limit + 1,
         "offset": offset,
+        **after_params,
     }
     if editable_only:
         where_clause = """
@@ -277,27 +298,33 @@ SELECT DISTINCT
 FROM playlists p
 JOIN users owner ON owner.id = p.owner_id
 WHERE {where_clause}
-ORDER BY p.updated_at DESC
-LIMIT :limit OFFSET :offset
+{after_sql}{PLAYLIST_KEYSET.order_by()}LIMIT :limit OFFSET :offset
 """
             ),
             params,
         )
     ).mappings().all()
-    total = int(
-        (
-            await db.execute(
-                text(f"SELECT count(*) FROM playlists p WHERE {where_clause}"),
-                {"user_id": user_id, "is_admin": _is_admin(current_user)},
-            )
-        ).scalar_one()
-    )
+    page, next_cursor = PLAYLIST_KEYSET.page(rows, limit)
+    total = totals.NO_TOTAL
+    if cursor is None:
+        total = await totals.capped_total(
+            db,
+            f"SELECT 1 FROM playlists p WHERE {where_clause}",
+            {"user_id": user_id, "is_admin": _is_admin(current_user)},
+            exact=exact_total,
+        )
 
     items: list[dict[str, Any]] = []
-    for row in rows:
+    for row in page:
         tracks = await _fetch_playlist_tracks(db, row["id"])
         items.append(_serialize_playlist(row, tracks))
-    return {"items": items, "total": total, "limit": limit, "offset": offset}
+    return {
+        "items": items,
+        **total.fields(),
+        "limit": limit,
+        "offset": offset,
+        "nextCursor": next_cursor,
+    }
 
 
 async def _list_tracks_for_relation(
@@ -308,61 +335,47 @@ async def _list_tracks_for_relation(
     user_id: str,
     limit: int,
     offset: int,
+    cursor: str | None,
+    exact_total: bool,
 ) -> dict[str, Any]:
+    keyset = _relation_keyset(timestamp_column, "track_id")
+    after_sql, after_params = keyset.after(cursor)
     rows = (
         await db.execute(
             text(
-                tracks_router.TRACK_SELECT_BASE
-                + f"""
-AND EXISTS (
-  SELECT 1
-  FROM {table_name} rel
-  WHERE rel.user_id = :user_id
-    AND rel.track_id = t.id
-)
-ORDER BY (
-  SELECT max(rel.{timestamp_column})
-  FROM {table_name} rel
-  WHERE rel.user_id = :user_id
-    AND rel.track_id = t.id
-) DESC NULLS LAST, t.created_at DESC
-LIMIT :limit OFFSET :offset
+                f"""
+SELECT{tracks_router.TRACK_COLUMNS}, rel.{timestamp_column} AS related_at
+FROM {table_name} rel
+JOIN track_cards t ON t.id = rel.track_id
+WHERE rel.user_id = :user_id
 """
+                + after_sql
+                + keyset.order_by()
+                + "LIMIT :limit OFFSET :offset\n"
             ),
-            {"user_id": user_id, "limit": limit, "offset": offset},
+            {"user_id": user_id, "limit": limit + 1, "offset": offset, **after_params},
         )
     ).mappings().all()
-    total = int(
-        (
-            await db.execute(
-                text(
-                    f"""
-SELECT count(*)
-FROM tracks t
-JOIN artists pa ON pa.id = t.primary_artist_id
-JOIN albums al ON al.id = t.album_id
-JOIN artists aa ON aa.id = al.artist_id
-WHERE t.status = 'published'
-  AND al.status = 'published'
-  AND pa.status = 'published'
-  AND aa.status = 'published'
-  AND EXISTS (
-    SELECT 1
-    FROM {table_name} rel
-    WHERE rel.user_id = :user_id
-      AND rel.track_id = t.id
-  )
-"""
-                ),
-                {"user_id": user_id},
-            )
-        ).scalar_one()
-    )
+    page, next_cursor = keyset.page(rows, limit)
+    total = totals.NO_TOTAL
+    if cursor is None:
+        total = await totals.capped_total(
+            db,
+            f"""
+SELECT 1
+FROM {table_name} rel
+JOIN track_cards t ON t.id = rel.track_id
+WHERE rel.user_id = :user_id
+""",
+            {"user_id": user_id},
+            exact=exact_total,
+        )
     return {
-        "items": [tracks_router._serialize_track(row) for row in rows],
-        "total": total,
+        "items": [tracks_router._serialize_track(row) for row in page],
+        **total.fields(),
         "limit": limit,
         "offset": offset,
+        "nextCursor": next_cursor,
     }
 
 
@@ -374,57 +387,53 @@ async def _list_albums_for_relation(
     user_id: str,
     limit: int,
     offset: int,
+    cursor: str | None,
+    exact_total: bool,
 ) -> dict[str, Any]:
+    keyset = _relation_keyset(timestamp_column, "album_id")
+    after_sql, after_params = keyset.after(cursor)
     rows = (
         await db.execute(
             text(
-                ALBUM_SELECT_BASE
-                + f"""
-  AND EXISTS (
-    SELECT 1
-    FROM {table_name} rel
-    WHERE rel.user_id = :user_id
-      AND rel.album_id = al.id
-  )
-ORDER BY (
-  SELECT max(rel.{timestamp_column})
-  FROM {table_name} rel
-  WHERE rel.user_id = :user_id
-    AND rel.album_id = al.id
-) DESC NULLS LAST, al.created_at DESC
-LIMIT :limit OFFSET :offset
+                f"""
+SELECT{ALBUM_COLUMNS}, rel.{timestamp_column} AS related_at
+FROM {table_name} rel
+JOIN albums al ON al.id = rel.album_id
+JOIN artists ar ON ar.id = al.artist_id
+WHERE rel.user_id = :user_id
+  AND al.status = 'published'
+  AND ar.status = 'published'
 """
+                + after_sql
+                + keyset.order_by()
+                + "LIMIT :limit OFFSET :offset\n"
             ),
-            {"user_id": user_id, "limit": limit, "offset": offset},
+            {"user_id": user_id, "limit": limit + 1, "offset": offset, **after_params},
         )
     ).mappings().all()
-    total = int(
-        (
-            await db.execute(
-                text(
-                    f"""
-SELECT count(*)
-FROM albums al
+    page, next_cursor = keyset.page(rows, limit)
+    total = totals.NO_TOTAL
+    if cursor is None:
+        total = await totals.capped_total(
+            db,
+            f"""
+SELECT 1
+FROM {table_name} rel
+JOIN albums al ON al.id = rel.album_id
 JOIN artists ar ON ar.id = al.artist_id
-WHERE al.status = 'published'
+WHERE rel.user_id = :user_id
+  AND al.status = 'published'
   AND ar.status = 'published'
-  AND EXISTS (
-    SELECT 1
-    FROM {table_name} rel
-    WHERE rel.user_id = :user_id
-      AND rel.album_id = al.id
-  )
-"""
-                ),
-                {"user_id": user_id},
-            )
-        ).scalar_one()
-    )
+""",
+            {"user_id": user_id},
+            exact=exact_total,
+        )
     return {
-        "items": [albums_router._serialize_album(row) for row in rows],
-        "total": total,
+        "items": [albums_router._serialize_album(row) for row in page],
+        **total.fields(),
         "limit": limit,
         "offset": offset,
+        "nextCursor": next_cursor,
     }
 
 
@@ -436,55 +445,49 @@ async def _list_artists_for_relation(
     user_id: str,
     limit: int,
     offset: int,
+    cursor: str | None,
+    exact_total: bool,
 ) -> dict[str, Any]:
+    keyset = _relation_keyset(timestamp_column, "artist_id")
+    after_sql, after_params = keyset.after(cursor)
     rows = (
         await db.execute(
             text(
-                ARTIST_SELECT_BASE
-                + f"""
-  AND EXISTS (
-    SELECT 1
-    FROM {table_name} rel
-    WHERE rel.user_id = :user_id
-      AND rel.artist_id = a.id
-  )
-ORDER BY (
-  SELECT max(rel.{timestamp_column})
-  FROM {table_name} rel
-  WHERE rel.user_id = :user_id
-    AND rel.artist_id = a.id
-) DESC NULLS LAST, a.created_at DESC
-LIMIT :limit OFFSET :offset
+                f"""
+SELECT{ARTIST_COLUMNS}, rel.{timestamp_column} AS related_at
+FROM {table_name} rel
+JOIN artists a ON a.id = rel.artist_id
+WHERE rel.user_id = :user_id
+  AND a.status = 'published'
 """
+                + after_sql
+                + keyset.order_by()
+                + "LIMIT :limit OFFSET :offset\n"
             ),
-            {"user_id": user_id, "limit": limit, "offset": offset},
+            {"user_id": user_id, "limit": limit + 1, "offset": offset, **after_params},
         )
     ).mappings().all()
-    total = int(
-        (
-            await db.execute(
-                text(
-                    f"""
-SELECT count(*)
-FROM artists a
-WHERE a.status = 'published'
-  AND EXISTS (
-    SELECT 1
-    FROM {table_name} rel
-    WHERE rel.user_id = :user_id
-      AND rel.artist_id = a.id
-  )
-"""
-                ),
-                {"user_id": user_id},
-            )
-        ).scalar_one()
-    )
+    page, next_cursor = keyset.page(rows, limit)
+    total = totals.NO_TOTAL
+    if cursor is None:
+        total = await totals.capped_total(
+            db,
+            f"""
+SELECT 1
+FROM {table_name} rel
+JOIN artists a ON a.id = rel.artist_id
+WHERE rel.user_id = :user_id
+  AND a.status = 'published'
+""",
+            {"user_id": user_id},
+            exact=exact_total,
+        )
     return {
-        "items": [artists_router._serialize_artist(row) for row in rows],
-        "total": total,
+        "items": [artists_router._serialize_artist(row) for row in page],
+        **total.fields(),
         "limit": limit,
         "offset": offset,
+        "nextCursor": next_cursor,
     }
 
 
@@ -507,7 +510,7 @@ async def get_collection_state(
     album_ids: list[str] = Query(default_factory=list, alias="albumIds"),
     artist_ids: list[str] = Query(default_factory=list, alias="artistIds"),
     playlist_ids: list[str] = Query(default_factory=list, alias="playlistIds"),
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     user_id = current_user["id"]
@@ -628,7 +631,9 @@ WHERE p.id::text IN :ids
 async def get_library_tracks(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: dict[str, Any] = Depends(get_current_user),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     return await _list_tracks_for_relation(
@@ -638,13 +643,15 @@ async def get_library_tracks(
         user_id=current_user["id"],
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        exact_total=exact_total,
     )
 
 
 @router.put("/me/library/tracks/{track_id}", summary="Save a track to the current user's library")
 async def save_track_to_library(
     track_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await _ensure_track_available(db, track_id)
@@ -664,7 +671,7 @@ ON CONFLICT (user_id, track_id) DO NOTHING
 @router.delete("/me/library/tracks/{track_id}", summary="Remove a track from the current user's library")
 async def remove_track_from_library(
     track_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await db.execute(
@@ -678,7 +685,9 @@ async def remove_track_from_library(
 async def get_library_albums(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: dict[str, Any] = Depends(get_current_user),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     return await _list_albums_for_relation(
@@ -688,13 +697,15 @@ async def get_library_albums(
         user_id=current_user["id"],
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        exact_total=exact_total,
     )
 
 
 @router.put("/me/library/albums/{album_id}", summary="Save an album to the current user's library")
 async def save_album_to_library(
     album_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await _ensure_album_available(db, album_id)
@@ -714,7 +725,7 @@ ON CONFLICT (user_id, album_id) DO NOTHING
 @router.delete("/me/library/albums/{album_id}", summary="Remove an album from the current user's library")
 async def remove_album_from_library(
     album_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await db.execute(
@@ -728,7 +739,9 @@ async def remove_album_from_library(
 async def get_library_artists(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: dict[str, Any] = Depends(get_current_user),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     return await _list_artists_for_relation(
@@ -738,13 +751,15 @@ async def get_library_artists(
         user_id=current_user["id"],
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        exact_total=exact_total,
     )
 
 
 @router.put("/me/library/artists/{artist_id}", summary="Save an artist to the current user's library")
 async def save_artist_to_library(
     artist_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await _ensure_artist_available(db, artist_id)
@@ -764,7 +779,7 @@ ON CONFLICT (user_id, artist_id) DO NOTHING
 @router.delete("/me/library/artists/{artist_id}", summary="Remove an artist from the current user's library")
 async def remove_artist_from_library(
     artist_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await db.execute(
@@ -778,12 +793,16 @@ async def remove_artist_from_library(
 async def get_library_playlists(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: dict[str, Any] = Depends(get_current_user),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     return await _list_library_playlists(
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        exact_total=exact_total,
         editable_only=False,
         current_user=current_user,
         db=db,
@@ -793,7 +812,7 @@ async def get_library_playlists(
 @router.put("/me/library/playlists/{playlist_id}", summary="Save a playlist to the current user's library")
 async def save_playlist_to_library(
     playlist_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     playlist = await _ensure_playlist_accessible(db, playlist_id, current_user)
@@ -829,7 +848,7 @@ WHERE id = :playlist_id
 @router.delete("/me/library/playlists/{playlist_id}", summary="Remove a playlist from the current user's library")
 async def remove_playlist_from_library(
     playlist_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     playlist = await _ensure_playlist_accessible(db, playlist_id, current_user)
@@ -863,7 +882,9 @@ WHERE id = :playlist_id
 async def get_favorite_tracks(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: dict[str, Any] = Depends(get_current_user),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     return await _list_tracks_for_relation(
@@ -873,13 +894,15 @@ async def get_favorite_tracks(
         user_id=current_user["id"],
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        exact_total=exact_total,
     )
 
 
 @router.put("/me/favorites/tracks/{track_id}", summary="Favorite a track")
 async def favorite_track(
     track_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await _ensure_track_available(db, track_id)
@@ -899,7 +922,7 @@ ON CONFLICT (user_id, track_id) DO NOTHING
 @router.delete("/me/favorites/tracks/{track_id}", summary="Unfavorite a track")
 async def unfavorite_track(
     track_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await db.execute(
@@ -913,7 +936,9 @@ async def unfavorite_track(
 async def get_favorite_albums(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: dict[str, Any] = Depends(get_current_user),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     return await _list_albums_for_relation(
@@ -923,13 +948,15 @@ async def get_favorite_albums(
         user_id=current_user["id"],
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        exact_total=exact_total,
     )
 
 
 @router.put("/me/favorites/albums/{album_id}", summary="Favorite an album")
 async def favorite_album(
     album_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await _ensure_album_available(db, album_id)
@@ -949,7 +976,7 @@ ON CONFLICT (user_id, album_id) DO NOTHING
 @router.delete("/me/favorites/albums/{album_id}", summary="Unfavorite an album")
 async def unfavorite_album(
     album_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await db.execute(
@@ -963,7 +990,9 @@ async def unfavorite_album(
 async def get_favorite_artists(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: dict[str, Any] = Depends(get_current_user),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     return await _list_artists_for_relation(
@@ -973,13 +1002,15 @@ async def get_favorite_artists(
         user_id=current_user["id"],
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        exact_total=exact_total,
     )
 
 
 @router.put("/me/favorites/artists/{artist_id}", summary="Favorite an artist")
 async def favorite_artist(
     artist_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await _ensure_artist_available(db, artist_id)
@@ -999,7 +1030,7 @@ ON CONFLICT (user_id, artist_id) DO NOTHING
 @router.delete("/me/favorites/artists/{artist_id}", summary="Unfavorite an artist")
 async def unfavorite_artist(
     artist_id: str,
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     await db.execute(
@@ -1013,43 +1044,74 @@ async def unfavorite_artist(
 async def get_liked_tracks(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: dict[str, Any] = Depends(get_current_user),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
-    return await get_favorite_tracks(limit=limit, offset=offset, current_user=current_user, db=db)
+    return await get_favorite_tracks(
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        exact_total=exact_total,
+        current_user=current_user,
+        db=db,
+    )
 
 
 @router.get("/me/albums", summary="Get current user's saved albums")
 async def get_saved_albums(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: dict[str, Any] = Depends(get_current_user),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
-    return await get_library_albums(limit=limit, offset=offset, current_user=current_user, db=db)
+    return await get_library_albums(
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        exact_total=exact_total,
+        current_user=current_user,
+        db=db,
+    )
 
 
 @router.get("/me/artists", summary="Get artists followed by current user")
 async def get_followed_artists(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    current_user: dict[str, Any] = Depends(get_current_user),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
-    return await get_library_artists(limit=limit, offset=offset, current_user=current_user, db=db)
+    return await get_library_artists(
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        exact_total=exact_total,
+        current_user=current_user,
+        db=db,
+    )
 
 
 @router.get("/me/playlists", summary="Get current user's playlists")
 async def get_my_playlists(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
+    exact_total: bool = Query(False, alias="exactTotal"),
     editable_only: bool = Query(False, alias="editableOnly"),
-    current_user: dict[str, Any] = Depends(get_current_user),
+    current_user: dict[str, Any] = Depends(get_token_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, Any]:
     return await _list_library_playlists(
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        exact_total=exact_total,
         editable_only=editable_only,
         current_user=current_user,
         db=db,
@@ -0,0 +1,185 @@
+"""
+Refresh-token sessions and access-token revocation.
+
+A login opens a ``user_sessions`` row holding the SHA-256 of an opaque
+refresh token.  Only the hash is stored, so a database read does not yield
+usable tokens.  ``POST /v1/auth/refresh`` rotates the token in place: the
+presented token stops working, the row gets a new hash and a new expiry,
+and the session id (the access token's ``sid`` claim) stays the same.
+Logout and forced logouts set ``revoked_at``, after which refresh fails.
+
+Access tokens are stateless and carry ``role`` and ``plan`` claims, so they
+outlive a revocation until they expire.  With ``REDIS_CACHE_ENABLED`` a
+sorted set closes that gap.  Its members are scored with the revocation
+time, and a token issued (``iat``) before its member's score is affected:
+
+* ``session:<id>`` — the session was logged out; its access tokens are
+  rejected.
+* ``user:<id>`` — the user's role, plan or active flag changed; the claims
+  of older tokens are stale, and the request falls back to the user lookup
+  in Postgres.
+
+Members older than one access-token lifetime are pruned on every write, so
+the set only ever holds recent revocations.  Without Redis, revocations
+take effect when the access token expires.
+"""
+from __future__ import annotations
+
+import hashlib
+import secrets
+import time
+from typing import Any, Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api.caching import redis_call
+from myndral_api.config import get_settings
+
+_REVOKED_KEY = "myndral:revoked-tokens"
+
+TokenStatus = Literal["valid", "stale", "revoked"]
+
+_OPEN_SESSION_SQL = """
+INSERT INTO user_sessions (user_id, refresh_token_hash, ip_address, user_agent, expires_at)
+VALUES (
+  :user_id,
+  :token_hash,
+  CAST(:ip_address AS inet),
+  :user_agent,
+  now() + make_interval(days => :days)
+)
+RETURNING id::text
+"""
+
+# Conditional on the presented hash, so of two concurrent refreshes with the
+# same token exactly one succeeds.
+_ROTATE_SESSION_SQL = """
+UPDATE user_sessions
+SET
+  refresh_token_hash = :new_hash,
+  expires_at = now() + make_interval(days => :days)
+WHERE refresh_token_hash = :token_hash
+  AND revoked_at IS NULL
+  AND expires_at > now()
+RETURNING id::text, user_id::text
+"""
+
+_REVOKE_SESSION_SQL = """
+UPDATE user_sessions
+SET revoked_at = now()
+WHERE refresh_token_hash = :token_hash
+  AND revoked_at IS NULL
+RETURNING id::text
+"""
+
+_REVOKE_USER_SESSIONS_SQL = """
+UPDATE user_sessions
+SET revoked_at = now()
+WHERE user_id = :user_id
+  AND revoked_at IS NULL
+"""
+
+
+def _hash_token(refresh_token: str) -> str:
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+async def open_session(
+    db: AsyncSession,
+    user_id: str,
+    *,
+    ip_address: str | None = None,
+    user_agent: str | None = None,
+) -> tuple[str, str]:
+    """Create a session for ``user_id``; return ``(session_id, refresh_token)``."""
+    refresh_token = secrets.token_urlsafe(32)
+    session_id = (
+        await db.execute(
+            text(_OPEN_SESSION_SQL),
+            {
+                "user_id": user_id,
+                "token_hash": _hash_token(refresh_token),
+                "ip_address": ip_address or None,
+                "user_agent": user_agent,
+                "days": get_settings().refresh_token_expire_days,
+            },
+        )
+    ).scalar_one()
+    return session_id, refresh_token
+
+
+async def rotate_session(db: AsyncSession, refresh_token: str) -> tuple[str, str, str] | None:
+    """Replace a live refresh token; ``(session_id, user_id, new_token)`` or ``None``."""
+    new_token = secrets.token_urlsafe(32)
+    row = (
+        await db.execute(
+            text(_ROTATE_SESSION_SQL),
+            {
+                "token_hash": _hash_token(refresh_token),
+                "new_hash": _hash_token(new_token),
+                "days": get_settings().refresh_token_expire_days,
+            },
+        )
+    ).first()
+    if row is None:
+        return None
+    return row[0], row[1], new_token
+
+
+async def revoke_session(db: AsyncSession, refresh_token: str) -> str | None:
+    """Revoke the session holding ``refresh_token``; its id, or ``None`` if none was live."""
+    return (
+        await db.execute(text(_REVOKE_SESSION_SQL), {"token_hash": _hash_token(refresh_token)})
+    ).scalar_one_or_none()
+
+
+async def revoke_user_sessions(db: AsyncSession, user_id: str) -> None:
+    """Revoke every session of a user, so none of them can refresh again."""
+    await db.execute(text(_REVOKE_USER_SESSIONS_SQL), {"user_id": user_id})
+
+
+async def revoke_access_tokens(
+    *, session_id: str | None = None, user_id: str | None = None
+) -> None:
+    """Record a revocation for access tokens issued until now; call after the commit."""
+    members = [f"session:{session_id}"] if session_id else []
+    if user_id:
+        members.append(f"user:{user_id}")
+    if not members:
+        return
+    now = time.time()
+    lifetime = get_settings().access_token_expire_minutes * 60
+
+    async def _add(redis):
+        pipe = redis.pipeline(transaction=False)
+        pipe.zadd(_REVOKED_KEY, {member: now for member in members})
+        pipe.zremrangebyscore(_REVOKED_KEY, "-inf", now - lifetime)
+        pipe.expire(_REVOKED_KEY, lifetime)
+        await pipe.execute()
+
+    await redis_call(_add)
+
+
+async def access_token_status(claims: dict[str, Any]) -> TokenStatus | None:
+    """Check decoded access-token claims against the revocation set.
+
+    ``None`` means the set cannot be consulted (Redis off or failing), so
+    the caller must not rely on the token's role and plan claims.
+    """
+    if not get_settings().redis_cache_enabled:
+        return None
+    members = [f"user:{claims['sub']}"]
+    if claims.get("sid"):
+        members.append(f"session:{claims['sid']}")
+    scores = await redis_call(lambda redis: redis.zmscore(_REVOKED_KEY, members))
+    if scores is None:
+        return None
+    issued_at = float(claims.get("iat", 0))
+    user_score = scores[0]
+    session_score = scores[1] if len(scores) > 1 else None
+    if session_score is not None and issued_at < session_score:
+        return "revoked"
+    if user_score is not None and issued_at < user_score:
+        return "stale"
+    return "valid"
@@ -0,0 +1,100 @@
+"""
+Single-flight coalescing for identical concurrent reads.
+
+When a new album drops, hundreds of clients ask for the same album, track
+list and cover image within the same second.  A cache only helps once the
+first read has finished, so every request that arrives before then runs the
+same query or storage fetch again.
+
+``SingleFlight.do(key, fn)`` runs ``fn()`` once per key at a time.  Callers
+that arrive while it is running wait for it and share its result or its
+exception.  Results are shared objects, so callers must not mutate them.
+Coalescing is per process; the caches in front of it (Redis, ``TTLCache``)
+share results across instances once the first read has finished.
+
+If the caller running ``fn`` is cancelled (a client disconnects), the
+waiters do not inherit the cancellation.  One of them runs ``fn`` instead.
+The waiters never run ``fn`` with their own database session otherwise, so
+``fn`` may close over the session of the request that started it.
+
+Each group counts executions and coalesced callers.  The counters are served
+by ``GET /v1/internal/metrics/single-flight``.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class SingleFlightStats:
+    executions: int = 0
+    coalesced: int = 0
+
+    def to_dict(self) -> dict[str, int | float]:
+        calls = self.executions + self.coalesced
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalescingRatio": round(self.coalesced / calls, 4) if calls else 0.0,
+        }
+
+
+class SingleFlight[K: Hashable]:
+    """Runs at most one ``fn`` per key at a time and shares its outcome."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.stats = SingleFlightStats()
+        self._calls: dict[K, asyncio.Future[Any]] = {}
+        _groups[name] = self
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do[T](self, key: K, fn: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            call = self._calls.get(key)
+            if call is None:
+                break
+            self.stats.coalesced += 1
+            try:
+                # Shielded: a waiter's own cancellation must not cancel the call.
+                return await asyncio.shield(call)
+            except asyncio.CancelledError:
+                if not call.cancelled():
+                    raise
+                # The running caller was cancelled; try again, possibly as leader.
+                self.stats.coalesced -= 1
+
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        self.stats.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as exc:
+            call.set_exception(exc)
+            # Waiters re-raise it; mark it retrieved when there are none.
+            call.exception()
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def describe(self) -> dict[str, int | float]:
+        return {**self.stats.to_dict(), "inFlight": len(self._calls)}
+
+
+_groups: dict[str, SingleFlight[Any]] = {}
+
+
+def describe_all() -> dict[str, dict[str, int | float]]:
+    return {name: group.describe() for name, group in sorted(_groups.items())}
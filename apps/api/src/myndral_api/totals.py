@@ -0,0 +1,114 @@
+"""
+Totals for paginated list responses.
+
+Every list endpoint used to run a second ``count(*)`` over the same joins as
+its page.  That count walks every matching row, on every page.  This module
+replaces it with the cheapest total that still serves the client:
+
+* ``estimated_total`` is for lists that are a whole table.  It reads the
+  planner's row estimate (``pg_class.reltuples``), which VACUUM and ANALYZE
+  keep current.  Tables below ``list_total_estimate_min_rows`` rows, or never
+  analysed, are counted exactly through ``cached_total`` instead.
+* ``cached_total`` is for unfiltered catalog lists.  It reuses an exact count
+  per worker for ``list_total_cache_ttl_seconds``.
+* ``capped_total`` is for filtered and per-user lists.  It stops counting
+  after ``list_total_cap`` rows and reports the total as "at least" the cap.
+
+Every function takes ``exact=True``, which the endpoints map to the
+``exactTotal`` query flag, for clients that need the precise number.  The
+row source is passed as the ``SELECT 1 FROM … WHERE …`` that the page reads,
+without ORDER BY or LIMIT.  Responses carry ``total`` and ``totalAccuracy``,
+where the accuracy is "exact", "estimated" or "atLeast".
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api.caching import TTLCache
+from myndral_api.config import get_settings
+
+_ESTIMATE_SQL = """
+SELECT reltuples::bigint
+FROM pg_class
+WHERE oid = to_regclass(:table_name)
+"""
+
+_cache: TTLCache[str, int] = TTLCache(get_settings().list_total_cache_ttl_seconds, 1_000)
+
+
+@dataclass(frozen=True)
+class Total:
+    value: int | None
+    accuracy: str | None = "exact"
+
+    def fields(self) -> dict[str, Any]:
+        return {"total": self.value, "totalAccuracy": self.accuracy}
+
+
+# Cursor pages (pagination.py) report no total; the first page carried one.
+NO_TOTAL = Total(None, None)
+
+
+async def _count(db: AsyncSession, source: str, params: dict[str, Any] | None) -> int:
+    sql = f"SELECT count(*) FROM ({source}) AS counted"
+    return int((await db.execute(text(sql), params or {})).scalar_one())
+
+
+async def cached_total(
+    db: AsyncSession,
+    key: str,
+    source: str,
+    params: dict[str, Any] | None = None,
+    *,
+    exact: bool = False,
+) -> Total:
+    """Exact count of ``source``, reused under ``key`` for the cache TTL."""
+    cached = None if exact else _cache.get(key)
+    if cached is None:
+        cached = await _count(db, source, params)
+        _cache.put(key, cached)
+    return Total(cached)
+
+
+async def estimated_total(db: AsyncSession, table_name: str, *, exact: bool = False) -> Total:
+    """Row count of a whole table, estimated once the table is large."""
+    source = f"SELECT 1 FROM {table_name}"
+    if exact:
+        return await cached_total(db, table_name, source, exact=True)
+    key = f"estimate:{table_name}"
+    estimate = _cache.get(key)
+    if estimate is None:
+        estimate = int(
+            (await db.execute(text(_ESTIMATE_SQL), {"table_name": table_name})).scalar_one()
+            or -1
+        )
+        _cache.put(key, estimate)
+    if estimate < get_settings().list_total_estimate_min_rows:
+        # Small or never analysed (reltuples = -1): counting is cheap and exact.
+        return await cached_total(db, table_name, source)
+    return Total(estimate, "estimated")
+
+
+async def capped_total(
+    db: AsyncSession,
+    source: str,
+    params: dict[str, Any] | None = None,
+    *,
+    exact: bool = False,
+) -> Total:
+    """Count of ``source``, stopping once it passes ``list_total_cap``."""
+    if exact:
+        return Total(await _count(db, source, params))
+    cap = get_settings().list_total_cap
+    counted = await _count(db, f"{source}\nLIMIT {cap + 1}", params)
+    if counted > cap:
+        return Total(cap, "atLeast")
+    return Total(counted)
+
+
+def clear_cache() -> None:
+    _cache.clear()
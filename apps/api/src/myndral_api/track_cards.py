@@ -0,0 +1,188 @@
+"""
+Denormalised "track card" read model.
+
+Every public track listing serialises the same card: the track, its primary
+artist, its album with the album artist and genre tags, and the preferred
+audio file.  Assembling that per request means four joins plus two
+correlated subqueries per row.  ``track_cards`` instead holds one pre-joined
+row per *visible* track — the track, its album and both artists published —
+so listings read a single table by index.
+
+The table is maintained by the code paths that change what a card shows:
+
+* staging publish / reject / revoke / restore (routers/staging.py) and the
+  internal edit endpoints (routers/internal.py) call ``refresh_track_cards``
+  with the ids they touched, in the same transaction as the change;
+* the rollup job (rollups.py) applies play-count deltas to cards alongside
+  ``tracks`` and calls ``sync_listener_counts`` after recounting listeners.
+
+Anything written to the catalog by other means (manual SQL, seed scripts) is
+picked up by a full rebuild, safe to run at any time:
+
+    python -m myndral_api.track_cards
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myndral_api.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# In the order _SOURCE_SQL selects them.
+_COLUMNS = (
+    "id", "title", "album_id", "primary_artist_id", "album_artist_id",
+    "disc_number", "track_number", "duration_ms", "play_count", "explicit", "created_at",
+    "artist_name", "artist_slug", "artist_bio", "artist_image_url",
+    "artist_monthly_listeners", "artist_style_tags",
+    "album_title", "album_cover_url", "album_release_date", "album_type", "album_track_count",
+    "album_artist_name", "album_artist_slug", "album_artist_bio", "album_artist_image_url",
+    "album_artist_monthly_listeners", "album_artist_style_tags",
+    "album_genre_tags", "audio_url",
+)
+_COLUMN_LIST = ", ".join(_COLUMNS)
+_UPSERT_ASSIGNMENTS = ",\n  ".join(f"{column} = EXCLUDED.{column}" for column in _COLUMNS[1:])
+
+# The join every card used to be read through; only the refresh runs it now.
+_SOURCE_SQL = """
+SELECT
+  t.id, t.title, t.album_id, t.primary_artist_id, al.artist_id,
+  t.disc_number, t.track_number, t.duration_ms, t.play_count, t.explicit, t.created_at,
+  pa.name, pa.slug, pa.bio, pa.image_url,
+  pa.monthly_listeners, pa.style_tags,
+  al.title, al.cover_url, al.release_date, al.album_type::text, al.track_count,
+  aa.name, aa.slug, aa.bio, aa.image_url,
+  aa.monthly_listeners, aa.style_tags,
+  COALESCE((
+    SELECT array_agg(g.name ORDER BY g.name)
+    FROM album_genres ag
+    JOIN genres g ON g.id = ag.genre_id
+    WHERE ag.album_id = al.id
+  ), ARRAY[]::text[]),
+  (
+    SELECT taf.storage_url
+    FROM track_audio_files taf
+    WHERE taf.track_id = t.id
+    ORDER BY CASE taf.quality
+      WHEN 'high_320' THEN 1
+      WHEN 'lossless' THEN 2
+      WHEN 'standard_256' THEN 3
+      WHEN 'low_128' THEN 4
+      ELSE 5
+    END
+    LIMIT 1
+  )
+FROM tracks t
+JOIN artists pa ON pa.id = t.primary_artist_id
+JOIN albums al ON al.id = t.album_id
+JOIN artists aa ON aa.id = al.artist_id
+WHERE t.status = 'published'
+  AND al.status = 'published'
+  AND pa.status = 'published'
+  AND aa.status = 'published'
+"""
+
+_SOURCE_SCOPE_SQL = """
+  AND (
+    t.id = ANY(CAST(:track_ids AS uuid[]))
+    OR t.album_id = ANY(CAST(:album_ids AS uuid[]))
+    OR t.primary_artist_id = ANY(CAST(:artist_ids AS uuid[]))
+    OR al.artist_id = ANY(CAST(:artist_ids AS uuid[]))
+  )
+"""
+
+_DELETE_SCOPE_SQL = """
+DELETE FROM track_cards
+WHERE id = ANY(CAST(:track_ids AS uuid[]))
+   OR album_id = ANY(CAST(:album_ids AS uuid[]))
+   OR primary_artist_id = ANY(CAST(:artist_ids AS uuid[]))
+   OR album_artist_id = ANY(CAST(:artist_ids AS uuid[]))
+"""
+
+# Concurrent refreshes of overlapping scopes may both insert the same track.
+_INSERT_SCOPE_SQL = f"""
+INSERT INTO track_cards ({_COLUMN_LIST})
+{_SOURCE_SQL}{_SOURCE_SCOPE_SQL}
+ON CONFLICT (id) DO UPDATE SET
+  {_UPSERT_ASSIGNMENTS},
+  refreshed_at = now()
+"""
+
+_CLEAR_SQL = """
+DELETE FROM track_cards
+"""
+
+_INSERT_ALL_SQL = f"""
+INSERT INTO track_cards ({_COLUMN_LIST})
+{_SOURCE_SQL}
+"""
+
+_SYNC_LISTENERS_SQL = """
+UPDATE track_cards c
+SET artist_monthly_listeners = pa.monthly_listeners,
+    album_artist_monthly_listeners = aa.monthly_listeners
+FROM artists pa, artists aa
+WHERE pa.id = c.primary_artist_id
+  AND aa.id = c.album_artist_id
+  AND (
+    c.primary_artist_id = ANY(CAST(:artist_ids AS uuid[]))
+    OR c.album_artist_id = ANY(CAST(:artist_ids AS uuid[]))
+  )
+  AND (c.artist_monthly_listeners, c.album_artist_monthly_listeners)
+      IS DISTINCT FROM (pa.monthly_listeners, aa.monthly_listeners)
+"""
+
+
+async def refresh_track_cards(
+    db: AsyncSession,
+    *,
+    track_ids: Iterable[str] = (),
+    album_ids: Iterable[str] = (),
+    artist_ids: Iterable[str] = (),
+) -> int:
+    """Recompute the cards of the given tracks and of every track on the given
+    albums or by the given artists (primary or album artist).
+
+    Cards of tracks that are no longer visible are removed.  The caller
+    commits; returns the number of cards written.
+    """
+    params = {
+        "track_ids": [str(i) for i in track_ids],
+        "album_ids": [str(i) for i in album_ids],
+        "artist_ids": [str(i) for i in artist_ids],
+    }
+    if not any(params.values()):
+        return 0
+    await db.execute(text(_DELETE_SCOPE_SQL), params)
+    result = await db.execute(text(_INSERT_SCOPE_SQL), params)
+    return int(result.rowcount or 0)
+
+
+async def sync_listener_counts(db: AsyncSession, artist_ids: list[str]) -> None:
+    """Copy ``artists.monthly_listeners`` onto the cards of the given artists."""
+    if artist_ids:
+        await db.execute(text(_SYNC_LISTENERS_SQL), {"artist_ids": artist_ids})
+
+
+async def rebuild_track_cards(db: AsyncSession) -> int:
+    """Replace every card; the caller commits."""
+    await db.execute(text(_CLEAR_SQL))
+    result = await db.execute(text(_INSERT_ALL_SQL))
+    return int(result.rowcount or 0)
+
+
+async def _main() -> None:
+    async with AsyncSessionLocal() as db:
+        cards = await rebuild_track_cards(db)
+        await db.commit()
+    logger.info("Track cards rebuilt: %d", cards)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(_main())
@@ -0,0 +1,358 @@
+"""
+Time-decayed trending scores and the charts materialised from them.
+
+Every played track, album and artist has a row in ``chart_scores`` whose value
+is the sum over its events of ``weight · 2^(-age / CHART_HALF_LIFE_HOURS)``:
+a play counts 1, a completed play 1.5, a skip -0.5, and each halves in weight
+every half-life.  Scores use forward decay — an event at time ``t`` is stored
+as ``weight · 2^((t - epoch) / half-life)`` against a fixed epoch — so folding
+in new events is a plain addition and older rows are never rewritten.  The
+current value is ``stored · 2^(-(now - epoch) / half-life)``; that factor is
+shared by every row, so stored scores rank directly.
+
+The rollup job (rollups.py) adds each batch of ``play_events`` /
+``skip_events`` in the same transaction as the counters, so every event is
+scored exactly once.  The epoch is kept in ``rollup_state`` ('chart_epoch',
+epoch seconds).  Once it falls ``REBASE_AFTER_HALF_LIVES`` behind,
+``rebase_scores`` moves it to the start of today and rescales every score in
+one UPDATE, which keeps the exponent far from float overflow.
+
+``refresh_charts`` then rebuilds ``chart_entries``: the top ``CHART_SIZE``
+published tracks, albums and artists globally and per genre, ranked by score.
+Readers take one chart by primary-key range, O(N) in the entries returned,
+instead of sorting the catalog per request.  The rebuild commits atomically,
+so a reader sees either the previous charts or the new ones.
+
+Changing ``CHART_HALF_LIFE_HOURS`` does not rewrite existing scores; events
+scored under the old half-life wash out within a few half-lives.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+EntityType = Literal["track", "album", "artist"]
+ENTITY_TYPES: tuple[EntityType, ...] = ("track", "album", "artist")
+
+GLOBAL_CHART = "global"
+EPOCH_SOURCE = "chart_epoch"
+
+PLAY_WEIGHT = 1.0
+COMPLETED_PLAY_WEIGHT = 1.5
+SKIP_WEIGHT = -0.5
+
+# 2^32 ≈ 4e9: far below float overflow even for a very popular track.
+REBASE_AFTER_HALF_LIVES = 32
+# Scores that have decayed below this many recent plays are pruned.
+MIN_SCORE = 0.01
+
+
+@dataclass(frozen=True)
+class ChartEntry:
+    rank: int
+    entity_id: str
+    score: float
+    generated_at: datetime
+
+
+# ── SQL ───────────────────────────────────────────────────────────────────────
+
+_ENSURE_EPOCH_SQL = """
+INSERT INTO rollup_state (source, high_water)
+VALUES (:source, extract(epoch FROM date_trunc('day', now() AT TIME ZONE 'UTC'))::bigint)
+ON CONFLICT (source) DO NOTHING
+"""
+
+# Batches take the epoch FOR SHARE so that a rebase cannot interleave with them.
+_SHARE_EPOCH_SQL = """
+SELECT high_water FROM rollup_state WHERE source = :source FOR SHARE
+"""
+
+_LOCK_EPOCH_SQL = """
+SELECT high_water FROM rollup_state WHERE source = :source FOR UPDATE
+"""
+
+_MOVE_EPOCH_SQL = """
+UPDATE rollup_state SET high_water = :epoch, updated_at = now() WHERE source = :source
+"""
+
+_RESCALE_SQL = """
+UPDATE chart_scores SET score = score * :factor
+"""
+
+_PRUNE_SQL = """
+DELETE FROM chart_scores WHERE score < :floor
+"""
+
+# Client timestamps in the future are clamped to now, and far-past ones to a
+# weight of 2^-1000, so power() can neither overflow nor underflow.
+_WEIGHT_SQL = """
+  {weight} * power(
+    2.0::double precision,
+    GREATEST(
+      -1000.0,
+      (extract(epoch FROM LEAST({column}, now()))::double precision - :epoch) / :half_life
+    )
+  )"""
+
+_ADD_SCORES_SQL = """
+WITH batch AS (
+  SELECT t.id AS track_id, t.album_id, t.primary_artist_id AS artist_id,{weight} AS weight
+  FROM {table} e
+  JOIN tracks t ON t.id = e.track_id
+  WHERE e.seq > :low AND e.seq <= :high
+)
+INSERT INTO chart_scores AS cs (entity_type, entity_id, score)
+SELECT 'track', track_id, sum(weight) FROM batch GROUP BY track_id
+UNION ALL
+SELECT 'album', album_id, sum(weight) FROM batch GROUP BY album_id
+UNION ALL
+SELECT 'artist', artist_id, sum(weight) FROM batch GROUP BY artist_id
+ON CONFLICT (entity_type, entity_id)
+DO UPDATE SET score = cs.score + EXCLUDED.score, updated_at = now()
+"""
+
+_SCORE_PLAYS_SQL = _ADD_SCORES_SQL.format(
+    table="play_events",
+    weight=_WEIGHT_SQL.format(
+        weight=(
+            "CASE WHEN e.completed THEN CAST(:completed_weight AS double precision)"
+            " ELSE CAST(:play_weight AS double precision) END"
+        ),
+        column="e.played_at",
+    ),
+)
+
+_SCORE_SKIPS_SQL = _ADD_SCORES_SQL.format(
+    table="skip_events",
+    weight=_WEIGHT_SQL.format(
+        weight="CAST(:skip_weight AS double precision)", column="e.skipped_at"
+    ),
+)
+
+_CLEAR_CHARTS_SQL = """
+DELETE FROM chart_entries
+"""
+
+# Candidates are the published entities with a positive score; each lands in
+# the global chart and in the chart of every genre it is tagged with.
+_TRACK_CANDIDATES_SQL = """
+WITH scored AS (
+  SELECT cs.entity_id, cs.score
+  FROM chart_scores cs
+  JOIN tracks t ON t.id = cs.entity_id
+  JOIN albums al ON al.id = t.album_id
+  JOIN artists pa ON pa.id = t.primary_artist_id
+  JOIN artists aa ON aa.id = al.artist_id
+  WHERE cs.entity_type = 'track'
+    AND cs.score > 0
+    AND t.status = 'published'
+    AND al.status = 'published'
+    AND pa.status = 'published'
+    AND aa.status = 'published'
+),
+tagged AS (
+  SELECT s.entity_id, tg.genre_id
+  FROM scored s
+  JOIN track_genres tg ON tg.track_id = s.entity_id
+  UNION
+  SELECT s.entity_id, ag.genre_id
+  FROM scored s
+  JOIN tracks t ON t.id = s.entity_id
+  JOIN album_genres ag ON ag.album_id = t.album_id
+),"""
+
+_ALBUM_CANDIDATES_SQL = """
+WITH scored AS (
+  SELECT cs.entity_id, cs.score
+  FROM chart_scores cs
+  JOIN albums al ON al.id = cs.entity_id
+  JOIN artists ar ON ar.id = al.artist_id
+  WHERE cs.entity_type = 'album'
+    AND cs.score > 0
+    AND al.status = 'published'
+    AND ar.status = 'published'
+),
+tagged AS (
+  SELECT s.entity_id, ag.genre_id
+  FROM scored s
+  JOIN album_genres ag ON ag.album_id = s.entity_id
+),"""
+
+_ARTIST_CANDIDATES_SQL = """
+WITH scored AS (
+  SELECT cs.entity_id, cs.score
+  FROM chart_scores cs
+  JOIN artists a ON a.id = cs.entity_id
+  WHERE cs.entity_type = 'artist'
+    AND cs.score > 0
+    AND a.status = 'published'
+),
+tagged AS (
+  SELECT s.entity_id, ag.genre_id
+  FROM scored s
+  JOIN artist_genres ag ON ag.artist_id = s.entity_id
+),"""
+
+_RANK_SQL = """
+keyed AS (
+  SELECT 'global' AS chart_key, entity_id, score FROM scored
+  UNION ALL
+  SELECT tg.genre_id::text, s.entity_id, s.score
+  FROM tagged tg
+  JOIN scored s ON s.entity_id = tg.entity_id
+),
+ranked AS (
+  SELECT chart_key, entity_id, score,
+         row_number() OVER (PARTITION BY chart_key ORDER BY score DESC, entity_id) AS rank
+  FROM keyed
+)
+INSERT INTO chart_entries (entity_type, chart_key, rank, entity_id, score)
+SELECT CAST(:entity_type AS text), chart_key, rank, entity_id, score * :decay
+FROM ranked
+WHERE rank <= :size
+"""
+
+_REFRESH_SQL: dict[EntityType, str] = {
+    "track": _TRACK_CANDIDATES_SQL + _RANK_SQL,
+    "album": _ALBUM_CANDIDATES_SQL + _RANK_SQL,
+    "artist": _ARTIST_CANDIDATES_SQL + _RANK_SQL,
+}
+
+_READ_CHART_SQL = """
+SELECT entity_id::text AS entity_id, rank, score, generated_at
+FROM chart_entries
+WHERE entity_type = :entity_type
+  AND chart_key = :chart_key
+  AND rank > :offset
+ORDER BY rank
+LIMIT :limit
+"""
+
+_CHART_LENGTH_SQL = """
+SELECT count(*) FROM chart_entries WHERE entity_type = :entity_type AND chart_key = :chart_key
+"""
+
+
+# ── Decay arithmetic ──────────────────────────────────────────────────────────
+
+def decay_factor(epoch: int, now: datetime, half_life_seconds: float) -> float:
+    """Multiplier turning a stored score into its value at ``now``."""
+    return 2.0 ** (-(now.timestamp() - epoch) / half_life_seconds)
+
+
+def plan_rebase(epoch: int, now: datetime, half_life_seconds: float) -> tuple[int, float] | None:
+    """New epoch and rescale factor once ``epoch`` is too far behind, else None."""
+    if (now.timestamp() - epoch) / half_life_seconds < REBASE_AFTER_HALF_LIVES:
+        return None
+    seconds = int(now.timestamp())
+    new_epoch = seconds - seconds % 86_400
+    return new_epoch, 2.0 ** (-(new_epoch - epoch) / half_life_seconds)
+
+
+def _half_life_seconds(half_life_hours: float) -> float:
+    if not half_life_hours > 0 or math.isinf(half_life_hours):
+        raise ValueError(f"CHART_HALF_LIFE_HOURS must be positive: {half_life_hours!r}")
+    return half_life_hours * 3600.0
+
+
+async def _epoch(db: AsyncSession, lock_sql: str) -> int:
+    await db.execute(text(_ENSURE_EPOCH_SQL), {"source": EPOCH_SOURCE})
+    return int((await db.execute(text(lock_sql), {"source": EPOCH_SOURCE})).scalar_one())
+
+
+# ── Steps (the caller commits) ────────────────────────────────────────────────
+
+async def score_batch(
+    db: AsyncSession,
+    source: Literal["play_events", "skip_events"],
+    *,
+    low: int,
+    high: int,
+    half_life_hours: float,
+) -> None:
+    """Add the events with ``low < seq <= high`` to the decayed scores."""
+    params: dict[str, object] = {
+        "low": low,
+        "high": high,
+        "epoch": float(await _epoch(db, _SHARE_EPOCH_SQL)),
+        "half_life": _half_life_seconds(half_life_hours),
+    }
+    if source == "play_events":
+        params |= {"play_weight": PLAY_WEIGHT, "completed_weight": COMPLETED_PLAY_WEIGHT}
+        await db.execute(text(_SCORE_PLAYS_SQL), params)
+    else:
+        await db.execute(text(_SCORE_SKIPS_SQL), params | {"skip_weight": SKIP_WEIGHT})
+
+
+async def rebase_scores(
+    db: AsyncSession, *, half_life_hours: float, now: datetime | None = None
+) -> bool:
+    """Move the epoch forward and rescale every score if it is due; True if it was."""
+    now = now or datetime.now(UTC)
+    epoch = await _epoch(db, _LOCK_EPOCH_SQL)
+    plan = plan_rebase(epoch, now, _half_life_seconds(half_life_hours))
+    if plan is None:
+        return False
+    new_epoch, factor = plan
+    await db.execute(text(_RESCALE_SQL), {"factor": factor})
+    await db.execute(text(_MOVE_EPOCH_SQL), {"source": EPOCH_SOURCE, "epoch": new_epoch})
+    return True
+
+
+async def refresh_charts(
+    db: AsyncSession, *, size: int, half_life_hours: float, now: datetime | None = None
+) -> int:
+    """Prune faded scores and rebuild every chart; returns the entries written."""
+    now = now or datetime.now(UTC)
+    epoch = await _epoch(db, _SHARE_EPOCH_SQL)
+    decay = decay_factor(epoch, now, _half_life_seconds(half_life_hours))
+
+    await db.execute(text(_PRUNE_SQL), {"floor": MIN_SCORE / decay})
+    await db.execute(text(_CLEAR_CHARTS_SQL))
+    written = 0
+    for entity_type in ENTITY_TYPES:
+        result = await db.execute(
+            text(_REFRESH_SQL[entity_type]),
+            {"entity_type": entity_type, "decay": decay, "size": size},
+        )
+        written += int(result.rowcount or 0)
+    return written
+
+
+# ── Reads ─────────────────────────────────────────────────────────────────────
+
+async def read_chart(
+    db: AsyncSession,
+    entity_type: EntityType,
+    chart_key: str = GLOBAL_CHART,
+    *,
+    limit: int,
+    offset: int = 0,
+) -> list[ChartEntry]:
+    """Entries ranked ``offset + 1`` … ``offset + limit``; empty if the chart is not built."""
+    rows = (
+        await db.execute(
+            text(_READ_CHART_SQL),
+            {"entity_type": entity_type, "chart_key": chart_key, "limit": limit, "offset": offset},
+        )
+    ).mappings().all()
+    return [
+        ChartEntry(int(row["rank"]), row["entity_id"], float(row["score"]), row["generated_at"])
+        for row in rows
+    ]
+
+
+async def chart_length(db: AsyncSession, entity_type: EntityType, chart_key: str) -> int:
+    return int(
+        (
+            await db.execute(
+                text(_CHART_LENGTH_SQL), {"entity_type": entity_type, "chart_key": chart_key}
+            )
+        ).scalar_one()
+    )
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+
+from myndral_api.audio_cache import AudioBlockCache
+
+OBJECT = bytes(range(256)) * 64  # 16 KiB
+
+
+class _Origin:
+    def __init__(self) -> None:
+        self.calls: list[tuple[int, int]] = []
+
+    async def __call__(self, start: int, end: int) -> bytes:
+        self.calls.append((start, end))
+        return OBJECT[start : end + 1]
+
+
+async def _read(cache: AudioBlockCache, origin: _Origin, start: int, end: int) -> bytes:
+    key = cache.object_key("gs://bucket/audio/a.mp3", "abc123")
+    return b"".join([chunk async for chunk in cache.iter_range(key, start, end, origin)])
+
+
+@pytest.mark.asyncio
+async def test_block_cache_fetches_only_missing_aligned_blocks(tmp_path: Path) -> None:
+    cache = AudioBlockCache(tmp_path, max_bytes=1 << 20, block_size=4096)
+    origin = _Origin()
+
+    assert await _read(cache, origin, 1000, 5000) == OBJECT[1000:5001]
+    assert origin.calls == [(0, 4095), (4096, 8191)]
+
+    assert await _read(cache, origin, 4500, 9000) == OBJECT[4500:9001]
+    assert origin.calls[2:] == [(8192, 12287)]
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 3
+
+
+@pytest.mark.asyncio
+async def test_block_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = AudioBlockCache(tmp_path, max_bytes=8192, block_size=4096)
+    origin = _Origin()
+
+    await _read(cache, origin, 0, 8191)       # blocks 0, 1
+    await _read(cache, origin, 0, 10)         # touch block 0
+    await _read(cache, origin, 8192, 8200)    # block 2 evicts block 1
+
+    assert cache.stats.evictions == 1
+    assert cache.size_bytes == 8192
+    origin.calls.clear()
+    assert await _read(cache, origin, 0, 8191) == OBJECT[:8192]
+    assert origin.calls == [(4096, 8191)]
+
+
+@pytest.mark.asyncio
+async def test_block_cache_index_survives_restart(tmp_path: Path) -> None:
+    origin = _Origin()
+    await _read(AudioBlockCache(tmp_path, max_bytes=1 << 20, block_size=4096), origin, 0, 100)
+
+    reopened = AudioBlockCache(tmp_path, max_bytes=1 << 20, block_size=4096)
+    origin.calls.clear()
+    assert await _read(reopened, origin, 0, 100) == OBJECT[:101]
+    assert origin.calls == []
@@ -0,0 +1,205 @@
+from datetime import UTC, datetime
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import DataError, OperationalError
+
+from myndral_api import events
+from myndral_api.main import app
+
+TRACK_ID = "6f1c1d2e-4b8a-4a57-9d55-2a3f6f0b9c11"
+
+
+def _event(kind: events.EventKind = "play") -> events.PlaybackEvent:
+    return events.PlaybackEvent(kind=kind, track_id=TRACK_ID, occurred_at=datetime.now(UTC))
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.batches: list[list[events.PlaybackEvent]] = []
+        self.fail = False
+
+    async def __call__(self, batch: list[events.PlaybackEvent]) -> None:
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.batches.append(batch)
+
+
+@pytest.mark.asyncio
+async def test_ingestor_flushes_in_batches_and_retries_failed_batches() -> None:
+    writer = _Writer()
+    ingestor = events.EventIngestor(
+        events.MemoryEventQueue(max_events=100), writer, batch_size=4, interval_seconds=60
+    )
+    await ingestor.submit([_event() for _ in range(10)])
+
+    writer.fail = True
+    with pytest.raises(RuntimeError):
+        await ingestor.flush()
+    assert await ingestor.queue.pending() == 10
+    assert ingestor.stats.failed_flushes == 1
+
+    writer.fail = False
+    assert await ingestor.flush() == 10
+    assert [len(batch) for batch in writer.batches] == [4, 4, 2]
+    assert ingestor.stats.to_dict()["flushed"] == 10
+
+
+@pytest.mark.asyncio
+async def test_ingestor_dead_letters_a_batch_that_keeps_failing() -> None:
+    poison = _event("skip")
+
+    class _PoisonWriter(_Writer):
+        async def __call__(self, batch: list[events.PlaybackEvent]) -> None:
+            if poison in batch:
+                raise DataError("INSERT", {}, ValueError("invalid input value for enum"))
+            await super().__call__(batch)
+
+    writer = _PoisonWriter()
+    ingestor = events.EventIngestor(
+        events.MemoryEventQueue(max_events=100),
+        writer,
+        batch_size=2,
+        interval_seconds=60,
+        max_attempts=3,
+    )
+    await ingestor.submit([_event(), poison, _event(), _event()])
+
+    for _ in range(2):
+        with pytest.raises(DataError):
+            await ingestor.flush()
+        assert await ingestor.queue.pending() == 4
+        assert writer.batches == []
+
+    # The third failure drops the batch and the events behind it get through.
+    assert await ingestor.flush() == 2
+    assert [len(batch) for batch in writer.batches] == [2]
+    assert await ingestor.queue.pending() == 0
+    stats = ingestor.stats.to_dict()
+    assert (stats["failedFlushes"], stats["deadLettered"]) == (3, 2)
+
+
+@pytest.mark.asyncio
+async def test_ingestor_keeps_retrying_through_a_database_outage() -> None:
+    class _DownWriter(_Writer):
+        async def __call__(self, batch: list[events.PlaybackEvent]) -> None:
+            if self.fail:
+                raise OperationalError("INSERT", {}, ConnectionRefusedError())
+            await super().__call__(batch)
+
+    writer = _DownWriter()
+    writer.fail = True
+    ingestor = events.EventIngestor(
+        events.MemoryEventQueue(max_events=100),
+        writer,
+        batch_size=2,
+        interval_seconds=60,
+        max_attempts=2,
+    )
+    await ingestor.submit([_event() for _ in range(3)])
+
+    for _ in range(5):
+        with pytest.raises(OperationalError):
+            await ingestor.flush()
+    assert await ingestor.queue.pending() == 3
+
+    writer.fail = False
+    assert await ingestor.flush() == 3
+    assert ingestor.stats.dead_lettered == 0
+
+
+class _StreamRedis:
+    def __init__(self) -> None:
+        self.entries: list[dict[str, str]] = []
+
+    async def xlen(self, name: str) -> int:
+        return len(self.entries)
+
+    def pipeline(self, transaction: bool = True) -> "_StreamPipeline":
+        return _StreamPipeline(self)
+
+
+class _StreamPipeline:
+    def __init__(self, redis: _StreamRedis) -> None:
+        self.redis = redis
+
+    async def __aenter__(self) -> "_StreamPipeline":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        pass
+
+    def xadd(self, name: str, fields: dict[str, str], **kwargs: object) -> None:
+        assert "maxlen" not in kwargs
+        self.redis.entries.append(fields)
+
+    async def execute(self) -> list[object]:
+        return []
+
+
+@pytest.mark.asyncio
+async def test_redis_queue_counts_events_beyond_capacity_as_dropped() -> None:
+    redis = _StreamRedis()
+    ingestor = events.EventIngestor(
+        events.RedisEventQueue(redis, max_events=3), _Writer(), batch_size=10, interval_seconds=60
+    )
+    await ingestor.submit([_event() for _ in range(2)])
+    await ingestor.submit([_event() for _ in range(2)])
+
+    assert len(redis.entries) == 3
+    assert (ingestor.stats.accepted, ingestor.stats.dropped) == (3, 1)
+
+
+@pytest.mark.asyncio
+async def test_memory_queue_drops_events_beyond_capacity() -> None:
+    ingestor = events.EventIngestor(
+        events.MemoryEventQueue(max_events=3), _Writer(), batch_size=10, interval_seconds=60
+    )
+    await ingestor.submit([_event() for _ in range(5)])
+
+    assert ingestor.stats.accepted == 3
+    assert ingestor.stats.dropped == 2
+
+
+def test_playback_event_json_round_trip() -> None:
+    event = events.PlaybackEvent(
+        kind="skip",
+        track_id=TRACK_ID,
+        occurred_at=datetime(2026, 10, 1, 12, 0, tzinfo=UTC),
+        played_ms=1500,
+        context_type="radio",
+    )
+    assert events.PlaybackEvent.from_json(event.to_json()) == event
+
+
+@pytest.mark.asyncio
+async def test_play_routes_buffer_events_without_database(monkeypatch: pytest.MonkeyPatch) -> None:
+    ingestor = events.EventIngestor(
+        events.MemoryEventQueue(max_events=100), _Writer(), batch_size=100, interval_seconds=60
+    )
+    monkeypatch.setattr("myndral_api.routers.tracks.get_event_ingestor", lambda: ingestor)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        single = await client.post(f"/v1/tracks/{TRACK_ID}/play", json={"playedMs": 30000})
+        batch = await client.post(
+            "/v1/tracks/events",
+            json={
+                "events": [
+                    {"type": "play", "trackId": TRACK_ID, "completed": True},
+                    {"type": "skip", "trackId": TRACK_ID, "playedMs": 4000,
+                     "occurredAt": "2001-01-01T00:00:00Z"},
+                ]
+            },
+        )
+        invalid = await client.post("/v1/tracks/not-a-uuid/play")
+
+    assert single.status_code == 202
+    assert batch.json() == {"accepted": 2}
+    assert invalid.status_code == 422
+
+    queued = (await ingestor.queue.take(10)).events
+    assert [event.kind for event in queued] == ["play", "play", "skip"]
+    assert queued[0].played_ms == 30000
+    # Implausible client timestamps are replaced with the receipt time.
+    assert queued[2].occurred_at.year >= 2026
@@ -0,0 +1,46 @@
+import pytest
+
+from myndral_api.hll import HyperLogLog
+
+
+def _users(start: int, stop: int) -> list[str]:
+    return [f"user-{i}" for i in range(start, stop)]
+
+
+@pytest.mark.parametrize("n", [10, 1_000, 20_000])
+def test_estimate_is_within_three_standard_errors(n: int) -> None:
+    sketch = HyperLogLog()
+    sketch.update(_users(0, n))
+
+    # 1.04 / sqrt(4096) ≈ 1.6 % standard error at the default precision.
+    assert abs(sketch.count() - n) <= max(1, 0.05 * n)
+
+
+def test_merged_days_equal_one_sketch_of_all_listeners() -> None:
+    days = []
+    for day in range(28):
+        sketch = HyperLogLog()
+        sketch.update(_users(day * 500, day * 500 + 2_000))  # overlapping listeners
+        days.append(sketch)
+    everyone = HyperLogLog()
+    everyone.update(_users(0, 27 * 500 + 2_000))
+
+    merged = HyperLogLog.union(days)
+
+    assert merged.to_bytes() == everyone.to_bytes()
+    assert abs(merged.count() - 15_500) <= 0.05 * 15_500
+
+
+def test_serialisation_is_sparse_until_dense_is_smaller() -> None:
+    small = HyperLogLog()
+    assert small.update(["a", "b", "c"])
+    assert not small.add("a")
+    assert len(small.to_bytes()) == 2 + 3 * 3
+    assert HyperLogLog.from_bytes(small.to_bytes()).count() == 3
+
+    large = HyperLogLog()
+    large.update(_users(0, 5_000))
+    assert len(large.to_bytes()) == 2 + 4096
+    assert HyperLogLog.from_bytes(large.to_bytes()).to_bytes() == large.to_bytes()
+    with pytest.raises(ValueError):
+        HyperLogLog.from_bytes(b"\x07\x0c")
@@ -0,0 +1,66 @@
+import struct
+
+from myndral_api import hls
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, no padding → 417-byte frames of 1152 samples.
+FRAME_HEADER = b"\xff\xfb\x90\x00"
+FRAME = FRAME_HEADER + b"\x11" * 413
+ID3_TAG = b"ID3\x04\x00\x00\x00\x00\x00\x05" + b"\x00" * 5
+XING_FRAME = FRAME_HEADER + b"\x00" * 32 + b"Xing" + b"\x00" * 377
+
+
+def _mp3(frames: int) -> bytes:
+    return ID3_TAG + XING_FRAME + FRAME * frames + b"TAG" + b"\x00" * 125
+
+
+def test_iter_mp3_frames_skips_tags_and_xing_header() -> None:
+    frames = list(hls.iter_mp3_frames(_mp3(3)))
+
+    assert [frame.offset for frame in frames] == [432, 849, 1266]
+    assert {(frame.length, frame.samples, frame.sample_rate) for frame in frames} == {
+        (417, 1152, 44100)
+    }
+
+
+def test_segment_mp3_cuts_on_frame_boundaries_with_timestamps() -> None:
+    segments = hls.segment_mp3(_mp3(500), segment_seconds=6)
+
+    # 230 frames is the first count reaching 6 s (230 × 1152 / 44100 ≈ 6.008 s).
+    assert [len(segment.data) for segment in segments] == [
+        73 + 230 * 417,
+        73 + 230 * 417,
+        73 + 40 * 417,
+    ]
+    second = segments[1].data
+    assert second[:3] == b"ID3"
+    assert second[20:65] == b"com.apple.streaming.transportStreamTimestamp\x00"
+    (pts,) = struct.unpack(">Q", second[65:73])
+    assert pts == round(230 * 1152 / 44100 * 90_000)
+    assert second[73:77] == FRAME_HEADER
+
+
+def test_playlists_reference_segments_and_variants() -> None:
+    rendition = hls.build_rendition(_mp3(500), segment_seconds=6)
+
+    lines = rendition.playlist.splitlines()
+    assert lines[:5] == [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        "#EXT-X-TARGETDURATION:7",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+    ]
+    assert lines[5:7] == ["#EXTINF:6.008,", "seg_00000.mp3"]
+    assert lines[-1] == "#EXT-X-ENDLIST"
+    assert len(rendition.version) == 16
+    assert rendition.version != hls.build_rendition(_mp3(500), segment_seconds=4).version
+
+    master = hls.render_master_playlist(
+        [("high_320/abc/index.m3u8", 330_000), ("low_128/def/index.m3u8", 130_000)]
+    )
+    assert master.splitlines()[2:] == [
+        '#EXT-X-STREAM-INF:BANDWIDTH=130000,CODECS="mp4a.40.34"',
+        "low_128/def/index.m3u8",
+        '#EXT-X-STREAM-INF:BANDWIDTH=330000,CODECS="mp4a.40.34"',
+        "high_320/abc/index.m3u8",
+    ]
@@ -0,0 +1,67 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+
+from myndral_api import home
+
+
+@asynccontextmanager
+async def _session():
+    yield object()
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    home.clear_shared_cache()
+    yield
+    home.clear_shared_cache()
+
+
+def _loader(items: list[dict[str, Any]], *, delay: float = 0.0, calls: list[int] | None = None):
+    async def load(_db: Any) -> list[dict[str, Any]]:
+        if calls is not None:
+            calls.append(1)
+        await asyncio.sleep(delay)
+        return items
+
+    return load
+
+
+async def _broken(_db: Any) -> list[dict[str, Any]]:
+    raise RuntimeError("boom")
+
+
+async def test_slow_and_failing_shelves_do_not_stall_the_page() -> None:
+    shelves = [
+        home.Shelf("fast", "Fast", "tracks", _loader([{"id": "t1"}])),
+        home.Shelf("slow", "Slow", "tracks", _loader([{"id": "t2"}], delay=5)),
+        home.Shelf("broken", "Broken", "albums", _broken),
+    ]
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = await home.assemble(shelves, timeout=0.05, session_factory=_session)
+
+    assert loop.time() - started < 1
+    assert [(s["id"], s["status"], s["items"]) for s in result] == [
+        ("fast", "ok", [{"id": "t1"}]),
+        ("slow", "timeout", []),
+        ("broken", "error", []),
+    ]
+
+
+async def test_shared_shelves_are_cached_and_served_stale_on_failure() -> None:
+    calls: list[int] = []
+    shelf = home.Shelf("charts", "Charts", "tracks", _loader([{"id": "t1"}], calls=calls), True)
+
+    await home.assemble([shelf], timeout=1, session_factory=_session)
+    await home.assemble([shelf], timeout=1, session_factory=_session)
+    assert len(calls) == 1
+
+    home._shared_cache.clear()
+    failing = home.Shelf("charts", "Charts", "tracks", _broken, shared=True)
+    (payload,) = await home.assemble([failing], timeout=1, session_factory=_session)
+    assert payload["status"] == "stale"
+    assert payload["items"] == [{"id": "t1"}]
@@ -0,0 +1,77 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from myndral_api import caching, gcs_utils, main
+
+
+@pytest.mark.asyncio
+async def test_serve_image_revalidates_with_etag(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(main, "_IMAGES_DIR", tmp_path)
+    (tmp_path / "20260101T000000Z.png").write_bytes(b"legacy")
+    (tmp_path / "20260101T000000Z-0123456789abcdef.png").write_bytes(b"hashed")
+
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/v1/images/20260101T000000Z.png")
+        repeat = await client.get(
+            "/v1/images/20260101T000000Z.png", headers={"If-None-Match": first.headers["etag"]}
+        )
+        hashed = await client.get("/v1/images/20260101T000000Z-0123456789abcdef.png")
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "public, no-cache"
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert hashed.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+
+class _InlineBackend:
+    async def run(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        return fn(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_overwritable_gcs_images_are_revalidated_against_fresh_metadata(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    objects = {
+        "20260101T000000Z.png": (1, b"legacy"),
+        "20260101T000000Z-0123456789abcdef.png": (1, b"hashed"),
+    }
+
+    def stat(gs_url: str) -> gcs_utils.GcsObjectMetadata:
+        generation, data = objects[gs_url.rsplit("/", 1)[1]]
+        return gcs_utils.GcsObjectMetadata(
+            size=len(data), content_type="image/png", generation=generation
+        )
+
+    monkeypatch.setattr(main.get_settings(), "gcs_bucket_name", "bucket")
+    monkeypatch.setattr(gcs_utils, "object_metadata_cache", caching.TTLCache(300))
+    monkeypatch.setattr(gcs_utils, "get_storage_backend", lambda: _InlineBackend())
+    monkeypatch.setattr(gcs_utils, "stat_gcs_object", stat)
+    monkeypatch.setattr(
+        gcs_utils, "read_gcs_object", lambda gs_url: objects[gs_url.rsplit("/", 1)[1]][1]
+    )
+
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        legacy = await client.get("/v1/images/20260101T000000Z.png")
+        await client.get("/v1/images/20260101T000000Z-0123456789abcdef.png")
+        objects["20260101T000000Z.png"] = (2, b"replaced")
+        objects["20260101T000000Z-0123456789abcdef.png"] = (2, b"hashed")
+        revalidated = await client.get(
+            "/v1/images/20260101T000000Z.png", headers={"If-None-Match": legacy.headers["etag"]}
+        )
+        hashed = await client.get("/v1/images/20260101T000000Z-0123456789abcdef.png")
+
+    # The overwrite is seen at once; content-addressed names keep their cached entry.
+    assert revalidated.status_code == 200
+    assert revalidated.content == b"replaced"
+    assert revalidated.headers["etag"] != legacy.headers["etag"]
+    assert hashed.headers["etag"] == '"1"'
@@ -3,6 +3,7 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 from uuid import uuid4
 
+from myndral_api import track_cards
 from myndral_api.auth_utils import create_access_token
 from myndral_api.main import app
 
@@ -159,6 +160,8 @@ VALUES
             "UPDATE albums SET track_count = 2 WHERE id = $1::uuid",
             album_id,
         )
+        # Seeded with plain SQL, so build the album's track cards by hand.
+        await conn.execute(track_cards._INSERT_ALL_SQL + "  AND al.id = $1::uuid\n", album_id)
 
         bob_playlist_id = await conn.fetchval(
             """
@@ -0,0 +1,88 @@
+import base64
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import HTTPException
+
+from myndral_api.pagination import Keyset, SortKey
+
+PLAYS = Keyset(
+    SortKey("t.play_count", "play_count", "bigint"),
+    SortKey("t.created_at", "created_at", "timestamptz"),
+    SortKey("t.id", "id", "uuid"),
+)
+TRACK_A = "0b7e4c2a-1d3f-4e5a-8b6c-9d0e1f2a3b4c"
+TRACK_B = "5f6a7b8c-9d0e-4f1a-2b3c-4d5e6f7a8b9c"
+TRACK_C = "a1b2c3d4-e5f6-4a7b-8c9d-0e1f2a3b4c5d"
+
+NAMES = Keyset(
+    SortKey("a.monthly_listeners", "monthly_listeners", "bigint"),
+    SortKey("a.id", "id", "uuid", descending=False),
+)
+
+
+def _row(plays: int, track_id: str) -> dict[str, object]:
+    return {
+        "play_count": plays,
+        "created_at": datetime(2026, 10, 17, 12, 30, tzinfo=UTC),
+        "id": track_id,
+    }
+
+
+def test_page_cursor_round_trips_the_last_row() -> None:
+    rows = [_row(9, TRACK_A), _row(7, TRACK_B), _row(7, TRACK_C)]
+
+    page, cursor = PLAYS.page(rows, limit=2)
+    assert page == rows[:2]
+    assert cursor is not None
+
+    sql, params = PLAYS.after(cursor)
+    assert sql == (
+        "  AND (t.play_count, t.created_at, t.id) < "
+        "(CAST(:cursor_0 AS bigint), CAST(:cursor_1 AS timestamptz), CAST(:cursor_2 AS uuid))\n"
+    )
+    assert params == {
+        "cursor_0": 7,
+        "cursor_1": datetime(2026, 10, 17, 12, 30, tzinfo=UTC),
+        "cursor_2": TRACK_B,
+    }
+
+
+def test_last_page_has_no_cursor() -> None:
+    assert PLAYS.page([_row(1, TRACK_A)], limit=2) == ([_row(1, TRACK_A)], None)
+    assert PLAYS.after(None) == ("", {})
+
+
+def test_mixed_directions_expand_the_comparison() -> None:
+    _, cursor = NAMES.page([{"monthly_listeners": 5, "id": TRACK_A}] * 2, limit=1)
+
+    sql, _ = NAMES.after(cursor)
+    assert sql == (
+        "  AND ((a.monthly_listeners < CAST(:cursor_0 AS bigint)) OR "
+        "(a.monthly_listeners = CAST(:cursor_0 AS bigint) AND a.id > CAST(:cursor_1 AS uuid)))\n"
+    )
+    assert NAMES.order_by() == "ORDER BY a.monthly_listeners DESC, a.id ASC\n"
+
+
+def _cursor(*values: str) -> str:
+    raw = ("[" + ",".join(values) + "]").encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        "W10",
+        "WyJ4IiwieSJd",
+        _cursor("5", '"nope"'),
+        _cursor("1e999", f'"{TRACK_A}"'),
+        _cursor("5.5", f'"{TRACK_A}"'),
+        _cursor("true", f'"{TRACK_A}"'),
+        _cursor(str(2**63), f'"{TRACK_A}"'),
+    ],
+)
+def test_malformed_cursors_are_rejected(cursor: str) -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        NAMES.after(cursor)
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,49 @@
+from datetime import UTC, datetime
+
+from myndral_api import partitions
+
+PLAYS = partitions.PartitionedTable("play_events", "played_at", retention_months=2)
+
+
+def _month(year: int, month: int) -> datetime:
+    return datetime(year, month, 1, tzinfo=UTC)
+
+
+def test_parse_partition_bounds_from_pg_get_expr() -> None:
+    legacy = partitions.parse_partition(
+        "play_events_legacy", "FOR VALUES FROM (MINVALUE) TO ('2026-12-01 00:00:00+00')"
+    )
+    default = partitions.parse_partition("play_events_default", "DEFAULT")
+
+    assert legacy.lower is None
+    assert legacy.upper == _month(2026, 12)
+    assert default.is_default
+
+
+def test_plan_premakes_uncovered_months_and_expires_past_retention() -> None:
+    existing = [
+        partitions.Partition("play_events_legacy", None, _month(2026, 12)),
+        partitions.Partition("play_events_p2026_12", _month(2026, 12), _month(2027, 1)),
+        partitions.Partition("play_events_default", None, None, is_default=True),
+    ]
+
+    to_create, expired = partitions.plan_maintenance(
+        PLAYS, existing, now=datetime(2026, 12, 15, 8, 30, tzinfo=UTC), premake_months=3
+    )
+    assert [partitions.partition_name("play_events", m) for m in to_create] == [
+        "play_events_p2027_01",
+        "play_events_p2027_02",
+        "play_events_p2027_03",
+    ]
+    assert expired == []
+
+    # Two months after the legacy range ends it falls out of a 2-month retention.
+    _, expired = partitions.plan_maintenance(
+        PLAYS, existing, now=datetime(2027, 2, 1, tzinfo=UTC), premake_months=0
+    )
+    assert [p.name for p in expired] == ["play_events_legacy"]
+
+
+def test_add_months_crosses_year_boundaries() -> None:
+    assert partitions.add_months(_month(2026, 11), 3) == _month(2027, 2)
+    assert partitions.add_months(_month(2027, 1), -25) == _month(2024, 12)
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from myndral_api.prefetch import ReadAheadPrefetcher
+
+OBJECT = bytes(range(256)) * 64  # 16 KiB
+URL = "gs://bucket/audio/a.mp3"
+
+
+class _Origin:
+    def __init__(self) -> None:
+        self.calls: list[tuple[int, int]] = []
+
+    async def __call__(self, gs_url: str, start: int, end: int) -> bytes:
+        self.calls.append((start, end))
+        return OBJECT[start : end + 1]
+
+
+def _prefetcher(origin: _Origin, max_bytes: int = 1 << 20) -> ReadAheadPrefetcher:
+    return ReadAheadPrefetcher(origin, block_size=4096, window_blocks=2, max_bytes=max_bytes)
+
+
+async def _read(prefetcher: ReadAheadPrefetcher, start: int, end: int) -> bytes:
+    return b"".join([chunk async for chunk in prefetcher.iter_range(URL, "abc", start, end)])
+
+
+@pytest.mark.asyncio
+async def test_sequential_reads_are_served_from_prefetch_buffer() -> None:
+    origin = _Origin()
+    prefetcher = _prefetcher(origin)
+
+    assert prefetcher.observe("client", URL, "abc", 0, 4095, len(OBJECT)) == 0
+    await _read(prefetcher, 0, 4095)
+    assert prefetcher.observe("client", URL, "abc", 4096, 8191, len(OBJECT)) == 2
+    await asyncio.sleep(0)
+    assert origin.calls == [(0, 4095), (8192, 12287), (12288, 16383)]
+
+    assert await _read(prefetcher, 8192, 12000) == OBJECT[8192:12001]
+    assert origin.calls[3:] == []
+    assert prefetcher.stats.hits == 1
+    assert prefetcher.stats.issued == 2
+
+
+@pytest.mark.asyncio
+async def test_seek_does_not_prefetch_and_evicted_blocks_count_as_wasted() -> None:
+    origin = _Origin()
+    prefetcher = _prefetcher(origin, max_bytes=8192)
+
+    prefetcher.observe("client", URL, "abc", 0, 1023, len(OBJECT))
+    assert prefetcher.observe("client", URL, "abc", 9000, 9999, len(OBJECT)) == 0
+    assert prefetcher.observe("other", URL, "abc", 0, 1023, len(OBJECT)) == 0
+
+    prefetcher.observe("client", URL, "abc", 10000, 10999, len(OBJECT))  # blocks 2, 3
+    await asyncio.sleep(0)
+    prefetcher.observe("client", URL, "abc", 11000, 12287, len(OBJECT))  # 3 buffered, 4 past EOF
+    prefetcher.observe("other", URL, "abc", 1024, 4095, len(OBJECT))  # block 1 evicts block 3
+    await asyncio.sleep(0)
+
+    assert prefetcher.stats.issued == 3
+    assert prefetcher.stats.wasted_blocks == 1
+    assert prefetcher.stats.wasted_bytes == 4096
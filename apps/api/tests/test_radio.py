@@ -0,0 +1,49 @@
+import pytest
+
+from myndral_api import radio
+
+POOL = radio.Pool(
+    track_ids=("t1", "t2", "t3", "t4", "t5"),
+    artist_ids=("a1", "a2", "a1", "a3", "a2"),
+)
+
+
+def test_cursor_round_trips_and_rejects_tampering() -> None:
+    seed = radio.Seed("artist", "1b9d6bcd-bbfd-4b2d-9b5d-ab8dfbbd4bed")
+
+    assert radio.decode_cursor(radio.encode_cursor(seed, 42)) == (seed, 42)
+    for bad in ("not-base64!", radio.encode_cursor(radio.Seed("artist", "x"), 1)[:-3], ""):
+        with pytest.raises(ValueError):
+            radio.decode_cursor(bad)
+
+
+@pytest.mark.parametrize("seed_type", radio.SEED_TYPES)
+@pytest.mark.parametrize("seed_id", ["x", "1' OR '1'='1", "", "1b9d6bcd-bbfd-4b2d-9b5d"])
+def test_cursor_rejects_malformed_seed_ids(seed_type: radio.SeedType, seed_id: str) -> None:
+    cursor = radio.encode_cursor(radio.Seed(seed_type, seed_id), 0)
+
+    with pytest.raises(ValueError):
+        radio.decode_cursor(cursor)
+
+
+def test_next_batch_skips_recent_tracks_and_skipped_artists() -> None:
+    history = radio.History(tracks=frozenset({"t1"}), artists=frozenset({"a2"}))
+
+    picked, position = radio.next_batch(POOL, 0, 2, history)
+
+    assert picked == ["t3", "t4"]
+    assert position == 4
+
+
+def test_next_batch_wraps_around_without_repeating_within_a_page() -> None:
+    picked, position = radio.next_batch(POOL, 3, 10, radio.History())
+
+    assert picked == ["t4", "t5", "t1", "t2", "t3"]
+    assert position == 3
+
+
+def test_compose_pool_keeps_first_occurrence_in_source_order() -> None:
+    pool = radio.compose_pool((["s"], ["a"]), (["n1", "s"], ["b", "a"]), (None, None))
+
+    assert pool.track_ids == ("s", "n1")
+    assert pool.artist_ids == ("a", "b")
@@ -0,0 +1,41 @@
+import numpy as np
+
+from myndral_api import related
+
+
+def _matrix(pairs: list[tuple[int, int]], shape: tuple[int, int]):
+    users, items = zip(*pairs, strict=True)
+    return related.build_matrix(
+        np.array(users), np.array(items), np.ones(len(pairs), dtype=np.float32), shape
+    )
+
+
+def test_neighbours_are_ranked_by_cosine_and_exclude_self() -> None:
+    # Items 0 and 1 share all three users; item 2 shares one user with each.
+    matrix = _matrix(
+        [(0, 0), (0, 1), (1, 0), (1, 1), (2, 0), (2, 1), (2, 2), (3, 2), (4, 2)],
+        (5, 3),
+    )
+
+    neighbours = related.top_k_neighbours(matrix, k=2, block_bytes=1)
+
+    cols, scores = neighbours[0]
+    assert cols.tolist() == [1, 2]
+    assert np.allclose(scores, [1.0, 1 / 3])
+    assert neighbours[2][0].tolist() in ([0, 1], [1, 0])
+
+
+def test_items_below_min_users_are_left_out_on_both_sides() -> None:
+    matrix = _matrix([(0, 0), (0, 1), (1, 0), (1, 1), (0, 2)], (2, 3))
+
+    neighbours = related.top_k_neighbours(matrix, k=5, min_users=2)
+
+    assert neighbours[0][0].tolist() == [1]
+    assert neighbours[2][0].tolist() == []
+
+
+def test_duplicate_interactions_are_summed() -> None:
+    matrix = related.build_matrix(
+        np.array([0, 0]), np.array([1, 1]), np.array([1.0, 2.0]), (1, 2)
+    )
+    assert matrix[0, 1] == 3.0
@@ -0,0 +1,112 @@
+import asyncio
+from typing import Any
+
+import pytest
+from sqlalchemy.orm import Session
+
+from myndral_api import caching, response_cache
+
+ALBUM_ID = "5f0c6b0e-8a55-4f43-9d0f-2f5c2d7b9a11"
+ARTIST_ID = "0e3b9a52-51c1-4c57-8f8e-7c9d3f1f2b44"
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+
+    async def get(self, key: str) -> Any:
+        return self.values.get(key)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.values.pop(key, None)
+
+    def pipeline(self, transaction: bool = True) -> "_FakePipeline":
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis: _FakeRedis) -> None:
+        self.redis = redis
+        self.results: list[Any] = []
+
+    def set(self, key: str, value: str, ex: int) -> None:
+        self.redis.values[key] = value
+        self.results.append(True)
+
+    def sadd(self, key: str, member: str) -> None:
+        self.redis.values.setdefault(key, set()).add(member)
+        self.results.append(1)
+
+    def expire(self, key: str, seconds: int) -> None:
+        self.results.append(True)
+
+    def smembers(self, key: str) -> None:
+        self.results.append(set(self.redis.values.get(key, set())))
+
+    async def execute(self) -> list[Any]:
+        return self.results
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> _FakeRedis:
+    fake = _FakeRedis()
+    monkeypatch.setattr(caching.get_settings(), "redis_cache_enabled", True)
+    monkeypatch.setattr(caching, "get_redis", lambda: fake)
+    return fake
+
+
+def _counting_handler(calls: list[str], *, listing: bool = False):
+    @response_cache.cached_response("test.album", listing=listing)
+    async def get_album(album_id: str, db: Any = None) -> dict[str, Any]:
+        calls.append(album_id)
+        return {"id": album_id, "artist": {"id": ARTIST_ID}, "items": []}
+
+    return get_album
+
+
+async def test_responses_are_shared_until_a_contained_id_is_purged(redis: _FakeRedis) -> None:
+    calls: list[str] = []
+    get_album = _counting_handler(calls)
+
+    first = await get_album(ALBUM_ID, db=object())
+    assert await get_album(album_id=ALBUM_ID, db=object()) == first
+    assert calls == [ALBUM_ID]
+
+    await response_cache.purge([ARTIST_ID])
+    await get_album(ALBUM_ID)
+    assert calls == [ALBUM_ID, ALBUM_ID]
+
+
+async def test_listings_are_purged_by_any_catalog_change(redis: _FakeRedis) -> None:
+    calls: list[str] = []
+    new_releases = _counting_handler(calls, listing=True)
+    await new_releases(ALBUM_ID)
+
+    await response_cache.purge(["an-unrelated-id"])
+    await new_releases(ALBUM_ID)
+    assert len(calls) == 2
+
+
+async def test_purge_waits_for_the_commit(redis: _FakeRedis) -> None:
+    calls: list[str] = []
+    get_album = _counting_handler(calls)
+    await get_album(ALBUM_ID)
+
+    session = Session()
+    session.info[response_cache._PENDING_TAGS] = {ALBUM_ID}
+    await get_album(ALBUM_ID)
+    assert len(calls) == 1
+
+    session.commit()
+    await asyncio.gather(*response_cache._purge_tasks)
+    await get_album(ALBUM_ID)
+    assert len(calls) == 2
+
+
+async def test_disabled_cache_always_runs_the_handler() -> None:
+    calls: list[str] = []
+    get_album = _counting_handler(calls)
+    await get_album(ALBUM_ID)
+    await get_album(ALBUM_ID)
+    assert len(calls) == 2
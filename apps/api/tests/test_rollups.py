@@ -0,0 +1,117 @@
+from datetime import date
+from typing import Any
+
+import pytest
+
+from myndral_api import listeners, rollups, track_cards, trending
+from myndral_api.hll import HyperLogLog
+
+ARTIST_ID = "1b9d6bcd-bbfd-4b2d-9b5d-ab8dfbbd4bed"
+
+
+class _Result:
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def scalar_one(self) -> Any:
+        return self.value
+
+    def mappings(self) -> "_Result":
+        return self
+
+    def one(self) -> Any:
+        return self.value
+
+    def scalars(self) -> "_Result":
+        return self
+
+    def all(self) -> Any:
+        return self.value
+
+
+class _ScriptedSession:
+    """Answers each statement by the SQL constant it was built from."""
+
+    def __init__(self, pending: int = 0, sketches: list[bytes] | None = None) -> None:
+        self.pending = pending
+        self.sketches = sketches or []
+        self.statements: list[tuple[str, dict[str, Any]]] = []
+
+    async def execute(self, statement: Any, params: dict[str, Any] | None = None) -> _Result:
+        sql = str(statement)
+        self.statements.append((sql, params or {}))
+        if sql == rollups._LOCK_STATE_SQL:
+            return _Result(40)
+        if sql.startswith("\nSELECT max(seq)"):
+            return _Result({"high": 40 + self.pending, "events": self.pending})
+        if sql == trending._SHARE_EPOCH_SQL:
+            return _Result(1_790_000_000)
+        if sql == rollups._LISTENER_MARK_SQL:
+            return _Result(1_800_000_000)
+        if sql == rollups._SKETCHES_CHANGED_SQL:
+            return _Result([ARTIST_ID])
+        if sql == rollups._EXPIRE_SKETCHES_SQL:
+            return _Result([])
+        if sql == listeners._WINDOW_SQL:
+            return _Result([(ARTIST_ID, sketch) for sketch in self.sketches])
+        return _Result(None)
+
+
+@pytest.mark.asyncio
+async def test_play_batch_applies_deltas_and_advances_high_water() -> None:
+    db = _ScriptedSession(pending=3)
+    result = rollups.RollupResult()
+
+    consumed = await rollups.roll_up_batch(
+        db, "play_events", batch_size=10, settle_seconds=0, half_life_hours=72, result=result
+    )
+
+    assert consumed == 3
+    executed = [sql for sql, _ in db.statements]
+    assert rollups._APPLY_PLAYS_SQL in executed
+    scored = dict(db.statements)[trending._SCORE_PLAYS_SQL]
+    assert (scored["low"], scored["high"], scored["epoch"]) == (40, 43, 1_790_000_000)
+    assert executed[-1] == rollups._ADVANCE_STATE_SQL
+    assert db.statements[-1][1] == {"source": "play_events", "high": 43}
+    assert result.to_dict()["plays"] == 3
+
+
+@pytest.mark.asyncio
+async def test_empty_batch_leaves_counters_and_high_water_alone() -> None:
+    db = _ScriptedSession(pending=0)
+    result = rollups.RollupResult()
+
+    consumed = await rollups.roll_up_batch(
+        db, "skip_events", batch_size=10, settle_seconds=30, half_life_hours=72, result=result
+    )
+
+    assert consumed == 0
+    executed = [sql for sql, _ in db.statements]
+    assert rollups._APPLY_SKIPS_SQL not in executed
+    assert trending._SCORE_SKIPS_SQL not in executed
+    assert rollups._ADVANCE_STATE_SQL not in executed
+    assert result.batches == 0
+
+
+def test_listener_window_covers_window_days_including_today() -> None:
+    assert rollups.listener_window_start(28, today=date(2026, 10, 17)) == date(2026, 9, 20)
+
+
+@pytest.mark.asyncio
+async def test_monthly_listeners_merge_daily_sketches_of_changed_artists() -> None:
+    days = []
+    for day in range(3):
+        sketch = HyperLogLog()
+        sketch.update(f"user-{i}" for i in range(day * 10, day * 10 + 20))
+        days.append(sketch.to_bytes())
+    db = _ScriptedSession(sketches=days)
+
+    recounted, expired = await rollups.refresh_monthly_listeners(
+        db, window_start=date(2026, 9, 20), settle_seconds=30
+    )
+
+    assert (recounted, expired) == (1, 0)
+    stored = dict(db.statements)[rollups._STORE_LISTENERS_SQL]
+    assert stored == {"artist_ids": [ARTIST_ID], "listeners": [40]}
+    assert dict(db.statements)[track_cards._SYNC_LISTENERS_SQL] == {"artist_ids": [ARTIST_ID]}
+    assert db.statements[-1][1] == {"source": "listener_sketches", "high": 1_800_000_000}
@@ -0,0 +1,151 @@
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from myndral_api import auth_utils, caching, sessions
+from myndral_api.routers import auth
+
+USER_ID = "2b0f6a8e-5c1d-4e7a-9f3b-8d2c6e4a1b57"
+SESSION_ID = "c3e9d1a4-7b2f-4c8e-a6d5-1f0b9e3c7a28"
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.revoked: dict[str, float] = {}
+
+    async def zmscore(self, key: str, members: list[str]) -> list[float | None]:
+        return [self.revoked.get(member) for member in members]
+
+    def pipeline(self, transaction: bool = True) -> "_FakePipeline":
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis: _FakeRedis) -> None:
+        self.redis = redis
+
+    def zadd(self, key: str, mapping: dict[str, float]) -> None:
+        self.redis.revoked.update(mapping)
+
+    def zremrangebyscore(self, key: str, low: str, high: float) -> None:
+        self.redis.revoked = {m: s for m, s in self.redis.revoked.items() if s > high}
+
+    def expire(self, key: str, seconds: int) -> None:
+        pass
+
+    async def execute(self) -> list[Any]:
+        return []
+
+
+class _Result:
+    def __init__(self, row: Any) -> None:
+        self.row = row
+
+    def mappings(self) -> "_Result":
+        return self
+
+    def first(self) -> Any:
+        return self.row
+
+
+class _AuthSession:
+    """Holds one session row and answers the rotate query and user lookups."""
+
+    def __init__(self, refresh_token: str) -> None:
+        self.token_hash = sessions._hash_token(refresh_token)
+        self.user = {
+            "id": USER_ID,
+            "username": "alice",
+            "email": "alice@example.com",
+            "display_name": "Alice",
+            "avatar_url": None,
+            "role": "listener",
+            "hashed_password": "x",
+            "is_active": True,
+            "created_at": datetime(2026, 1, 1, tzinfo=UTC),
+            "subscription_plan": "premium_monthly",
+        }
+        self.user_lookups = 0
+
+    async def execute(self, statement: Any, params: dict[str, Any] | None = None) -> _Result:
+        sql = str(statement)
+        if sql == sessions._ROTATE_SESSION_SQL:
+            if params["token_hash"] != self.token_hash:
+                return _Result(None)
+            self.token_hash = params["new_hash"]
+            return _Result((SESSION_ID, USER_ID))
+        self.user_lookups += 1
+        return _Result(self.user)
+
+    async def commit(self) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _empty_user_context_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth_utils, "_user_context_cache", caching.TTLCache(30))
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> _FakeRedis:
+    fake = _FakeRedis()
+    monkeypatch.setattr(caching.get_settings(), "redis_cache_enabled", True)
+    monkeypatch.setattr(caching, "get_redis", lambda: fake)
+    # Every fallback reaches the (fake) database.
+    monkeypatch.setattr(caching.get_settings(), "user_context_cache_ttl_seconds", 0)
+    return fake
+
+
+def _bearer(**claims: Any) -> HTTPAuthorizationCredentials:
+    token, _ = auth_utils.create_access_token(USER_ID, **claims)
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+async def test_claims_authorize_without_a_lookup_until_revoked(redis: _FakeRedis) -> None:
+    db = _AuthSession("unused")
+    credentials = _bearer(role="listener", subscription_plan="free", session_id=SESSION_ID)
+
+    user = await auth_utils.get_token_user(credentials, db)
+    assert user == {"id": USER_ID, "role": "listener", "subscriptionPlan": "free"}
+    assert db.user_lookups == 0
+
+    # A role or plan change makes the claims stale: the user row is read instead.
+    await sessions.revoke_access_tokens(user_id=USER_ID)
+    user = await auth_utils.get_token_user(credentials, db)
+    assert user["subscriptionPlan"] == "premium_monthly"
+    assert db.user_lookups == 1
+
+    await sessions.revoke_access_tokens(session_id=SESSION_ID)
+    for dependency in (auth_utils.get_token_user, auth_utils.get_current_user):
+        with pytest.raises(HTTPException) as exc_info:
+            await dependency(credentials, db)
+        assert exc_info.value.status_code == 401
+
+
+async def test_claims_are_not_trusted_without_redis() -> None:
+    db = _AuthSession("unused")
+    credentials = _bearer(role="admin", subscription_plan="free", session_id=SESSION_ID)
+
+    user = await auth_utils.get_token_user(credentials, db)
+    assert user["role"] == "listener"
+    assert db.user_lookups == 1
+
+
+async def test_refresh_rotates_the_token_and_reissues_claims() -> None:
+    db = _AuthSession("first-refresh-token")
+
+    response = await auth.refresh(auth.RefreshTokenRequest(refresh_token="first-refresh-token"), db)
+    claims = auth_utils.decode_access_token(response["accessToken"])
+    assert claims["sid"] == SESSION_ID
+    assert (claims["role"], claims["plan"]) == ("listener", "premium_monthly")
+    assert response["refreshToken"] != "first-refresh-token"
+
+    with pytest.raises(HTTPException) as exc_info:
+        await auth.refresh(auth.RefreshTokenRequest(refresh_token="first-refresh-token"), db)
+    assert exc_info.value.status_code == 401
+
+    rotated = auth.RefreshTokenRequest(refresh_token=response["refreshToken"])
+    assert (await auth.refresh(rotated, db))["user"]["id"] == USER_ID
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from myndral_api.singleflight import SingleFlight
+
+
+async def test_concurrent_identical_reads_share_one_call() -> None:
+    flights: SingleFlight[str] = SingleFlight("test.shared")
+    release = asyncio.Event()
+    calls = 0
+
+    async def load() -> dict[str, str]:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"id": "album-1"}
+
+    readers = [asyncio.create_task(flights.do("album-1", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*readers)
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert flights.describe() == {
+        "executions": 1,
+        "coalesced": 4,
+        "coalescingRatio": 0.8,
+        "inFlight": 0,
+    }
+
+    # Finished calls are not cached: the next read runs again.
+    await flights.do("album-1", load)
+    assert calls == 2
+
+
+async def test_errors_reach_every_waiter() -> None:
+    flights: SingleFlight[str] = SingleFlight("test.errors")
+    release = asyncio.Event()
+
+    async def load() -> None:
+        await release.wait()
+        raise LookupError("album-1")
+
+    readers = [asyncio.create_task(flights.do("album-1", load)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*readers, return_exceptions=True)
+    assert all(isinstance(result, LookupError) for result in results)
+
+
+async def test_waiters_take_over_when_the_leader_is_cancelled() -> None:
+    flights: SingleFlight[str] = SingleFlight("test.cancel")
+    started = asyncio.Event()
+    calls = 0
+
+    async def load() -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            started.set()
+            await asyncio.Event().wait()
+        return "cover"
+
+    leader = asyncio.create_task(flights.do("cover.jpg", load))
+    await started.wait()
+    waiter = asyncio.create_task(flights.do("cover.jpg", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert await waiter == "cover"
+    assert calls == 2
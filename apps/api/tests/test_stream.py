@@ -0,0 +1,228 @@
+import functools
+from typing import Any
+
+import pytest
+from starlette.requests import Request
+
+from myndral_api import caching, gcs_utils, media_utils, playback
+from myndral_api.routers import stream
+
+
+class _FakeBlob:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.size = len(data)
+        self.content_type = "audio/mpeg"
+        self.generation = 1
+        self.etag = "etag-1"
+        self.updated = None
+        self.calls: list[tuple[int, int]] = []
+
+    def reload(self) -> None:
+        pass
+
+    def download_as_bytes(self, start: int = 0, end: int | None = None) -> bytes:
+        end = self.size - 1 if end is None else end
+        self.calls.append((start, end))
+        return self.data[start : end + 1]
+
+
+class _FakeBackend:
+    def __init__(self, blob: _FakeBlob) -> None:
+        self._blob = blob
+
+    def blob(self, gs_url: str) -> _FakeBlob:
+        return self._blob
+
+    async def run(self, fn: Any, /, *args: Any, **kwargs: Any) -> Any:
+        return functools.partial(fn, *args, **kwargs)()
+
+
+@pytest.fixture
+def fake_blob(monkeypatch: pytest.MonkeyPatch) -> _FakeBlob:
+    blob = _FakeBlob(bytes(range(256)) * 40)
+    monkeypatch.setattr(gcs_utils, "_backend", _FakeBackend(blob))
+    return blob
+
+
+@pytest.mark.asyncio
+async def test_iter_gcs_bytes_reads_range_in_bounded_chunks(fake_blob: _FakeBlob) -> None:
+    chunks = [
+        chunk
+        async for chunk in gcs_utils.iter_gcs_bytes(
+            "gs://bucket/audio/a.mp3", 100, 3099, chunk_size=1024
+        )
+    ]
+
+    assert b"".join(chunks) == fake_blob.data[100:3100]
+    assert all(len(chunk) <= 1024 for chunk in chunks)
+    assert fake_blob.calls == [(100, 1123), (1124, 2147), (2148, 3099)]
+
+
+@pytest.mark.asyncio
+async def test_iter_gcs_bytes_stops_fetching_when_consumer_stops(fake_blob: _FakeBlob) -> None:
+    stream = gcs_utils.iter_gcs_bytes("gs://bucket/audio/a.mp3", 0, 9999, chunk_size=1000)
+    first = await anext(stream)
+    await stream.aclose()
+
+    assert first == fake_blob.data[:1000]
+    assert fake_blob.calls == [(0, 999)]
+
+
+@pytest.mark.asyncio
+async def test_object_metadata_uses_db_size_hint_without_storage_request(
+    fake_blob: _FakeBlob, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(gcs_utils, "object_metadata_cache", caching.TTLCache(60))
+
+    hinted = await gcs_utils.get_gcs_object_metadata("gs://bucket/a.mp3", size_hint=4321)
+    fetched = await gcs_utils.get_gcs_object_metadata("gs://bucket/b.mp3")
+
+    assert hinted.size == 4321
+    assert fetched.size == fake_blob.size
+    assert fake_blob.calls == []
+
+
+def test_ttl_cache_expires_and_invalidates(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(caching.time, "monotonic", lambda: now[0])
+    cache: caching.TTLCache[str, gcs_utils.GcsObjectMetadata] = caching.TTLCache(ttl_seconds=30)
+    cache.put("gs://bucket/a.mp3", gcs_utils.GcsObjectMetadata(size=1))
+    cache.put("gs://bucket/b.mp3", gcs_utils.GcsObjectMetadata(size=2))
+
+    cache.invalidate("gs://bucket/b.mp3")
+    assert cache.get("gs://bucket/a.mp3") == gcs_utils.GcsObjectMetadata(size=1)
+    assert cache.get("gs://bucket/b.mp3") is None
+
+    now[0] += 31
+    assert cache.get("gs://bucket/a.mp3") is None
+
+
+def test_signed_url_cache_is_bounded_and_refreshes_early(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = [0.0]
+    monkeypatch.setattr(caching.time, "monotonic", lambda: now[0])
+    cache = stream.SignedUrlCache(refresh_margin=60, max_entries=2)
+    cache.put("t1", "high_320", "gs://bucket/a.mp3", "https://signed/1", ttl_seconds=300)
+
+    assert cache.get("t1", "high_320", "gs://bucket/a.mp3") == "https://signed/1"
+    assert cache.get("t1", "lossless", "gs://bucket/a.mp3") is None
+    assert cache.get("t1", "high_320", "gs://bucket/replaced.mp3") is None
+
+    cache.put("t1", "high_320", "gs://bucket/a.mp3", "https://signed/1", ttl_seconds=300)
+    now[0] = 241
+    assert cache.get("t1", "high_320", "gs://bucket/a.mp3") is None
+
+    # Bounded: the least recently used entry goes first.
+    now[0] = 0
+    for track_id in ("t1", "t2", "t3"):
+        cache.put(track_id, "high_320", "gs://bucket/a.mp3", "https://signed/1", ttl_seconds=300)
+    assert cache.get("t1", "high_320", "gs://bucket/a.mp3") is None
+    assert cache.get("t3", "high_320", "gs://bucket/a.mp3") == "https://signed/1"
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-1023", [(0, 1023)]),
+        ("bytes=512-", [(512, 9999)]),
+        ("bytes=-65536", [(0, 9999)]),
+        ("bytes=-100", [(9900, 9999)]),
+        ("bytes=9000-20000", [(9000, 9999)]),
+        ("bytes=0-99, 200-299", [(0, 99), (200, 299)]),
+        ("bytes=200-299,0-150,100-199", [(0, 299)]),
+        ("bytes=10000-", []),
+        ("bytes=-0", []),
+        ("bytes=500-100", None),
+        ("bytes=abc", None),
+        ("items=0-10", None),
+    ],
+)
+def test_parse_range_header(header: str, expected: list[tuple[int, int]] | None) -> None:
+    assert stream.parse_range_header(header, 10_000) == expected
+
+
+def test_if_range_requires_matching_strong_etag() -> None:
+    def request_with(if_range: str | None) -> Request:
+        headers = [(b"if-range", if_range.encode())] if if_range is not None else []
+        return Request({"type": "http", "headers": headers})
+
+    assert stream._if_range_allows_partial(request_with(None), None)
+    assert stream._if_range_allows_partial(request_with('"abc"'), '"abc"')
+    assert not stream._if_range_allows_partial(request_with('"old"'), '"abc"')
+    http_date = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert not stream._if_range_allows_partial(request_with(http_date), '"abc"')
+    assert not stream._if_range_allows_partial(request_with('"abc"'), None)
+
+
+class _FakeResult:
+    def __init__(self, row: dict[str, Any] | None) -> None:
+        self._row = row
+
+    def mappings(self) -> "_FakeResult":
+        return self
+
+    def first(self) -> dict[str, Any] | None:
+        return self._row
+
+
+class _FakeSession:
+    def __init__(self, row: dict[str, Any] | None) -> None:
+        self.row = row
+        self.queries = 0
+
+    async def execute(self, *args: Any, **kwargs: Any) -> _FakeResult:
+        self.queries += 1
+        return _FakeResult(self.row)
+
+
+@pytest.mark.asyncio
+async def test_playable_track_resolution_is_cached_until_invalidated(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(playback, "_local_cache", caching.TTLCache(60))
+    db = _FakeSession(
+        {
+            "storage_url": "gs://bucket/audio/a.mp3",
+            "quality": "high_320",
+            "format": "mp3",
+            "file_size_bytes": 1234,
+            "checksum_sha256": "abc",
+            "published": True,
+        }
+    )
+
+    first = await playback.resolve_playable_track(db, "t1")
+    second = await playback.resolve_playable_track(db, "t1")
+    assert first == second
+    assert first is not None and first.published
+    assert db.queries == 1
+
+    db.row = {**db.row, "published": False}
+    await playback.invalidate_playable_tracks(["t1"])
+    revoked = await playback.resolve_playable_track(db, "t1")
+    assert revoked is not None and not revoked.published
+    assert db.queries == 2
+
+    await playback.invalidate_playable_tracks()
+    await playback.resolve_playable_track(db, "t1")
+    assert db.queries == 3
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "etag", "expected"),
+    [
+        ('"abc"', '"abc"', True),
+        ('W/"abc"', '"abc"', True),
+        ('"old", "abc"', '"abc"', True),
+        ("*", '"abc"', True),
+        ('"old"', '"abc"', False),
+        (None, '"abc"', False),
+        ('"abc"', None, False),
+    ],
+)
+def test_etag_matches_uses_weak_comparison(
+    if_none_match: str | None, etag: str | None, expected: bool
+) -> None:
+    assert media_utils.etag_matches(if_none_match, etag) is expected
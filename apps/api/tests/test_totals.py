@@ -0,0 +1,74 @@
+from typing import Any
+
+import pytest
+
+from myndral_api import totals
+
+
+class _Result:
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def scalar_one(self) -> Any:
+        return self.value
+
+
+class _CountingSession:
+    """Answers the reltuples lookup with ``estimate`` and counts with ``rows``."""
+
+    def __init__(self, *, rows: int, estimate: int = -1) -> None:
+        self.rows = rows
+        self.estimate = estimate
+        self.statements: list[str] = []
+
+    async def execute(self, statement: Any, params: dict[str, Any] | None = None) -> _Result:
+        sql = str(statement)
+        self.statements.append(sql)
+        if sql == totals._ESTIMATE_SQL:
+            return _Result(self.estimate)
+        limit = sql.rsplit("LIMIT ", 1)
+        if len(limit) == 2:
+            return _Result(min(self.rows, int(limit[1].split(")")[0])))
+        return _Result(self.rows)
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    totals.clear_cache()
+    yield
+    totals.clear_cache()
+
+
+async def test_cached_total_is_reused_until_exact_is_asked_for() -> None:
+    db = _CountingSession(rows=42)
+
+    assert await totals.cached_total(db, "albums", "SELECT 1 FROM albums") == totals.Total(42)
+    db.rows = 43
+    assert (await totals.cached_total(db, "albums", "SELECT 1 FROM albums")).value == 42
+    assert (await totals.cached_total(db, "albums", "SELECT 1 FROM albums", exact=True)).value == 43
+    assert len(db.statements) == 2
+
+
+async def test_large_tables_are_estimated_and_small_ones_counted() -> None:
+    big = _CountingSession(rows=0, estimate=2_500_000)
+    assert (await totals.estimated_total(big, "track_cards")).fields() == {
+        "total": 2_500_000,
+        "totalAccuracy": "estimated",
+    }
+
+    totals.clear_cache()
+    unanalysed = _CountingSession(rows=12)
+    assert await totals.estimated_total(unanalysed, "track_cards") == totals.Total(12)
+
+
+async def test_capped_total_stops_at_the_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(totals.get_settings(), "list_total_cap", 100)
+    db = _CountingSession(rows=5_000)
+
+    assert await totals.capped_total(db, "SELECT 1 FROM playlists") == totals.Total(100, "atLeast")
+    assert "LIMIT 101" in db.statements[-1]
+    exact = await totals.capped_total(db, "SELECT 1 FROM playlists", exact=True)
+    assert exact == totals.Total(5_000)
+
+    db.rows = 7
+    assert await totals.capped_total(db, "SELECT 1 FROM playlists") == totals.Total(7)
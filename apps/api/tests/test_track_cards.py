@@ -0,0 +1,37 @@
+import uuid
+from typing import Any
+
+from myndral_api import track_cards
+
+
+class _Result:
+    rowcount = 3
+
+
+class _RecordingSession:
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, dict[str, Any]]] = []
+
+    async def execute(self, statement: Any, params: dict[str, Any] | None = None) -> _Result:
+        self.statements.append((str(statement), params or {}))
+        return _Result()
+
+
+async def test_refresh_without_ids_touches_nothing() -> None:
+    db = _RecordingSession()
+    assert await track_cards.refresh_track_cards(db) == 0
+    assert db.statements == []
+
+
+async def test_refresh_deletes_the_scope_before_reinserting_it() -> None:
+    db = _RecordingSession()
+    album_id = uuid.uuid4()
+
+    written = await track_cards.refresh_track_cards(db, album_ids=[album_id])
+
+    assert written == 3
+    expected = {"track_ids": [], "album_ids": [str(album_id)], "artist_ids": []}
+    assert db.statements == [
+        (track_cards._DELETE_SCOPE_SQL, expected),
+        (track_cards._INSERT_SCOPE_SQL, expected),
+    ]
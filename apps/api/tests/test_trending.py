@@ -0,0 +1,32 @@
+from datetime import UTC, datetime, timedelta
+
+from myndral_api import trending
+
+HALF_LIFE = 72 * 3600.0
+EPOCH = int(datetime(2026, 10, 1, tzinfo=UTC).timestamp())
+
+
+def test_decay_halves_a_score_every_half_life() -> None:
+    start = datetime(2026, 10, 1, tzinfo=UTC)
+
+    assert trending.decay_factor(EPOCH, start, HALF_LIFE) == 1.0
+    assert trending.decay_factor(EPOCH, start + timedelta(hours=72), HALF_LIFE) == 0.5
+    assert trending.decay_factor(EPOCH, start + timedelta(hours=216), HALF_LIFE) == 0.125
+
+
+def test_rebase_waits_until_the_epoch_is_far_behind() -> None:
+    soon = datetime(2026, 10, 1, tzinfo=UTC) + timedelta(hours=72 * 31)
+    assert trending.plan_rebase(EPOCH, soon, HALF_LIFE) is None
+
+
+def test_rebase_keeps_current_scores_unchanged() -> None:
+    now = datetime(2026, 10, 1, tzinfo=UTC) + timedelta(hours=72 * 40, minutes=90)
+    plan = trending.plan_rebase(EPOCH, now, HALF_LIFE)
+
+    assert plan is not None
+    new_epoch, factor = plan
+    assert new_epoch % 86_400 == 0 and new_epoch <= now.timestamp()
+    stored = 3.0e11
+    before = stored * trending.decay_factor(EPOCH, now, HALF_LIFE)
+    after = stored * factor * trending.decay_factor(new_epoch, now, HALF_LIFE)
+    assert abs(after - before) <= 1e-9 * before
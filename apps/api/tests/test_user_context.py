@@ -0,0 +1,108 @@
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from myndral_api import auth_utils, caching
+
+USER_ID = "7d4c1e8a-3b8f-4f0e-9a51-0c6a2b5e9d10"
+
+
+class _Result:
+    def __init__(self, row: dict[str, Any] | None) -> None:
+        self.row = row
+
+    def mappings(self) -> "_Result":
+        return self
+
+    def first(self) -> dict[str, Any] | None:
+        return self.row
+
+
+class _UserSession:
+    def __init__(self, **overrides: Any) -> None:
+        self.row = {
+            "id": USER_ID,
+            "username": "alice",
+            "email": "alice@example.com",
+            "display_name": "Alice",
+            "avatar_url": None,
+            "role": "listener",
+            "hashed_password": "x",
+            "is_active": True,
+            "created_at": datetime(2026, 1, 1, tzinfo=UTC),
+            "subscription_plan": "free",
+            **overrides,
+        }
+        self.queries = 0
+
+    async def execute(self, statement: Any, params: dict[str, Any] | None = None) -> _Result:
+        self.queries += 1
+        return _Result(self.row)
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth_utils, "_user_context_cache", caching.TTLCache(30))
+
+
+def _bearer() -> HTTPAuthorizationCredentials:
+    token, _ = auth_utils.create_access_token(USER_ID)
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+async def test_user_context_is_cached_until_invalidated() -> None:
+    db = _UserSession()
+
+    first = await auth_utils.get_current_user(_bearer(), db)
+    first["role"] = "mutated by a handler"
+    second = await auth_utils.get_current_user(_bearer(), db)
+    assert second["role"] == "listener"
+    assert db.queries == 1
+
+    db.row["subscription_plan"] = "premium_monthly"
+    await auth_utils.invalidate_user_context(USER_ID)
+    third = await auth_utils.get_current_user(_bearer(), db)
+    assert third["subscriptionPlan"] == "premium_monthly"
+    assert db.queries == 2
+
+
+async def test_inactive_users_are_not_cached() -> None:
+    db = _UserSession(is_active=False)
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            await auth_utils.get_current_user(_bearer(), db)
+        assert exc_info.value.status_code == 401
+    assert db.queries == 2
+
+
+async def test_zero_ttl_disables_the_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(auth_utils.get_settings(), "user_context_cache_ttl_seconds", 0)
+    db = _UserSession()
+
+    await auth_utils.get_current_user(_bearer(), db)
+    await auth_utils.get_current_user(_bearer(), db)
+    assert db.queries == 2
+
+
+async def test_without_redis_entries_expire_after_the_local_ttl(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Another worker's invalidation never reaches this cache; only the TTL does.
+    now = [0.0]
+    monkeypatch.setattr(caching.time, "monotonic", lambda: now[0])
+    db = _UserSession()
+
+    await auth_utils.get_current_user(_bearer(), db)
+    db.row["is_active"] = False
+    now[0] += auth_utils.get_settings().user_context_local_ttl_seconds - 1
+    await auth_utils.get_current_user(_bearer(), db)
+    assert db.queries == 1
+
+    now[0] += 1
+    with pytest.raises(HTTPException) as exc_info:
+        await auth_utils.get_current_user(_bearer(), db)
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,22 @@
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Migration 20261017_01 — HLS renditions per track quality tier
+--
+-- Written by hls.package_track after staging approval and read by the
+-- /v1/stream/{track_id}/hls/master.m3u8 route to build the master playlist.
+-- ─────────────────────────────────────────────────────────────────────────────
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS track_hls_variants (
+  track_id           UUID          NOT NULL REFERENCES tracks(id) ON DELETE CASCADE,
+  quality            audio_quality NOT NULL,
+  version            TEXT          NOT NULL,
+  storage_prefix     TEXT          NOT NULL,
+  bandwidth_bps      INTEGER       NOT NULL,
+  segment_count      INTEGER       NOT NULL,
+  target_duration_s  SMALLINT      NOT NULL,
+  packaged_at        TIMESTAMPTZ   NOT NULL DEFAULT now(),
+  PRIMARY KEY (track_id, quality)
+);
+
+COMMIT;
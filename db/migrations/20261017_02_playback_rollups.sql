@@ -0,0 +1,105 @@
+-- migrate:no-transaction
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Migration 20261017_02 — incremental counter rollups
+--
+-- Adds an insertion sequence to play_events / skip_events so the rollup job
+-- (python -m myndral_api.rollups) can consume new rows from a persisted
+-- high-water mark.
+--
+-- These are the largest tables in the schema, so nothing here rewrites them
+-- or holds an ACCESS EXCLUSIVE lock for longer than a catalog update:
+--   * seq is added as a plain nullable BIGINT (metadata only) and its
+--     nextval default is set in a separate statement.  A volatile default on
+--     ADD COLUMN (BIGSERIAL) would rewrite the table under that lock.
+--   * existing rows are numbered in batches of heap pages, each batch its own
+--     transaction;
+--   * NOT NULL is proven by a CHECK validated under SHARE UPDATE EXCLUSIVE,
+--     which lets SET NOT NULL skip its scan (20261017_05 needs the column
+--     NOT NULL to attach the table as a partition);
+--   * the seq indexes are built CONCURRENTLY.
+-- ingested_at's now() default is stable, so adding it is metadata only too.
+--
+-- Existing events are folded into the counters on the first rollup run;
+-- play_count / total_plays are never written anywhere else.
+-- Every statement is idempotent, so a failed run can simply be retried.
+-- ─────────────────────────────────────────────────────────────────────────────
+
+CREATE SEQUENCE IF NOT EXISTS play_events_seq_seq;
+CREATE SEQUENCE IF NOT EXISTS skip_events_seq_seq;
+
+ALTER TABLE play_events ADD COLUMN IF NOT EXISTS seq BIGINT;
+ALTER TABLE play_events ALTER COLUMN seq SET DEFAULT nextval('play_events_seq_seq');
+ALTER SEQUENCE play_events_seq_seq OWNED BY play_events.seq;
+ALTER TABLE play_events ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMPTZ NOT NULL DEFAULT now();
+
+ALTER TABLE skip_events ADD COLUMN IF NOT EXISTS seq BIGINT;
+ALTER TABLE skip_events ALTER COLUMN seq SET DEFAULT nextval('skip_events_seq_seq');
+ALTER SEQUENCE skip_events_seq_seq OWNED BY skip_events.seq;
+ALTER TABLE skip_events ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMPTZ NOT NULL DEFAULT now();
+
+-- Rows inserted from here on take the default; number the older ones 1000
+-- heap pages (~8 MB) at a time with TID range scans, committing per batch.
+-- Updated rows may move to later pages, but by then they carry a seq.
+DO $$
+DECLARE
+  spec      text[];
+  pages     bigint;
+  from_page bigint;
+  batch     constant bigint := 1000;
+BEGIN
+  FOREACH spec SLICE 1 IN ARRAY ARRAY[
+    ['play_events', 'play_events_seq_seq'],
+    ['skip_events', 'skip_events_seq_seq']
+  ] LOOP
+    pages := pg_relation_size(spec[1]::regclass) / current_setting('block_size')::bigint;
+    from_page := 0;
+    WHILE from_page <= pages LOOP
+      EXECUTE format(
+        'UPDATE %I SET seq = nextval(%L)
+         WHERE ctid >= %L::tid AND ctid < %L::tid AND seq IS NULL',
+        spec[1], spec[2], format('(%s,0)', from_page), format('(%s,0)', from_page + batch)
+      );
+      COMMIT;
+      from_page := from_page + batch;
+    END LOOP;
+  END LOOP;
+END
+$$;
+
+DO $$
+DECLARE
+  tbl text;
+BEGIN
+  FOREACH tbl IN ARRAY ARRAY['play_events', 'skip_events'] LOOP
+    IF NOT EXISTS (
+      SELECT 1 FROM pg_constraint WHERE conname = 'ck_' || tbl || '_seq_not_null'
+    ) THEN
+      EXECUTE format(
+        'ALTER TABLE %I ADD CONSTRAINT %I CHECK (seq IS NOT NULL) NOT VALID',
+        tbl, 'ck_' || tbl || '_seq_not_null'
+      );
+    END IF;
+  END LOOP;
+END
+$$;
+
+ALTER TABLE play_events VALIDATE CONSTRAINT ck_play_events_seq_not_null;
+ALTER TABLE skip_events VALIDATE CONSTRAINT ck_skip_events_seq_not_null;
+
+ALTER TABLE play_events ALTER COLUMN seq SET NOT NULL;
+ALTER TABLE skip_events ALTER COLUMN seq SET NOT NULL;
+
+ALTER TABLE play_events DROP CONSTRAINT IF EXISTS ck_play_events_seq_not_null;
+ALTER TABLE skip_events DROP CONSTRAINT IF EXISTS ck_skip_events_seq_not_null;
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_plays_seq;
+CREATE INDEX CONCURRENTLY idx_plays_seq ON play_events (seq);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_skips_seq;
+CREATE INDEX CONCURRENTLY idx_skips_seq ON skip_events (seq);
+
+CREATE TABLE IF NOT EXISTS rollup_state (
+  source      TEXT        PRIMARY KEY,
+  high_water  BIGINT      NOT NULL DEFAULT 0,
+  updated_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
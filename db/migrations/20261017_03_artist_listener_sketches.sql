@@ -0,0 +1,26 @@
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Migration 20261017_03 — HyperLogLog listener sketches
+--
+-- Keeps one compact HyperLogLog sketch per artist per UTC day (see apps/api
+-- hll.py) instead of exact per-day listener sets.  The event writer updates
+-- the sketches as plays are inserted; the rollup job merges the days in the
+-- window into artists.monthly_listeners.
+--
+-- After applying, seed the current window once with:
+--   python -m myndral_api.rollups --backfill-listeners
+-- ─────────────────────────────────────────────────────────────────────────────
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS artist_listener_sketches (
+  artist_id  UUID        NOT NULL REFERENCES artists(id) ON DELETE CASCADE,
+  day        DATE        NOT NULL,
+  sketch     BYTEA       NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (artist_id, day)
+);
+
+CREATE INDEX IF NOT EXISTS idx_listen_sketch_day ON artist_listener_sketches (day);
+CREATE INDEX IF NOT EXISTS idx_listen_sketch_upd ON artist_listener_sketches (updated_at);
+
+COMMIT;
@@ -0,0 +1,57 @@
+-- migrate:no-transaction
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Migration 20261017_04 — prepare play_events / skip_events / ad_impressions
+-- for monthly range partitioning (swap happens in 20261017_05)
+--
+-- Runs statement by statement outside a transaction so nothing here blocks
+-- event inserts for longer than a catalog update:
+--   * the (id, <time>) unique index a partitioned primary key needs is built
+--     CONCURRENTLY;
+--   * a CHECK (<time> < cutover) constraint is added NOT VALID and validated
+--     separately (VALIDATE only takes SHARE UPDATE EXCLUSIVE), which lets the
+--     swap attach each existing table as a partition without re-scanning it.
+--
+-- cutover is the first day of the month after next (UTC).  20261017_05
+-- derives the same value; if the month rolls over in between, the attach
+-- falls back to a validating scan — slower, never wrong.
+-- Every statement is idempotent, so a failed run can simply be retried.
+-- ─────────────────────────────────────────────────────────────────────────────
+
+DROP INDEX CONCURRENTLY IF EXISTS play_events_id_played_at_key;
+CREATE UNIQUE INDEX CONCURRENTLY play_events_id_played_at_key
+  ON play_events (id, played_at);
+
+DROP INDEX CONCURRENTLY IF EXISTS skip_events_id_skipped_at_key;
+CREATE UNIQUE INDEX CONCURRENTLY skip_events_id_skipped_at_key
+  ON skip_events (id, skipped_at);
+
+DROP INDEX CONCURRENTLY IF EXISTS ad_impressions_id_played_at_key;
+CREATE UNIQUE INDEX CONCURRENTLY ad_impressions_id_played_at_key
+  ON ad_impressions (id, played_at);
+
+DO $$
+DECLARE
+  cutover timestamptz := (date_trunc('month', now() AT TIME ZONE 'UTC')
+                          + interval '2 months') AT TIME ZONE 'UTC';
+  spec    text[];
+BEGIN
+  FOREACH spec SLICE 1 IN ARRAY ARRAY[
+    ['play_events',    'played_at'],
+    ['skip_events',    'skipped_at'],
+    ['ad_impressions', 'played_at']
+  ] LOOP
+    IF NOT EXISTS (
+      SELECT 1 FROM pg_constraint WHERE conname = 'ck_' || spec[1] || '_cutover'
+    ) THEN
+      EXECUTE format(
+        'ALTER TABLE %I ADD CONSTRAINT %I CHECK (%I < %L) NOT VALID',
+        spec[1], 'ck_' || spec[1] || '_cutover', spec[2], cutover
+      );
+    END IF;
+  END LOOP;
+END
+$$;
+
+ALTER TABLE play_events    VALIDATE CONSTRAINT ck_play_events_cutover;
+ALTER TABLE skip_events    VALIDATE CONSTRAINT ck_skip_events_cutover;
+ALTER TABLE ad_impressions VALIDATE CONSTRAINT ck_ad_impressions_cutover;
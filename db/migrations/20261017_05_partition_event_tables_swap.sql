@@ -0,0 +1,135 @@
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Migration 20261017_05 — switch play_events / skip_events / ad_impressions to
+-- monthly RANGE partitions
+--
+-- Each existing table is renamed to <table>_legacy and attached, unchanged, as
+-- the partition FROM (MINVALUE) TO (cutover) of a new partitioned parent with
+-- the original name.  20261017_04 already built the (id, <time>) unique index
+-- and validated CHECK (<time> < cutover), so nothing here rewrites or scans
+-- event rows: indexes are adopted, the attach is proven by the constraint,
+-- and the whole swap holds its locks for a few catalog updates.
+--
+-- Monthly partitions from cutover onwards, the DEFAULT catch-all's contents
+-- and retention are handled by the maintenance job (python -m
+-- myndral_api.partitions).  The legacy partition ages out like any other once
+-- its upper bound falls past the retention horizon.
+-- ─────────────────────────────────────────────────────────────────────────────
+
+BEGIN;
+
+SET LOCAL lock_timeout = '10s';
+LOCK TABLE play_events, skip_events, ad_impressions IN ACCESS EXCLUSIVE MODE;
+
+-- ── play_events ─────────────────────────────────────────────────────────────
+
+ALTER TABLE play_events RENAME TO play_events_legacy;
+ALTER INDEX idx_plays_user    RENAME TO play_events_legacy_user_idx;
+ALTER INDEX idx_plays_track   RENAME TO play_events_legacy_track_idx;
+ALTER INDEX idx_plays_session RENAME TO play_events_legacy_session_idx;
+ALTER INDEX idx_plays_seq     RENAME TO play_events_legacy_seq_idx;
+ALTER TABLE play_events_legacy
+  DROP CONSTRAINT play_events_pkey,
+  ADD CONSTRAINT play_events_legacy_pkey PRIMARY KEY USING INDEX play_events_id_played_at_key;
+
+CREATE TABLE play_events (
+  id                 UUID             NOT NULL DEFAULT gen_random_uuid(),
+  user_id            UUID             REFERENCES users(id)              ON DELETE SET NULL,
+  track_id           UUID             NOT NULL REFERENCES tracks(id)    ON DELETE CASCADE,
+  session_id         UUID             REFERENCES listening_sessions(id) ON DELETE SET NULL,
+  duration_played_ms INTEGER          NOT NULL DEFAULT 0,
+  completed          BOOLEAN          NOT NULL DEFAULT false,
+  context_type       playback_context NOT NULL DEFAULT 'unknown',
+  context_id         UUID,
+  audio_quality      audio_quality,
+  shuffle_active     BOOLEAN,
+  played_at          TIMESTAMPTZ      NOT NULL DEFAULT now(),
+  seq                BIGINT           NOT NULL DEFAULT nextval('play_events_seq_seq'),
+  ingested_at        TIMESTAMPTZ      NOT NULL DEFAULT now(),
+
+  PRIMARY KEY (id, played_at),
+  CONSTRAINT ck_play_duration CHECK (duration_played_ms >= 0)
+) PARTITION BY RANGE (played_at);
+
+ALTER SEQUENCE play_events_seq_seq OWNED BY play_events.seq;
+
+CREATE INDEX idx_plays_user    ON play_events (user_id,  played_at DESC);
+CREATE INDEX idx_plays_track   ON play_events (track_id, played_at DESC);
+CREATE INDEX idx_plays_session ON play_events (session_id);
+CREATE INDEX idx_plays_seq     ON play_events (seq);
+
+-- ── skip_events ─────────────────────────────────────────────────────────────
+
+ALTER TABLE skip_events RENAME TO skip_events_legacy;
+ALTER INDEX idx_skips_track RENAME TO skip_events_legacy_track_idx;
+ALTER INDEX idx_skips_user  RENAME TO skip_events_legacy_user_idx;
+ALTER INDEX idx_skips_seq   RENAME TO skip_events_legacy_seq_idx;
+ALTER TABLE skip_events_legacy
+  DROP CONSTRAINT skip_events_pkey,
+  ADD CONSTRAINT skip_events_legacy_pkey PRIMARY KEY USING INDEX skip_events_id_skipped_at_key;
+
+CREATE TABLE skip_events (
+  id           UUID             NOT NULL DEFAULT gen_random_uuid(),
+  user_id      UUID             REFERENCES users(id)              ON DELETE SET NULL,
+  track_id     UUID             NOT NULL REFERENCES tracks(id)    ON DELETE CASCADE,
+  session_id   UUID             REFERENCES listening_sessions(id) ON DELETE SET NULL,
+  played_ms    INTEGER          NOT NULL DEFAULT 0,
+  context_type playback_context NOT NULL DEFAULT 'unknown',
+  context_id   UUID,
+  skipped_at   TIMESTAMPTZ      NOT NULL DEFAULT now(),
+  seq          BIGINT           NOT NULL DEFAULT nextval('skip_events_seq_seq'),
+  ingested_at  TIMESTAMPTZ      NOT NULL DEFAULT now(),
+
+  PRIMARY KEY (id, skipped_at),
+  CONSTRAINT ck_skip_played CHECK (played_ms >= 0)
+) PARTITION BY RANGE (skipped_at);
+
+ALTER SEQUENCE skip_events_seq_seq OWNED BY skip_events.seq;
+
+CREATE INDEX idx_skips_track ON skip_events (track_id, skipped_at DESC);
+CREATE INDEX idx_skips_user  ON skip_events (user_id,  skipped_at DESC);
+CREATE INDEX idx_skips_seq   ON skip_events (seq);
+
+-- ── ad_impressions ──────────────────────────────────────────────────────────
+
+ALTER TABLE ad_impressions RENAME TO ad_impressions_legacy;
+ALTER INDEX idx_ad_impr_user  RENAME TO ad_impressions_legacy_user_idx;
+ALTER INDEX idx_ad_impr_asset RENAME TO ad_impressions_legacy_asset_idx;
+ALTER TABLE ad_impressions_legacy
+  DROP CONSTRAINT ad_impressions_pkey,
+  ADD CONSTRAINT ad_impressions_legacy_pkey
+    PRIMARY KEY USING INDEX ad_impressions_id_played_at_key;
+
+CREATE TABLE ad_impressions (
+  id          UUID        NOT NULL DEFAULT gen_random_uuid(),
+  user_id     UUID        REFERENCES users(id)              ON DELETE SET NULL,
+  ad_asset_id UUID        NOT NULL REFERENCES ad_assets(id) ON DELETE CASCADE,
+  session_id  UUID        REFERENCES listening_sessions(id) ON DELETE SET NULL,
+  completed   BOOLEAN     NOT NULL DEFAULT false,
+  played_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+  PRIMARY KEY (id, played_at)
+) PARTITION BY RANGE (played_at);
+
+CREATE INDEX idx_ad_impr_user  ON ad_impressions (user_id,     played_at DESC);
+CREATE INDEX idx_ad_impr_asset ON ad_impressions (ad_asset_id, played_at DESC);
+
+-- ── Attach the old tables and add the catch-all partitions ──────────────────
+
+DO $$
+DECLARE
+  cutover timestamptz := (date_trunc('month', now() AT TIME ZONE 'UTC')
+                          + interval '2 months') AT TIME ZONE 'UTC';
+  tbl     text;
+BEGIN
+  FOREACH tbl IN ARRAY ARRAY['play_events', 'skip_events', 'ad_impressions'] LOOP
+    EXECUTE format(
+      'ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (MINVALUE) TO (%L)',
+      tbl, tbl || '_legacy', cutover
+    );
+    EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', tbl || '_legacy', 'ck_' || tbl || '_cutover');
+    EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', tbl || '_default', tbl);
+  END LOOP;
+END
+$$;
+
+COMMIT;
@@ -0,0 +1,36 @@
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Migration 20261017_06 — time-decayed trending scores and materialised charts
+--
+-- chart_scores holds one exponentially decayed score per track, album and
+-- artist, added to by the rollup job as it folds in play/skip events.
+-- chart_entries holds the top-N lists (global and per genre) rebuilt from it
+-- at the end of each run and served by /v1/charts.
+--
+-- Scores start from zero: only events rolled up after this migration count,
+-- which is what a trending chart wants anyway.  The first rollup run creates
+-- the 'chart_epoch' row in rollup_state.
+-- ─────────────────────────────────────────────────────────────────────────────
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS chart_scores (
+  entity_type TEXT             NOT NULL,
+  entity_id   UUID             NOT NULL,
+  score       DOUBLE PRECISION NOT NULL DEFAULT 0,
+  updated_at  TIMESTAMPTZ      NOT NULL DEFAULT now(),
+  PRIMARY KEY (entity_type, entity_id),
+  CONSTRAINT ck_chart_score_type CHECK (entity_type IN ('track', 'album', 'artist'))
+);
+
+CREATE TABLE IF NOT EXISTS chart_entries (
+  entity_type  TEXT             NOT NULL,
+  chart_key    TEXT             NOT NULL,
+  rank         INTEGER          NOT NULL,
+  entity_id    UUID             NOT NULL,
+  score        DOUBLE PRECISION NOT NULL,
+  generated_at TIMESTAMPTZ      NOT NULL DEFAULT now(),
+  PRIMARY KEY (entity_type, chart_key, rank),
+  CONSTRAINT ck_chart_entry_type CHECK (entity_type IN ('track', 'album', 'artist'))
+);
+
+COMMIT;
@@ -0,0 +1,21 @@
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Migration 20261017_07 — precomputed related tracks
+--
+-- track_neighbors holds each track's top-K neighbours by cosine similarity of
+-- its listeners, written by the offline job (python -m myndral_api.related)
+-- and read by /v1/tracks/{id}/related with one primary-key lookup.  The
+-- endpoint returns an empty list until the job has run once.
+-- ─────────────────────────────────────────────────────────────────────────────
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS track_neighbors (
+  track_id     UUID        PRIMARY KEY REFERENCES tracks(id) ON DELETE CASCADE,
+  neighbor_ids UUID[]      NOT NULL,
+  scores       REAL[]      NOT NULL,
+  generated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+  CONSTRAINT ck_track_neighbors_len CHECK (cardinality(neighbor_ids) = cardinality(scores))
+);
+
+COMMIT;
@@ -0,0 +1,25 @@
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Migration 20261017_08 — radio candidate pools
+--
+-- radio_pools holds one ordered candidate list per artist and per genre for
+-- /v1/radio.  Track-seeded stations combine the seed's track_neighbors row
+-- with its artist's and genre's pools.  Both tables are rebuilt together by
+-- the nightly job (python -m myndral_api.related); until its first run,
+-- stations contain only the seed track.
+-- ─────────────────────────────────────────────────────────────────────────────
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS radio_pools (
+  seed_type    TEXT        NOT NULL,
+  seed_id      UUID        NOT NULL,
+  track_ids    UUID[]      NOT NULL,
+  artist_ids   UUID[]      NOT NULL,
+  generated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (seed_type, seed_id),
+
+  CONSTRAINT ck_radio_pool_type CHECK (seed_type IN ('artist', 'genre')),
+  CONSTRAINT ck_radio_pool_len  CHECK (cardinality(track_ids) = cardinality(artist_ids))
+);
+
+COMMIT;
@@ -0,0 +1,101 @@
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Migration 20261017_09 — track-card read model
+--
+-- track_cards holds one pre-joined row per visible track (track, album and
+-- both artists published) with everything a track listing serialises: artist
+-- and album fields, album genre tags and the preferred audio URL.  Public
+-- track listings read it instead of joining four tables with two correlated
+-- subqueries per row.  The API keeps it in step on every staging and internal
+-- edit; this migration backfills it, and a full rebuild is available at any
+-- time with python -m myndral_api.track_cards.
+-- ─────────────────────────────────────────────────────────────────────────────
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS track_cards (
+  id                             UUID        PRIMARY KEY REFERENCES tracks(id) ON DELETE CASCADE,
+  title                          TEXT        NOT NULL,
+  album_id                       UUID        NOT NULL,
+  primary_artist_id              UUID        NOT NULL,
+  album_artist_id                UUID        NOT NULL,
+  disc_number                    SMALLINT    NOT NULL,
+  track_number                   SMALLINT    NOT NULL,
+  duration_ms                    INTEGER     NOT NULL,
+  play_count                     BIGINT      NOT NULL,
+  explicit                       BOOLEAN     NOT NULL,
+  created_at                     TIMESTAMPTZ NOT NULL,
+  artist_name                    TEXT        NOT NULL,
+  artist_slug                    TEXT        NOT NULL,
+  artist_bio                     TEXT,
+  artist_image_url               TEXT,
+  artist_monthly_listeners       BIGINT      NOT NULL,
+  artist_style_tags              TEXT[]      NOT NULL,
+  album_title                    TEXT        NOT NULL,
+  album_cover_url                TEXT,
+  album_release_date             DATE,
+  album_type                     TEXT        NOT NULL,
+  album_track_count              SMALLINT    NOT NULL,
+  album_artist_name              TEXT        NOT NULL,
+  album_artist_slug              TEXT        NOT NULL,
+  album_artist_bio               TEXT,
+  album_artist_image_url         TEXT,
+  album_artist_monthly_listeners BIGINT      NOT NULL,
+  album_artist_style_tags        TEXT[]      NOT NULL,
+  album_genre_tags               TEXT[]      NOT NULL,
+  audio_url                      TEXT,
+  refreshed_at                   TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_track_cards_plays  ON track_cards (play_count DESC, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_track_cards_album  ON track_cards (album_id, disc_number, track_number);
+CREATE INDEX IF NOT EXISTS idx_track_cards_artist ON track_cards (primary_artist_id, play_count DESC);
+CREATE INDEX IF NOT EXISTS idx_track_cards_aa     ON track_cards (album_artist_id);
+
+INSERT INTO track_cards (
+  id, title, album_id, primary_artist_id, album_artist_id,
+  disc_number, track_number, duration_ms, play_count, explicit, created_at,
+  artist_name, artist_slug, artist_bio, artist_image_url,
+  artist_monthly_listeners, artist_style_tags,
+  album_title, album_cover_url, album_release_date, album_type, album_track_count,
+  album_artist_name, album_artist_slug, album_artist_bio, album_artist_image_url,
+  album_artist_monthly_listeners, album_artist_style_tags,
+  album_genre_tags, audio_url
+)
+SELECT
+  t.id, t.title, t.album_id, t.primary_artist_id, al.artist_id,
+  t.disc_number, t.track_number, t.duration_ms, t.play_count, t.explicit, t.created_at,
+  pa.name, pa.slug, pa.bio, pa.image_url,
+  pa.monthly_listeners, pa.style_tags,
+  al.title, al.cover_url, al.release_date, al.album_type::text, al.track_count,
+  aa.name, aa.slug, aa.bio, aa.image_url,
+  aa.monthly_listeners, aa.style_tags,
+  COALESCE((
+    SELECT array_agg(g.name ORDER BY g.name)
+    FROM album_genres ag
+    JOIN genres g ON g.id = ag.genre_id
+    WHERE ag.album_id = al.id
+  ), ARRAY[]::text[]),
+  (
+    SELECT taf.storage_url
+    FROM track_audio_files taf
+    WHERE taf.track_id = t.id
+    ORDER BY CASE taf.quality
+      WHEN 'high_320' THEN 1
+      WHEN 'lossless' THEN 2
+      WHEN 'standard_256' THEN 3
+      WHEN 'low_128' THEN 4
+      ELSE 5
+    END
+    LIMIT 1
+  )
+FROM tracks t
+JOIN artists pa ON pa.id = t.primary_artist_id
+JOIN albums al ON al.id = t.album_id
+JOIN artists aa ON aa.id = al.artist_id
+WHERE t.status = 'published'
+  AND al.status = 'published'
+  AND pa.status = 'published'
+  AND aa.status = 'published'
+ON CONFLICT (id) DO NOTHING;
+
+COMMIT;
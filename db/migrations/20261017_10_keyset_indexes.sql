@@ -0,0 +1,44 @@
+-- migrate:no-transaction
+-- ─────────────────────────────────────────────────────────────────────────────
+-- Migration 20261017_10 — indexes for cursor pagination
+--
+-- The public list endpoints page by keyset (pagination.py).  Each page starts
+-- right after the last row of the previous one instead of skipping OFFSET rows.
+-- That is only cheap when an index holds the whole sort order, including the
+-- unique id that breaks ties.  The indexes below replace the single-column
+-- ones the lists used before, which had no tie-breaker.  The album index is
+-- also built on the COALESCE the lists sort by, because the old
+-- release_date DESC index put NULL dates first.
+--
+-- Runs statement by statement outside a transaction so catalog reads never
+-- wait on an index build: each replacement is built CONCURRENTLY under a
+-- temporary name, the old index is dropped CONCURRENTLY and the new one takes
+-- its name (RENAME only takes SHARE UPDATE EXCLUSIVE).
+-- Every statement is idempotent, so a failed run can simply be retried.
+-- ─────────────────────────────────────────────────────────────────────────────
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_track_cards_plays_new;
+CREATE INDEX CONCURRENTLY idx_track_cards_plays_new
+  ON track_cards (play_count DESC, created_at DESC, id DESC);
+DROP INDEX CONCURRENTLY IF EXISTS idx_track_cards_plays;
+ALTER INDEX idx_track_cards_plays_new RENAME TO idx_track_cards_plays;
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_albums_release_new;
+CREATE INDEX CONCURRENTLY idx_albums_release_new ON albums (
+  (COALESCE(release_date, DATE '0001-01-01')) DESC, created_at DESC, id DESC
+) WHERE status = 'published';
+DROP INDEX CONCURRENTLY IF EXISTS idx_albums_release;
+ALTER INDEX idx_albums_release_new RENAME TO idx_albums_release;
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_artists_listeners_new;
+CREATE INDEX CONCURRENTLY idx_artists_listeners_new ON artists (monthly_listeners DESC, name, id)
+  WHERE status = 'published';
+DROP INDEX CONCURRENTLY IF EXISTS idx_artists_listeners;
+ALTER INDEX idx_artists_listeners_new RENAME TO idx_artists_listeners;
+
+-- Followed artists are listed newest first like the other library relations.
+DROP INDEX CONCURRENTLY IF EXISTS idx_followed_art_u_new;
+CREATE INDEX CONCURRENTLY idx_followed_art_u_new
+  ON user_followed_artists (user_id, followed_at DESC);
+DROP INDEX CONCURRENTLY IF EXISTS idx_followed_art_u;
+ALTER INDEX idx_followed_art_u_new RENAME TO idx_followed_art_u;
@@ -261,7 +261,7 @@ CREATE TABLE artists (
   bio               TEXT,
   image_url         TEXT,          -- profile / avatar
   header_image_url  TEXT,          -- banner / hero
-  -- Denormalised counters (refreshed by a scheduled background job)
+  -- Denormalised counters (refreshed by the rollup job, rollups.py)
   monthly_listeners BIGINT         NOT NULL DEFAULT 0,
   total_plays       BIGINT         NOT NULL DEFAULT 0,
   follower_count    INTEGER        NOT NULL DEFAULT 0,
@@ -355,7 +355,7 @@ CREATE TABLE tracks (
   disc_number       SMALLINT       NOT NULL DEFAULT 1,
   duration_ms       INTEGER        NOT NULL DEFAULT 0,
   explicit          BOOLEAN        NOT NULL DEFAULT false,
-  -- Denormalised counters (updated by background job, not inline on writes)
+  -- Denormalised counters (updated by the rollup job, not inline on writes)
   play_count        BIGINT         NOT NULL DEFAULT 0,
   skip_count        BIGINT         NOT NULL DEFAULT 0,
   -- skip_ratio = skip_count::float / NULLIF(play_count, 0)  (compute in queries)
@@ -413,6 +413,59 @@ CREATE TABLE track_audio_files (
   CONSTRAINT ck_audio_channels      CHECK (channels IN (1, 2))
 );
 
+-- HLS renditions packaged from track_audio_files when a track is approved.
+-- Objects live under <storage_prefix>/index.m3u8 and <storage_prefix>/seg_NNNNN.mp3;
+-- version is a content hash, so every packaged object is immutable.
+CREATE TABLE track_hls_variants (
+  track_id           UUID          NOT NULL REFERENCES tracks(id) ON DELETE CASCADE,
+  quality            audio_quality NOT NULL,
+  version            TEXT          NOT NULL,
+  storage_prefix     TEXT          NOT NULL,
+  bandwidth_bps      INTEGER       NOT NULL,
+  segment_count      INTEGER       NOT NULL,
+  target_duration_s  SMALLINT      NOT NULL,
+  packaged_at        TIMESTAMPTZ   NOT NULL DEFAULT now(),
+  PRIMARY KEY (track_id, quality)
+);
+
+-- Track-card read model (track_cards.py): one pre-joined row per visible
+-- track — track, album and both artists published — holding everything a
+-- track listing serialises.  Kept in step by the staging and internal edit
+-- endpoints and the rollup job; every public track listing reads it alone.
+CREATE TABLE track_cards (
+  id                             UUID        PRIMARY KEY REFERENCES tracks(id) ON DELETE CASCADE,
+  title                          TEXT        NOT NULL,
+  album_id                       UUID        NOT NULL,
+  primary_artist_id              UUID        NOT NULL,
+  album_artist_id                UUID        NOT NULL,
+  disc_number                    SMALLINT    NOT NULL,
+  track_number                   SMALLINT    NOT NULL,
+  duration_ms                    INTEGER     NOT NULL,
+  play_count                     BIGINT      NOT NULL,
+  explicit                       BOOLEAN     NOT NULL,
+  created_at                     TIMESTAMPTZ NOT NULL,
+  artist_name                    TEXT        NOT NULL,
+  artist_slug                    TEXT        NOT NULL,
+  artist_bio                     TEXT,
+  artist_image_url               TEXT,
+  artist_monthly_listeners       BIGINT      NOT NULL,
+  artist_style_tags              TEXT[]      NOT NULL,
+  album_title                    TEXT        NOT NULL,
+  album_cover_url                TEXT,
+  album_release_date             DATE,
+  album_type                     TEXT        NOT NULL,
+  album_track_count              SMALLINT    NOT NULL,
+  album_artist_name              TEXT        NOT NULL,
+  album_artist_slug              TEXT        NOT NULL,
+  album_artist_bio               TEXT,
+  album_artist_image_url         TEXT,
+  album_artist_monthly_listeners BIGINT      NOT NULL,
+  album_artist_style_tags        TEXT[]      NOT NULL,
+  album_genre_tags               TEXT[]      NOT NULL,
+  audio_url                      TEXT,
+  refreshed_at                   TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
 CREATE TABLE track_genres (
   track_id UUID NOT NULL REFERENCES tracks(id)  ON DELETE CASCADE,
   genre_id UUID NOT NULL REFERENCES genres(id)  ON DELETE CASCADE,
@@ -578,9 +631,13 @@ CREATE TABLE playlist_track_edits (
 -- ════════════════════════════════════════════════════════════════════════════
 -- PLAYBACK EVENTS
 -- ════════════════════════════════════════════════════════════════════════════
--- NOTE: play_events and skip_events grow very fast (millions/day at scale).
--- Consider RANGE-partitioning by month on played_at / skipped_at once
--- volume warrants it. Can be applied without downtime using pg_partman.
+-- NOTE: play_events and skip_events grow very fast (millions/day at scale), so
+-- they (and ad_impressions) are RANGE-partitioned by month on played_at /
+-- skipped_at.  Partitions are named <table>_pYYYY_MM; the maintenance job
+-- (python -m myndral_api.partitions) creates them ahead of time and detaches
+-- months past retention.  Rows outside every monthly range land in
+-- <table>_default, which the job drains when it creates the matching month.
+-- Primary keys include the partition column, as Postgres requires.
 
 -- Groups individual play/skip events into a single browsing session
 CREATE TABLE listening_sessions (
@@ -596,7 +653,7 @@ CREATE TABLE listening_sessions (
 );
 
 CREATE TABLE play_events (
-  id                 UUID             PRIMARY KEY DEFAULT gen_random_uuid(),
+  id                 UUID             NOT NULL DEFAULT gen_random_uuid(),
   user_id            UUID             REFERENCES users(id)              ON DELETE SET NULL,
   track_id           UUID             NOT NULL REFERENCES tracks(id)    ON DELETE CASCADE,
   session_id         UUID             REFERENCES listening_sessions(id) ON DELETE SET NULL,
@@ -607,12 +664,18 @@ CREATE TABLE play_events (
   audio_quality      audio_quality,
   shuffle_active     BOOLEAN,
   played_at          TIMESTAMPTZ      NOT NULL DEFAULT now(),
+  -- Insertion order for incremental consumers (rollups.py); played_at is client time
+  seq                BIGSERIAL,
+  ingested_at        TIMESTAMPTZ      NOT NULL DEFAULT now(),
 
+  PRIMARY KEY (id, played_at),
   CONSTRAINT ck_play_duration CHECK (duration_played_ms >= 0)
-);
+) PARTITION BY RANGE (played_at);
+
+CREATE TABLE play_events_default PARTITION OF play_events DEFAULT;
 
 CREATE TABLE skip_events (
-  id           UUID             PRIMARY KEY DEFAULT gen_random_uuid(),
+  id           UUID             NOT NULL DEFAULT gen_random_uuid(),
   user_id      UUID             REFERENCES users(id)              ON DELETE SET NULL,
   track_id     UUID             NOT NULL REFERENCES tracks(id)    ON DELETE CASCADE,
   session_id   UUID             REFERENCES listening_sessions(id) ON DELETE SET NULL,
@@ -620,8 +683,91 @@ CREATE TABLE skip_events (
   context_type playback_context NOT NULL DEFAULT 'unknown',
   context_id   UUID,
   skipped_at   TIMESTAMPTZ      NOT NULL DEFAULT now(),
+  seq          BIGSERIAL,
+  ingested_at  TIMESTAMPTZ      NOT NULL DEFAULT now(),
 
+  PRIMARY KEY (id, skipped_at),
   CONSTRAINT ck_skip_played CHECK (played_ms >= 0)
+) PARTITION BY RANGE (skipped_at);
+
+CREATE TABLE skip_events_default PARTITION OF skip_events DEFAULT;
+
+-- High-water marks for the counter rollup job (rollups.py).  high_water is the
+-- last event seq folded into the denormalised counters; it is advanced in the
+-- same transaction as the counters, so every event is counted exactly once.
+-- For 'listener_sketches' it is the epoch second sketches were last read up to;
+-- for 'chart_epoch' the epoch second that chart_scores are decayed against.
+CREATE TABLE rollup_state (
+  source      TEXT        PRIMARY KEY,  -- 'play_events' | 'skip_events' | 'listener_sketches' | 'chart_epoch'
+  high_water  BIGINT      NOT NULL DEFAULT 0,
+  updated_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- HyperLogLog sketch of the signed-in listeners per artist per UTC day
+-- (hll.py / listeners.py), updated by the event writer as plays are inserted.
+-- monthly_listeners merges the days in the rolling window; older rows are pruned.
+CREATE TABLE artist_listener_sketches (
+  artist_id  UUID        NOT NULL REFERENCES artists(id) ON DELETE CASCADE,
+  day        DATE        NOT NULL,
+  sketch     BYTEA       NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (artist_id, day)
+);
+
+-- Exponentially time-decayed trending score per track/album/artist
+-- (trending.py), added to by the rollup job batch by batch.  Stored as forward
+-- decay against the 'chart_epoch' in rollup_state: the current value is
+-- score · 2^(-(now - epoch) / CHART_HALF_LIFE_HOURS).  No FK because the
+-- entity is polymorphic; rows of deleted entities are pruned as they fade.
+CREATE TABLE chart_scores (
+  entity_type TEXT             NOT NULL,
+  entity_id   UUID             NOT NULL,
+  score       DOUBLE PRECISION NOT NULL DEFAULT 0,
+  updated_at  TIMESTAMPTZ      NOT NULL DEFAULT now(),
+  PRIMARY KEY (entity_type, entity_id),
+  CONSTRAINT ck_chart_score_type CHECK (entity_type IN ('track', 'album', 'artist'))
+);
+
+-- Materialised top-N charts, rebuilt in one transaction after each rollup run.
+-- chart_key is 'global' or a genres.id; score is decayed to generated_at.
+CREATE TABLE chart_entries (
+  entity_type  TEXT             NOT NULL,
+  chart_key    TEXT             NOT NULL,
+  rank         INTEGER          NOT NULL,
+  entity_id    UUID             NOT NULL,
+  score        DOUBLE PRECISION NOT NULL,
+  generated_at TIMESTAMPTZ      NOT NULL DEFAULT now(),
+  PRIMARY KEY (entity_type, chart_key, rank),
+  CONSTRAINT ck_chart_entry_type CHECK (entity_type IN ('track', 'album', 'artist'))
+);
+
+-- Item-to-item neighbours from the offline related-tracks job (related.py):
+-- the top-K tracks by cosine similarity of listeners, best first, with
+-- scores[i] belonging to neighbor_ids[i].  One row per track so that
+-- /v1/tracks/{id}/related is a single primary-key lookup; replaced wholesale
+-- on each run.
+CREATE TABLE track_neighbors (
+  track_id     UUID        PRIMARY KEY REFERENCES tracks(id) ON DELETE CASCADE,
+  neighbor_ids UUID[]      NOT NULL,
+  scores       REAL[]      NOT NULL,
+  generated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+  CONSTRAINT ck_track_neighbors_len CHECK (cardinality(neighbor_ids) = cardinality(scores))
+);
+
+-- Radio candidate pools (radio.py) per artist and genre seed, rebuilt with
+-- track_neighbors.  artist_ids[i] is the primary artist of track_ids[i], so
+-- stations can re-rank by artist without another lookup.
+CREATE TABLE radio_pools (
+  seed_type    TEXT        NOT NULL,
+  seed_id      UUID        NOT NULL,
+  track_ids    UUID[]      NOT NULL,
+  artist_ids   UUID[]      NOT NULL,
+  generated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (seed_type, seed_id),
+
+  CONSTRAINT ck_radio_pool_type CHECK (seed_type IN ('artist', 'genre')),
+  CONSTRAINT ck_radio_pool_len  CHECK (cardinality(track_ids) = cardinality(artist_ids))
 );
 
 -- ════════════════════════════════════════════════════════════════════════════
@@ -739,15 +885,19 @@ CREATE TABLE ad_assets (
   CONSTRAINT ck_ad_duration CHECK (duration_ms > 0)
 );
 
--- High-volume impression log — partition by month if needed
+-- High-volume impression log — monthly partitions, like play_events
 CREATE TABLE ad_impressions (
-  id          UUID        PRIMARY KEY DEFAULT gen_random_uuid(),
+  id          UUID        NOT NULL DEFAULT gen_random_uuid(),
   user_id     UUID        REFERENCES users(id)              ON DELETE SET NULL,
   ad_asset_id UUID        NOT NULL REFERENCES ad_assets(id) ON DELETE CASCADE,
   session_id  UUID        REFERENCES listening_sessions(id) ON DELETE SET NULL,
   completed   BOOLEAN     NOT NULL DEFAULT false,
-  played_at   TIMESTAMPTZ NOT NULL DEFAULT now()
-);
+  played_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+  PRIMARY KEY (id, played_at)
+) PARTITION BY RANGE (played_at);
+
+CREATE TABLE ad_impressions_default PARTITION OF ad_impressions DEFAULT;
 
 -- ════════════════════════════════════════════════════════════════════════════
 -- CONTENT GENERATION JOBS
@@ -828,12 +978,13 @@ CREATE INDEX idx_subs_active       ON subscriptions (user_id, status) WHERE stat
 CREATE INDEX idx_artists_status    ON artists (status);
 CREATE INDEX idx_artists_search    ON artists USING GIN (search_vector);
 CREATE INDEX idx_artists_trgm      ON artists USING GIN (name        gin_trgm_ops);
-CREATE INDEX idx_artists_listeners ON artists (monthly_listeners DESC) WHERE status = 'published';
+CREATE INDEX idx_artists_listeners ON artists (monthly_listeners DESC, name, id) WHERE status = 'published';
 
 -- Albums
 CREATE INDEX idx_albums_artist     ON albums (artist_id);
 CREATE INDEX idx_albums_status     ON albums (status);
-CREATE INDEX idx_albums_release    ON albums (release_date DESC) WHERE status = 'published';
+CREATE INDEX idx_albums_release    ON albums ((COALESCE(release_date, DATE '0001-01-01')) DESC, created_at DESC, id DESC)
+  WHERE status = 'published';
 CREATE INDEX idx_albums_search     ON albums USING GIN (search_vector);
 CREATE INDEX idx_albums_trgm       ON albums USING GIN (title        gin_trgm_ops);
 
@@ -844,6 +995,10 @@ CREATE INDEX idx_tracks_status     ON tracks (status);
 CREATE INDEX idx_tracks_search     ON tracks USING GIN (search_vector);
 CREATE INDEX idx_tracks_trgm       ON tracks USING GIN (title        gin_trgm_ops);
 CREATE INDEX idx_tracks_plays      ON tracks (play_count DESC) WHERE status = 'published';
+CREATE INDEX idx_track_cards_plays  ON track_cards (play_count DESC, created_at DESC, id DESC);
+CREATE INDEX idx_track_cards_album  ON track_cards (album_id, disc_number, track_number);
+CREATE INDEX idx_track_cards_artist ON track_cards (primary_artist_id, play_count DESC);
+CREATE INDEX idx_track_cards_aa     ON track_cards (album_artist_id);
 
 -- Track relationships
 CREATE INDEX idx_track_artists_a   ON track_artists  (artist_id);
@@ -857,7 +1012,7 @@ CREATE INDEX idx_liked_tracks      ON user_liked_tracks   (user_id, liked_at DES
 CREATE INDEX idx_saved_tracks      ON user_saved_tracks   (user_id, saved_at DESC);
 CREATE INDEX idx_saved_albums      ON user_saved_albums   (user_id, saved_at DESC);
 CREATE INDEX idx_liked_albums      ON user_liked_albums   (user_id, liked_at DESC);
-CREATE INDEX idx_followed_art_u    ON user_followed_artists (user_id);
+CREATE INDEX idx_followed_art_u    ON user_followed_artists (user_id, followed_at DESC);
 CREATE INDEX idx_followed_art_a    ON user_followed_artists (artist_id);
 CREATE INDEX idx_liked_artists_u   ON user_liked_artists  (user_id, liked_at DESC);
 CREATE INDEX idx_liked_artists_a   ON user_liked_artists  (artist_id);
@@ -877,6 +1032,10 @@ CREATE INDEX idx_plays_track       ON play_events  (track_id, played_at DESC);
 CREATE INDEX idx_plays_session     ON play_events  (session_id);
 CREATE INDEX idx_skips_track       ON skip_events  (track_id, skipped_at DESC);
 CREATE INDEX idx_skips_user        ON skip_events  (user_id,  skipped_at DESC);
+CREATE INDEX idx_plays_seq         ON play_events  (seq);
+CREATE INDEX idx_skips_seq         ON skip_events  (seq);
+CREATE INDEX idx_listen_sketch_day ON artist_listener_sketches (day);
+CREATE INDEX idx_listen_sketch_upd ON artist_listener_sketches (updated_at);
 
 -- Feed
 CREATE INDEX idx_feed_actor        ON feed_events (actor_id,    created_at DESC);
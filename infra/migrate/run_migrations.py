@@ -6,6 +6,12 @@ Applies all SQL files in db/migrations/ that have not yet been recorded in the
 `schema_migrations` tracking table.  Files are applied in lexicographic order
 (YYYYMMDD_NN prefix guarantees chronological ordering).
 
+A file whose first line is ``-- migrate:no-transaction`` is run one statement
+at a time in autocommit mode instead of as a single transaction, for DDL that
+refuses to run inside one (CREATE INDEX CONCURRENTLY, ALTER … VALIDATE on a
+busy table without holding its lock).  Such files must be safe to re-run: a
+failure part-way leaves the earlier statements applied and the file pending.
+
 Intended to run as a Cloud Run Job before each deployment.  Can also be
 executed locally:
 
@@ -26,6 +32,8 @@ import psycopg2.extras
 # In the container: script is at /app/run_migrations.py, migrations at /app/db/migrations/
 MIGRATIONS_DIR = Path(__file__).resolve().parent / "db" / "migrations"
 
+NO_TRANSACTION_MARKER = "-- migrate:no-transaction"
+
 CREATE_TRACKING_TABLE = """
 CREATE TABLE IF NOT EXISTS schema_migrations (
     filename   TEXT PRIMARY KEY,
@@ -34,6 +42,54 @@ CREATE TABLE IF NOT EXISTS schema_migrations (
 """
 
 
+def split_statements(sql: str) -> list[str]:
+    """Split a script on top-level semicolons.
+
+    Understands '…' strings, "…" identifiers, -- comments and $tag$ … $tag$
+    bodies (DO blocks, functions) — enough for hand-written migration files.
+    """
+    statements: list[str] = []
+    start = i = 0
+    while i < len(sql):
+        ch = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = len(sql) if end == -1 else end + 1
+            continue
+        if ch in ("'", '"'):
+            end = sql.find(ch, i + 1)
+            i = len(sql) if end == -1 else end + 1
+            continue
+        if ch == "$":
+            tag_end = sql.find("$", i + 1)
+            tag = sql[i : tag_end + 1] if tag_end != -1 else ""
+            if tag and (tag == "$$" or tag[1:-1].replace("_", "").isalnum()):
+                end = sql.find(tag, tag_end + 1)
+                i = len(sql) if end == -1 else end + len(tag)
+                continue
+        if ch == ";":
+            statements.append(sql[start:i].strip())
+            start = i + 1
+        i += 1
+    statements.append(sql[start:].strip())
+    # Drop empty and comment-only fragments.
+    return [
+        s for s in statements
+        if any(line.strip() and not line.strip().startswith("--") for line in s.splitlines())
+    ]
+
+
+def apply_without_transaction(conn, path: Path, sql: str) -> None:
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            for statement in split_statements(sql):
+                cur.execute(statement)
+            cur.execute("INSERT INTO schema_migrations (filename) VALUES (%s)", (path.name,))
+    finally:
+        conn.autocommit = False
+
+
 def main() -> None:
     dsn = os.environ.get("DATABASE_URL", "")
     if not dsn:
@@ -63,6 +119,14 @@ def main() -> None:
     for path in pending:
         print(f"Applying {path.name} ...", end=" ", flush=True)
         sql = path.read_text()
+        if sql.startswith(NO_TRANSACTION_MARKER):
+            try:
+                apply_without_transaction(conn, path, sql)
+                print("done.")
+            except psycopg2.Error as exc:
+                print(f"FAILED: {exc}", file=sys.stderr)
+                sys.exit(1)
+            continue
         with conn.cursor() as cur:
             try:
                 cur.execute(sql)